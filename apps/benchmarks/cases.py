@@ -0,0 +1,165 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache.backends.dummy import DummyCache
+
+from apps.benchmarks.generators import (
+    generate_ranked_matches,
+    generate_series_ruleset,
+    generate_service_record_data,
+    generate_voice_events,
+)
+from apps.fun_time_friday.utils import (
+    get_voice_connection_report,
+    get_voice_connections,
+)
+from apps.halo_infinite.utils import get_era_xbox_earns
+from apps.season_05.models import Domain
+from apps.season_05.utils import score_domain
+from apps.series.utils import build_series, invalidate_series_indexes
+from apps.trailblazer.utils import get_e1_xbox_earn_dict, get_e2_xbox_earn_dict
+
+# Each case's `setup` receives a throwaway User (all database writes are rolled back after the case runs) and returns
+# the zero-argument callable that is actually timed. Cases marked `slow` only run with `benchmark --full`.
+
+
+def series_case(gametype_count: int, warm: bool) -> dict:
+    def setup(creator: User):
+        ruleset = generate_series_ruleset(creator, gametype_count)
+        build_series(ruleset, 7)
+
+        def run():
+            if not warm:
+                invalidate_series_indexes([ruleset.id])
+            return build_series(ruleset, 7)
+
+        return run
+
+    return {
+        "name": f"series.build_series[bo7-{gametype_count}-{'warm' if warm else 'cold'}]",
+        "setup": setup,
+        "repeat": 20,
+        "slow": False,
+    }
+
+
+def voice_connections_case(event_count: int) -> dict:
+    def setup(creator: User):
+        accounts, time_start, time_end = generate_voice_events(creator, event_count, 1)
+        return lambda: get_voice_connections(accounts[0], time_start, time_end)
+
+    return {
+        "name": f"fun_time_friday.get_voice_connections[{event_count}]",
+        "setup": setup,
+        "repeat": 3,
+        "slow": False,
+    }
+
+
+def voice_connection_report_case(event_count: int, slow: bool = False) -> dict:
+    def setup(creator: User):
+        _, time_start, time_end = generate_voice_events(
+            creator, event_count, max(10, event_count // 1000)
+        )
+        return lambda: get_voice_connection_report(time_start, time_end)
+
+    return {
+        "name": f"fun_time_friday.get_voice_connection_report[{event_count}]",
+        "setup": setup,
+        "repeat": 1,
+        "slow": slow,
+    }
+
+
+def hot_streak_case(match_count: int) -> dict:
+    def setup(creator: User):
+        matches = generate_ranked_matches(match_count, 1)
+
+        def run():
+            with patch(
+                "apps.halo_infinite.utils.get_era_matches_for_xuid",
+                return_value=matches,
+            ), patch("apps.halo_infinite.utils.cache", DummyCache("benchmarks", {})):
+                return get_e1_xbox_earn_dict([0])
+
+        return run
+
+    return {
+        "name": f"trailblazer.hot_streak[{match_count}]",
+        "setup": setup,
+        "repeat": 5,
+        "slow": False,
+    }
+
+
+def the_cycle_case(match_count: int) -> dict:
+    def setup(creator: User):
+        matches = generate_ranked_matches(match_count, 2)
+
+        def run():
+            with patch(
+                "apps.halo_infinite.utils.get_era_matches_for_xuid",
+                return_value=matches,
+            ), patch("apps.halo_infinite.utils.cache", DummyCache("benchmarks", {})):
+                return get_e2_xbox_earn_dict([0])
+
+        return run
+
+    return {
+        "name": f"trailblazer.the_cycle[{match_count}]",
+        "setup": setup,
+        "repeat": 5,
+        "slow": False,
+    }
+
+
+def era_xbox_earns_case(match_count: int, era: int) -> dict:
+    # Scores every registered program for an Era without the earn dict's fetch and cache plumbing
+    def setup(creator: User):
+        matches = generate_ranked_matches(match_count, era)
+        return lambda: get_era_xbox_earns(matches, era)
+
+    return {
+        "name": f"halo_infinite.get_era_xbox_earns[e{era}-{match_count}]",
+        "setup": setup,
+        "repeat": 5,
+        "slow": False,
+    }
+
+
+def score_domain_case(record_count: int) -> dict:
+    def setup(creator: User):
+        service_record_data_by_playlist = generate_service_record_data(record_count)
+        domains = [
+            Domain(creator=creator, stat=stat, max_score=1000000, medal_id=1)
+            for stat in Domain.Stats.values
+        ]
+
+        def run():
+            return [
+                score_domain(domain, service_record_data_by_playlist)
+                for domain in domains
+            ]
+
+        return run
+
+    return {
+        "name": f"season_05.score_domain[{record_count}]",
+        "setup": setup,
+        "repeat": 5,
+        "slow": False,
+    }
+
+
+BENCHMARK_CASES = [
+    *[series_case(count, warm) for count in (10, 20, 40, 60) for warm in (False, True)],
+    voice_connections_case(10000),
+    voice_connections_case(100000),
+    voice_connection_report_case(10000),
+    voice_connection_report_case(100000, slow=True),
+    voice_connection_report_case(1000000, slow=True),
+    *[hot_streak_case(count) for count in (100, 1000, 10000)],
+    *[the_cycle_case(count) for count in (100, 1000, 10000)],
+    *[era_xbox_earns_case(count, era) for count in (100, 10000) for era in (1, 2)],
+    *[score_domain_case(count) for count in (10, 100, 1000)],
+]
@@ -0,0 +1,218 @@
+import datetime
+import random
+import uuid
+
+from django.contrib.auth.models import User
+
+from apps.discord.models import DiscordAccount
+from apps.fun_time_friday.models import (
+    FunTimeFridayVoiceConnect,
+    FunTimeFridayVoiceDisconnect,
+)
+from apps.fun_time_friday.utils import backfill_voice_sessions
+from apps.halo_infinite.constants import (
+    GAME_VARIANT_CATEGORY_CAPTURE_THE_FLAG,
+    GAME_VARIANT_CATEGORY_KING_OF_THE_HILL,
+    GAME_VARIANT_CATEGORY_ODDBALL,
+    GAME_VARIANT_CATEGORY_SLAYER,
+    GAME_VARIANT_CATEGORY_STRONGHOLDS,
+    LEVEL_ID_AQUARIUS,
+    LEVEL_ID_LIVE_FIRE,
+    LEVEL_ID_STREETS,
+    LIFECYCLE_MODE_MATCHMADE,
+    PLAYLIST_ID_RANKED_ARENA,
+)
+from apps.halo_infinite.utils import get_start_and_end_times_for_era
+from apps.season_05.models import Domain
+from apps.series.models import SeriesGametype, SeriesMap, SeriesMode, SeriesRuleset
+
+BULK_CREATE_BATCH_SIZE = 10000
+VOICE_CHANNEL_IDS = [str(1000000000000000000 + i) for i in range(8)]
+
+
+def generate_series_ruleset(
+    creator: User, gametype_count: int, seed: int = 0
+) -> SeriesRuleset:
+    """
+    Creates an HCS-style ruleset (featured mode, map repeats allowed in a best of 7) with `gametype_count` distinct
+    map/mode pairs. Maps and modes grow with the ruleset the way real rulesets do (about three gametypes per map and
+    six per mode). The featured mode has three gametypes and the rest are spread across the other modes, so every
+    series length is possible.
+    """
+    rng = random.Random(seed)
+    maps = SeriesMap.objects.bulk_create(
+        [
+            SeriesMap(creator=creator, name=f"Map {i}")
+            for i in range(max(4, gametype_count // 3))
+        ]
+    )
+    modes = SeriesMode.objects.bulk_create(
+        [
+            SeriesMode(creator=creator, name=f"Mode {i}")
+            for i in range(max(5, gametype_count // 6))
+        ]
+    )
+    ruleset = SeriesRuleset.objects.create(
+        creator=creator,
+        id=uuid.uuid4().hex,
+        name=f"Benchmark {gametype_count}",
+        featured_mode=modes[0],
+        allow_bo7_map_repeats=True,
+    )
+    # Deal the remaining gametypes round-robin across the other modes, each on a random map
+    pairs = [(maps[i], modes[0]) for i in range(3)]
+    shuffled_maps_by_mode = {mode: rng.sample(maps, len(maps)) for mode in modes[1:]}
+    for i in range(gametype_count - 3):
+        mode = modes[1 + i % (len(modes) - 1)]
+        pairs.append((shuffled_maps_by_mode[mode].pop(), mode))
+    SeriesGametype.objects.bulk_create(
+        [
+            SeriesGametype(creator=creator, ruleset=ruleset, map=map, mode=mode)
+            for map, mode in pairs
+        ]
+    )
+    return ruleset
+
+
+def generate_voice_events(
+    creator: User, event_count: int, account_count: int, seed: int = 0
+) -> tuple[list[DiscordAccount], datetime.datetime, datetime.datetime]:
+    """
+    Creates `event_count` voice connects and disconnects spread evenly across `account_count` new Discord accounts.
+    Each account hops between channels back to back; about one session in twenty is missing its connect or disconnect
+    so the matching logic's look-ahead paths are exercised. Voice sessions are then built for the matched pairs.
+    Returns the accounts and the window containing every event.
+    """
+    rng = random.Random(seed)
+    time_start = datetime.datetime(2024, 1, 5, 18, 0, 0, tzinfo=datetime.timezone.utc)
+    accounts = DiscordAccount.objects.bulk_create(
+        [
+            DiscordAccount(
+                creator=creator,
+                discord_id=str(900000000000000000 + i),
+                discord_username=f"Benchmark{i}",
+            )
+            for i in range(account_count)
+        ]
+    )
+    connects = []
+    disconnects = []
+    time_end = time_start
+    sessions_per_account = max(1, event_count // 2 // account_count)
+    for account in accounts:
+        current_time = time_start + datetime.timedelta(seconds=rng.randint(0, 600))
+        for _ in range(sessions_per_account):
+            channel_id = rng.choice(VOICE_CHANNEL_IDS)
+            disconnected_at = current_time + datetime.timedelta(
+                seconds=rng.randint(30, 3600)
+            )
+            roll = rng.random()
+            if roll >= 0.025:
+                connects.append(
+                    FunTimeFridayVoiceConnect(
+                        creator=creator,
+                        connector_discord=account,
+                        connected_at=current_time,
+                        channel_id=channel_id,
+                    )
+                )
+            if roll < 0.025 or roll >= 0.05:
+                disconnects.append(
+                    FunTimeFridayVoiceDisconnect(
+                        creator=creator,
+                        disconnector_discord=account,
+                        disconnected_at=disconnected_at,
+                        channel_id=channel_id,
+                    )
+                )
+            current_time = disconnected_at + datetime.timedelta(
+                seconds=rng.randint(0, 300)
+            )
+        time_end = max(time_end, current_time)
+    FunTimeFridayVoiceConnect.objects.bulk_create(
+        connects, batch_size=BULK_CREATE_BATCH_SIZE
+    )
+    FunTimeFridayVoiceDisconnect.objects.bulk_create(
+        disconnects, batch_size=BULK_CREATE_BATCH_SIZE
+    )
+    # bulk_create skips the disconnect signal, so build the sessions the way historical rows are backfilled
+    backfill_voice_sessions()
+    return accounts, time_start, time_end
+
+
+def generate_ranked_matches(
+    match_count: int, era: int, worst_case: bool = True, seed: int = 0
+) -> list[dict]:
+    """
+    Returns `match_count` Ranked Arena match history entries played across the given era in sessions of about twenty
+    matches a night. With `worst_case` set, no six-hour window contains a win in all five Cycle modes and no three
+    consecutive matches are all first-place finishes, so the streak and cycle detectors have to scan everything.
+    """
+    rng = random.Random(seed)
+    categories = [
+        GAME_VARIANT_CATEGORY_CAPTURE_THE_FLAG,
+        GAME_VARIANT_CATEGORY_KING_OF_THE_HILL,
+        GAME_VARIANT_CATEGORY_ODDBALL,
+        GAME_VARIANT_CATEGORY_SLAYER,
+        GAME_VARIANT_CATEGORY_STRONGHOLDS,
+    ]
+    level_ids = [LEVEL_ID_AQUARIUS, LEVEL_ID_LIVE_FIRE, LEVEL_ID_STREETS]
+    era_start_time, era_end_time = get_start_and_end_times_for_era(era)
+    current_time = era_start_time
+    matches = []
+    first_place_streak = 0
+    for i in range(match_count):
+        if i % 20 == 0:
+            current_time += datetime.timedelta(hours=rng.randint(12, 36))
+        start_time = current_time
+        end_time = start_time + datetime.timedelta(minutes=rng.randint(6, 14))
+        outcome = 2 if rng.random() < 0.5 else 3
+        category = rng.choice(categories[:-1] if worst_case else categories)
+        rank = 1 if rng.random() < 0.4 else rng.randint(2, 8)
+        if worst_case and rank == 1 and first_place_streak == 2:
+            rank = 2
+        first_place_streak = first_place_streak + 1 if rank == 1 else 0
+        matches.append(
+            {
+                "MatchId": str(uuid.UUID(int=rng.getrandbits(128))),
+                "MatchInfo": {
+                    "StartTime": start_time.isoformat(),
+                    "EndTime": end_time.isoformat(),
+                    "GameVariantCategory": category,
+                    "LevelId": rng.choice(level_ids),
+                    "LifecycleMode": LIFECYCLE_MODE_MATCHMADE,
+                    "Playlist": {"AssetId": PLAYLIST_ID_RANKED_ARENA},
+                },
+                "Outcome": outcome,
+                "Rank": rank,
+            }
+        )
+        current_time = end_time + datetime.timedelta(minutes=rng.randint(1, 3))
+    return matches
+
+
+def generate_service_record_data(
+    record_count: int, medal_count: int = 50, seed: int = 0
+) -> dict:
+    """
+    Returns service record data shaped like `get_service_record_data` output for a single (null) playlist, with
+    `record_count` service records that each contain every stat a Domain can track.
+    """
+    rng = random.Random(seed)
+    service_records = {}
+    for i in range(record_count):
+        record = {}
+        for stat in Domain.Stats.values:
+            *path, leaf = stat.split("_")
+            data = record
+            for piece in path:
+                data = data.setdefault(piece, {})
+            if stat == Domain.Stats.CoreStats_Medals:
+                data[leaf] = [
+                    {"NameId": rng.randint(1, 4294967295), "Count": rng.randint(1, 50)}
+                    for _ in range(medal_count)
+                ]
+            else:
+                data[leaf] = rng.randint(0, 10000)
+        service_records[f"Csr/Seasons/CsrSeason5-{i}.json"] = record
+    return {None: service_records}
@@ -0,0 +1,89 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.benchmarks.cases import BENCHMARK_CASES
+from apps.benchmarks.utils import (
+    find_regressions,
+    read_baselines,
+    run_case,
+    write_baselines,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the pure-Python hot spot benchmarks against synthetic data, reporting time and peak memory per case and "
+        "failing if any case regresses past its stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-k",
+            dest="patterns",
+            action="append",
+            default=[],
+            help="Only run cases whose names contain this substring (may be repeated).",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Also run the slow cases (e.g. million-event voice logs).",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=1.5,
+            help="Fail when a case is more than this many times slower or hungrier than its baseline.",
+        )
+        parser.add_argument(
+            "--update-baselines",
+            action="store_true",
+            help="Store this run's results as the new baselines instead of comparing against them.",
+        )
+
+    def handle(self, *args, **options):
+        cases = [
+            case
+            for case in BENCHMARK_CASES
+            if (options["full"] or not case["slow"])
+            and (
+                len(options["patterns"]) == 0
+                or any(pattern in case["name"] for pattern in options["patterns"])
+            )
+        ]
+        baselines = read_baselines()
+        results = {}
+        self.stdout.write(
+            f"{'case':<56} {'time (ms)':>12} {'baseline':>12} {'peak (KiB)':>12} {'baseline':>12}"
+        )
+        for case in cases:
+            result = run_case(case)
+            results[case["name"]] = result
+            baseline = baselines.get(case["name"], {})
+            baseline_ms = (
+                f"{baseline['seconds'] * 1000:.2f}" if "seconds" in baseline else "-"
+            )
+            baseline_kib = (
+                f"{baseline['peak_bytes'] / 1024:.0f}"
+                if "peak_bytes" in baseline
+                else "-"
+            )
+            self.stdout.write(
+                f"{case['name']:<56} {result['seconds'] * 1000:>12.2f} {baseline_ms:>12} "
+                f"{result['peak_bytes'] / 1024:>12.0f} {baseline_kib:>12}"
+            )
+
+        if options["update_baselines"]:
+            write_baselines({**baselines, **results})
+            self.stdout.write(
+                self.style.SUCCESS(f"Updated baselines for {len(results)} case(s).")
+            )
+            return
+
+        regressions = find_regressions(results, baselines, options["threshold"])
+        if len(regressions) > 0:
+            raise CommandError(
+                "Benchmark regression(s) detected:\n" + "\n".join(regressions)
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(results)} case(s) within baseline.")
+        )
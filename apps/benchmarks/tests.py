@@ -0,0 +1,96 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.benchmarks.generators import (
+    generate_ranked_matches,
+    generate_series_ruleset,
+    generate_service_record_data,
+    generate_voice_events,
+)
+from apps.benchmarks.utils import find_regressions
+from apps.fun_time_friday.models import (
+    FunTimeFridayVoiceConnect,
+    FunTimeFridayVoiceDisconnect,
+)
+from apps.season_05.models import Domain
+from apps.season_05.utils import score_domain
+from apps.series.models import SeriesGametype
+from apps.series.utils import build_series
+
+
+class BenchmarksTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="test", email="test@test.com", password="test"
+        )
+
+    def test_find_regressions(self):
+        baselines = {
+            "fast": {"seconds": 0.1, "peak_bytes": 1024 * 1024},
+            "tiny": {"seconds": 0.0001, "peak_bytes": 1024},
+        }
+
+        # Results within the threshold (or without a baseline) are not regressions
+        results = {
+            "fast": {"seconds": 0.14, "peak_bytes": 1024 * 1024},
+            "new": {"seconds": 100, "peak_bytes": 1024 * 1024 * 1024},
+        }
+        self.assertEqual(find_regressions(results, baselines, 1.5), [])
+
+        # Results past the threshold are regressions
+        results = {"fast": {"seconds": 0.2, "peak_bytes": 2 * 1024 * 1024}}
+        regressions = find_regressions(results, baselines, 1.5)
+        self.assertEqual(len(regressions), 2)
+        self.assertIn("0.2000s vs. baseline 0.1000s", regressions[0])
+        self.assertIn("2097152 peak bytes vs. baseline 1048576", regressions[1])
+
+        # Differences below the noise floor are not regressions, however large relative to the baseline
+        results = {"tiny": {"seconds": 0.001, "peak_bytes": 10 * 1024}}
+        self.assertEqual(find_regressions(results, baselines, 1.5), [])
+
+    def test_generate_series_ruleset(self):
+        for gametype_count in (10, 60):
+            ruleset = generate_series_ruleset(self.user, gametype_count)
+            gametypes = SeriesGametype.objects.filter(ruleset=ruleset)
+            self.assertEqual(gametypes.count(), gametype_count)
+            self.assertEqual(
+                gametypes.filter(mode=ruleset.featured_mode).count(),
+                3,
+            )
+            self.assertEqual(len(build_series(ruleset, 7)), 7)
+
+    def test_generate_voice_events(self):
+        accounts, time_start, time_end = generate_voice_events(self.user, 200, 2)
+        self.assertEqual(len(accounts), 2)
+        connects = FunTimeFridayVoiceConnect.objects.filter(
+            connected_at__range=[time_start, time_end]
+        )
+        disconnects = FunTimeFridayVoiceDisconnect.objects.filter(
+            disconnected_at__range=[time_start, time_end]
+        )
+        # About one session in twenty is missing an event
+        self.assertGreater(connects.count() + disconnects.count(), 180)
+        self.assertLessEqual(connects.count() + disconnects.count(), 200)
+
+    def test_generate_ranked_matches(self):
+        matches = generate_ranked_matches(1000, 2)
+        self.assertEqual(len(matches), 1000)
+        end_times = [
+            datetime.datetime.fromisoformat(match["MatchInfo"]["EndTime"])
+            for match in matches
+        ]
+        self.assertEqual(end_times, sorted(end_times))
+        # Worst case histories never contain three consecutive first-place finishes
+        for i in range(len(matches) - 2):
+            ranks = {matches[i]["Rank"], matches[i + 1]["Rank"], matches[i + 2]["Rank"]}
+            self.assertNotEqual(ranks, {1})
+
+    def test_generate_service_record_data(self):
+        service_record_data_by_playlist = generate_service_record_data(3)
+        self.assertEqual(len(service_record_data_by_playlist[None]), 3)
+        for stat in Domain.Stats.values:
+            domain = Domain(creator=self.user, stat=stat, max_score=1, medal_id=1)
+            score, _ = score_domain(domain, service_record_data_by_playlist)
+            self.assertGreaterEqual(score, 0)
@@ -0,0 +1,84 @@
+import gc
+import json
+import logging
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+BASELINES_PATH = Path(__file__).resolve().parent / "baselines.json"
+# Differences smaller than these are treated as noise regardless of the threshold
+MIN_REGRESSION_SECONDS = 0.002
+MIN_REGRESSION_PEAK_BYTES = 64 * 1024
+
+
+def run_case(case: dict) -> dict:
+    """
+    Runs a benchmark case inside a transaction that is always rolled back. Returns the best wall-clock time across the
+    case's repeats (measured without tracing) and the peak traced Python memory of one additional, traced run.
+    """
+    with transaction.atomic():
+        creator = User.objects.create_user(username="benchmark")
+        run = case["setup"](creator)
+        timings = []
+        for _ in range(case["repeat"]):
+            gc.collect()
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run()
+            _, peak_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        transaction.set_rollback(True)
+    return {"seconds": min(timings), "peak_bytes": peak_bytes}
+
+
+def find_regressions(
+    results: dict[str, dict], baselines: dict[str, dict], threshold: float
+) -> list[str]:
+    """
+    Returns a description of every result that is more than `threshold` times slower (or hungrier) than its baseline.
+    Cases without a baseline never regress.
+    """
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        if (
+            result["seconds"] > baseline["seconds"] * threshold
+            and result["seconds"] - baseline["seconds"] > MIN_REGRESSION_SECONDS
+        ):
+            regressions.append(
+                f"{name}: {result['seconds']:.4f}s vs. baseline {baseline['seconds']:.4f}s"
+            )
+        if (
+            result["peak_bytes"] > baseline["peak_bytes"] * threshold
+            and result["peak_bytes"] - baseline["peak_bytes"]
+            > MIN_REGRESSION_PEAK_BYTES
+        ):
+            regressions.append(
+                f"{name}: {result['peak_bytes']} peak bytes vs. baseline {baseline['peak_bytes']} peak bytes"
+            )
+    return regressions
+
+
+def read_baselines() -> dict[str, dict]:
+    if not BASELINES_PATH.exists():
+        return {}
+    with open(BASELINES_PATH) as baselines_file:
+        return json.load(baselines_file)
+
+
+def write_baselines(baselines: dict[str, dict]) -> None:
+    with open(BASELINES_PATH, "w") as baselines_file:
+        json.dump(baselines, baselines_file, indent=2, sort_keys=True)
+        baselines_file.write("\n")
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class DiscordConfig(AppConfig):
     name = "apps.discord"
+
+    def ready(self):
+        import apps.discord.signals  # noqa
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:55
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def delete_duplicate_lfg_help_prompts(apps, schema_editor):
+    # Concurrent LFG posts could double-insert prompts before the unique constraints existed; keep the earliest of each
+    for model_name, location_field in (
+        ("DiscordLFGChannelHelpPrompt", "lfg_channel_id"),
+        ("DiscordLFGThreadHelpPrompt", "lfg_thread_id"),
+    ):
+        model = apps.get_model("discord", model_name)
+        earliest_ids = model.objects.filter(
+            help_receiver_discord_id=OuterRef("help_receiver_discord_id"),
+            **{location_field: OuterRef(location_field)},
+        ).order_by("created_at", "id")
+        model.objects.exclude(id=Subquery(earliest_ids.values("id")[:1])).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("discord", "0006_alter_discordaccount_created_at_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            delete_duplicate_lfg_help_prompts,
+            reverse_code=migrations.RunPython.noop,
+        ),
+        migrations.AddConstraint(
+            model_name="discordlfgchannelhelpprompt",
+            constraint=models.UniqueConstraint(
+                fields=("help_receiver_discord", "lfg_channel_id"),
+                name="discord_lfg_channel_help_prompt_unique_receiver_channel",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="discordlfgthreadhelpprompt",
+            constraint=models.UniqueConstraint(
+                fields=("help_receiver_discord", "lfg_thread_id"),
+                name="discord_lfg_thread_help_prompt_unique_receiver_thread",
+            ),
+        ),
+    ]
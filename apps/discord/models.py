@@ -33,6 +33,12 @@ class DiscordLFGChannelHelpPrompt(Base):
         ordering = [
             "-created_at",
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["help_receiver_discord", "lfg_channel_id"],
+                name="discord_lfg_channel_help_prompt_unique_receiver_channel",
+            )
+        ]
         verbose_name = "LFG Channel Help Prompt"
         verbose_name_plural = "LFG Channel Help Prompts"
 
@@ -59,6 +65,12 @@ class DiscordLFGThreadHelpPrompt(Base):
         ordering = [
             "-created_at",
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["help_receiver_discord", "lfg_thread_id"],
+                name="discord_lfg_thread_help_prompt_unique_receiver_thread",
+            )
+        ]
         verbose_name = "LFG Thread Help Prompt"
         verbose_name_plural = "LFG Thread Help Prompts"
 
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.discord.models import DiscordAccount
+from apps.discord.utils import forget_discord_account_identity
+
+
+@receiver(post_save, sender=DiscordAccount)
+def discord_account_post_save(sender, instance, **kwargs):
+    forget_discord_account_identity(instance.discord_id)
+
+
+@receiver(post_delete, sender=DiscordAccount)
+def discord_account_post_delete(sender, instance, **kwargs):
+    forget_discord_account_identity(instance.discord_id)
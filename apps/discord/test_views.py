@@ -24,8 +24,7 @@ class DiscordTestCase(APITestCase):
         self.client = APIClient(HTTP_AUTHORIZATION="Bearer " + token.key)
 
     @patch("apps.discord.views.get_csrs")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
-    def test_csr_snapshot_view(self, mock_get_xuid_and_exact_gamertag, mock_get_csrs):
+    def test_csr_snapshot_view(self, mock_get_csrs):
         # Missing field values throw errors
         response = self.client.post("/discord/csr-snapshot", {}, format="json")
         self.assertEqual(response.status_code, 400)
@@ -72,14 +71,13 @@ class DiscordTestCase(APITestCase):
         test_playlist_id = str(uuid.uuid4())
         links = []
         for i in range(10):
-            mock_get_xuid_and_exact_gamertag.return_value = (i, f"test{i}")
             discord_account = DiscordAccount.objects.create(
                 creator=self.user,
                 discord_id=str(i),
                 discord_username=f"TestUsername{i}",
             )
             xbox_live_account = XboxLiveAccount.objects.create(
-                creator=self.user, gamertag=f"testGT{i}"
+                creator=self.user, gamertag=f"test{i}", xuid=i
             )
             links.append(
                 DiscordXboxLiveLink.objects.create(
@@ -605,11 +603,8 @@ class DiscordTestCase(APITestCase):
         self.assertFalse(response.data.get("new"))
         self.assertEqual(DiscordLFGThreadHelpPrompt.objects.count(), 1)
 
-    @patch("apps.discord.views.get_csrs")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
-    def test_ranked_role_check_view(
-        self, mock_get_xuid_and_exact_gamertag, mock_get_csrs
-    ):
+    @patch("apps.discord.views.aget_csrs")
+    def test_ranked_role_check_view(self, mock_get_csrs):
         # Missing field values throw errors
         response = self.client.post("/discord/ranked-role-check", {}, format="json")
         self.assertEqual(response.status_code, 400)
@@ -656,14 +651,13 @@ class DiscordTestCase(APITestCase):
         test_playlist_id = str(uuid.uuid4())
         links = []
         for i in range(10):
-            mock_get_xuid_and_exact_gamertag.return_value = (i, f"test{i}")
             discord_account = DiscordAccount.objects.create(
                 creator=self.user,
                 discord_id=str(i),
                 discord_username=f"TestUsername{i}",
             )
             xbox_live_account = XboxLiveAccount.objects.create(
-                creator=self.user, gamertag=f"testGT{i}"
+                creator=self.user, gamertag=f"test{i}", xuid=i
             )
             links.append(
                 DiscordXboxLiveLink.objects.create(
@@ -2,8 +2,13 @@ from django.contrib.auth.models import User
 from django.db.utils import IntegrityError
 from django.test import TestCase
 
-from apps.discord.models import DiscordAccount
-from apps.discord.utils import update_or_create_discord_account
+from apps.discord.models import DiscordAccount, DiscordLFGChannelHelpPrompt
+from apps.discord.utils import (
+    bulk_update_or_create_discord_accounts,
+    create_lfg_help_prompt,
+    discord_account_identities,
+    update_or_create_discord_account,
+)
 
 
 class DiscordAccountTestCase(TestCase):
@@ -62,3 +67,140 @@ class DiscordAccountTestCase(TestCase):
         self.assertIsNotNone(discord_account_3.created_at)
         self.assertIsNotNone(discord_account_3.updated_at)
         self.assertEqual(len(DiscordAccount.objects.all()), 2)
+
+    def test_bulk_update_or_create_discord_accounts(self):
+        update_or_create_discord_account("123", "ABC1234", self.user)
+        created_at = DiscordAccount.objects.get(discord_id="123").created_at
+
+        # Existing accounts are read in one query, then renamed and new accounts are written in another
+        with self.assertNumQueries(2):
+            discord_accounts = bulk_update_or_create_discord_accounts(
+                {"123": "DEF1234", "456": "GHI4567"}, self.user
+            )
+        self.assertEqual(list(discord_accounts.keys()), ["123", "456"])
+        self.assertEqual(discord_accounts["123"].discord_username, "DEF1234")
+        self.assertEqual(
+            dict(DiscordAccount.objects.values_list("discord_id", "discord_username")),
+            {"123": "DEF1234", "456": "GHI4567"},
+        )
+        self.assertEqual(
+            DiscordAccount.objects.get(discord_id="123").created_at, created_at
+        )
+
+        # Unchanged accounts are only read
+        with self.assertNumQueries(1):
+            discord_accounts = bulk_update_or_create_discord_accounts(
+                {"123": "DEF1234", "456": "GHI4567"}, self.user
+            )
+        self.assertEqual(discord_accounts["456"].discord_username, "GHI4567")
+
+        # Nothing to save
+        with self.assertNumQueries(0):
+            self.assertEqual(bulk_update_or_create_discord_accounts({}, self.user), {})
+
+    def test_discord_account_identity_cache(self):
+        discord_account_identities.clear()
+        self.addCleanup(discord_account_identities.clear)
+
+        # Committed accounts are remembered, and later calls with the same username skip the database
+        with self.captureOnCommitCallbacks(execute=True):
+            update_or_create_discord_account("123", "ABC1234", self.user)
+        with self.assertNumQueries(0):
+            discord_account = update_or_create_discord_account(
+                "123", "ABC1234", self.user
+            )
+            discord_accounts = bulk_update_or_create_discord_accounts(
+                {"123": "ABC1234"}, self.user
+            )
+        self.assertEqual(discord_account.discord_id, "123")
+        self.assertEqual(discord_account.discord_username, "ABC1234")
+        self.assertEqual(discord_account.creator_id, self.user.id)
+        self.assertEqual(discord_accounts["123"].discord_id, "123")
+
+        # A new username goes to the database
+        with self.captureOnCommitCallbacks(execute=True):
+            update_or_create_discord_account("123", "DEF1234", self.user)
+        self.assertEqual(
+            DiscordAccount.objects.get(discord_id="123").discord_username, "DEF1234"
+        )
+        with self.assertNumQueries(0):
+            update_or_create_discord_account("123", "DEF1234", self.user)
+
+        # Saving or deleting the account elsewhere drops its identity
+        DiscordAccount.objects.filter(discord_id="123").get().delete()
+        self.assertNotIn("123", discord_account_identities)
+        update_or_create_discord_account("123", "DEF1234", self.user)
+        self.assertTrue(DiscordAccount.objects.filter(discord_id="123").exists())
+
+        # Identities expire
+        with self.captureOnCommitCallbacks(execute=True):
+            update_or_create_discord_account("456", "GHI4567", self.user)
+        discord_account_identities["456"]["expires_at"] = 0
+        with self.assertNumQueries(1):
+            update_or_create_discord_account("456", "GHI4567", self.user)
+
+    def test_create_lfg_help_prompt(self):
+        # New account and prompt are both created in one query
+        with self.assertNumQueries(1):
+            self.assertTrue(
+                create_lfg_help_prompt(
+                    DiscordLFGChannelHelpPrompt,
+                    "123",
+                    "ABC1234",
+                    self.user,
+                    lfg_channel_id="987",
+                    lfg_channel_name="LFG",
+                )
+            )
+        discord_account = DiscordAccount.objects.get(discord_id="123")
+        self.assertEqual(discord_account.discord_username, "ABC1234")
+        prompt = DiscordLFGChannelHelpPrompt.objects.get()
+        self.assertEqual(prompt.help_receiver_discord, discord_account)
+        self.assertEqual(prompt.lfg_channel_id, "987")
+        self.assertEqual(prompt.lfg_channel_name, "LFG")
+        self.assertEqual(prompt.creator, self.user)
+
+        # Repeat prompt with an unchanged username writes nothing
+        self.assertFalse(
+            create_lfg_help_prompt(
+                DiscordLFGChannelHelpPrompt,
+                "123",
+                "ABC1234",
+                self.user,
+                lfg_channel_id="987",
+                lfg_channel_name="LFG",
+            )
+        )
+        self.assertEqual(DiscordLFGChannelHelpPrompt.objects.count(), 1)
+        self.assertEqual(
+            DiscordAccount.objects.get(discord_id="123").updated_at,
+            discord_account.updated_at,
+        )
+
+        # Changed username is saved even when the prompt already exists
+        self.assertFalse(
+            create_lfg_help_prompt(
+                DiscordLFGChannelHelpPrompt,
+                "123",
+                "DEF1234",
+                self.user,
+                lfg_channel_id="987",
+                lfg_channel_name="LFG",
+            )
+        )
+        self.assertEqual(
+            DiscordAccount.objects.get(discord_id="123").discord_username, "DEF1234"
+        )
+
+        # Same account in another channel gets a new prompt
+        self.assertTrue(
+            create_lfg_help_prompt(
+                DiscordLFGChannelHelpPrompt,
+                "123",
+                "DEF1234",
+                self.user,
+                lfg_channel_id="654",
+                lfg_channel_name="LFG 2",
+            )
+        )
+        self.assertEqual(DiscordLFGChannelHelpPrompt.objects.count(), 2)
@@ -1,7 +1,35 @@
+import time
+import uuid
+
 from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.utils import timezone
 
 from apps.discord.models import DiscordAccount
 
+DISCORD_ACCOUNT_IDENTITY_TIMEOUT = 60
+
+# This worker's recently confirmed Discord usernames, keyed by Discord ID
+discord_account_identities = {}
+
+# Upserts the Discord account - writing it only when it is new or its username changed - and inserts the help prompt
+# unless one already exists for the same account and channel/thread, all in one statement
+LFG_HELP_PROMPT_UPSERT_SQL = """
+WITH discord_account AS (
+    INSERT INTO {account_table} AS account (discord_id, discord_username, created_at, updated_at, creator_id)
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (discord_id) DO UPDATE SET
+        discord_username = EXCLUDED.discord_username,
+        updated_at = EXCLUDED.updated_at,
+        creator_id = EXCLUDED.creator_id
+    WHERE account.discord_username <> EXCLUDED.discord_username
+)
+INSERT INTO {prompt_table} (id, created_at, updated_at, creator_id, help_receiver_discord_id, {prompt_columns})
+VALUES (%s, %s, %s, %s, %s, {prompt_placeholders})
+ON CONFLICT DO NOTHING
+RETURNING id
+"""
+
 
 def get_or_create_discord_account(discord_id: str, user: User, discord_username=""):
     return DiscordAccount.objects.get_or_create(
@@ -10,10 +38,146 @@ def get_or_create_discord_account(discord_id: str, user: User, discord_username=
     )[0]
 
 
+def get_cached_discord_account(
+    discord_id: str, discord_username: str
+) -> DiscordAccount | None:
+    """
+    Returns the DiscordAccount if this worker confirmed within the last DISCORD_ACCOUNT_IDENTITY_TIMEOUT seconds that it
+    exists with this username. Only the account's ID, username and creator are loaded; other fields load on access.
+    """
+    identity = discord_account_identities.get(discord_id)
+    if (
+        identity is None
+        or identity["discord_username"] != discord_username
+        or time.monotonic() > identity["expires_at"]
+    ):
+        return None
+    # `from_db` expects the loaded values in the model's field order
+    return DiscordAccount.from_db(
+        DEFAULT_DB_ALIAS,
+        ["creator_id", "discord_id", "discord_username"],
+        [identity["creator_id"], discord_id, discord_username],
+    )
+
+
+def remember_discord_account_identities(discord_accounts: list[DiscordAccount]):
+    # Identities are only remembered once committed, so a rolled back transaction never leaves one behind
+    def remember():
+        expires_at = time.monotonic() + DISCORD_ACCOUNT_IDENTITY_TIMEOUT
+        for discord_account in discord_accounts:
+            discord_account_identities[discord_account.discord_id] = {
+                "discord_username": discord_account.discord_username,
+                "creator_id": discord_account.creator_id,
+                "expires_at": expires_at,
+            }
+
+    transaction.on_commit(remember)
+
+
+def forget_discord_account_identity(discord_id: str):
+    discord_account_identities.pop(discord_id, None)
+
+
 def update_or_create_discord_account(
     discord_id: str, discord_username: str, user: User
 ):
-    return DiscordAccount.objects.update_or_create(
+    # Only touches the database when the identity is not cached, and only writes when the account is new or renamed
+    discord_account = get_cached_discord_account(discord_id, discord_username)
+    if discord_account is not None:
+        return discord_account
+    discord_account, created = DiscordAccount.objects.get_or_create(
         discord_id=discord_id,
         defaults={"discord_username": discord_username, "creator": user},
-    )[0]
+    )
+    if not created and discord_account.discord_username != discord_username:
+        discord_account.discord_username = discord_username
+        discord_account.creator = user
+        discord_account.save(
+            update_fields=["discord_username", "creator", "updated_at"]
+        )
+    remember_discord_account_identities([discord_account])
+    return discord_account
+
+
+def bulk_update_or_create_discord_accounts(
+    discord_usernames_by_id: dict[str, str], user: User
+) -> dict[str, DiscordAccount]:
+    # Equivalent to calling `update_or_create_discord_account` for each Discord ID: uncached accounts are read in one
+    # query, and only the new or renamed ones are written, in one INSERT ... ON CONFLICT
+    discord_accounts = {}
+    for discord_id, discord_username in discord_usernames_by_id.items():
+        discord_account = get_cached_discord_account(discord_id, discord_username)
+        if discord_account is not None:
+            discord_accounts[discord_id] = discord_account
+    uncached_discord_ids = [
+        discord_id
+        for discord_id in discord_usernames_by_id
+        if discord_id not in discord_accounts
+    ]
+    if len(uncached_discord_ids) == 0:
+        return discord_accounts
+    existing_discord_accounts = DiscordAccount.objects.in_bulk(uncached_discord_ids)
+    saved_discord_accounts = DiscordAccount.objects.bulk_create(
+        [
+            DiscordAccount(
+                discord_id=discord_id,
+                discord_username=discord_usernames_by_id[discord_id],
+                creator=user,
+            )
+            for discord_id in uncached_discord_ids
+            if discord_id not in existing_discord_accounts
+            or existing_discord_accounts[discord_id].discord_username
+            != discord_usernames_by_id[discord_id]
+        ],
+        update_conflicts=True,
+        unique_fields=["discord_id"],
+        update_fields=["discord_username", "creator", "updated_at"],
+    )
+    existing_discord_accounts.update(
+        {
+            discord_account.discord_id: discord_account
+            for discord_account in saved_discord_accounts
+        }
+    )
+    remember_discord_account_identities(list(existing_discord_accounts.values()))
+    return {
+        discord_id: discord_accounts.get(discord_id)
+        or existing_discord_accounts[discord_id]
+        for discord_id in discord_usernames_by_id
+    }
+
+
+def create_lfg_help_prompt(
+    prompt_model, discord_id: str, discord_username: str, user: User, **prompt_fields
+) -> bool:
+    """
+    Records that a Discord account was shown an LFG help prompt, upserting the account along the way. Returns False
+    without writing anything if the account had already been shown the prompt for the same channel or thread.
+    """
+    # The statement may rename the account without going through the identity cache
+    forget_discord_account_identity(discord_id)
+    now = timezone.now()
+    sql = LFG_HELP_PROMPT_UPSERT_SQL.format(
+        account_table=connection.ops.quote_name(DiscordAccount._meta.db_table),
+        prompt_table=connection.ops.quote_name(prompt_model._meta.db_table),
+        prompt_columns=", ".join(prompt_fields.keys()),
+        prompt_placeholders=", ".join(["%s"] * len(prompt_fields)),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql,
+            [
+                discord_id,
+                discord_username,
+                now,
+                now,
+                user.id,
+                uuid.uuid4(),
+                now,
+                now,
+                user.id,
+                discord_id,
+                *prompt_fields.values(),
+            ],
+        )
+        return cursor.fetchone() is not None
@@ -18,9 +18,10 @@ from apps.discord.serializers import (
     RankedRoleCheckRequestSerializer,
     RankedRoleCheckResponseSerializer,
 )
-from apps.discord.utils import update_or_create_discord_account
-from apps.halo_infinite.utils import get_csrs
+from apps.discord.utils import create_lfg_help_prompt
+from apps.halo_infinite.utils import aget_csrs, get_csrs
 from apps.link.models import DiscordXboxLiveLink
+from apps.overrides.views import AsyncAPIView
 from config.serializers import StandardErrorSerializer
 
 logger = logging.getLogger(__name__)
@@ -107,23 +108,14 @@ class LFGChannelHelpPromptView(APIView):
             lfg_channel_id = validation_serializer.data.get("lfgChannelId")
             lfg_channel_name = validation_serializer.data.get("lfgChannelName")
             try:
-                discord_account = update_or_create_discord_account(
-                    discord_id, discord_username, request.user
+                new = create_lfg_help_prompt(
+                    DiscordLFGChannelHelpPrompt,
+                    discord_id,
+                    discord_username,
+                    request.user,
+                    lfg_channel_id=lfg_channel_id,
+                    lfg_channel_name=lfg_channel_name,
                 )
-                new = (
-                    DiscordLFGChannelHelpPrompt.objects.filter(
-                        help_receiver_discord_id=discord_account.discord_id,
-                        lfg_channel_id=lfg_channel_id,
-                    ).count()
-                    == 0
-                )
-                if new:
-                    DiscordLFGChannelHelpPrompt.objects.create(
-                        creator=request.user,
-                        help_receiver_discord=discord_account,
-                        lfg_channel_id=lfg_channel_id,
-                        lfg_channel_name=lfg_channel_name,
-                    )
             except Exception as ex:
                 logger.error("Error attempting LFG Channel Help.")
                 logger.error(ex)
@@ -155,23 +147,14 @@ class LFGThreadHelpPromptView(APIView):
             lfg_thread_id = validation_serializer.data.get("lfgThreadId")
             lfg_thread_name = validation_serializer.data.get("lfgThreadName")
             try:
-                discord_account = update_or_create_discord_account(
-                    discord_id, discord_username, request.user
-                )
-                new = (
-                    DiscordLFGThreadHelpPrompt.objects.filter(
-                        help_receiver_discord_id=discord_account.discord_id,
-                        lfg_thread_id=lfg_thread_id,
-                    ).count()
-                    == 0
+                new = create_lfg_help_prompt(
+                    DiscordLFGThreadHelpPrompt,
+                    discord_id,
+                    discord_username,
+                    request.user,
+                    lfg_thread_id=lfg_thread_id,
+                    lfg_thread_name=lfg_thread_name,
                 )
-                if new:
-                    DiscordLFGThreadHelpPrompt.objects.create(
-                        creator=request.user,
-                        help_receiver_discord=discord_account,
-                        lfg_thread_id=lfg_thread_id,
-                        lfg_thread_name=lfg_thread_name,
-                    )
             except Exception as ex:
                 logger.error("Error attempting LFG Thread Help.")
                 logger.error(ex)
@@ -182,7 +165,7 @@ class LFGThreadHelpPromptView(APIView):
             return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class RankedRoleCheckView(APIView):
+class RankedRoleCheckView(AsyncAPIView):
     @extend_schema(
         request=RankedRoleCheckRequestSerializer,
         responses={
@@ -191,7 +174,7 @@ class RankedRoleCheckView(APIView):
             500: StandardErrorSerializer,
         },
     )
-    def post(self, request, format=None):
+    async def post(self, request, format=None):
         """
         Evaluate a list of Discord IDs by retrieving their verified linked Xbox Live gamertags, querying stats from the
         Halo Infinite API, and returning a payload indicating the rank Tier each Discord ID belongs to, if applicable.
@@ -202,20 +185,21 @@ class RankedRoleCheckView(APIView):
             playlist_id = validation_serializer.data.get("playlistId")
             try:
                 # Get the XUIDs from all DiscordXboxLiveLink records matching the input discordUserIDs
-                links = (
-                    DiscordXboxLiveLink.objects.filter(
+                links = [
+                    link
+                    async for link in DiscordXboxLiveLink.objects.filter(
                         discord_account_id__in=discord_ids
                     )
                     .filter(verified=True)
                     .order_by("created_at")
-                )
+                ]
                 xuid_to_discord_id = {
                     link.xbox_live_account_id: link.discord_account_id for link in links
                 }
                 xuids = [link.xbox_live_account_id for link in links]
 
                 # Get CSRs for all XUIDs for the playlist ID in question
-                csr_by_xuid = get_csrs(xuids, playlist_id).get("csrs")
+                csr_by_xuid = (await aget_csrs(xuids, playlist_id)).get("csrs")
 
                 # For each XUID in the returned list, add Discord IDs to the appropriate tier list
                 onyx = []
@@ -8,6 +8,7 @@ from apps.era_01.models import BingoChallenge
 from apps.halo_infinite.api.match import match_stats, matches_between
 from apps.halo_infinite.constants import ERA_1_END_TIME, ERA_1_START_TIME, STATS
 from apps.halo_infinite.models import HaloInfiniteMatch
+from apps.overrides.utils import read_from_replica
 
 EARLIEST_TIME = ERA_1_START_TIME
 LATEST_TIME = ERA_1_END_TIME
@@ -45,6 +46,7 @@ def save_new_matches(match_ids: set[str], user) -> bool:
         return False
 
 
+@read_from_replica()
 def check_xuid_challenge(
     xuid: int, challenge: BingoChallenge
 ) -> HaloInfiniteMatch | None:
@@ -1,6 +1,5 @@
 import datetime
 import uuid
-from unittest.mock import patch
 
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
@@ -10,14 +9,13 @@ from rest_framework.test import APIClient, APITestCase
 from apps.discord.models import DiscordAccount
 from apps.era_02.models import MVT, TeamUpChallengeCompletion, TeamUpChallenges
 from apps.halo_infinite.models import HaloInfiniteMatch
+from apps.halo_infinite.utils import apply_match_data
 from apps.link.models import DiscordXboxLiveLink
 from apps.xbox_live.models import XboxLiveAccount
 
 
 class Era02TestCase(APITestCase):
-    @patch("apps.halo_infinite.signals.match_stats")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
-    def setUp(self, mock_get_xuid_and_exact_gamertag, mock_match_stats):
+    def setUp(self):
         self.user = User.objects.create_user(
             username="test", email="test@test.com", password="test"
         )
@@ -27,9 +25,8 @@ class Era02TestCase(APITestCase):
         self.discord_account = DiscordAccount.objects.create(
             creator=self.user, discord_id="1234", discord_username="Test1234"
         )
-        mock_get_xuid_and_exact_gamertag.return_value = (1234, "test1234")
         self.xbl_account = XboxLiveAccount.objects.create(
-            creator=self.user, gamertag="test1234"
+            creator=self.user, gamertag="test1234", xuid=1234
         )
         self.link = DiscordXboxLiveLink.objects.create(
             creator=self.user,
@@ -39,16 +36,18 @@ class Era02TestCase(APITestCase):
         )
         # Create a HaloInfiniteMatch
         self.match_id = uuid.uuid4()
-        mock_match_stats.return_value = {
-            "MatchId": str(self.match_id),
-            "MatchInfo": {
-                "StartTime": "2023-01-02T07:50:24.936Z",
-                "EndTime": "2023-01-02T08:06:04.702Z",
+        self.match = HaloInfiniteMatch(creator=self.user)
+        apply_match_data(
+            self.match,
+            {
+                "MatchId": str(self.match_id),
+                "MatchInfo": {
+                    "StartTime": "2023-01-02T07:50:24.936Z",
+                    "EndTime": "2023-01-02T08:06:04.702Z",
+                },
             },
-        }
-        self.match = HaloInfiniteMatch.objects.create(
-            creator=self.user, match_id=self.match_id
         )
+        self.match.save()
 
     def test_save_mvt_view(self):
         # Missing field values throw errors
@@ -21,6 +21,7 @@ from apps.halo_infinite.constants import (
     MEDAL_ID_IMMORTAL_CHAUFFEUR,
 )
 from apps.halo_infinite.models import HaloInfiniteMatch
+from apps.halo_infinite.utils import apply_match_data
 
 
 class Era01TestCase(TestCase):
@@ -178,11 +179,10 @@ class UtilsTestCase(TestCase):
             ],
         )
 
-    @patch("apps.halo_infinite.signals.match_stats")
-    def test_challenge_completion_bait_the_flags(self, mock_match_stats):
+    def test_challenge_completion_bait_the_flags(self):
         # Set up test data for the challenge
         match_id = uuid.uuid4()
-        mock_match_stats.return_value = {
+        match_data = {
             "Teams": [
                 {
                     "Rank": 1,
@@ -227,7 +227,9 @@ class UtilsTestCase(TestCase):
                 },
             ],
         }
-        match = HaloInfiniteMatch.objects.create(creator=self.user, match_id=match_id)
+        match = HaloInfiniteMatch(creator=self.user)
+        apply_match_data(match, match_data)
+        match.save()
 
         # Challenge incomplete
         save_challenge_completions_for_match(match, self.user)
@@ -248,11 +250,10 @@ class UtilsTestCase(TestCase):
             self.assertEqual(completion.challenge, TeamUpChallenges.BAIT_THE_FLAGS)
             xuid += 1
 
-    @patch("apps.halo_infinite.signals.match_stats")
-    def test_challenge_completion_forty_fists(self, mock_match_stats):
+    def test_challenge_completion_forty_fists(self):
         # Set up test data for the challenge
         match_id = uuid.uuid4()
-        mock_match_stats.return_value = {
+        match_data = {
             "Teams": [
                 {
                     "Rank": 1,
@@ -294,7 +295,9 @@ class UtilsTestCase(TestCase):
                 },
             ],
         }
-        match = HaloInfiniteMatch.objects.create(creator=self.user, match_id=match_id)
+        match = HaloInfiniteMatch(creator=self.user)
+        apply_match_data(match, match_data)
+        match.save()
 
         # Challenge incomplete
         save_challenge_completions_for_match(match, self.user)
@@ -313,11 +316,10 @@ class UtilsTestCase(TestCase):
             self.assertEqual(completion.challenge, TeamUpChallenges.FORTY_FISTS)
             xuid += 1
 
-    @patch("apps.halo_infinite.signals.match_stats")
-    def test_challenge_completion_grenade_parade(self, mock_match_stats):
+    def test_challenge_completion_grenade_parade(self):
         # Set up test data for the challenge
         match_id = uuid.uuid4()
-        mock_match_stats.return_value = {
+        match_data = {
             "Teams": [
                 {
                     "Rank": 1,
@@ -359,7 +361,9 @@ class UtilsTestCase(TestCase):
                 },
             ],
         }
-        match = HaloInfiniteMatch.objects.create(creator=self.user, match_id=match_id)
+        match = HaloInfiniteMatch(creator=self.user)
+        apply_match_data(match, match_data)
+        match.save()
 
         # Challenge incomplete
         save_challenge_completions_for_match(match, self.user)
@@ -378,11 +382,10 @@ class UtilsTestCase(TestCase):
             self.assertEqual(completion.challenge, TeamUpChallenges.GRENADE_PARADE)
             xuid += 1
 
-    @patch("apps.halo_infinite.signals.match_stats")
-    def test_challenge_completion_hundred_heads(self, mock_match_stats):
+    def test_challenge_completion_hundred_heads(self):
         # Set up test data for the challenge
         match_id = uuid.uuid4()
-        mock_match_stats.return_value = {
+        match_data = {
             "Teams": [
                 {
                     "Rank": 1,
@@ -424,7 +427,9 @@ class UtilsTestCase(TestCase):
                 },
             ],
         }
-        match = HaloInfiniteMatch.objects.create(creator=self.user, match_id=match_id)
+        match = HaloInfiniteMatch(creator=self.user)
+        apply_match_data(match, match_data)
+        match.save()
 
         # Challenge incomplete
         save_challenge_completions_for_match(match, self.user)
@@ -443,11 +448,10 @@ class UtilsTestCase(TestCase):
             self.assertEqual(completion.challenge, TeamUpChallenges.HUNDRED_HEADS)
             xuid += 1
 
-    @patch("apps.halo_infinite.signals.match_stats")
-    def test_challenge_completion_marks_of_shame(self, mock_match_stats):
+    def test_challenge_completion_marks_of_shame(self):
         # Set up test data for the challenge
         match_id = uuid.uuid4()
-        mock_match_stats.return_value = {
+        match_data = {
             "Teams": [
                 {
                     "Rank": 1,
@@ -489,7 +493,9 @@ class UtilsTestCase(TestCase):
                 },
             ],
         }
-        match = HaloInfiniteMatch.objects.create(creator=self.user, match_id=match_id)
+        match = HaloInfiniteMatch(creator=self.user)
+        apply_match_data(match, match_data)
+        match.save()
 
         # Challenge incomplete
         save_challenge_completions_for_match(match, self.user)
@@ -508,11 +514,10 @@ class UtilsTestCase(TestCase):
             self.assertEqual(completion.challenge, TeamUpChallenges.MARKS_OF_SHAME)
             xuid += 1
 
-    @patch("apps.halo_infinite.signals.match_stats")
-    def test_challenge_completion_most_valuable_driver(self, mock_match_stats):
+    def test_challenge_completion_most_valuable_driver(self):
         # Set up test data for the challenge
         match_id = uuid.uuid4()
-        mock_match_stats.return_value = {
+        match_data = {
             "Teams": [
                 {
                     "Rank": 1,
@@ -554,7 +559,9 @@ class UtilsTestCase(TestCase):
                 },
             ],
         }
-        match = HaloInfiniteMatch.objects.create(creator=self.user, match_id=match_id)
+        match = HaloInfiniteMatch(creator=self.user)
+        apply_match_data(match, match_data)
+        match.save()
 
         # Challenge incomplete
         save_challenge_completions_for_match(match, self.user)
@@ -577,11 +584,10 @@ class UtilsTestCase(TestCase):
             )
             xuid += 1
 
-    @patch("apps.halo_infinite.signals.match_stats")
-    def test_challenge_completion_own_the_zones(self, mock_match_stats):
+    def test_challenge_completion_own_the_zones(self):
         # Set up test data for the challenge
         match_id = uuid.uuid4()
-        mock_match_stats.return_value = {
+        match_data = {
             "Teams": [
                 {
                     "Rank": 1,
@@ -626,7 +632,9 @@ class UtilsTestCase(TestCase):
                 },
             ],
         }
-        match = HaloInfiniteMatch.objects.create(creator=self.user, match_id=match_id)
+        match = HaloInfiniteMatch(creator=self.user)
+        apply_match_data(match, match_data)
+        match.save()
 
         # Challenge incomplete
         save_challenge_completions_for_match(match, self.user)
@@ -647,11 +655,10 @@ class UtilsTestCase(TestCase):
             self.assertEqual(completion.challenge, TeamUpChallenges.OWN_THE_ZONES)
             xuid += 1
 
-    @patch("apps.halo_infinite.signals.match_stats")
-    def test_challenge_completion_speed_for_seeds(self, mock_match_stats):
+    def test_challenge_completion_speed_for_seeds(self):
         # Set up test data for the challenge
         match_id = uuid.uuid4()
-        mock_match_stats.return_value = {
+        match_data = {
             "Teams": [
                 {
                     "Rank": 1,
@@ -696,7 +703,9 @@ class UtilsTestCase(TestCase):
                 },
             ],
         }
-        match = HaloInfiniteMatch.objects.create(creator=self.user, match_id=match_id)
+        match = HaloInfiniteMatch(creator=self.user)
+        apply_match_data(match, match_data)
+        match.save()
 
         # Challenge incomplete
         save_challenge_completions_for_match(match, self.user)
@@ -717,11 +726,10 @@ class UtilsTestCase(TestCase):
             self.assertEqual(completion.challenge, TeamUpChallenges.SPEED_FOR_SEEDS)
             xuid += 1
 
-    @patch("apps.halo_infinite.signals.match_stats")
-    def test_challenge_completion_spin_class(self, mock_match_stats):
+    def test_challenge_completion_spin_class(self):
         # Set up test data for the challenge
         match_id = uuid.uuid4()
-        mock_match_stats.return_value = {
+        match_data = {
             "Teams": [
                 {
                     "Rank": 1,
@@ -763,7 +771,9 @@ class UtilsTestCase(TestCase):
                 },
             ],
         }
-        match = HaloInfiniteMatch.objects.create(creator=self.user, match_id=match_id)
+        match = HaloInfiniteMatch(creator=self.user)
+        apply_match_data(match, match_data)
+        match.save()
 
         # Challenge incomplete
         save_challenge_completions_for_match(match, self.user)
@@ -784,11 +794,10 @@ class UtilsTestCase(TestCase):
             self.assertEqual(completion.challenge, TeamUpChallenges.SPIN_CLASS)
             xuid += 1
 
-    @patch("apps.halo_infinite.signals.match_stats")
-    def test_challenge_completion_summon_a_demon(self, mock_match_stats):
+    def test_challenge_completion_summon_a_demon(self):
         # Set up test data for the challenge
         match_id = uuid.uuid4()
-        mock_match_stats.return_value = {
+        match_data = {
             "Teams": [
                 {
                     "Rank": 1,
@@ -830,7 +839,9 @@ class UtilsTestCase(TestCase):
                 },
             ],
         }
-        match = HaloInfiniteMatch.objects.create(creator=self.user, match_id=match_id)
+        match = HaloInfiniteMatch(creator=self.user)
+        apply_match_data(match, match_data)
+        match.save()
 
         # Challenge incomplete
         save_challenge_completions_for_match(match, self.user)
@@ -16,6 +16,7 @@ from apps.era_03.models import (
     WeeklyBoatAssignments,
 )
 from apps.halo_infinite.models import HaloInfiniteMatch
+from apps.halo_infinite.utils import apply_match_data
 from apps.link.models import DiscordXboxLiveLink
 from apps.xbox_live.models import XboxLiveAccount
 
@@ -124,20 +125,16 @@ class Era03TestCase(APITestCase):
         self.assertEqual(deckhand_record.deckhand_id, "123")
         self.assertEqual(deckhand_record.rank, self.first_rank)
 
-    @patch("apps.halo_infinite.signals.match_stats")
     @patch("apps.era_03.utils.check_xuid_secret")
     @patch("apps.era_03.views.check_xuid_assignment")
     @patch("apps.era_03.views.generate_weekly_assignments")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
     @patch("apps.era_03.views.get_current_week_start")
     def test_check_boat_assignments_view(
         self,
         mock_get_current_week_start,
-        mock_get_xuid_and_exact_gamertag,
         mock_generate_weekly_assignments,
         mock_check_xuid_assignment,
         mock_check_xuid_secret,
-        mock_match_stats,
     ):
         mock_get_current_week_start.return_value = datetime.date(2025, 2, 11)
 
@@ -242,9 +239,9 @@ class Era03TestCase(APITestCase):
         self.assertEqual(response.data.get("justPromoted"), False)
 
         # Early return - already at rank 10
-        mock_get_xuid_and_exact_gamertag.return_value = (123, "Test123")
         test_xbox_live_account = XboxLiveAccount.objects.create(
-            gamertag="test123",
+            gamertag="Test123",
+            xuid=123,
             creator=self.user,
         )
         DiscordXboxLiveLink.objects.create(
@@ -375,17 +372,18 @@ class Era03TestCase(APITestCase):
         test_deckhand.rank = self.second_rank
         test_deckhand.save()
         test_match_id = uuid.uuid4()
-        mock_match_stats.return_value = {
-            "MatchId": str(test_match_id),
-            "MatchInfo": {
-                "StartTime": "2025-02-11T00:00:00Z",
-                "EndTime": "2025-02-11T00:00:00Z",
+        test_match = HaloInfiniteMatch(creator=self.user)
+        apply_match_data(
+            test_match,
+            {
+                "MatchId": str(test_match_id),
+                "MatchInfo": {
+                    "StartTime": "2025-02-11T00:00:00Z",
+                    "EndTime": "2025-02-11T00:00:00Z",
+                },
             },
-        }
-        test_match = HaloInfiniteMatch.objects.create(
-            match_id=test_match_id,
-            creator=self.user,
         )
+        test_match.save()
         mock_check_xuid_assignment.side_effect = [
             test_match,
             None,
@@ -827,21 +827,12 @@ class UtilsTestCase(TestCase):
                 hint=f"TestHint{i}",
                 medal_id=i,
             )
-            with patch("apps.halo_infinite.signals.match_stats") as mock_match_stats:
-                match_uuid = str(uuid.uuid4())
-                mock_match_stats.return_value = {
-                    "MatchId": match_uuid,
-                    "MatchInfo": {
-                        "StartTime": "2025-01-09T00:00:00.00Z",
-                        "EndTime": "2025-01-09T01:20:34.567Z",
-                    },
-                }
-                match = HaloInfiniteMatch.objects.create(
-                    creator=self.user,
-                    match_id=match_uuid,
-                    start_time=datetime.datetime(2025, 1, 1),
-                    end_time=datetime.datetime(2025, 1, 1),
-                )
+            match = HaloInfiniteMatch.objects.create(
+                creator=self.user,
+                match_id=uuid.uuid4(),
+                start_time=datetime.datetime(2025, 1, 1),
+                end_time=datetime.datetime(2025, 1, 1),
+            )
             BoatSecretUnlock.objects.create(
                 creator=self.user, secret=secret, deckhand=deckhand, match=match
             )
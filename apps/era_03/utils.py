@@ -17,6 +17,7 @@ from apps.era_03.models import (
 from apps.halo_infinite.api.match import match_stats, matches_between
 from apps.halo_infinite.constants import ERA_3_END_TIME, ERA_3_START_TIME, STATS
 from apps.halo_infinite.models import HaloInfiniteMatch
+from apps.overrides.utils import read_from_replica
 
 EARLIEST_TIME = ERA_3_START_TIME
 LATEST_TIME = ERA_3_END_TIME
@@ -183,6 +184,7 @@ def check_deckhand_promotion(
     return False
 
 
+@read_from_replica()
 def check_xuid_assignment(
     xuid: int, assignment: BoatAssignment, current_week_start: datetime.date
 ) -> HaloInfiniteMatch | None:
@@ -270,6 +272,7 @@ def check_xuid_assignment(
     return None
 
 
+@read_from_replica()
 def check_xuid_secret(
     xuid: int, secret: BoatSecret, current_week_start: datetime.date
 ) -> HaloInfiniteMatch | None:
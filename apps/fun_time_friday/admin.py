@@ -3,6 +3,7 @@ from django.contrib import admin
 from apps.fun_time_friday.models import (
     FunTimeFridayVoiceConnect,
     FunTimeFridayVoiceDisconnect,
+    FunTimeFridayVoiceSession,
 )
 from apps.overrides.admin import AutofillCreatorModelAdmin, linkify
 
@@ -51,3 +52,30 @@ class FunTimeFridayVoiceDisconnectAdmin(AutofillCreatorModelAdmin):
         "channel_name",
         "creator",
     )
+
+
+@admin.register(FunTimeFridayVoiceSession)
+class FunTimeFridayVoiceSessionAdmin(AutofillCreatorModelAdmin):
+    autocomplete_fields = ["discord"]
+    list_display = (
+        "__str__",
+        linkify("discord"),
+        "connected_at",
+        "disconnected_at",
+        "channel_id",
+        "creator",
+    )
+    list_filter = (
+        "discord",
+        "creator",
+    )
+    fields = (
+        "discord",
+        "connect",
+        "disconnect",
+        "connected_at",
+        "disconnected_at",
+        "channel_id",
+        "creator",
+    )
+    raw_id_fields = ["connect", "disconnect"]
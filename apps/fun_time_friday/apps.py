@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FunTimeFridayConfig(AppConfig):
     name = "apps.fun_time_friday"
     verbose_name = "Fun Time Friday"
+
+    def ready(self):
+        import apps.fun_time_friday.signals  # noqa
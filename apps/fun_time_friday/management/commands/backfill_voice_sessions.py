@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.fun_time_friday.utils import VOICE_SESSION_BATCH_SIZE, backfill_voice_sessions
+
+
+class Command(BaseCommand):
+    help = "Creates the voice sessions missing for historical voice connects and disconnects. Safe to run repeatedly."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=VOICE_SESSION_BATCH_SIZE,
+            help="Number of events read, and sessions written, per batch.",
+        )
+
+    def handle(self, *args, **options):
+        created_count = backfill_voice_sessions(options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {created_count} voice session(s).")
+        )
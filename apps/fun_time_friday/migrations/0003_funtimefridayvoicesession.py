@@ -0,0 +1,127 @@
+# Generated by Django 5.1.4 on 2026-10-19 03:54
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("discord", "0006_alter_discordaccount_created_at_and_more"),
+        ("fun_time_friday", "0002_alter_funtimefridayvoiceconnect_created_at_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FunTimeFridayVoiceSession",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("connected_at", models.DateTimeField(verbose_name="Connected At")),
+                (
+                    "disconnected_at",
+                    models.DateTimeField(verbose_name="Disconnected At"),
+                ),
+                (
+                    "channel_id",
+                    models.CharField(max_length=20, verbose_name="Channel ID"),
+                ),
+            ],
+            options={
+                "verbose_name": "Voice Session",
+                "verbose_name_plural": "Voice Sessions",
+                "db_table": "FunTimeFridayVoiceSession",
+                "ordering": ["-connected_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="funtimefridayvoiceconnect",
+            index=models.Index(
+                fields=["connected_at"], name="FunTimeFrid_connect_9365df_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="funtimefridayvoiceconnect",
+            index=models.Index(
+                fields=["connector_discord", "channel_id", "connected_at"],
+                name="FunTimeFrid_connect_398f0f_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="funtimefridayvoicedisconnect",
+            index=models.Index(
+                fields=["disconnected_at"], name="FunTimeFrid_disconn_7ddb7b_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="funtimefridayvoicesession",
+            name="connect",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="session",
+                to="fun_time_friday.funtimefridayvoiceconnect",
+                verbose_name="Connect",
+            ),
+        ),
+        migrations.AddField(
+            model_name="funtimefridayvoicesession",
+            name="creator",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="funtimefridayvoicesession",
+            name="disconnect",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="session",
+                to="fun_time_friday.funtimefridayvoicedisconnect",
+                verbose_name="Disconnect",
+            ),
+        ),
+        migrations.AddField(
+            model_name="funtimefridayvoicesession",
+            name="discord",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="voice_sessions",
+                to="discord.discordaccount",
+                verbose_name="Discord",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="funtimefridayvoicesession",
+            index=models.Index(
+                fields=["connected_at", "disconnected_at"],
+                name="FunTimeFrid_connect_2df724_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="funtimefridayvoicesession",
+            index=models.Index(
+                fields=["discord", "connected_at"],
+                name="FunTimeFrid_discord_1f0d5f_idx",
+            ),
+        ),
+    ]
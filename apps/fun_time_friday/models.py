@@ -8,6 +8,10 @@ class FunTimeFridayVoiceConnect(Base):
     class Meta:
         db_table = "FunTimeFridayVoiceConnect"
         ordering = ["-connected_at"]
+        indexes = [
+            models.Index(fields=["connected_at"]),
+            models.Index(fields=["connector_discord", "channel_id", "connected_at"]),
+        ]
         verbose_name = "Voice Connect"
         verbose_name_plural = "Voice Connects"
 
@@ -31,6 +35,7 @@ class FunTimeFridayVoiceDisconnect(Base):
     class Meta:
         db_table = "FunTimeFridayVoiceDisconnect"
         ordering = ["-disconnected_at"]
+        indexes = [models.Index(fields=["disconnected_at"])]
         verbose_name = "Voice Disconnect"
         verbose_name_plural = "Voice Disconnects"
 
@@ -48,3 +53,40 @@ class FunTimeFridayVoiceDisconnect(Base):
 
     def __str__(self):
         return f"{str(self.disconnector_discord)} disconnected"
+
+
+class FunTimeFridayVoiceSession(Base):
+    class Meta:
+        db_table = "FunTimeFridayVoiceSession"
+        ordering = ["-connected_at"]
+        indexes = [
+            models.Index(fields=["connected_at", "disconnected_at"]),
+            models.Index(fields=["discord", "connected_at"]),
+        ]
+        verbose_name = "Voice Session"
+        verbose_name_plural = "Voice Sessions"
+
+    discord = models.ForeignKey(
+        DiscordAccount,
+        on_delete=models.RESTRICT,
+        related_name="voice_sessions",
+        verbose_name="Discord",
+    )
+    connect = models.OneToOneField(
+        FunTimeFridayVoiceConnect,
+        on_delete=models.CASCADE,
+        related_name="session",
+        verbose_name="Connect",
+    )
+    disconnect = models.OneToOneField(
+        FunTimeFridayVoiceDisconnect,
+        on_delete=models.CASCADE,
+        related_name="session",
+        verbose_name="Disconnect",
+    )
+    connected_at = models.DateTimeField(verbose_name="Connected At")
+    disconnected_at = models.DateTimeField(verbose_name="Disconnected At")
+    channel_id = models.CharField(max_length=20, blank=False, verbose_name="Channel ID")
+
+    def __str__(self):
+        return f"{str(self.discord)} in {self.channel_id}"
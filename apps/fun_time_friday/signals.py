@@ -0,0 +1,23 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.fun_time_friday.models import (
+    FunTimeFridayVoiceConnect,
+    FunTimeFridayVoiceDisconnect,
+)
+from apps.fun_time_friday.utils import (
+    create_voice_session,
+    create_voice_session_for_connect,
+)
+
+
+@receiver(post_save, sender=FunTimeFridayVoiceConnect)
+def fun_time_friday_voice_connect_post_save(sender, instance, created, **kwargs):
+    if created:
+        create_voice_session_for_connect(instance)
+
+
+@receiver(post_save, sender=FunTimeFridayVoiceDisconnect)
+def fun_time_friday_voice_disconnect_post_save(sender, instance, created, **kwargs):
+    if created:
+        create_voice_session(instance)
@@ -1,4 +1,5 @@
 import datetime
+from decimal import Decimal
 
 from django.contrib.auth.models import User
 from django.test import TestCase
@@ -7,8 +8,15 @@ from apps.discord.models import DiscordAccount
 from apps.fun_time_friday.models import (
     FunTimeFridayVoiceConnect,
     FunTimeFridayVoiceDisconnect,
+    FunTimeFridayVoiceSession,
+)
+from apps.fun_time_friday.utils import (
+    backfill_voice_sessions,
+    get_max_voice_session_time,
+    get_voice_connection_report,
+    get_voice_connections,
+    save_voice_session,
 )
-from apps.fun_time_friday.utils import get_voice_connections
 
 
 class FunTimeFridayUtilsTestCase(TestCase):
@@ -426,3 +434,195 @@ class FunTimeFridayUtilsTestCase(TestCase):
             ],
         )
         ftf_d_orphan_single_after.delete()
+
+    def test_get_voice_connection_report(self):
+        time_start = datetime.datetime(2023, 7, 7, 18, tzinfo=datetime.timezone.utc)
+        time_end = time_start + datetime.timedelta(hours=12)
+
+        # No voice events means no report
+        self.assertIsNone(get_voice_connection_report(time_start, time_end))
+
+        # Four accounts with 3h, 2h, 1h (split across two channels) and 0h (orphaned connect) of connection time
+        sessions = {
+            "1": [("1", 0, 180)],
+            "2": [("1", 30, 150)],
+            "3": [("1", 0, 30), ("2", 60, 90)],
+            "4": [("2", 60, None)],
+        }
+        for discord_id, account_sessions in sessions.items():
+            discord_account = DiscordAccount.objects.create(
+                creator=self.user,
+                discord_id=discord_id,
+                discord_username=f"ABC{discord_id}",
+            )
+            for channel_id, connect_minutes, disconnect_minutes in account_sessions:
+                FunTimeFridayVoiceConnect.objects.create(
+                    creator=self.user,
+                    connector_discord=discord_account,
+                    connected_at=time_start
+                    + datetime.timedelta(minutes=connect_minutes),
+                    channel_id=channel_id,
+                )
+                if disconnect_minutes is not None:
+                    FunTimeFridayVoiceDisconnect.objects.create(
+                        creator=self.user,
+                        disconnector_discord=discord_account,
+                        disconnected_at=time_start
+                        + datetime.timedelta(minutes=disconnect_minutes),
+                        channel_id=channel_id,
+                    )
+
+        report = get_voice_connection_report(time_start, time_end)
+        self.assertEqual(report["total_players"], 4)
+        self.assertEqual(report["total_hours"], Decimal("6.000"))
+        self.assertEqual(report["total_channels"], 2)
+        self.assertEqual(
+            report["party_animals"],
+            [
+                {"discord_id": "1", "seconds": 10800},
+                {"discord_id": "2", "seconds": 7200},
+                {"discord_id": "3", "seconds": 3600},
+            ],
+        )
+        self.assertEqual(report["party_poopers"], [{"discord_id": "4", "seconds": 0}])
+
+    def test_voice_sessions(self):
+        time_start = datetime.datetime(2023, 7, 7, 18, tzinfo=datetime.timezone.utc)
+        discord_account = DiscordAccount.objects.create(
+            creator=self.user, discord_id="1", discord_username="ABC1"
+        )
+
+        def connect(channel_id, minutes):
+            FunTimeFridayVoiceConnect.objects.create(
+                creator=self.user,
+                connector_discord=discord_account,
+                connected_at=time_start + datetime.timedelta(minutes=minutes),
+                channel_id=channel_id,
+            )
+
+        def disconnect(channel_id, minutes):
+            FunTimeFridayVoiceDisconnect.objects.create(
+                creator=self.user,
+                disconnector_discord=discord_account,
+                disconnected_at=time_start + datetime.timedelta(minutes=minutes),
+                channel_id=channel_id,
+            )
+
+        # Orphaned connect is superseded by the next connect to the same channel
+        connect("1", 0)
+        connect("1", 10)
+        disconnect("1", 70)
+        # Disconnect whose connect was never recorded does not reuse the closed connect
+        disconnect("1", 80)
+        # Disconnect without any prior connect in the channel
+        disconnect("2", 90)
+        # Sessions in other channels are tracked separately
+        connect("2", 100)
+        disconnect("2", 220)
+        sessions = list(
+            FunTimeFridayVoiceSession.objects.order_by("connected_at").values_list(
+                "channel_id", "connected_at", "disconnected_at"
+            )
+        )
+        self.assertEqual(
+            sessions,
+            [
+                (
+                    "1",
+                    time_start + datetime.timedelta(minutes=10),
+                    time_start + datetime.timedelta(minutes=70),
+                ),
+                (
+                    "2",
+                    time_start + datetime.timedelta(minutes=100),
+                    time_start + datetime.timedelta(minutes=220),
+                ),
+            ],
+        )
+        self.assertEqual(
+            get_max_voice_session_time(
+                discord_account, time_start, time_start + datetime.timedelta(days=1)
+            ),
+            datetime.timedelta(hours=2),
+        )
+        self.assertIsNone(
+            get_max_voice_session_time(
+                discord_account,
+                time_start + datetime.timedelta(days=1),
+                time_start + datetime.timedelta(days=2),
+            )
+        )
+
+        # Backfilling recreates exactly the sessions built at disconnect time, and is idempotent
+        self.assertEqual(backfill_voice_sessions(), 0)
+
+    def test_voice_sessions_out_of_order(self):
+        time_start = datetime.datetime(2023, 7, 7, 18, tzinfo=datetime.timezone.utc)
+        discord_account = DiscordAccount.objects.create(
+            creator=self.user, discord_id="1", discord_username="ABC1"
+        )
+
+        def connect(channel_id, minutes):
+            return FunTimeFridayVoiceConnect.objects.create(
+                creator=self.user,
+                connector_discord=discord_account,
+                connected_at=time_start + datetime.timedelta(minutes=minutes),
+                channel_id=channel_id,
+            )
+
+        def disconnect(channel_id, minutes):
+            return FunTimeFridayVoiceDisconnect.objects.create(
+                creator=self.user,
+                disconnector_discord=discord_account,
+                disconnected_at=time_start + datetime.timedelta(minutes=minutes),
+                channel_id=channel_id,
+            )
+
+        # Connect recorded after its disconnect is paired from the connect side
+        disconnect("1", 60)
+        late_connect = connect("1", 0)
+        # Connect recorded late behind a newer connect to the channel is superseded by it
+        disconnect("2", 120)
+        connect("2", 90)
+        connect("2", 80)
+        # Connect recorded late after a later disconnect in another channel is not paired with it
+        disconnect("3", 180)
+        connect("4", 150)
+        sessions = list(
+            FunTimeFridayVoiceSession.objects.order_by("connected_at").values_list(
+                "channel_id", "connected_at", "disconnected_at"
+            )
+        )
+        self.assertEqual(
+            sessions,
+            [
+                (
+                    "1",
+                    time_start,
+                    time_start + datetime.timedelta(minutes=60),
+                ),
+                (
+                    "2",
+                    time_start + datetime.timedelta(minutes=90),
+                    time_start + datetime.timedelta(minutes=120),
+                ),
+            ],
+        )
+        # Both sides pairing the same events creates the session once
+        self.assertIsNone(
+            save_voice_session(late_connect, late_connect.session.disconnect)
+        )
+        self.assertEqual(FunTimeFridayVoiceSession.objects.count(), 2)
+        # Backfilling agrees with the sessions paired from either side
+        self.assertEqual(backfill_voice_sessions(), 0)
+        FunTimeFridayVoiceSession.objects.all().delete()
+        self.assertEqual(backfill_voice_sessions(), 2)
+        self.assertEqual(
+            list(
+                FunTimeFridayVoiceSession.objects.order_by("connected_at").values_list(
+                    "channel_id", "connected_at", "disconnected_at"
+                )
+            ),
+            sessions,
+        )
+        self.assertEqual(backfill_voice_sessions(), 0)
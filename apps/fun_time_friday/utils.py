@@ -3,56 +3,285 @@ import logging
 from collections import deque
 from decimal import Decimal
 
-from django.db.models import Q
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, Max, OuterRef, Q, Sum, Value
 
 from apps.discord.models import DiscordAccount
 from apps.fun_time_friday.models import (
     FunTimeFridayVoiceConnect,
     FunTimeFridayVoiceDisconnect,
+    FunTimeFridayVoiceSession,
 )
+from apps.overrides.utils import read_from_replica
 
 logger = logging.getLogger(__name__)
 
+VOICE_SESSION_BATCH_SIZE = 5000
 
+
+def pair_voice_events(connects: list, disconnects: list) -> list[tuple]:
+    # Pairs one account's time-ordered connects and disconnects (anything with a `channel_id`), returning a list of
+    # (connect, disconnect) tuples. Events that cannot be matched by looking one event ahead are discarded.
+    pairs = []
+    connects = deque(connects)
+    disconnects = deque(disconnects)
+    while connects and disconnects:
+        connect = None
+        disconnect = None
+        next_connect = connects[0]
+        next_disconnect = disconnects[0]
+        # If next connect matches next disconnect, we can pop them both
+        if (
+            next_connect is not None
+            and next_disconnect is not None
+            and next_connect.channel_id == next_disconnect.channel_id
+        ):
+            connect = connects.popleft()
+            disconnect = disconnects.popleft()
+        # Otherwise we must look one further ahead in each deque
+        else:
+            second_connect = None
+            try:
+                second_connect = connects[1]
+            except IndexError:
+                pass
+            second_disconnect = None
+            try:
+                second_disconnect = disconnects[1]
+            except IndexError:
+                pass
+            # Check the second connect (if it matches, pop twice)
+            if (
+                second_connect is not None
+                and second_connect.channel_id == next_disconnect.channel_id
+            ):
+                connects.popleft()  # Pop and discard "next" connect
+                connect = connects.popleft()
+                disconnect = disconnects.popleft()
+            # Check the second disconnect (if it matches, pop twice)
+            elif (
+                second_disconnect is not None
+                and next_connect.channel_id == second_disconnect.channel_id
+            ):
+                disconnects.popleft()  # Pop and discard "next" disconnect
+                connect = connects.popleft()
+                disconnect = disconnects.popleft()
+            # If neither of the next records match, pop both
+            else:
+                connects.popleft()
+                disconnects.popleft()
+
+        if connect is not None and disconnect is not None:
+            pairs.append((connect, disconnect))
+    return pairs
+
+
+def save_voice_session(
+    connect: FunTimeFridayVoiceConnect, disconnect: FunTimeFridayVoiceDisconnect
+) -> FunTimeFridayVoiceSession | None:
+    # Creates the session for a connect and disconnect pair. The other side's signal may pair either event at the same
+    # time, so a conflict on either OneToOne means the session (or a competing one) already exists and None is returned.
+    try:
+        with transaction.atomic():
+            return FunTimeFridayVoiceSession.objects.create(
+                creator_id=disconnect.creator_id,
+                discord_id=disconnect.disconnector_discord_id,
+                connect=connect,
+                disconnect=disconnect,
+                connected_at=connect.connected_at,
+                disconnected_at=disconnect.disconnected_at,
+                channel_id=disconnect.channel_id,
+            )
+    except IntegrityError:
+        return None
+
+
+def create_voice_session(
+    disconnect: FunTimeFridayVoiceDisconnect,
+) -> FunTimeFridayVoiceSession | None:
+    # Pairs a disconnect with the account's most recent connect to the same channel, provided that connect is still
+    # open. If the most recent connect was already closed by an earlier disconnect, this disconnect's connect was never
+    # recorded and no session is created.
+    connect = (
+        FunTimeFridayVoiceConnect.objects.filter(
+            connector_discord_id=disconnect.disconnector_discord_id,
+            channel_id=disconnect.channel_id,
+            connected_at__lte=disconnect.disconnected_at,
+        )
+        .select_related("session")
+        .order_by("-connected_at")
+        .first()
+    )
+    if connect is None or hasattr(connect, "session"):
+        return None
+    return save_voice_session(connect, disconnect)
+
+
+def create_voice_session_for_connect(
+    connect: FunTimeFridayVoiceConnect,
+) -> FunTimeFridayVoiceSession | None:
+    # Pairs a connect that was recorded after its disconnect (e.g. the bot delivered the events out of order) with the
+    # account's next disconnect from the same channel, using the same rule as `create_voice_session`: the disconnect
+    # must still be open and no other connect to the channel may come between them. A connect recorded in order has
+    # no later disconnect yet, so this is a no-op and the disconnect's own signal creates the session.
+    disconnect = (
+        FunTimeFridayVoiceDisconnect.objects.filter(
+            disconnector_discord_id=connect.connector_discord_id,
+            channel_id=connect.channel_id,
+            disconnected_at__gte=connect.connected_at,
+        )
+        .select_related("session")
+        .order_by("disconnected_at")
+        .first()
+    )
+    if disconnect is None or hasattr(disconnect, "session"):
+        return None
+    if FunTimeFridayVoiceConnect.objects.filter(
+        connector_discord_id=connect.connector_discord_id,
+        channel_id=connect.channel_id,
+        connected_at__gt=connect.connected_at,
+        connected_at__lte=disconnect.disconnected_at,
+    ).exists():
+        return None
+    return save_voice_session(connect, disconnect)
+
+
+def backfill_voice_sessions(batch_size: int = VOICE_SESSION_BATCH_SIZE) -> int:
+    # Replays every recorded connect and disconnect through the same pairing rule as `create_voice_session`, creating
+    # any sessions that are missing. Returns the number of sessions created.
+    connects = FunTimeFridayVoiceConnect.objects.annotate(
+        discord_id=F("connector_discord_id"),
+        at=F("connected_at"),
+        is_connect=Value(True),
+        has_session=Exists(
+            FunTimeFridayVoiceSession.objects.filter(connect=OuterRef("pk"))
+        ),
+    ).values_list(
+        "id",
+        "discord_id",
+        "channel_id",
+        "at",
+        "is_connect",
+        "has_session",
+        "creator_id",
+    )
+    disconnects = FunTimeFridayVoiceDisconnect.objects.annotate(
+        discord_id=F("disconnector_discord_id"),
+        at=F("disconnected_at"),
+        is_connect=Value(False),
+        has_session=Exists(
+            FunTimeFridayVoiceSession.objects.filter(disconnect=OuterRef("pk"))
+        ),
+    ).values_list(
+        "id",
+        "discord_id",
+        "channel_id",
+        "at",
+        "is_connect",
+        "has_session",
+        "creator_id",
+    )
+    # Connects sort ahead of disconnects at the same instant, matching `connected_at__lte` above
+    events = connects.union(disconnects, all=True).order_by(
+        "discord_id", "channel_id", "at", "-is_connect"
+    )
+
+    sessions = []
+    created_count = 0
+    open_connect = None
+    previous_key = None
+    for (
+        event_id,
+        discord_id,
+        channel_id,
+        at,
+        is_connect,
+        has_session,
+        creator_id,
+    ) in events.iterator(chunk_size=batch_size):
+        if (discord_id, channel_id) != previous_key:
+            open_connect = None
+            previous_key = (discord_id, channel_id)
+        if is_connect:
+            open_connect = None if has_session else (event_id, at)
+        elif has_session:
+            open_connect = None
+        elif open_connect is not None:
+            sessions.append(
+                FunTimeFridayVoiceSession(
+                    creator_id=creator_id,
+                    discord_id=discord_id,
+                    connect_id=open_connect[0],
+                    disconnect_id=event_id,
+                    connected_at=open_connect[1],
+                    disconnected_at=at,
+                    channel_id=channel_id,
+                )
+            )
+            open_connect = None
+        if len(sessions) >= batch_size:
+            FunTimeFridayVoiceSession.objects.bulk_create(sessions)
+            created_count += len(sessions)
+            sessions = []
+    FunTimeFridayVoiceSession.objects.bulk_create(sessions)
+    return created_count + len(sessions)
+
+
+def get_max_voice_session_time(
+    discord_account: DiscordAccount,
+    time_start: datetime.datetime,
+    time_end: datetime.datetime,
+) -> datetime.timedelta | None:
+    return FunTimeFridayVoiceSession.objects.filter(
+        discord=discord_account,
+        connected_at__gte=time_start,
+        disconnected_at__lte=time_end,
+    ).aggregate(max_time_connected=Max(F("disconnected_at") - F("connected_at")))[
+        "max_time_connected"
+    ]
+
+
+@read_from_replica()
 def get_voice_connection_report(
     time_start: datetime.datetime, time_end: datetime.datetime
 ) -> dict | None:
-    connects = list(
+    sessions = FunTimeFridayVoiceSession.objects.filter(
+        connected_at__gte=time_start, disconnected_at__lte=time_end
+    )
+    time_connected_by_discord_id = dict(
+        sessions.values("discord_id")
+        .annotate(time_connected=Sum(F("disconnected_at") - F("connected_at")))
+        .values_list("discord_id", "time_connected")
+        .order_by()
+    )
+    unique_channel_count = sessions.values("channel_id").distinct().order_by().count()
+    # Anyone who connected or disconnected in the window took part, even if no complete session was recorded for them
+    participant_discord_ids = (
         FunTimeFridayVoiceConnect.objects.filter(
             Q(connected_at__gte=time_start) & Q(connected_at__lte=time_end)
-        ).order_by("connected_at")
-    )
-    disconnects = list(
-        FunTimeFridayVoiceDisconnect.objects.filter(
-            Q(disconnected_at__gte=time_start) & Q(disconnected_at__lte=time_end)
-        ).order_by("disconnected_at")
+        )
+        .values_list("connector_discord_id", flat=True)
+        .order_by()
+        .union(
+            FunTimeFridayVoiceDisconnect.objects.filter(
+                Q(disconnected_at__gte=time_start) & Q(disconnected_at__lte=time_end)
+            )
+            .values_list("disconnector_discord_id", flat=True)
+            .order_by()
+        )
     )
-    unique_discord_accounts = set()
-    for connect in connects:
-        unique_discord_accounts.add(connect.connector_discord)
-    for disconnect in disconnects:
-        unique_discord_accounts.add(disconnect.disconnector_discord)
 
-    unique_channel_ids = set()
     total_connection_time = datetime.timedelta(seconds=0)
     discord_ids_by_seconds_connected = {}
-    for discord_account in unique_discord_accounts:
-        connection_data = get_voice_connections(
-            discord_account=discord_account, time_start=time_start, time_end=time_end
+    for discord_id in sorted(participant_discord_ids):
+        user_connection_time = time_connected_by_discord_id.get(
+            discord_id, datetime.timedelta(seconds=0)
         )
-        user_connection_time = datetime.timedelta(seconds=0)
-        for connection in connection_data:
-            unique_channel_ids.add(connection["channel_id"])
-            user_connection_time += connection["time_connected"]
         seconds_connected = int(user_connection_time.total_seconds())
         if seconds_connected in discord_ids_by_seconds_connected:
-            discord_ids_by_seconds_connected[seconds_connected].append(
-                discord_account.discord_id
-            )
+            discord_ids_by_seconds_connected[seconds_connected].append(discord_id)
         else:
-            discord_ids_by_seconds_connected[seconds_connected] = [
-                discord_account.discord_id
-            ]
+            discord_ids_by_seconds_connected[seconds_connected] = [discord_id]
         total_connection_time += user_connection_time
 
     if discord_ids_by_seconds_connected == {}:
@@ -86,9 +315,12 @@ def get_voice_connection_report(
         )
 
     return {
-        "total_players": len(unique_discord_accounts),
+        "total_players": sum(
+            len(discord_ids)
+            for discord_ids in discord_ids_by_seconds_connected.values()
+        ),
         "total_hours": round(Decimal(total_connection_time.total_seconds() / 3600), 3),
-        "total_channels": len(unique_channel_ids),
+        "total_channels": unique_channel_count,
         "party_animals": party_animals,
         "party_poopers": party_poopers,
     }
@@ -103,78 +335,26 @@ def get_voice_connections(
     assert time_start is not None
     assert time_end is not None
     voice_connections = []
-    connects = deque(
-        list(
-            FunTimeFridayVoiceConnect.objects.filter(connector_discord=discord_account)
-            .filter(Q(connected_at__gte=time_start) & Q(connected_at__lte=time_end))
-            .order_by("connected_at")
-        )
+    connects = list(
+        FunTimeFridayVoiceConnect.objects.filter(connector_discord=discord_account)
+        .filter(Q(connected_at__gte=time_start) & Q(connected_at__lte=time_end))
+        .order_by("connected_at")
     )
-    disconnects = deque(
-        list(
-            FunTimeFridayVoiceDisconnect.objects.filter(
-                disconnector_discord=discord_account
-            )
-            .filter(
-                Q(disconnected_at__gte=time_start) & Q(disconnected_at__lte=time_end)
-            )
-            .order_by("disconnected_at")
+    disconnects = list(
+        FunTimeFridayVoiceDisconnect.objects.filter(
+            disconnector_discord=discord_account
         )
+        .filter(Q(disconnected_at__gte=time_start) & Q(disconnected_at__lte=time_end))
+        .order_by("disconnected_at")
     )
-    while connects and disconnects:
-        connect = None
-        disconnect = None
-        next_connect = connects[0]
-        next_disconnect = disconnects[0]
-        # If next connect matches next disconnect, we can pop them both
-        if (
-            next_connect is not None
-            and next_disconnect is not None
-            and next_connect.channel_id == next_disconnect.channel_id
-        ):
-            connect = connects.popleft()
-            disconnect = disconnects.popleft()
-        # Otherwise we must look one further ahead in each deque
-        else:
-            second_connect = None
-            try:
-                second_connect = connects[1]
-            except IndexError:
-                pass
-            second_disconnect = None
-            try:
-                second_disconnect = disconnects[1]
-            except IndexError:
-                pass
-            # Check the second connect (if it matches, pop twice)
-            if (
-                second_connect is not None
-                and second_connect.channel_id == next_disconnect.channel_id
-            ):
-                connects.popleft()  # Pop and discard "next" connect
-                connect = connects.popleft()
-                disconnect = disconnects.popleft()
-            # Check the second disconnect (if it matches, pop twice)
-            elif (
-                second_disconnect is not None
-                and next_connect.channel_id == second_disconnect.channel_id
-            ):
-                disconnects.popleft()  # Pop and discard "next" disconnect
-                connect = connects.popleft()
-                disconnect = disconnects.popleft()
-            # If neither of the next records match, pop both
-            else:
-                connects.popleft()
-                disconnects.popleft()
-
-        if connect is not None and disconnect is not None:
-            time_connected = disconnect.disconnected_at - connect.connected_at
-            voice_connections.append(
-                {
-                    "channel_id": connect.channel_id,
-                    "connect": connect,
-                    "disconnect": disconnect,
-                    "time_connected": time_connected,
-                }
-            )
+    for connect, disconnect in pair_voice_events(connects, disconnects):
+        time_connected = disconnect.disconnected_at - connect.connected_at
+        voice_connections.append(
+            {
+                "channel_id": connect.channel_id,
+                "connect": connect,
+                "disconnect": disconnect,
+                "time_connected": time_connected,
+            }
+        )
     return voice_connections
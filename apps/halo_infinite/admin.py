@@ -5,11 +5,13 @@ from apps.halo_infinite.models import (
     HaloInfiniteClearanceToken,
     HaloInfiniteMap,
     HaloInfiniteMapModePair,
+    HaloInfiniteMapModePairContributor,
     HaloInfiniteMatch,
     HaloInfinitePlaylist,
     HaloInfiniteSpartanToken,
     HaloInfiniteXSTSToken,
 )
+from apps.halo_infinite.utils import hydrate_maps, hydrate_playlists
 from apps.overrides.admin import AutofillCreatorModelAdmin
 
 
@@ -29,6 +31,7 @@ class HaloInfiniteMapAdmin(AutofillCreatorModelAdmin):
     list_display = ("public_name", "description", "published_at", "creator")
     list_filter = (
         "public_name",
+        "needs_hydration",
         "creator",
     )
     fields = (
@@ -42,6 +45,12 @@ class HaloInfiniteMapAdmin(AutofillCreatorModelAdmin):
     )
     readonly_fields = ("updated_at",)
     search_fields = ["public_name"]
+    actions = ["hydrate"]
+
+    @admin.action(description="Refresh selected maps from the Halo Infinite API")
+    def hydrate(self, request, queryset):
+        maps = hydrate_maps([str(map.asset_id) for map in queryset], request.user)
+        self.message_user(request, f"Refreshed {len(maps)} map(s).")
 
 
 @admin.register(HaloInfiniteMapModePair)
@@ -64,12 +73,26 @@ class HaloInfiniteMapModePairAdmin(AutofillCreatorModelAdmin):
     search_fields = ["public_name"]
 
 
+@admin.register(HaloInfiniteMapModePairContributor)
+class HaloInfiniteMapModePairContributorAdmin(AutofillCreatorModelAdmin):
+    autocomplete_fields = ["map_mode_pair"]
+    list_display = ("__str__", "map_mode_pair", "xuid", "creator")
+    list_filter = ("creator",)
+    fields = (
+        "map_mode_pair",
+        "xuid",
+        "creator",
+    )
+    search_fields = ["xuid"]
+
+
 @admin.register(HaloInfiniteMatch)
 class HaloInfiniteMatchAdmin(AutofillCreatorModelAdmin):
     list_display = ("match_id", "start_time", "end_time", "creator")
     list_filter = (
         "start_time",
         "end_time",
+        "needs_hydration",
         "creator",
     )
     fields = (
@@ -85,7 +108,7 @@ class HaloInfiniteMatchAdmin(AutofillCreatorModelAdmin):
 @admin.register(HaloInfinitePlaylist)
 class HaloInfinitePlaylistAdmin(AutofillCreatorModelAdmin):
     list_display = ("name", "description", "active", "creator")
-    list_filter = ("active", "ranked", "creator")
+    list_filter = ("active", "ranked", "needs_hydration", "creator")
     fields = (
         "playlist_id",
         "version_id",
@@ -100,6 +123,12 @@ class HaloInfinitePlaylistAdmin(AutofillCreatorModelAdmin):
     )
     readonly_fields = ("updated_at",)
     search_fields = ("name",)
+    actions = ["hydrate"]
+
+    @admin.action(description="Refresh selected playlists from the Halo Infinite API")
+    def hydrate(self, request, queryset):
+        playlists = hydrate_playlists(list(queryset))
+        self.message_user(request, f"Refreshed {len(playlists)} playlist(s).")
 
 
 @admin.register(HaloInfiniteXSTSToken)
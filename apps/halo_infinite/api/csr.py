@@ -1,9 +1,11 @@
+import asyncio
 import logging
-import math
 
+import httpx
 import requests
 
-from apps.halo_infinite.api.utils import hi_api_get
+from apps.halo_infinite.api.utils import ahi_api_get, get_xuid_strings, hi_api_get
+from apps.overrides.utils import get_async_client
 
 logger = logging.getLogger(__name__)
 
@@ -16,17 +18,7 @@ def get_csr(
     return_dict = {"Value": []}
     close_session_before_exit = session is None
     s = requests.Session() if session is None else session
-    # Build XUID strings for every 30 XUIDs, as that is the max allowed per API call
-    xuid_strings = []
-    for i in range(math.ceil(len(xuids) / 30)):
-        start = i * 30
-        end = (i + 1) * 30
-        xuid_string = ""
-        for xuid in xuids[start:end]:
-            xuid_string += f"xuid({xuid}),"
-        xuid_string = xuid_string.rstrip(",")
-        xuid_strings.append(xuid_string)
-    for xuid_string in xuid_strings:
+    for xuid_string in get_xuid_strings(xuids):
         url = f"https://skill.svc.halowaypoint.com:443/hi/playlist/{playlist_id}/csrs?players={xuid_string}"
         response = hi_api_get(url, s, use_spartan=True, use_clearance=True)
         if response.status_code == 200:
@@ -37,6 +29,34 @@ def get_csr(
     return return_dict
 
 
+async def aget_csr(
+    xuids: list[int], playlist_id: str, client: httpx.AsyncClient = None
+) -> dict:
+    # Every batch of 30 XUIDs is requested at once
+    return_dict = {"Value": []}
+    close_client_before_exit = client is None
+    c = get_async_client() if client is None else client
+    try:
+        responses = await asyncio.gather(
+            *[
+                ahi_api_get(
+                    f"https://skill.svc.halowaypoint.com:443/hi/playlist/{playlist_id}/csrs?players={xuid_string}",
+                    c,
+                    use_spartan=True,
+                    use_clearance=True,
+                )
+                for xuid_string in get_xuid_strings(xuids)
+            ]
+        )
+    finally:
+        if close_client_before_exit:
+            await c.aclose()
+    for response in responses:
+        if response.status_code == 200:
+            return_dict.get("Value").extend(response.json().get("Value"))
+    return return_dict
+
+
 # https://discovery-infiniteugc.svc.halowaypoint.com:443
 #   /hi/projects/712add52-f989-48e1-b3bb-ac7cd8a1c17a - Get 343 Recommended
 #   /hi/projects/a9dc0785-2a99-4fec-ba6e-0216feaaf041 - Get Custom Game Manifest
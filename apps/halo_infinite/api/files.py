@@ -1,9 +1,12 @@
 import logging
 from uuid import UUID
 
+import httpx
 import requests
 
+from apps.halo_infinite.api.utils import ahi_api_get
 from apps.halo_infinite.decorators import spartan_token
+from apps.overrides.utils import get_async_client
 
 logger = logging.getLogger(__name__)
 
@@ -93,3 +96,43 @@ def get_prefab(prefab_file_id: UUID, **kwargs) -> dict:
         if response.status_code == 200:
             return_dict = response.json()
     return return_dict
+
+
+async def aget_discovery_asset(route: str, client: httpx.AsyncClient = None) -> dict:
+    return_dict = {}
+    close_client_before_exit = client is None
+    c = get_async_client() if client is None else client
+    try:
+        response = await ahi_api_get(
+            f"https://discovery-infiniteugc.svc.halowaypoint.com/{route}",
+            c,
+            use_spartan=True,
+        )
+    finally:
+        if close_client_before_exit:
+            await c.aclose()
+    if response.status_code == 200:
+        return_dict = response.json()
+    return return_dict
+
+
+async def aget_map(
+    map_asset_id: UUID, map_version_id: UUID = None, client: httpx.AsyncClient = None
+) -> dict:
+    route = f"hi/maps/{map_asset_id}"
+    if map_version_id is not None:
+        route += f"/versions/{map_version_id}"
+    return await aget_discovery_asset(route, client)
+
+
+async def aget_mode(
+    mode_asset_id: UUID, mode_version_id: UUID = None, client: httpx.AsyncClient = None
+) -> dict:
+    route = f"hi/ugcGameVariants/{mode_asset_id}"
+    if mode_version_id is not None:
+        route += f"/versions/{mode_version_id}"
+    return await aget_discovery_asset(route, client)
+
+
+async def aget_prefab(prefab_file_id: UUID, client: httpx.AsyncClient = None) -> dict:
+    return await aget_discovery_asset(f"hi/prefabs/{prefab_file_id}", client)
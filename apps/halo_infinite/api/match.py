@@ -1,10 +1,12 @@
 import datetime
 import logging
 
+import httpx
 import requests
 
-from apps.halo_infinite.api.utils import hi_api_get
+from apps.halo_infinite.api.utils import ahi_api_get, hi_api_get
 from apps.halo_infinite.decorators import spartan_token
+from apps.overrides.utils import get_async_client
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +86,34 @@ def match_skill(xuid: int, match_id: str, **kwargs):
     return return_dict
 
 
+def filter_matches_page(
+    results: list[dict],
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
+    ids_only: bool,
+) -> tuple[list[dict], bool]:
+    # Returns the page's matches that ended within the window, and whether the page reached back past its start
+    match_list = []
+    before_start_time = False
+    for match in results:
+        if (
+            datetime.datetime.fromisoformat(match.get("MatchInfo", {}).get("EndTime"))
+            < start_time
+        ):
+            before_start_time = True
+        elif (
+            datetime.datetime.fromisoformat(match.get("MatchInfo", {}).get("EndTime"))
+            > end_time
+        ):
+            pass
+        else:
+            if ids_only:
+                match_list.append({"MatchId": match.get("MatchId")})
+            else:
+                match_list.append(match)
+    return match_list, before_start_time
+
+
 def matches_between(
     xuid: int,
     start_time: datetime.datetime,
@@ -114,26 +144,10 @@ def matches_between(
             # Break if no results were returned
             if len(response_dict.get("Results")) == 0:
                 break
-            for match in response_dict.get("Results"):
-                if (
-                    datetime.datetime.fromisoformat(
-                        match.get("MatchInfo", {}).get("EndTime")
-                    )
-                    < start_time
-                ):
-                    before_start_time = True
-                elif (
-                    datetime.datetime.fromisoformat(
-                        match.get("MatchInfo", {}).get("EndTime")
-                    )
-                    > end_time
-                ):
-                    pass
-                else:
-                    if ids_only:
-                        match_list.append({"MatchId": match.get("MatchId")})
-                    else:
-                        match_list.append(match)
+            page_matches, before_start_time = filter_matches_page(
+                response_dict.get("Results"), start_time, end_time, ids_only
+            )
+            match_list.extend(page_matches)
             start = response_dict.get("Start") + 25
         else:
             break
@@ -142,6 +156,47 @@ def matches_between(
     return match_list
 
 
+async def amatches_between(
+    xuid: int,
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
+    type: str = None,
+    client: httpx.AsyncClient = None,
+    ids_only: bool = False,
+) -> list[dict]:
+    # Each page depends on the last, so a single player's history is still paged through one request at a time
+    match_list = []
+    close_client_before_exit = client is None
+    c = get_async_client() if client is None else client
+    try:
+        before_start_time = False
+        start = 0
+        while not before_start_time:
+            query_string = f"?count=25&start={start}"
+            if type is not None:
+                query_string += f"&type={type}"
+            response = await ahi_api_get(
+                f"https://halostats.svc.halowaypoint.com/hi/players/xuid({xuid})/matches{query_string}",
+                c,
+                use_spartan=True,
+                use_clearance=False,
+            )
+            if response.status_code != 200:
+                break
+            response_dict = response.json()
+            if len(response_dict.get("Results")) == 0:
+                break
+            page_matches, before_start_time = filter_matches_page(
+                response_dict.get("Results"), start_time, end_time, ids_only
+            )
+            match_list.extend(page_matches)
+            start = response_dict.get("Start") + 25
+    finally:
+        if close_client_before_exit:
+            await c.aclose()
+    return match_list
+
+
 @spartan_token
 def last_25_matches(xuid: int, type: str = None, **kwargs) -> list[dict]:
     spartan_token = kwargs.get("HaloInfiniteSpartanToken")
@@ -167,3 +222,26 @@ def last_25_matches(xuid: int, type: str = None, **kwargs) -> list[dict]:
                 for match in response_dict.get("Results"):
                     match_list.append(match)
     return match_list
+
+
+async def alast_25_matches(
+    xuid: int, type: str = None, client: httpx.AsyncClient = None
+) -> list[dict]:
+    match_list = []
+    close_client_before_exit = client is None
+    c = get_async_client() if client is None else client
+    query_string = "?count=25&start=0"
+    if type is not None:
+        query_string += f"&type={type}"
+    try:
+        response = await ahi_api_get(
+            f"https://halostats.svc.halowaypoint.com/hi/players/xuid({xuid})/matches{query_string}",
+            c,
+            use_spartan=True,
+        )
+    finally:
+        if close_client_before_exit:
+            await c.aclose()
+    if response.status_code == 200:
+        match_list.extend(response.json().get("Results"))
+    return match_list
@@ -1,9 +1,11 @@
 import logging
 
+import httpx
 import requests
 
-from apps.halo_infinite.api.utils import hi_api_get
+from apps.halo_infinite.api.utils import ahi_api_get, hi_api_get
 from apps.halo_infinite.decorators import spartan_token
+from apps.overrides.utils import get_async_client
 
 logger = logging.getLogger(__name__)
 
@@ -76,3 +78,22 @@ def get_playlist(
     if close_session_before_exit:
         s.close()
     return return_dict
+
+
+async def aget_playlist(
+    playlist_id: str, version_id: str = None, client: httpx.AsyncClient = None
+) -> dict:
+    return_dict = {}
+    close_client_before_exit = client is None
+    c = get_async_client() if client is None else client
+    url = f"https://discovery-infiniteugc.svc.halowaypoint.com:443/hi/playlists/{playlist_id}"
+    if version_id is not None:
+        url += f"/versions/{version_id}"
+    try:
+        response = await ahi_api_get(url, c, use_spartan=True, use_clearance=False)
+    finally:
+        if close_client_before_exit:
+            await c.aclose()
+    if response.status_code == 200:
+        return_dict = response.json()
+    return return_dict
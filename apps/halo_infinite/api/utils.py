@@ -1,17 +1,14 @@
+import math
+
+import httpx
 import requests
 
 from apps.halo_infinite.decorators import clearance_token, spartan_token
 
 
-@clearance_token
-@spartan_token
-def hi_api_get(
-    url: str,
-    session: requests.Session,
-    use_spartan: bool = False,
-    use_clearance: bool = False,
-    **kwargs
-) -> requests.Response:
+def get_hi_api_headers(
+    use_spartan: bool = False, use_clearance: bool = False, **kwargs
+) -> dict:
     headers = {
         "Accept": "application/json",
         "User-Agent": "HaloWaypoint/2021112313511900 CFNetwork/1327.0.4 Darwin/21.2.0",
@@ -22,4 +19,46 @@ def hi_api_get(
     if use_clearance:
         clearance_token = kwargs.get("HaloInfiniteClearanceToken")
         headers["343-clearance"] = clearance_token.flight_configuration_id
-    return session.get(url, headers=headers)
+    return headers
+
+
+def get_xuid_strings(xuids: list[int]) -> list[str]:
+    # Build XUID strings for every 30 XUIDs, as that is the max allowed per API call
+    xuid_strings = []
+    for i in range(math.ceil(len(xuids) / 30)):
+        start = i * 30
+        end = (i + 1) * 30
+        xuid_string = ""
+        for xuid in xuids[start:end]:
+            xuid_string += f"xuid({xuid}),"
+        xuid_string = xuid_string.rstrip(",")
+        xuid_strings.append(xuid_string)
+    return xuid_strings
+
+
+@clearance_token
+@spartan_token
+def hi_api_get(
+    url: str,
+    session: requests.Session,
+    use_spartan: bool = False,
+    use_clearance: bool = False,
+    **kwargs,
+) -> requests.Response:
+    return session.get(
+        url, headers=get_hi_api_headers(use_spartan, use_clearance, **kwargs)
+    )
+
+
+@clearance_token
+@spartan_token
+async def ahi_api_get(
+    url: str,
+    client: httpx.AsyncClient,
+    use_spartan: bool = False,
+    use_clearance: bool = False,
+    **kwargs,
+) -> httpx.Response:
+    return await client.get(
+        url, headers=get_hi_api_headers(use_spartan, use_clearance, **kwargs)
+    )
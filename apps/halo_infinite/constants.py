@@ -297,6 +297,9 @@ GAME_VARIANT_CATEGORY_STRONGHOLDS = 11
 GAME_VARIANT_CATEGORY_TEAM_ESCALATION = 24
 GAME_VARIANT_CATEGORY_TOTAL_CONTROL = 14
 
+LIFECYCLE_MODE_CUSTOM = 1
+LIFECYCLE_MODE_MATCHMADE = 3
+
 LEVEL_ID_AQUARIUS = "fc878857-e778-4daf-b0ef-5d826b922f3f"
 LEVEL_ID_ARID = "b963a5ed-a8d0-4475-a47e-67430c56b3bd"
 LEVEL_ID_BARRAGE = "4f6bf10c-7628-49ed-b3bd-ec0cefd92ac5"
@@ -1,5 +1,7 @@
 from functools import wraps
 
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
 from apps.halo_infinite.tokens import (
     get_clearance_token,
     get_spartan_token,
@@ -7,28 +9,28 @@ from apps.halo_infinite.tokens import (
 )
 
 
-def xsts_token(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        kwargs["HaloInfiniteXSTSToken"] = get_xsts_token()
-        return func(*args, **kwargs)
+def token_decorator(kwarg: str, get_token):
+    # Coroutine functions get their token from the database off the event loop
+    def decorator(func):
+        if iscoroutinefunction(func):
 
-    return wrapper
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                kwargs[kwarg] = await sync_to_async(get_token)()
+                return await func(*args, **kwargs)
 
+            return async_wrapper
 
-def spartan_token(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        kwargs["HaloInfiniteSpartanToken"] = get_spartan_token()
-        return func(*args, **kwargs)
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            kwargs[kwarg] = get_token()
+            return func(*args, **kwargs)
 
-    return wrapper
+        return wrapper
 
+    return decorator
 
-def clearance_token(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        kwargs["HaloInfiniteClearanceToken"] = get_clearance_token()
-        return func(*args, **kwargs)
 
-    return wrapper
+xsts_token = token_decorator("HaloInfiniteXSTSToken", get_xsts_token)
+spartan_token = token_decorator("HaloInfiniteSpartanToken", get_spartan_token)
+clearance_token = token_decorator("HaloInfiniteClearanceToken", get_clearance_token)
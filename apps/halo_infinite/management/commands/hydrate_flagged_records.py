@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.halo_infinite.utils import hydrate_flagged_records
+from apps.xbox_live.models import XboxLiveAccount
+from apps.xbox_live.utils import hydrate_xbox_live_accounts
+
+
+class Command(BaseCommand):
+    help = (
+        "Fetches the API data for every Halo Infinite map, match and playlist and Xbox Live account that was saved "
+        "without it. Safe to run repeatedly."
+    )
+
+    def handle(self, *args, **options):
+        hydrated_counts = hydrate_flagged_records()
+        hydrated_counts["Xbox Live accounts"] = len(
+            hydrate_xbox_live_accounts(
+                list(XboxLiveAccount.objects.filter(needs_hydration=True))
+            )
+        )
+        for name, count in hydrated_counts.items():
+            self.stdout.write(self.style.SUCCESS(f"Hydrated {count} {name}."))
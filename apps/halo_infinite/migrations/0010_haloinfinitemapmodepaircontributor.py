@@ -0,0 +1,97 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:14
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_map_mode_pair_contributors(apps, schema_editor):
+    HaloInfiniteMapModePair = apps.get_model("halo_infinite", "HaloInfiniteMapModePair")
+    HaloInfiniteMapModePairContributor = apps.get_model(
+        "halo_infinite", "HaloInfiniteMapModePairContributor"
+    )
+    HaloInfiniteMapModePairContributor.objects.bulk_create(
+        [
+            HaloInfiniteMapModePairContributor(
+                map_mode_pair_id=map_mode_pair.asset_id,
+                xuid=xuid,
+                creator_id=map_mode_pair.creator_id,
+            )
+            for map_mode_pair in HaloInfiniteMapModePair.objects.all()
+            for xuid in {
+                int(contributor.lstrip("xuid(").rstrip(")"))
+                for contributor in map_mode_pair.data.get("MapLink", {}).get(
+                    "Contributors"
+                )
+                or []
+            }
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("halo_infinite", "0009_alter_haloinfinitemap_description_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HaloInfiniteMapModePairContributor",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("xuid", models.PositiveBigIntegerField(verbose_name="Xbox Live ID")),
+                (
+                    "creator",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.RESTRICT,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "map_mode_pair",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="contributors",
+                        to="halo_infinite.haloinfinitemapmodepair",
+                        verbose_name="MapModePair",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "MapModePair Contributor",
+                "verbose_name_plural": "MapModePair Contributors",
+                "db_table": "HaloInfiniteMapModePairContributor",
+                "ordering": ["map_mode_pair", "xuid"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("map_mode_pair", "xuid"),
+                        name="unique_map_mode_pair_contributor",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            backfill_map_mode_pair_contributors,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.1.4 on 2026-10-19 07:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("halo_infinite", "0010_haloinfinitemapmodepaircontributor"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="haloinfinitemap",
+            name="needs_hydration",
+            field=models.BooleanField(default=False, verbose_name="Needs Hydration"),
+        ),
+        migrations.AddField(
+            model_name="haloinfinitematch",
+            name="needs_hydration",
+            field=models.BooleanField(default=False, verbose_name="Needs Hydration"),
+        ),
+        migrations.AddField(
+            model_name="haloinfiniteplaylist",
+            name="needs_hydration",
+            field=models.BooleanField(default=False, verbose_name="Needs Hydration"),
+        ),
+        migrations.AlterField(
+            model_name="haloinfinitemap",
+            name="published_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Published Time"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="haloinfinitemap",
+            name="version_id",
+            field=models.UUIDField(blank=True, null=True, verbose_name="Version ID"),
+        ),
+        migrations.AlterField(
+            model_name="haloinfinitematch",
+            name="end_time",
+            field=models.DateTimeField(blank=True, null=True, verbose_name="End Time"),
+        ),
+        migrations.AlterField(
+            model_name="haloinfinitematch",
+            name="start_time",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Start Time"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="haloinfiniteplaylist",
+            name="ranked",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name="haloinfiniteplaylist",
+            name="version_id",
+            field=models.UUIDField(blank=True, null=True, verbose_name="Version ID"),
+        ),
+    ]
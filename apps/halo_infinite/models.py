@@ -32,9 +32,10 @@ class HaloInfiniteMatch(BaseWithoutPrimaryKey):
         verbose_name_plural = "Matches"
 
     match_id = models.UUIDField(primary_key=True, verbose_name="Match ID")
-    start_time = models.DateTimeField(blank=True, verbose_name="Start Time")
-    end_time = models.DateTimeField(blank=True, verbose_name="End Time")
+    start_time = models.DateTimeField(blank=True, null=True, verbose_name="Start Time")
+    end_time = models.DateTimeField(blank=True, null=True, verbose_name="End Time")
     data = models.JSONField(blank=True, default=dict, verbose_name="Raw Data")
+    needs_hydration = models.BooleanField(default=False, verbose_name="Needs Hydration")
 
     def __str__(self):
         return str(self.match_id)
@@ -50,15 +51,20 @@ class HaloInfiniteMap(BaseWithoutPrimaryKey):
         verbose_name_plural = "Maps"
 
     asset_id = models.UUIDField(primary_key=True, verbose_name="Asset ID")
-    version_id = models.UUIDField(blank=True, verbose_name="Version ID")
+    version_id = models.UUIDField(blank=True, null=True, verbose_name="Version ID")
     public_name = models.CharField(blank=True, max_length=255, verbose_name="Name")
     description = models.CharField(
         blank=True, max_length=255, verbose_name="Description"
     )
-    published_at = models.DateTimeField(blank=True, verbose_name="Published Time")
+    published_at = models.DateTimeField(
+        blank=True, null=True, verbose_name="Published Time"
+    )
     data = models.JSONField(blank=True, default=dict, verbose_name="Raw Data")
+    needs_hydration = models.BooleanField(default=False, verbose_name="Needs Hydration")
 
     def __str__(self):
+        if self.published_at is None:
+            return str(self.asset_id)
         return (
             f"{self.public_name} ({self.published_at.strftime('%Y-%m-%dT%H:%M:%SZ')})"
         )
@@ -85,6 +91,34 @@ class HaloInfiniteMapModePair(BaseWithoutPrimaryKey):
         return self.public_name
 
 
+class HaloInfiniteMapModePairContributor(Base):
+    class Meta:
+        db_table = "HaloInfiniteMapModePairContributor"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["map_mode_pair", "xuid"],
+                name="unique_map_mode_pair_contributor",
+            )
+        ]
+        ordering = [
+            "map_mode_pair",
+            "xuid",
+        ]
+        verbose_name = "MapModePair Contributor"
+        verbose_name_plural = "MapModePair Contributors"
+
+    map_mode_pair = models.ForeignKey(
+        HaloInfiniteMapModePair,
+        on_delete=models.CASCADE,
+        verbose_name="MapModePair",
+        related_name="contributors",
+    )
+    xuid = models.PositiveBigIntegerField(verbose_name="Xbox Live ID")
+
+    def __str__(self):
+        return f"{str(self.map_mode_pair)}: {self.xuid}"
+
+
 class HaloInfinitePlaylist(BaseWithoutPrimaryKey):
     class Meta:
         db_table = "HaloInfinitePlaylist"
@@ -96,16 +130,17 @@ class HaloInfinitePlaylist(BaseWithoutPrimaryKey):
         verbose_name_plural = "Playlists"
 
     playlist_id = models.UUIDField(primary_key=True, verbose_name="Playlist ID")
-    version_id = models.UUIDField(blank=True, verbose_name="Version ID")
-    ranked = models.BooleanField()
+    version_id = models.UUIDField(blank=True, null=True, verbose_name="Version ID")
+    ranked = models.BooleanField(default=False)
     active = models.BooleanField(default=False)
     name = models.CharField(blank=True, max_length=256)
     description = models.TextField(blank=True)
     info = models.JSONField(blank=True, default=dict, verbose_name="Raw Info")
     data = models.JSONField(blank=True, default=dict, verbose_name="Raw Data")
+    needs_hydration = models.BooleanField(default=False, verbose_name="Needs Hydration")
 
     def __str__(self):
-        return self.name
+        return self.name or str(self.playlist_id)
 
 
 class HaloInfiniteXSTSToken(Base):
@@ -1,11 +1,13 @@
 import datetime
 from unittest.mock import MagicMock, call, patch
 
+import httpx
+from asgiref.sync import async_to_sync
 from django.contrib.auth.models import User
 from django.test import TestCase
 
 from apps.halo_infinite.api.career_rank import career_rank
-from apps.halo_infinite.api.csr import get_csr
+from apps.halo_infinite.api.csr import aget_csr, get_csr
 from apps.halo_infinite.api.files import get_map, get_mode, get_prefab
 from apps.halo_infinite.api.match import (
     match_count,
@@ -361,6 +363,47 @@ class HaloInfiniteAPITestCase(TestCase):
             ),
         )
 
+    @patch("apps.halo_infinite.api.csr.get_async_client")
+    def test_aget_csr(self, mock_get_async_client):
+        requested_urls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested_urls.append(str(request.url))
+            self.assertEqual(
+                request.headers["x-343-authorization-spartan"],
+                self.spartan_token.token,
+            )
+            self.assertEqual(
+                request.headers["343-clearance"],
+                self.clearance_token.flight_configuration_id,
+            )
+            players = request.url.params["players"].split(",")
+            return httpx.Response(
+                200, json={"Value": [{"Id": player} for player in players]}
+            )
+
+        mock_get_async_client.side_effect = lambda: httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+
+        # 31 XUIDs are split into two batches, both requested at once
+        xuids = list(range(31))
+        csr_data = async_to_sync(aget_csr)(xuids, "test_playlist_id")
+        self.assertEqual(
+            sorted(requested_urls),
+            sorted(
+                [
+                    "https://skill.svc.halowaypoint.com/hi/playlist/test_playlist_id/csrs?players="
+                    + ",".join(f"xuid({xuid})" for xuid in xuids[:30]),
+                    "https://skill.svc.halowaypoint.com/hi/playlist/test_playlist_id/csrs?players=xuid(30)",
+                ]
+            ),
+        )
+        self.assertEqual(
+            [value.get("Id") for value in csr_data.get("Value")],
+            [f"xuid({xuid})" for xuid in xuids],
+        )
+
     @patch("apps.halo_infinite.api.files.requests.Session")
     def test_get_map(self, mock_Session):
         # Successful call
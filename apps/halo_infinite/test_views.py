@@ -2,11 +2,13 @@ import uuid
 from unittest.mock import patch
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from rest_framework.authtoken.models import Token
 from rest_framework.exceptions import ErrorDetail
 from rest_framework.test import APIClient, APITestCase
 
 from apps.halo_infinite.models import HaloInfinitePlaylist
+from apps.halo_infinite.utils import apply_playlist_data, get_stats_response_cache_key
 from apps.halo_infinite.views import (
     ERROR_GAMERTAG_INVALID,
     ERROR_GAMERTAG_MISSING,
@@ -21,6 +23,7 @@ class HaloInfiniteTestCase(APITestCase):
         )
         token, _created = Token.objects.get_or_create(user=self.user)
         self.client = APIClient(HTTP_AUTHORIZATION="Bearer " + token.key)
+        cache.clear()
 
     @patch("apps.halo_infinite.views.get_career_ranks")
     @patch("apps.halo_infinite.views.get_xuid_and_exact_gamertag")
@@ -105,17 +108,76 @@ class HaloInfiniteTestCase(APITestCase):
         mock_get_xuid_and_exact_gamertag.reset_mock()
         mock_get_career_ranks.reset_mock()
 
-    @patch("apps.halo_infinite.views.get_csrs")
-    @patch("apps.halo_infinite.signals.get_playlist")
-    @patch("apps.halo_infinite.signals.get_playlist_info")
+    @patch("apps.halo_infinite.utils.refresh_in_background")
+    @patch("apps.halo_infinite.views.get_career_ranks")
     @patch("apps.halo_infinite.views.get_xuid_and_exact_gamertag")
-    def test_csr_view(
+    def test_stats_response_cache(
         self,
         mock_get_xuid_and_exact_gamertag,
-        mock_get_playlist_info,
-        mock_get_playlist,
-        mock_get_csrs,
+        mock_get_career_ranks,
+        mock_refresh_in_background,
     ):
+        mock_refresh_in_background.side_effect = lambda func: func()
+        mock_get_xuid_and_exact_gamertag.return_value = (0, "InternActualGT")
+        mock_get_career_ranks.return_value = {
+            "career_ranks": {
+                0: {
+                    "current_rank_number": 272,
+                    "current_rank_name": "Hero",
+                    "current_rank_score": 0,
+                    "current_rank_score_max": 0,
+                    "cumulative_score": 9319350,
+                    "cumulative_score_max": 9319350,
+                }
+            }
+        }
+
+        # Repeated lookups are served from the cache with the same ETag
+        response = self.client.get("/halo-infinite/career-rank?gamertag=Intern")
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers.get("ETag")
+        self.assertIsNotNone(etag)
+        response = self.client.get("/halo-infinite/career-rank?gamertag=Intern")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers.get("ETag"), etag)
+        self.assertEqual(response.data.get("currentRankNumber"), 272)
+        mock_get_career_ranks.assert_called_once_with([0])
+
+        # A matching If-None-Match returns 304 without a body
+        response = self.client.get(
+            "/halo-infinite/career-rank?gamertag=Intern",
+            HTTP_IF_NONE_MATCH=f'W/"other", {etag}',
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response.headers.get("ETag"), etag)
+
+        # Stale responses are served once more while they are refreshed
+        cache_key = get_stats_response_cache_key("career-rank", 0, {})
+        entry = cache.get(cache_key)
+        entry["fresh_until"] = 0
+        cache.set(cache_key, entry)
+        mock_get_career_ranks.return_value["career_ranks"][0][
+            "current_rank_number"
+        ] = 273
+        response = self.client.get("/halo-infinite/career-rank?gamertag=Intern")
+        self.assertEqual(response.data.get("currentRankNumber"), 272)
+        mock_refresh_in_background.assert_called_once()
+        response = self.client.get("/halo-infinite/career-rank?gamertag=Intern")
+        self.assertEqual(response.data.get("currentRankNumber"), 273)
+        self.assertNotEqual(response.headers.get("ETag"), etag)
+        self.assertEqual(mock_get_career_ranks.call_count, 2)
+
+        # Errors are not cached
+        mock_get_xuid_and_exact_gamertag.return_value = (1, "OtherGT")
+        mock_get_career_ranks.side_effect = Exception()
+        response = self.client.get("/halo-infinite/career-rank?gamertag=Other")
+        self.assertEqual(response.status_code, 500)
+        self.assertIsNone(cache.get(get_stats_response_cache_key("career-rank", 1, {})))
+
+    @patch("apps.halo_infinite.views.aget_csrs")
+    @patch("apps.halo_infinite.views.get_xuid_and_exact_gamertag")
+    def test_csr_view(self, mock_get_xuid_and_exact_gamertag, mock_aget_csrs):
         # Missing `gamertag` throws error
         response = self.client.get("/halo-infinite/csr")
         self.assertEqual(response.status_code, 400)
@@ -158,23 +220,29 @@ class HaloInfiniteTestCase(APITestCase):
         # Add an active ranked playlist to the DB
         ranked_test_playlist_id_1 = uuid.uuid4()
         ranked_test_version_id_1 = uuid.uuid4()
-        mock_get_playlist_info.return_value = {
-            "UgcPlaylistVersion": str(ranked_test_version_id_1),
-            "HasCsr": True,
-        }
-        mock_get_playlist.return_value = {
-            "AssetId": str(ranked_test_playlist_id_1),
-            "VersionId": str(ranked_test_version_id_1),
-            "PublicName": "name",
-            "Description": "description",
-        }
-        ranked_test_playlist_1 = HaloInfinitePlaylist.objects.create(
+        ranked_test_playlist_1 = HaloInfinitePlaylist(
             creator=self.user, playlist_id=ranked_test_playlist_id_1, active=True
         )
+        apply_playlist_data(
+            ranked_test_playlist_1,
+            {
+                "UgcPlaylistVersion": str(ranked_test_version_id_1),
+                "HasCsr": True,
+            },
+            {
+                "AssetId": str(ranked_test_playlist_id_1),
+                "VersionId": str(ranked_test_version_id_1),
+                "PublicName": "name",
+                "Description": "description",
+            },
+        )
+        ranked_test_playlist_1.save()
+        # The cached response predates the new playlist
+        cache.clear()
 
         # Exception in get_csrs throws error
         mock_get_xuid_and_exact_gamertag.return_value = (0, "InternActualGT")
-        mock_get_csrs.side_effect = Exception()
+        mock_aget_csrs.side_effect = Exception()
         response = self.client.get("/halo-infinite/csr?gamertag=Intern")
         self.assertEqual(response.status_code, 500)
         details = response.data.get("error").get("details")
@@ -185,13 +253,13 @@ class HaloInfiniteTestCase(APITestCase):
             ),
         )
         mock_get_xuid_and_exact_gamertag.assert_called_once_with("Intern")
-        mock_get_csrs.assert_called_once_with([0], ranked_test_playlist_id_1)
+        mock_aget_csrs.assert_called_once_with([0], ranked_test_playlist_id_1)
         mock_get_xuid_and_exact_gamertag.reset_mock()
-        mock_get_csrs.reset_mock()
+        mock_aget_csrs.reset_mock()
 
         # Success returns 200
         mock_get_xuid_and_exact_gamertag.return_value = (0, "InternActualGT")
-        mock_get_csrs.return_value = {
+        mock_aget_csrs.return_value = {
             "csrs": {
                 0: {
                     "current_csr": 1000,
@@ -209,7 +277,7 @@ class HaloInfiniteTestCase(APITestCase):
                 }
             }
         }
-        mock_get_csrs.side_effect = None
+        mock_aget_csrs.side_effect = None
         response = self.client.get("/halo-infinite/csr?gamertag=Intern")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data.get("gamertag"), "InternActualGT")
@@ -246,9 +314,9 @@ class HaloInfiniteTestCase(APITestCase):
             self.assertEqual(all_time_max.get("subtier"), 1)
             self.assertEqual(all_time_max.get("tierDescription"), "Onyx")
         mock_get_xuid_and_exact_gamertag.assert_called_once_with("Intern")
-        mock_get_csrs.assert_called_once_with([0], ranked_test_playlist_id_1)
+        mock_aget_csrs.assert_called_once_with([0], ranked_test_playlist_id_1)
         mock_get_xuid_and_exact_gamertag.reset_mock()
-        mock_get_csrs.reset_mock()
+        mock_aget_csrs.reset_mock()
 
     @patch("apps.halo_infinite.views.get_summary_stats")
     @patch("apps.halo_infinite.views.get_xuid_and_exact_gamertag")
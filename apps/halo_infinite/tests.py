@@ -4,10 +4,16 @@ from unittest.mock import patch
 
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db.utils import IntegrityError
 from django.test import TestCase
 
 from apps.halo_infinite.constants import (
+    ERA_1_START_TIME,
+    LEVEL_ID_ARID,
+    LIFECYCLE_MODE_CUSTOM,
+    LIFECYCLE_MODE_MATCHMADE,
+    PLAYLIST_ID_RANKED_ARENA,
     SEARCH_ASSET_KIND_MAP,
     SEARCH_ASSET_KIND_MODE,
     SEARCH_ASSET_KIND_PREFAB,
@@ -22,6 +28,9 @@ from apps.halo_infinite.exceptions import (
 from apps.halo_infinite.models import (
     HaloInfiniteBuildID,
     HaloInfiniteClearanceToken,
+    HaloInfiniteMap,
+    HaloInfiniteMapModePair,
+    HaloInfiniteMapModePairContributor,
     HaloInfiniteMatch,
     HaloInfinitePlaylist,
     HaloInfiniteSpartanToken,
@@ -36,20 +45,30 @@ from apps.halo_infinite.tokens import (
     get_xsts_token,
 )
 from apps.halo_infinite.utils import (
+    apply_match_data,
+    apply_playlist_data,
     get_343_recommended_contributors,
     get_authored_maps,
     get_authored_modes,
     get_authored_prefabs,
     get_career_ranks,
+    get_contributor_xuids_for_maps_in_active_playlists,
     get_csr_after_match,
     get_csrs,
     get_current_season_id,
+    get_era_xbox_earn_dict,
     get_playlist_latest_version_info,
     get_ranked_arena_playlist_id_for_season,
     get_season_custom_matches_for_xuid,
     get_season_ranked_arena_matches_for_xuid,
+    get_start_and_end_times_for_era,
     get_start_and_end_times_for_season,
     get_summary_stats,
+    hydrate_flagged_records,
+    hydrate_matches,
+    update_active_playlists,
+    update_map_mode_pair_contributors,
+    update_map_mode_pairs_for_playlists,
 )
 from apps.xbox_live.models import XboxLiveUserToken
 
@@ -60,48 +79,33 @@ class HaloInfiniteDataSaveTestCase(TestCase):
             username="test", email="test@test.com", password="test"
         )
 
-    @patch("apps.halo_infinite.signals.match_stats")
-    def test_halo_infinite_match_save(self, mock_match_stats):
-        # Creating a match should be successful if only match ID is provided (rest is hydrated by pre_save)
+    def test_halo_infinite_match_save(self):
+        # Creating a match with only its match ID saves it unhydrated and flags it for hydration
         test_1_match_id = uuid.uuid4()
-        mock_match_stats.return_value = {
-            "MatchId": str(test_1_match_id),
-            "MatchInfo": {
-                "StartTime": "2024-01-09T00:00:00.00Z",
-                "EndTime": "2024-01-09T01:20:34.567Z",
-            },
-        }
         match = HaloInfiniteMatch.objects.create(
             creator=self.user, match_id=test_1_match_id
         )
         self.assertEqual(str(match.match_id), str(test_1_match_id))
-        self.assertEqual(
-            match.start_time,
-            datetime.datetime(2024, 1, 9, 0, 0, 0, 0, tzinfo=datetime.timezone.utc),
-        )
-        self.assertEqual(
-            match.end_time,
-            datetime.datetime(
-                2024, 1, 9, 1, 20, 34, 567000, tzinfo=datetime.timezone.utc
-            ),
-        )
+        self.assertIsNone(match.start_time)
+        self.assertIsNone(match.end_time)
         self.assertEqual(match.creator, self.user)
+        self.assertTrue(match.needs_hydration)
 
-        mock_match_stats.assert_called_once_with(test_1_match_id)
-        mock_match_stats.reset_mock()
-
-        # Match ID provided in create call should be replaced by the one retrieved in pre_save signal
+        # Creating a match with its data saves it as given
         test_2_match_id = uuid.uuid4()
-        mock_match_stats.return_value = {
-            "MatchId": str(test_2_match_id),
-            "MatchInfo": {
-                "StartTime": "2024-01-10T00:00:00.1234567Z",
-                "EndTime": "2024-01-10T01:20:34.567Z",
+        match = HaloInfiniteMatch(creator=self.user)
+        apply_match_data(
+            match,
+            {
+                "MatchId": str(test_2_match_id),
+                "MatchInfo": {
+                    "StartTime": "2024-01-10T00:00:00.1234567Z",
+                    "EndTime": "2024-01-10T01:20:34.567Z",
+                },
             },
-        }
-        match = HaloInfiniteMatch.objects.create(
-            creator=self.user, match_id="test_wrong_match_id"
         )
+        match.save()
+        match.refresh_from_db()
         self.assertEqual(str(match.match_id), str(test_2_match_id))
         self.assertEqual(
             match.start_time,
@@ -115,18 +119,9 @@ class HaloInfiniteDataSaveTestCase(TestCase):
                 2024, 1, 10, 1, 20, 34, 567000, tzinfo=datetime.timezone.utc
             ),
         )
-        self.assertEqual(match.creator, self.user)
-        mock_match_stats.assert_called_once_with("test_wrong_match_id")
-        mock_match_stats.reset_mock()
+        self.assertFalse(match.needs_hydration)
 
         # Duplicate Match ID should fail to save
-        mock_match_stats.return_value = {
-            "MatchId": str(test_1_match_id),
-            "MatchInfo": {
-                "StartTime": "2024-01-09T00:00:00.00Z",
-                "EndTime": "2024-01-09T01:20:34.567Z",
-            },
-        }
         self.assertRaisesMessage(
             IntegrityError,
             'duplicate key value violates unique constraint "HaloInfiniteMatch_pkey"',
@@ -134,83 +129,51 @@ class HaloInfiniteDataSaveTestCase(TestCase):
                 creator=self.user, match_id=test_1_match_id
             ),
         )
-        mock_match_stats.assert_called_once_with(test_1_match_id)
-        mock_match_stats.reset_mock()
 
-    @patch("apps.halo_infinite.signals.get_playlist")
-    @patch("apps.halo_infinite.signals.get_playlist_info")
-    def test_halo_infinite_playlist_save(
-        self, mock_get_playlist_info, mock_get_playlist
-    ):
-        # Creating a playlist should be successful if only Playlist ID is provided (rest is hydrated by pre_save)
+    def test_halo_infinite_playlist_save(self):
+        # Creating a playlist with only its Playlist ID saves it unhydrated and flags it for hydration
         test_1_playlist_id = str(uuid.uuid4())
-        test_1_version_id = str(uuid.uuid4())
-        mock_get_playlist_info.return_value = {
-            "UgcPlaylistVersion": test_1_version_id,
-            "HasCsr": True,
-        }
-        mock_get_playlist.return_value = {
-            "AssetId": test_1_playlist_id,
-            "VersionId": test_1_version_id,
-            "PublicName": "name",
-            "Description": "description",
-        }
         playlist = HaloInfinitePlaylist.objects.create(
             creator=self.user, playlist_id=test_1_playlist_id
         )
         self.assertEqual(playlist.playlist_id, test_1_playlist_id)
-        self.assertEqual(playlist.version_id, test_1_version_id)
-        self.assertEqual(playlist.ranked, True)
-        self.assertEqual(playlist.name, "name")
-        self.assertEqual(playlist.description, "description")
-
-        mock_get_playlist_info.assert_called_once_with(test_1_playlist_id, None)
-        mock_get_playlist_info.reset_mock()
-        mock_get_playlist.assert_called_once_with(
-            test_1_playlist_id, test_1_version_id, None
-        )
-        mock_get_playlist.reset_mock()
+        self.assertIsNone(playlist.version_id)
+        self.assertEqual(playlist.ranked, False)
+        self.assertEqual(str(playlist), test_1_playlist_id)
+        self.assertTrue(playlist.needs_hydration)
 
-        # Playlist ID provided in create call should not be replaced by the one retrieved in pre_save signal
+        # Creating a playlist with its data saves it as given
         test_2_playlist_id = str(uuid.uuid4())
         test_2_version_id = str(uuid.uuid4())
-        wrong_playlist_id = str(uuid.uuid4())
-        mock_get_playlist_info.return_value = {
-            "UgcPlaylistVersion": test_2_version_id,
-            "HasCsr": False,
-        }
-        mock_get_playlist.return_value = {
-            "AssetId": wrong_playlist_id,
-            "VersionId": test_2_version_id,
-            "PublicName": "test_name",
-            "Description": "test_description",
-        }
-        playlist = HaloInfinitePlaylist.objects.create(
+        playlist = HaloInfinitePlaylist(
             creator=self.user, playlist_id=test_2_playlist_id
         )
-        self.assertEqual(playlist.playlist_id, test_2_playlist_id)
-        self.assertEqual(playlist.version_id, test_2_version_id)
-        self.assertEqual(playlist.ranked, False)
-        self.assertEqual(playlist.name, "test_name")
-        self.assertEqual(playlist.description, "test_description")
-        mock_get_playlist_info.assert_called_once_with(test_2_playlist_id, None)
-        mock_get_playlist_info.reset_mock()
-        mock_get_playlist.assert_called_once_with(
-            test_2_playlist_id, test_2_version_id, None
+        apply_playlist_data(
+            playlist,
+            {"UgcPlaylistVersion": test_2_version_id, "HasCsr": True},
+            {
+                "AssetId": test_2_playlist_id,
+                "VersionId": test_2_version_id,
+                "PublicName": "name",
+                "Description": "description",
+            },
         )
-        mock_get_playlist.reset_mock()
+        playlist.save()
+        playlist.refresh_from_db()
+        self.assertEqual(str(playlist.version_id), test_2_version_id)
+        self.assertEqual(playlist.ranked, True)
+        self.assertEqual(playlist.name, "name")
+        self.assertEqual(playlist.description, "description")
+        self.assertFalse(playlist.needs_hydration)
+
+        # Re-saving an edited playlist keeps it hydrated
+        playlist.name = "edited"
+        playlist.save()
+        playlist.refresh_from_db()
+        self.assertEqual(playlist.name, "edited")
+        self.assertFalse(playlist.needs_hydration)
 
         # Duplicate Playlist ID should fail to save
-        mock_get_playlist_info.return_value = {
-            "UgcPlaylistVersion": test_1_version_id,
-            "HasCsr": True,
-        }
-        mock_get_playlist.return_value = {
-            "AssetId": test_1_playlist_id,
-            "VersionId": test_1_version_id,
-            "PublicName": "test_name",
-            "Description": "test_description",
-        }
         self.assertRaisesMessage(
             IntegrityError,
             'duplicate key value violates unique constraint "HaloInfinitePlaylist_pkey"',
@@ -218,12 +181,86 @@ class HaloInfiniteDataSaveTestCase(TestCase):
                 creator=self.user, playlist_id=test_1_playlist_id
             ),
         )
-        mock_get_playlist_info.assert_called_once_with(test_1_playlist_id, None)
+
+    @patch("apps.halo_infinite.utils.get_playlist")
+    @patch("apps.halo_infinite.utils.get_playlist_info")
+    @patch("apps.halo_infinite.utils.match_stats")
+    @patch("apps.halo_infinite.utils.get_map")
+    def test_hydrate_flagged_records(
+        self, mock_get_map, mock_match_stats, mock_get_playlist_info, mock_get_playlist
+    ):
+        map_asset_id = str(uuid.uuid4())
+        map_version_id = str(uuid.uuid4())
+        unpublished_map_asset_id = str(uuid.uuid4())
+        match_id = str(uuid.uuid4())
+        playlist_id = str(uuid.uuid4())
+        playlist_version_id = str(uuid.uuid4())
+        HaloInfiniteMap.objects.create(creator=self.user, asset_id=map_asset_id)
+        HaloInfiniteMap.objects.create(
+            creator=self.user, asset_id=unpublished_map_asset_id
+        )
+        HaloInfiniteMatch.objects.create(creator=self.user, match_id=match_id)
+        HaloInfinitePlaylist.objects.create(creator=self.user, playlist_id=playlist_id)
+        mock_get_map.side_effect = lambda asset_id: (
+            {
+                "AssetId": map_asset_id,
+                "VersionId": map_version_id,
+                "PublicName": "map",
+                "Description": "map description",
+                "PublishedDate": {"ISO8601Date": "2024-01-01T00:00:00Z"},
+            }
+            if asset_id == map_asset_id
+            else {}
+        )
+        mock_match_stats.return_value = {
+            "MatchId": match_id,
+            "MatchInfo": {
+                "StartTime": "2024-01-01T00:00:00+00:00",
+                "EndTime": "2024-01-01T00:10:00+00:00",
+            },
+        }
+        mock_get_playlist_info.return_value = {
+            "UgcPlaylistVersion": playlist_version_id,
+            "HasCsr": True,
+        }
+        mock_get_playlist.return_value = {
+            "AssetId": playlist_id,
+            "VersionId": playlist_version_id,
+            "PublicName": "playlist",
+            "Description": "playlist description",
+        }
+
+        # Every flagged record the API returns is hydrated; the unpublished map stays flagged
+        self.assertEqual(
+            hydrate_flagged_records(), {"maps": 1, "matches": 1, "playlists": 1}
+        )
+        halo_infinite_map = HaloInfiniteMap.objects.get(asset_id=map_asset_id)
+        self.assertEqual(str(halo_infinite_map.version_id), map_version_id)
+        self.assertEqual(halo_infinite_map.public_name, "map")
+        self.assertFalse(halo_infinite_map.needs_hydration)
+        self.assertTrue(
+            HaloInfiniteMap.objects.get(
+                asset_id=unpublished_map_asset_id
+            ).needs_hydration
+        )
+        match = HaloInfiniteMatch.objects.get(match_id=match_id)
+        self.assertEqual(
+            match.end_time - match.start_time, datetime.timedelta(minutes=10)
+        )
+        self.assertFalse(match.needs_hydration)
+        playlist = HaloInfinitePlaylist.objects.get(playlist_id=playlist_id)
+        self.assertEqual(playlist.name, "playlist")
+        self.assertTrue(playlist.ranked)
+        self.assertFalse(playlist.needs_hydration)
+        mock_match_stats.reset_mock()
         mock_get_playlist_info.reset_mock()
-        mock_get_playlist.assert_called_once_with(
-            test_1_playlist_id, test_1_version_id, None
+
+        # Hydrated records are not fetched again
+        self.assertEqual(
+            hydrate_flagged_records(), {"maps": 0, "matches": 0, "playlists": 0}
         )
-        mock_get_playlist.reset_mock()
+        mock_match_stats.assert_not_called()
+        mock_get_playlist_info.assert_not_called()
 
 
 class HaloInfiniteTokensTestCase(TestCase):
@@ -1032,6 +1069,78 @@ class HaloInfiniteUtilsTestCase(TestCase):
         )
         mock_career_rank.assert_called_once_with([2533274870001169])
 
+    def test_get_contributor_xuids_for_maps_in_active_playlists(self):
+        cache.clear()
+        map_mode_pair_1 = HaloInfiniteMapModePair.objects.create(
+            creator=self.user,
+            asset_id=uuid.uuid4(),
+            version_id=uuid.uuid4(),
+            data={"MapLink": {"Contributors": ["xuid(1)", "xuid(2)", "xuid(2)"]}},
+        )
+        map_mode_pair_2 = HaloInfiniteMapModePair.objects.create(
+            creator=self.user,
+            asset_id=uuid.uuid4(),
+            version_id=uuid.uuid4(),
+            data={"MapLink": {"Contributors": ["xuid(3)"]}},
+        )
+        update_map_mode_pair_contributors([map_mode_pair_1, map_mode_pair_2], self.user)
+        self.assertEqual(HaloInfiniteMapModePairContributor.objects.count(), 3)
+
+        # Playlists are bulk created to skip the pre_save signal's Halo Infinite API calls
+        active_playlist, inactive_playlist = HaloInfinitePlaylist.objects.bulk_create(
+            [
+                HaloInfinitePlaylist(
+                    creator=self.user,
+                    playlist_id=uuid.uuid4(),
+                    version_id=uuid.uuid4(),
+                    ranked=False,
+                    active=True,
+                    data={
+                        "RotationEntries": [{"AssetId": str(map_mode_pair_1.asset_id)}]
+                    },
+                ),
+                HaloInfinitePlaylist(
+                    creator=self.user,
+                    playlist_id=uuid.uuid4(),
+                    version_id=uuid.uuid4(),
+                    ranked=False,
+                    active=False,
+                    data={
+                        "RotationEntries": [{"AssetId": str(map_mode_pair_2.asset_id)}]
+                    },
+                ),
+            ]
+        )
+
+        # Only maps in active playlists count, and repeat lookups are served from the cached set (after reading the
+        # active playlist versions and the cache itself)
+        self.assertEqual(get_contributor_xuids_for_maps_in_active_playlists(), {1, 2})
+        with self.assertNumQueries(2):
+            self.assertEqual(
+                get_contributor_xuids_for_maps_in_active_playlists(), {1, 2}
+            )
+
+        # A new active playlist version is picked up immediately
+        HaloInfinitePlaylist.objects.filter(
+            playlist_id=active_playlist.playlist_id
+        ).update(
+            version_id=uuid.uuid4(),
+            data={
+                "RotationEntries": [
+                    {"AssetId": str(map_mode_pair_1.asset_id)},
+                    {"AssetId": str(map_mode_pair_2.asset_id)},
+                ]
+            },
+        )
+        self.assertEqual(
+            get_contributor_xuids_for_maps_in_active_playlists(), {1, 2, 3}
+        )
+
+        # Rebuilding the index for a MapModePair invalidates the cached set
+        map_mode_pair_1.data = {"MapLink": {"Contributors": ["xuid(4)"]}}
+        update_map_mode_pair_contributors([map_mode_pair_1], self.user)
+        self.assertEqual(get_contributor_xuids_for_maps_in_active_playlists(), {3, 4})
+
     @patch("apps.halo_infinite.utils.get_csr")
     def test_get_csrs(self, mock_get_csr):
         mock_get_csr.return_value = {
@@ -1201,6 +1310,61 @@ class HaloInfiniteUtilsTestCase(TestCase):
             )
             mock_matches_between.reset_mock()
 
+    @patch("apps.halo_infinite.utils.matches_between")
+    def test_get_era_xbox_earn_dict(self, mock_matches_between):
+        cache.clear()
+        start_time, end_time = get_start_and_end_times_for_era(1)
+        match_end_time = ERA_1_START_TIME + datetime.timedelta(days=1)
+        ranked_win = {
+            "Outcome": 2,
+            "MatchInfo": {
+                "LifecycleMode": LIFECYCLE_MODE_MATCHMADE,
+                "Playlist": {"AssetId": PLAYLIST_ID_RANKED_ARENA},
+                "StartTime": (
+                    match_end_time - datetime.timedelta(minutes=10)
+                ).isoformat(),
+                "EndTime": match_end_time.isoformat(),
+            },
+        }
+        forge_custom_game = {
+            "Outcome": 2,
+            "MatchInfo": {
+                "LevelId": LEVEL_ID_ARID,
+                "LifecycleMode": LIFECYCLE_MODE_CUSTOM,
+                "StartTime": (match_end_time - datetime.timedelta(hours=2)).isoformat(),
+                "EndTime": match_end_time.isoformat(),
+            },
+        }
+        mock_matches_between.return_value = [
+            ranked_win,
+            ranked_win,
+            forge_custom_game,
+        ]
+
+        # One match history scan scores every registered program
+        trailblazer_earn_dict = get_era_xbox_earn_dict("trailblazer", [123], 1)
+        pathfinder_earn_dict = get_era_xbox_earn_dict("pathfinder", [123], 1)
+        mock_matches_between.assert_called_once()
+        self.assertEqual(
+            mock_matches_between.call_args.args, (123, start_time, end_time)
+        )
+        self.assertEqual(
+            trailblazer_earn_dict,
+            {
+                123: {
+                    "csr_go_up": 2,
+                    "play_to_slay": 0,
+                    "mean_streets": 0,
+                    "hot_streak": 0,
+                }
+            },
+        )
+        self.assertEqual(pathfinder_earn_dict, {123: {"forged_in_fire": 2}})
+
+        # Unregistered programs have no match-based earns
+        self.assertEqual(get_era_xbox_earn_dict("unknown", [123], 1), {123: {}})
+        mock_matches_between.assert_called_once()
+
     @patch("apps.halo_infinite.utils.match_count")
     @patch("apps.halo_infinite.utils.service_record")
     def test_get_summary_stats(self, mock_service_record, mock_match_count):
@@ -1230,3 +1394,202 @@ class HaloInfiniteUtilsTestCase(TestCase):
         self.assertEqual(data.get("games_played"), 33)
         mock_service_record.assert_called_once_with(0)
         mock_match_count.assert_called_once_with(0)
+
+    @patch("apps.halo_infinite.utils.match_stats")
+    def test_hydrate_matches(self, mock_match_stats):
+        existing_match_id = str(uuid.uuid4())
+        new_match_ids = [str(uuid.uuid4()) for _ in range(3)]
+
+        def get_match_data(match_id, session):
+            return {
+                "MatchId": match_id,
+                "MatchInfo": {
+                    "StartTime": "2024-01-01T00:00:00+00:00",
+                    "EndTime": "2024-01-01T00:10:00+00:00",
+                },
+            }
+
+        mock_match_stats.side_effect = get_match_data
+        HaloInfiniteMatch.objects.create(
+            creator=self.user,
+            match_id=existing_match_id,
+            start_time=datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+            end_time=datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+            data={"MatchId": existing_match_id},
+        )
+
+        # Only matches missing from the database are fetched and saved
+        matches = hydrate_matches([existing_match_id] + new_match_ids, self.user)
+        self.assertEqual(
+            sorted(str(match.match_id) for match in matches), sorted(new_match_ids)
+        )
+        self.assertEqual(mock_match_stats.call_count, 3)
+        self.assertEqual(HaloInfiniteMatch.objects.count(), 4)
+        match = HaloInfiniteMatch.objects.get(match_id=new_match_ids[0])
+        self.assertEqual(
+            match.end_time - match.start_time, datetime.timedelta(minutes=10)
+        )
+        mock_match_stats.reset_mock()
+
+        # Missing match stats raise
+        mock_match_stats.side_effect = None
+        mock_match_stats.return_value = {}
+        self.assertRaises(Exception, hydrate_matches, [str(uuid.uuid4())], self.user)
+
+    @patch("apps.halo_infinite.utils.get_playlist")
+    @patch("apps.halo_infinite.utils.get_playlist_info")
+    def test_update_active_playlists(self, mock_get_playlist_info, mock_get_playlist):
+        unchanged_version_id = uuid.uuid4()
+        stale_version_id = uuid.uuid4()
+        latest_version_id = str(uuid.uuid4())
+        # Playlists are bulk created to skip the pre_save signal's Halo Infinite API calls
+        (
+            unchanged_playlist,
+            stale_playlist,
+            _,
+        ) = HaloInfinitePlaylist.objects.bulk_create(
+            [
+                HaloInfinitePlaylist(
+                    creator=self.user,
+                    playlist_id=uuid.uuid4(),
+                    version_id=unchanged_version_id,
+                    ranked=False,
+                    active=True,
+                    name="unchanged",
+                    data={"PublicName": "unchanged"},
+                ),
+                HaloInfinitePlaylist(
+                    creator=self.user,
+                    playlist_id=uuid.uuid4(),
+                    version_id=stale_version_id,
+                    ranked=False,
+                    active=True,
+                    name="stale",
+                ),
+                HaloInfinitePlaylist(
+                    creator=self.user,
+                    playlist_id=uuid.uuid4(),
+                    version_id=uuid.uuid4(),
+                    ranked=False,
+                    active=False,
+                    name="inactive",
+                ),
+            ]
+        )
+        latest_versions = {
+            str(unchanged_playlist.playlist_id): str(unchanged_version_id),
+            str(stale_playlist.playlist_id): latest_version_id,
+        }
+        mock_get_playlist_info.side_effect = lambda playlist_id, session: {
+            "UgcPlaylistVersion": latest_versions[str(playlist_id)],
+            "HasCsr": True,
+        }
+        mock_get_playlist.return_value = {
+            "AssetId": str(stale_playlist.playlist_id),
+            "VersionId": latest_version_id,
+            "PublicName": "latest",
+            "Description": "latest description",
+        }
+
+        # Info is fetched for every active playlist, but data only for the playlist with a new version
+        playlists = update_active_playlists()
+        self.assertEqual(len(playlists), 2)
+        self.assertEqual(mock_get_playlist_info.call_count, 2)
+        mock_get_playlist.assert_called_once()
+        self.assertEqual(
+            mock_get_playlist.call_args.args[:2],
+            (stale_playlist.playlist_id, latest_version_id),
+        )
+        stale_playlist.refresh_from_db()
+        self.assertEqual(str(stale_playlist.version_id), latest_version_id)
+        self.assertEqual(stale_playlist.ranked, True)
+        self.assertEqual(stale_playlist.name, "latest")
+        unchanged_playlist.refresh_from_db()
+        self.assertEqual(unchanged_playlist.name, "unchanged")
+        mock_get_playlist_info.reset_mock()
+        mock_get_playlist.reset_mock()
+
+        # A refresh with no new versions only fetches playlist info
+        update_active_playlists()
+        self.assertEqual(mock_get_playlist_info.call_count, 2)
+        mock_get_playlist.assert_not_called()
+
+        # Missing playlist info raises
+        mock_get_playlist_info.side_effect = None
+        mock_get_playlist_info.return_value = {}
+        self.assertRaises(Exception, update_active_playlists)
+
+    @patch("apps.halo_infinite.utils.get_map_mode_pair")
+    def test_update_map_mode_pairs_for_playlists(self, mock_get_map_mode_pair):
+        cache.clear()
+        existing_asset_id = str(uuid.uuid4())
+        existing_version_id = str(uuid.uuid4())
+        new_asset_id = str(uuid.uuid4())
+        new_version_id = str(uuid.uuid4())
+        HaloInfiniteMapModePair.objects.create(
+            creator=self.user,
+            asset_id=existing_asset_id,
+            version_id=existing_version_id,
+            public_name="existing",
+            data={"MapLink": {"Contributors": ["xuid(1)"]}},
+        )
+        playlist = HaloInfinitePlaylist(
+            creator=self.user,
+            playlist_id=uuid.uuid4(),
+            version_id=uuid.uuid4(),
+            ranked=False,
+            active=True,
+            data={
+                "RotationEntries": [
+                    {"AssetId": existing_asset_id, "VersionId": existing_version_id},
+                    {"AssetId": new_asset_id, "VersionId": new_version_id},
+                ]
+            },
+        )
+        mock_get_map_mode_pair.side_effect = lambda asset_id, version_id, session: {
+            "AssetId": asset_id,
+            "VersionId": version_id,
+            "PublicName": f"pair {asset_id}",
+            "Description": "description",
+            "MapLink": {"Contributors": ["xuid(2)"]},
+        }
+
+        # Only the MapModePair missing from the database is fetched and created
+        map_mode_pairs = update_map_mode_pairs_for_playlists([playlist], self.user)
+        self.assertEqual(
+            [str(map_mode_pair.asset_id) for map_mode_pair in map_mode_pairs],
+            [new_asset_id],
+        )
+        mock_get_map_mode_pair.assert_called_once()
+        self.assertEqual(
+            mock_get_map_mode_pair.call_args.args[:2], (new_asset_id, new_version_id)
+        )
+        self.assertEqual(HaloInfiniteMapModePair.objects.count(), 2)
+        self.assertEqual(
+            set(
+                HaloInfiniteMapModePairContributor.objects.filter(
+                    map_mode_pair_id=new_asset_id
+                ).values_list("xuid", flat=True)
+            ),
+            {2},
+        )
+        mock_get_map_mode_pair.reset_mock()
+
+        # A rotation with no new versions fetches nothing
+        self.assertEqual(update_map_mode_pairs_for_playlists([playlist], self.user), [])
+        mock_get_map_mode_pair.assert_not_called()
+
+        # A new rotation VersionId updates the stored MapModePair in place
+        updated_version_id = str(uuid.uuid4())
+        playlist.data["RotationEntries"][0]["VersionId"] = updated_version_id
+        map_mode_pairs = update_map_mode_pairs_for_playlists([playlist], self.user)
+        self.assertEqual(len(map_mode_pairs), 1)
+        mock_get_map_mode_pair.assert_called_once()
+        existing_map_mode_pair = HaloInfiniteMapModePair.objects.get(
+            asset_id=existing_asset_id
+        )
+        self.assertEqual(str(existing_map_mode_pair.version_id), updated_version_id)
+        self.assertEqual(
+            existing_map_mode_pair.public_name, f"pair {existing_asset_id}"
+        )
+        self.assertEqual(HaloInfiniteMapModePair.objects.count(), 2)
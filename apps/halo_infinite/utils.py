@@ -1,20 +1,35 @@
 import datetime
+import hashlib
+import json
 import logging
+import threading
+import time
+from itertools import pairwise
 
+import httpx
+import isodate
 import requests
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connections, transaction
 
 from apps.halo_infinite.api.career_rank import career_rank
-from apps.halo_infinite.api.csr import get_csr
-from apps.halo_infinite.api.files import get_map, get_mode
+from apps.halo_infinite.api.csr import aget_csr, get_csr
+from apps.halo_infinite.api.files import aget_map, aget_mode, get_map, get_mode
 from apps.halo_infinite.api.map_mode_pair import get_map_mode_pair
 from apps.halo_infinite.api.match import (
+    alast_25_matches,
+    amatches_between,
     last_25_matches,
     match_count,
     match_skill,
+    match_stats,
     matches_between,
 )
 from apps.halo_infinite.api.playlist import (
+    aget_playlist,
     get_playlist,
+    get_playlist_info,
     playlist_info,
     playlist_version,
 )
@@ -24,6 +39,8 @@ from apps.halo_infinite.api.service_record import service_record
 from apps.halo_infinite.constants import (
     CAREER_RANKS,
     ERA_DATA_DICT,
+    LIFECYCLE_MODE_CUSTOM,
+    LIFECYCLE_MODE_MATCHMADE,
     PLAYLIST_ID_RANKED_ARENA,
     SEARCH_ASSET_KIND_MAP,
     SEARCH_ASSET_KIND_MODE,
@@ -35,10 +52,33 @@ from apps.halo_infinite.exceptions import (
     MissingEraDataException,
     MissingSeasonDataException,
 )
-from apps.halo_infinite.models import HaloInfiniteMapModePair, HaloInfinitePlaylist
+from apps.halo_infinite.models import (
+    HaloInfiniteMap,
+    HaloInfiniteMapModePair,
+    HaloInfiniteMapModePairContributor,
+    HaloInfiniteMatch,
+    HaloInfinitePlaylist,
+)
+from apps.overrides.utils import acall_concurrently, call_concurrently
 
 logger = logging.getLogger(__name__)
 
+CONTRIBUTOR_XUIDS_CACHE_TIMEOUT = 60 * 10
+ERA_XBOX_EARNS_CACHE_TIMEOUT = 60 * 5
+# How long each read-only stats endpoint's responses are served from the cache before being refreshed
+STATS_RESPONSE_CACHE_TIMEOUTS = {
+    "career-rank": 60 * 5,
+    "csr": 60,
+    "recent-games": 60,
+    "summary-stats": 60 * 5,
+}
+# How long past its timeout a cached stats response may still be served while it is refreshed in the background
+STATS_RESPONSE_STALE_TIMEOUT = 60 * 10
+
+# Match filter and per-Era earn rules for each program, keyed by program name. Registered from the programs'
+# AppConfig.ready() so that a single scan of a player's Era matches can score every program at once.
+XBOX_EARN_RULES = {}
+
 
 def get_api_ids_for_season(season_id):
     season_dict = SEASON_DATA_DICT.get(season_id, {})
@@ -254,14 +294,13 @@ def get_csr_after_match(xuid: int, match_id: str) -> int:
         return -1
 
 
-def get_csrs(xuids: list[int], playlist_id: str):
+def get_csrs_from_csr_data(csr_data: dict) -> dict:
     def get_tier_description(tier, subtier):
         return f"{tier}{f' {subtier}' if tier != 'Onyx' else ''}"
 
     return_dict = {
         "csrs": {},
     }
-    csr_data = get_csr(xuids, playlist_id)
     for value in csr_data.get("Value", []):
         xuid = int(value.get("Id").lstrip("xuid(").rstrip(")"))
         current = value.get("Result", {}).get("Current", {})
@@ -290,72 +329,386 @@ def get_csrs(xuids: list[int], playlist_id: str):
     return return_dict
 
 
+def get_csrs(xuids: list[int], playlist_id: str):
+    return get_csrs_from_csr_data(get_csr(xuids, playlist_id))
+
+
+async def aget_csrs(xuids: list[int], playlist_id: str):
+    return get_csrs_from_csr_data(await aget_csr(xuids, playlist_id))
+
+
+def apply_map_data(halo_infinite_map: HaloInfiniteMap, map_data: dict) -> None:
+    halo_infinite_map.version_id = map_data.get("VersionId")
+    halo_infinite_map.public_name = map_data.get("PublicName")
+    halo_infinite_map.description = map_data.get("Description")
+    halo_infinite_map.published_at = isodate.parse_datetime(
+        map_data.get("PublishedDate", {}).get("ISO8601Date")
+    )
+    halo_infinite_map.data = map_data
+    halo_infinite_map.needs_hydration = False
+
+
+def apply_match_data(halo_infinite_match: HaloInfiniteMatch, match_data: dict) -> None:
+    halo_infinite_match.match_id = match_data.get("MatchId")
+    halo_infinite_match.start_time = datetime.datetime.fromisoformat(
+        match_data.get("MatchInfo", {}).get("StartTime")
+    )
+    halo_infinite_match.end_time = datetime.datetime.fromisoformat(
+        match_data.get("MatchInfo", {}).get("EndTime")
+    )
+    halo_infinite_match.data = match_data
+    halo_infinite_match.needs_hydration = False
+
+
+def apply_playlist_data(
+    playlist: HaloInfinitePlaylist, playlist_info: dict, playlist_data: dict
+) -> None:
+    playlist.version_id = playlist_info.get("UgcPlaylistVersion")
+    playlist.ranked = playlist_info.get("HasCsr")
+    playlist.info = playlist_info
+    playlist.name = playlist_data.get("PublicName")
+    playlist.description = playlist_data.get("Description")
+    playlist.data = playlist_data
+    playlist.needs_hydration = False
+
+
+def hydrate_maps(asset_ids: list[str], user) -> list[HaloInfiniteMap]:
+    """
+    Fetches the latest version of each map concurrently and creates or updates its HaloInfiniteMap in one query.
+    """
+    map_datas = call_concurrently(
+        lambda asset_id, session: get_map(asset_id), [(id,) for id in asset_ids]
+    )
+    halo_infinite_maps = []
+    for asset_id, map_data in zip(asset_ids, map_datas):
+        if not map_data:
+            raise Exception(f"Map {asset_id} is not published, so it cannot be saved.")
+        halo_infinite_map = HaloInfiniteMap(asset_id=asset_id, creator=user)
+        apply_map_data(halo_infinite_map, map_data)
+        halo_infinite_maps.append(halo_infinite_map)
+    return HaloInfiniteMap.objects.bulk_create(
+        halo_infinite_maps,
+        update_conflicts=True,
+        unique_fields=["asset_id"],
+        update_fields=[
+            "version_id",
+            "public_name",
+            "description",
+            "published_at",
+            "data",
+            "needs_hydration",
+            "updated_at",
+        ],
+    )
+
+
+def hydrate_matches(match_ids: list[str], user) -> list[HaloInfiniteMatch]:
+    """
+    Saves a HaloInfiniteMatch for each match ID not yet in the database or still flagged with `needs_hydration`,
+    fetching the match stats concurrently. Returns the saved matches.
+    """
+    existing_match_ids = {
+        str(match_id)
+        for match_id in HaloInfiniteMatch.objects.filter(
+            match_id__in=match_ids, needs_hydration=False
+        ).values_list("match_id", flat=True)
+    }
+    new_match_ids = sorted(
+        {str(match_id).lower() for match_id in match_ids} - existing_match_ids
+    )
+    halo_infinite_matches = []
+    for match_id, match_data in zip(
+        new_match_ids,
+        call_concurrently(match_stats, [(match_id,) for match_id in new_match_ids]),
+    ):
+        if not match_data:
+            raise Exception(f"Match {match_id} could not be retrieved.")
+        halo_infinite_match = HaloInfiniteMatch(creator=user)
+        apply_match_data(halo_infinite_match, match_data)
+        halo_infinite_matches.append(halo_infinite_match)
+    # A conflicting row is either a flagged match being hydrated or one saved concurrently with the same data
+    return HaloInfiniteMatch.objects.bulk_create(
+        halo_infinite_matches,
+        update_conflicts=True,
+        unique_fields=["match_id"],
+        update_fields=[
+            "start_time",
+            "end_time",
+            "data",
+            "needs_hydration",
+            "updated_at",
+        ],
+    )
+
+
+def hydrate_playlists(
+    playlists: list[HaloInfinitePlaylist],
+) -> list[HaloInfinitePlaylist]:
+    """
+    Refreshes HaloInfinitePlaylists in bulk. Playlist info is fetched concurrently for every playlist, but playlist
+    data is only fetched (and the record only written) for playlists with no data or whose UgcPlaylistVersion differs
+    from the stored one. Returns the playlists that were written.
+    """
+    playlist_infos = call_concurrently(
+        get_playlist_info, [(playlist.playlist_id,) for playlist in playlists]
+    )
+    stale_playlists = []
+    for playlist, latest_playlist_info in zip(playlists, playlist_infos):
+        latest_version_id = latest_playlist_info.get("UgcPlaylistVersion")
+        if latest_version_id is None:
+            raise Exception(
+                f"Playlist {playlist.playlist_id} info could not be retrieved."
+            )
+        if not playlist.data or str(playlist.version_id) != latest_version_id.lower():
+            stale_playlists.append((playlist, latest_playlist_info))
+
+    playlist_datas = call_concurrently(
+        get_playlist,
+        [
+            (playlist.playlist_id, latest_playlist_info.get("UgcPlaylistVersion"))
+            for playlist, latest_playlist_info in stale_playlists
+        ],
+    )
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    updated_playlists = []
+    for (playlist, latest_playlist_info), latest_playlist_data in zip(
+        stale_playlists, playlist_datas
+    ):
+        if not latest_playlist_data:
+            raise Exception(
+                f"Playlist {playlist.playlist_id} version "
+                f"{latest_playlist_info.get('UgcPlaylistVersion')} could not be retrieved."
+            )
+        apply_playlist_data(playlist, latest_playlist_info, latest_playlist_data)
+        playlist.updated_at = now
+        updated_playlists.append(playlist)
+    HaloInfinitePlaylist.objects.bulk_update(
+        updated_playlists,
+        [
+            "version_id",
+            "ranked",
+            "info",
+            "name",
+            "description",
+            "data",
+            "needs_hydration",
+            "updated_at",
+        ],
+    )
+    logger.info(f"Refreshed {len(updated_playlists)} of {len(playlists)} playlists.")
+    return updated_playlists
+
+
+def hydrate_flagged_records() -> dict[str, int]:
+    """
+    Hydrates every map, match and playlist that was saved without its API data and flagged with `needs_hydration`.
+    Each model's records are fetched concurrently and written back with one bulk query. Maps and matches the API cannot
+    return stay flagged for a later run. Returns the number of records hydrated per model.
+    """
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    flagged_maps = list(HaloInfiniteMap.objects.filter(needs_hydration=True))
+    map_datas = call_concurrently(
+        lambda halo_infinite_map, session: get_map(str(halo_infinite_map.asset_id)),
+        [(halo_infinite_map,) for halo_infinite_map in flagged_maps],
+    )
+    hydrated_maps = []
+    for halo_infinite_map, map_data in zip(flagged_maps, map_datas):
+        if map_data:
+            apply_map_data(halo_infinite_map, map_data)
+            halo_infinite_map.updated_at = now
+            hydrated_maps.append(halo_infinite_map)
+    HaloInfiniteMap.objects.bulk_update(
+        hydrated_maps,
+        [
+            "version_id",
+            "public_name",
+            "description",
+            "published_at",
+            "data",
+            "needs_hydration",
+            "updated_at",
+        ],
+    )
+
+    flagged_matches = list(HaloInfiniteMatch.objects.filter(needs_hydration=True))
+    match_datas = call_concurrently(
+        match_stats, [(str(match.match_id),) for match in flagged_matches]
+    )
+    hydrated_matches = []
+    for match, match_data in zip(flagged_matches, match_datas):
+        if match_data:
+            apply_match_data(match, match_data)
+            match.updated_at = now
+            hydrated_matches.append(match)
+    HaloInfiniteMatch.objects.bulk_update(
+        hydrated_matches,
+        ["start_time", "end_time", "data", "needs_hydration", "updated_at"],
+    )
+
+    hydrated_playlists = hydrate_playlists(
+        list(HaloInfinitePlaylist.objects.filter(needs_hydration=True))
+    )
+    return {
+        "maps": len(hydrated_maps),
+        "matches": len(hydrated_matches),
+        "playlists": len(hydrated_playlists),
+    }
+
+
 def update_active_playlists() -> list[HaloInfinitePlaylist]:
-    active_playlists = HaloInfinitePlaylist.objects.filter(active=True)
-    with requests.Session() as s:
-        for playlist in active_playlists:
-            # Kinda hacky but by triggering the pre-save signal we hit the Halo API
-            playlist.requests_session = s
-            playlist.save()
+    active_playlists = list(HaloInfinitePlaylist.objects.filter(active=True))
+    hydrate_playlists(active_playlists)
     return active_playlists
 
 
 def update_known_playlists():
-    known_playlists = HaloInfinitePlaylist.objects.all()
-    for playlist in known_playlists:
-        # Kinda hacky but by triggering the pre-save signal we hit the Halo API
-        playlist.save()
+    hydrate_playlists(list(HaloInfinitePlaylist.objects.all()))
 
 
-def get_contributor_xuids_for_maps_in_active_playlists() -> set[int]:
-    contributor_xuids = set()
-    # Retrieve MapModePair IDs (Asset/Version) for all active playlists
-    active_playlists = HaloInfinitePlaylist.objects.filter(active=True)
-    map_mode_pair_ids = set()
-    for playlist in active_playlists:
-        for rotation_entry in playlist.data.get("RotationEntries", []):
-            map_mode_pair_ids.add(rotation_entry["AssetId"])
+def get_active_playlist_versions() -> list[tuple[str, str]]:
+    return sorted(
+        (str(playlist_id), str(version_id))
+        for playlist_id, version_id in HaloInfinitePlaylist.objects.filter(
+            active=True
+        ).values_list("playlist_id", "version_id")
+    )
+
+
+def get_contributor_xuids_cache_key(playlist_versions: list[tuple[str, str]]) -> str:
+    versions_digest = hashlib.sha256(
+        ",".join(
+            f"{playlist_id}:{version_id}"
+            for playlist_id, version_id in playlist_versions
+        ).encode()
+    ).hexdigest()
+    return f"active-playlist-contributor-xuids-{versions_digest}"
 
-    # Retrieve contributor XUIDs for the MapLinks in each MapModePair
-    for asset_id in map_mode_pair_ids:
-        map_mode_pair = HaloInfiniteMapModePair.objects.get(asset_id=asset_id)
-        for contributor in map_mode_pair.data.get("MapLink", {}).get("Contributors"):
-            contributor_xuids.add(int(contributor.lstrip("xuid(").rstrip(")")))
 
+def get_contributor_xuids_for_maps_in_active_playlists() -> set[int]:
+    """
+    Returns the XUIDs credited on any map in the rotation of an active playlist. The set is read from the
+    HaloInfiniteMapModePairContributor index and cached against the active playlists' version IDs, so it only needs to
+    be rebuilt when a playlist version changes or the index is refreshed.
+    """
+    playlist_versions = get_active_playlist_versions()
+    cache_key = get_contributor_xuids_cache_key(playlist_versions)
+    contributor_xuids = cache.get(cache_key)
+    if contributor_xuids is None:
+        # Retrieve MapModePair IDs (Asset) for all active playlists
+        map_mode_pair_ids = set()
+        for playlist_data in HaloInfinitePlaylist.objects.filter(
+            playlist_id__in=[playlist_id for playlist_id, _ in playlist_versions]
+        ).values_list("data", flat=True):
+            for rotation_entry in playlist_data.get("RotationEntries", []):
+                map_mode_pair_ids.add(rotation_entry["AssetId"])
+
+        # Retrieve contributor XUIDs for the MapLinks in each MapModePair from the index
+        contributor_xuids = set(
+            HaloInfiniteMapModePairContributor.objects.filter(
+                map_mode_pair_id__in=map_mode_pair_ids
+            ).values_list("xuid", flat=True)
+        )
+        cache.set(cache_key, contributor_xuids, CONTRIBUTOR_XUIDS_CACHE_TIMEOUT)
     return contributor_xuids
 
 
+def update_map_mode_pair_contributors(
+    map_mode_pairs: list[HaloInfiniteMapModePair], user
+) -> None:
+    """
+    Rebuilds the HaloInfiniteMapModePairContributor rows for each MapModePair from its MapLink contributors.
+    """
+    with transaction.atomic():
+        HaloInfiniteMapModePairContributor.objects.filter(
+            map_mode_pair__in=map_mode_pairs
+        ).delete()
+        HaloInfiniteMapModePairContributor.objects.bulk_create(
+            [
+                HaloInfiniteMapModePairContributor(
+                    map_mode_pair=map_mode_pair, xuid=xuid, creator=user
+                )
+                for map_mode_pair in map_mode_pairs
+                for xuid in {
+                    int(contributor.lstrip("xuid(").rstrip(")"))
+                    for contributor in map_mode_pair.data.get("MapLink", {}).get(
+                        "Contributors"
+                    )
+                    or []
+                }
+            ]
+        )
+    cache.delete(get_contributor_xuids_cache_key(get_active_playlist_versions()))
+
+
 def update_map_mode_pairs_for_playlists(
     playlists: list[HaloInfinitePlaylist],
     user,
 ) -> list[HaloInfiniteMapModePair]:
-    map_mode_pairs = []
-    with requests.Session() as s:
-        # Retrieve MapModePair IDs (Asset/Version) for all active playlists
-        map_mode_pair_ids = set()
-        for playlist in playlists:
-            for rotation_entry in playlist.data.get("RotationEntries", []):
-                map_mode_pair_ids.add(
-                    (rotation_entry["AssetId"], rotation_entry["VersionId"])
-                )
+    """
+    Creates or updates the HaloInfiniteMapModePairs in the playlists' rotations. Only pairs that are missing, or whose
+    stored VersionId differs from the rotation entry's, are fetched and written. Returns the pairs that were written.
+    """
+    # Retrieve MapModePair IDs (Asset/Version) for all playlists
+    rotation_version_ids = {}
+    for playlist in playlists:
+        for rotation_entry in playlist.data.get("RotationEntries", []):
+            rotation_version_ids[rotation_entry["AssetId"].lower()] = rotation_entry[
+                "VersionId"
+            ].lower()
+    existing_map_mode_pairs = {
+        str(asset_id): map_mode_pair
+        for asset_id, map_mode_pair in HaloInfiniteMapModePair.objects.in_bulk(
+            list(rotation_version_ids.keys())
+        ).items()
+    }
+    stale_map_mode_pair_ids = [
+        (asset_id, version_id)
+        for asset_id, version_id in rotation_version_ids.items()
+        if asset_id not in existing_map_mode_pairs
+        or str(existing_map_mode_pairs[asset_id].version_id) != version_id
+    ]
 
-        # Create or Update all relevant MapModePairs
-        for map_mode_pair_id in map_mode_pair_ids:
-            asset_id = map_mode_pair_id[0]
-            version_id = map_mode_pair_id[1]
-            map_mode_pair = get_map_mode_pair(asset_id, version_id, s)
-            map_mode_pairs.append(
-                HaloInfiniteMapModePair.objects.update_or_create(
-                    asset_id=map_mode_pair.get("AssetId"),
-                    defaults={
-                        "version_id": map_mode_pair.get("VersionId"),
-                        "public_name": map_mode_pair.get("PublicName"),
-                        "description": map_mode_pair.get("Description"),
-                        "data": map_mode_pair,
-                        "creator": user,
-                    },
-                )
+    # Fetch the stale MapModePairs and write them in bulk
+    new_map_mode_pairs = []
+    updated_map_mode_pairs = []
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    for (asset_id, version_id), latest_map_mode_pair in zip(
+        stale_map_mode_pair_ids,
+        call_concurrently(get_map_mode_pair, stale_map_mode_pair_ids),
+    ):
+        if not latest_map_mode_pair:
+            raise Exception(
+                f"MapModePair {asset_id} version {version_id} could not be retrieved."
             )
+        map_mode_pair = existing_map_mode_pairs.get(asset_id)
+        if map_mode_pair is None:
+            map_mode_pair = HaloInfiniteMapModePair(asset_id=asset_id)
+            new_map_mode_pairs.append(map_mode_pair)
+        else:
+            map_mode_pair.updated_at = now
+            updated_map_mode_pairs.append(map_mode_pair)
+        map_mode_pair.version_id = latest_map_mode_pair.get("VersionId")
+        map_mode_pair.public_name = latest_map_mode_pair.get("PublicName")
+        map_mode_pair.description = latest_map_mode_pair.get("Description")
+        map_mode_pair.data = latest_map_mode_pair
+        map_mode_pair.creator = user
+    with transaction.atomic():
+        HaloInfiniteMapModePair.objects.bulk_create(new_map_mode_pairs)
+        HaloInfiniteMapModePair.objects.bulk_update(
+            updated_map_mode_pairs,
+            [
+                "version_id",
+                "public_name",
+                "description",
+                "data",
+                "creator",
+                "updated_at",
+            ],
+        )
+
+        # Rebuild the contributor index for the refreshed MapModePairs
+        map_mode_pairs = new_map_mode_pairs + updated_map_mode_pairs
+        update_map_mode_pair_contributors(map_mode_pairs, user)
 
     return map_mode_pairs
 
@@ -372,67 +725,98 @@ def get_playlist_latest_version_info(playlist_id: str):
     }
 
 
+def get_recent_game(
+    game: dict,
+    map_data: dict | None,
+    mode_data: dict | None,
+    playlist_data: dict | None,
+) -> dict:
+    map_thumbnail_url = None
+    if map_data is not None:
+        thumbnail_filepaths = list(
+            filter(
+                lambda x: "thumbnail" in x,
+                map_data.get("Files", {}).get("FileRelativePaths", []),
+            )
+        )
+        if len(thumbnail_filepaths) > 0:
+            map_thumbnail_url = (
+                map_data.get("Files", {}).get("Prefix") + thumbnail_filepaths[0]
+            )
+    playlist = game["MatchInfo"].get("Playlist", None) or {}
+    outcome = (
+        "Tied" if game["Outcome"] == 1 else "Won" if game["Outcome"] == 2 else "Lost"
+    )
+    return {
+        "match_id": game["MatchId"],
+        "outcome": outcome,
+        "finished": game["PresentAtEndOfMatch"],
+        "mode_name": None if mode_data is None else mode_data["PublicName"],
+        "mode_asset_id": game["MatchInfo"]["UgcGameVariant"]["AssetId"],
+        "mode_version_id": game["MatchInfo"]["UgcGameVariant"]["VersionId"],
+        "map_name": None if map_data is None else map_data["PublicName"],
+        "map_asset_id": game["MatchInfo"]["MapVariant"]["AssetId"],
+        "map_version_id": game["MatchInfo"]["MapVariant"]["VersionId"],
+        "map_thumbnail_url": map_thumbnail_url,
+        "playlist_name": None if playlist_data is None else playlist_data["PublicName"],
+        "playlist_asset_id": playlist.get("AssetId"),
+        "playlist_version_id": playlist.get("VersionId"),
+    }
+
+
+def get_recent_game_assets(game: dict) -> list[dict | None]:
+    # The game's map, mode & playlist variants, each None if the game doesn't have one
+    map_variant = game["MatchInfo"]["MapVariant"]
+    mode_variant = game["MatchInfo"]["UgcGameVariant"]
+    return [
+        map_variant if map_variant["AssetId"] is not None else None,
+        mode_variant if mode_variant["AssetId"] is not None else None,
+        game["MatchInfo"].get("Playlist", None),
+    ]
+
+
 def get_recent_games(xuid: int, match_type: str):
     last_10_games = last_25_matches(xuid, match_type)[:10]
     recent_games = []
     for game in last_10_games:
-        match_id = game["MatchId"]
-        map_asset_id = game["MatchInfo"]["MapVariant"]["AssetId"]
-        map_version_id = game["MatchInfo"]["MapVariant"]["VersionId"]
-        map_name = None
-        map_thumbnail_url = None
-        if map_asset_id is not None:
-            map_data = get_map(map_asset_id, map_version_id)
-            map_name = map_data["PublicName"]
-            thumbnail_filepaths = list(
-                filter(
-                    lambda x: "thumbnail" in x,
-                    map_data.get("Files", {}).get("FileRelativePaths", []),
-                )
+        asset_datas = [
+            None if asset is None else get_asset(asset["AssetId"], asset["VersionId"])
+            for get_asset, asset in zip(
+                (get_map, get_mode, get_playlist), get_recent_game_assets(game)
             )
-            if len(thumbnail_filepaths) > 0:
-                map_thumbnail_url = (
-                    map_data.get("Files", {}).get("Prefix") + thumbnail_filepaths[0]
-                )
-        mode_asset_id = game["MatchInfo"]["UgcGameVariant"]["AssetId"]
-        mode_version_id = game["MatchInfo"]["UgcGameVariant"]["VersionId"]
-        mode_name = None
-        if mode_asset_id is not None:
-            mode_data = get_mode(mode_asset_id, mode_version_id)
-            mode_name = mode_data["PublicName"]
-        playlist_asset_id = None
-        playlist_version_id = None
-        playlist_name = None
-        if game["MatchInfo"].get("Playlist", None) is not None:
-            playlist_asset_id = game["MatchInfo"]["Playlist"]["AssetId"]
-            playlist_version_id = game["MatchInfo"]["Playlist"]["VersionId"]
-            playlist_data = get_playlist(playlist_asset_id, playlist_version_id)
-            playlist_name = playlist_data["PublicName"]
-        finished = game["PresentAtEndOfMatch"]
-        outcome = (
-            "Tied"
-            if game["Outcome"] == 1
-            else "Won"
-            if game["Outcome"] == 2
-            else "Lost"
-        )
-        recent_games.append(
-            {
-                "match_id": match_id,
-                "outcome": outcome,
-                "finished": finished,
-                "mode_name": mode_name,
-                "mode_asset_id": mode_asset_id,
-                "mode_version_id": mode_version_id,
-                "map_name": map_name,
-                "map_asset_id": map_asset_id,
-                "map_version_id": map_version_id,
-                "map_thumbnail_url": map_thumbnail_url,
-                "playlist_name": playlist_name,
-                "playlist_asset_id": playlist_asset_id,
-                "playlist_version_id": playlist_version_id,
-            }
-        )
+        ]
+        recent_games.append(get_recent_game(game, *asset_datas))
+    return recent_games
+
+
+async def aget_recent_game_asset(
+    aget_asset, asset: dict | None, client: httpx.AsyncClient
+) -> dict | None:
+    if asset is None:
+        return None
+    return await aget_asset(asset["AssetId"], asset["VersionId"], client=client)
+
+
+async def aget_recent_games(xuid: int, match_type: str) -> list[dict]:
+    """
+    Async counterpart of `get_recent_games`: every map, mode & playlist lookup for the last 10 games is requested at
+    once instead of one after another.
+    """
+    last_10_games = (await alast_25_matches(xuid, match_type))[:10]
+    asset_datas = await acall_concurrently(
+        aget_recent_game_asset,
+        [
+            (aget_asset, asset)
+            for game in last_10_games
+            for aget_asset, asset in zip(
+                (aget_map, aget_mode, aget_playlist), get_recent_game_assets(game)
+            )
+        ],
+    )
+    recent_games = []
+    for game in last_10_games:
+        game_asset_datas, asset_datas = asset_datas[:3], asset_datas[3:]
+        recent_games.append(get_recent_game(game, *game_asset_datas))
     return recent_games
 
 
@@ -525,3 +909,252 @@ def get_era_ranked_arena_service_record_data(xuid: int, era: int) -> dict:
             xuid, era_api_id, PLAYLIST_ID_RANKED_ARENA
         )
     return combined_service_record
+
+
+def get_match_start_time(match: dict) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(match.get("MatchInfo", {}).get("StartTime"))
+
+
+def get_match_end_time(match: dict) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(match.get("MatchInfo", {}).get("EndTime"))
+
+
+def get_match_duration_seconds(match: dict) -> float:
+    # Whole seconds only, as sub-second timestamps are not consistently reported
+    return (
+        get_match_end_time(match).replace(microsecond=0)
+        - get_match_start_time(match).replace(microsecond=0)
+    ).total_seconds()
+
+
+def is_custom_match(match: dict) -> bool:
+    return match.get("MatchInfo", {}).get("LifecycleMode") == LIFECYCLE_MODE_CUSTOM
+
+
+def is_ranked_arena_match(match: dict) -> bool:
+    match_info = match.get("MatchInfo", {})
+    return (
+        match_info.get("LifecycleMode") == LIFECYCLE_MODE_MATCHMADE
+        and match_info.get("Playlist", {}).get("AssetId") == PLAYLIST_ID_RANKED_ARENA
+    )
+
+
+def get_era_matches_for_xuid(
+    xuid: int, era: int, session: requests.Session = None
+) -> list[dict]:
+    start_time, end_time = get_start_and_end_times_for_era(era)
+    return matches_between(xuid, start_time, end_time, session=session)
+
+
+def register_xbox_earn_rules(
+    program: str, match_filter, rules_by_era: dict[int, list[dict]]
+):
+    """
+    Registers a program's match-based earn rules for each Era. Only matches passing `match_filter` are considered for
+    the program's rules. A rule is a dict with a "key" naming the earn and either:
+    - a "predicate" selecting the matches that count towards it, an optional "value" accumulated per match (one by
+      default), an optional "unit" the total is divided into, a "cap" on the number of units and the "points" per unit
+    - a "detector" that is given the program's matches ordered by end time along with their end times as POSIX
+      timestamps, and returns whether the earn is unlocked, and the "points" it is worth
+    """
+    XBOX_EARN_RULES[program] = {"match_filter": match_filter, "rules": rules_by_era}
+
+
+def get_earn_rule_units(rule: dict, total: float) -> int:
+    return int(total / rule.get("unit", 1))
+
+
+def get_era_xbox_earns(matches: list[dict], era: int) -> dict[str, dict[str, int]]:
+    """
+    Scores every registered program's rules for an Era against a player's matches, keyed by program name. A counting
+    rule stops scanning as soon as it reaches its cap. For programs with detectors, each match's end time is parsed
+    once, and the matches are ordered by it and handed to every detector along with their end timestamps.
+    """
+    earns = {}
+    for program, registration in XBOX_EARN_RULES.items():
+        rules = registration["rules"].get(era, [])
+        program_matches = [
+            match for match in matches if registration["match_filter"](match)
+        ]
+        # Earns are reported in rule order
+        earns[program] = {rule["key"]: 0 for rule in rules}
+        for rule in rules:
+            if "predicate" not in rule:
+                continue
+            total = 0
+            for match in program_matches:
+                if rule["predicate"](match):
+                    total += rule["value"](match) if "value" in rule else 1
+                    if get_earn_rule_units(rule, total) >= rule["cap"]:
+                        break
+            earns[program][rule["key"]] = (
+                min(get_earn_rule_units(rule, total), rule["cap"]) * rule["points"]
+            )
+
+        detectors = [rule for rule in rules if "detector" in rule]
+        if len(detectors) == 0:
+            continue
+        # End times are kept as POSIX timestamps, which take half the memory of datetimes
+        end_times = [get_match_end_time(match).timestamp() for match in program_matches]
+        if all(earlier >= later for earlier, later in pairwise(end_times)):
+            # Match histories arrive newest first, so they usually only need reversing
+            program_matches.reverse()
+            end_times.reverse()
+        elif not all(earlier <= later for earlier, later in pairwise(end_times)):
+            order = sorted(range(len(end_times)), key=end_times.__getitem__)
+            program_matches = [program_matches[index] for index in order]
+            end_times = [end_times[index] for index in order]
+        for rule in detectors:
+            unlocked = rule["detector"](program_matches, end_times)
+            earns[program][rule["key"]] = rule["points"] if unlocked else 0
+
+    return earns
+
+
+def get_era_xbox_earns_cache_key(xuid: int, era: int) -> str:
+    return f"era-xbox-earns-{era}-{xuid}"
+
+
+def get_era_xbox_earns_for_xuid(
+    xuid: int, era: int, session: requests.Session = None
+) -> dict[str, dict[str, int]]:
+    """
+    Returns every registered program's match-based earns for a player in an Era. The result is cached briefly, so a
+    player checking their progress in several programs only has their match history fetched and scanned once.
+    """
+    cache_key = get_era_xbox_earns_cache_key(xuid, era)
+    earns = cache.get(cache_key)
+    if earns is None:
+        earns = get_era_xbox_earns(
+            get_era_matches_for_xuid(xuid, era, session=session), era
+        )
+        cache.set(cache_key, earns, ERA_XBOX_EARNS_CACHE_TIMEOUT)
+    return earns
+
+
+async def aget_era_xbox_earns_for_xuid(
+    xuid: int, era: int, client: httpx.AsyncClient = None
+) -> dict[str, dict[str, int]]:
+    cache_key = get_era_xbox_earns_cache_key(xuid, era)
+    earns = await cache.aget(cache_key)
+    if earns is None:
+        start_time, end_time = get_start_and_end_times_for_era(era)
+        earns = get_era_xbox_earns(
+            await amatches_between(xuid, start_time, end_time, client=client), era
+        )
+        await cache.aset(cache_key, earns, ERA_XBOX_EARNS_CACHE_TIMEOUT)
+    return earns
+
+
+async def awarm_era_xbox_earns(xuids: list[int], era: int) -> None:
+    """
+    Fetches and caches the players' match-based earns for an Era on the event loop, so that the sync earn dicts
+    called afterwards (which also tally database-backed earns) read them from the cache instead of the network.
+    """
+    await acall_concurrently(
+        aget_era_xbox_earns_for_xuid, [(xuid, era) for xuid in xuids]
+    )
+
+
+def get_era_xbox_earn_dict(
+    program: str, xuids: list[int], era: int
+) -> dict[int, dict[str, int]]:
+    # Players' match histories are fetched on a bounded thread pool
+    era_xbox_earns = call_concurrently(
+        get_era_xbox_earns_for_xuid, [(xuid, era) for xuid in xuids]
+    )
+    return {
+        xuid: dict(earns.get(program, {})) for xuid, earns in zip(xuids, era_xbox_earns)
+    }
+
+
+def get_stats_response_cache_key(endpoint: str, xuid: int, params: dict) -> str:
+    return f"stats-response-{endpoint}-{xuid}" + "".join(
+        f"-{key}-{value}" for key, value in sorted(params.items())
+    )
+
+
+def build_stats_response_entry(endpoint: str, data: dict) -> dict:
+    content = json.dumps(data, sort_keys=True, default=str)
+    return {
+        "data": data,
+        "etag": f'"{hashlib.sha256(content.encode()).hexdigest()[:32]}"',
+        "fresh_until": time.time() + STATS_RESPONSE_CACHE_TIMEOUTS[endpoint],
+    }
+
+
+def refresh_stats_response(cache_key: str, endpoint: str, build_data) -> None:
+    try:
+        cache.set(
+            cache_key,
+            build_stats_response_entry(endpoint, build_data()),
+            STATS_RESPONSE_CACHE_TIMEOUTS[endpoint] + STATS_RESPONSE_STALE_TIMEOUT,
+        )
+    except Exception as ex:
+        logger.error(f"Error attempting to refresh cached {endpoint} response.")
+        logger.error(ex)
+    finally:
+        cache.delete(f"{cache_key}-refreshing")
+
+
+def refresh_in_background(func) -> None:
+    def run():
+        try:
+            func()
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def get_stats_response_entry(
+    endpoint: str, xuid: int, params: dict, build_data
+) -> dict:
+    """
+    Returns the cached response entry (`data`, `etag` and `fresh_until`) for a read-only stats endpoint, calling
+    `build_data` to build it if it is missing. Entries past their timeout keep being served for up to
+    STATS_RESPONSE_STALE_TIMEOUT while a single background refresh per entry rebuilds them; errors are never cached.
+    """
+    cache_key = get_stats_response_cache_key(endpoint, xuid, params)
+    entry = cache.get(cache_key)
+    if entry is None:
+        entry = build_stats_response_entry(endpoint, build_data())
+        cache.set(
+            cache_key,
+            entry,
+            STATS_RESPONSE_CACHE_TIMEOUTS[endpoint] + STATS_RESPONSE_STALE_TIMEOUT,
+        )
+    elif time.time() > entry["fresh_until"] and cache.add(
+        f"{cache_key}-refreshing", True, STATS_RESPONSE_CACHE_TIMEOUTS[endpoint]
+    ):
+        refresh_in_background(
+            lambda: refresh_stats_response(cache_key, endpoint, build_data)
+        )
+    return entry
+
+
+async def aget_stats_response_entry(
+    endpoint: str, xuid: int, params: dict, abuild_data
+) -> dict:
+    """
+    Async counterpart of `get_stats_response_entry` for endpoints whose `abuild_data` is a coroutine function. A
+    background refresh runs it on its own event loop.
+    """
+    cache_key = get_stats_response_cache_key(endpoint, xuid, params)
+    entry = await cache.aget(cache_key)
+    if entry is None:
+        entry = build_stats_response_entry(endpoint, await abuild_data())
+        await cache.aset(
+            cache_key,
+            entry,
+            STATS_RESPONSE_CACHE_TIMEOUTS[endpoint] + STATS_RESPONSE_STALE_TIMEOUT,
+        )
+    elif time.time() > entry["fresh_until"] and await cache.aadd(
+        f"{cache_key}-refreshing", True, STATS_RESPONSE_CACHE_TIMEOUTS[endpoint]
+    ):
+        refresh_in_background(
+            lambda: refresh_stats_response(
+                cache_key, endpoint, async_to_sync(abuild_data)
+            )
+        )
+    return entry
@@ -1,6 +1,8 @@
+import asyncio
 import logging
 import re
 
+from asgiref.sync import sync_to_async
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status
@@ -24,13 +26,16 @@ from apps.halo_infinite.serializers import (
     UpdateActivePlaylistMapModePairsResponseSerializer,
 )
 from apps.halo_infinite.utils import (
+    aget_csrs,
+    aget_recent_games,
+    aget_stats_response_entry,
     get_career_ranks,
-    get_csrs,
-    get_recent_games,
+    get_stats_response_entry,
     get_summary_stats,
     update_active_playlists,
     update_map_mode_pairs_for_playlists,
 )
+from apps.overrides.views import AsyncAPIView
 from apps.xbox_live.utils import get_xuid_and_exact_gamertag
 from config.serializers import StandardErrorSerializer
 
@@ -43,6 +48,35 @@ ERROR_MATCH_TYPE_MISSING = "Missing 'matchType' query parameter."
 ERROR_MATCH_TYPE_INVALID = "The match type you specified is invalid. Valid match types are 'Custom' and 'Matchmaking'."
 
 
+def get_stats_entry_response(request, entry: dict) -> Response:
+    # Answers a matching If-None-Match with a 304
+    headers = {"ETag": entry["etag"]}
+    if_none_match = {
+        etag.strip().removeprefix("W/")
+        for etag in request.headers.get("If-None-Match", "").split(",")
+    }
+    if entry["etag"] in if_none_match or "*" in if_none_match:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(entry["data"], status=status.HTTP_200_OK, headers=headers)
+
+
+def get_stats_response(
+    request, endpoint: str, xuid: int, params: dict, build_data
+) -> Response:
+    # Serves a read-only stats endpoint from the stats response cache
+    return get_stats_entry_response(
+        request, get_stats_response_entry(endpoint, xuid, params, build_data)
+    )
+
+
+async def aget_stats_response(
+    request, endpoint: str, xuid: int, params: dict, abuild_data
+) -> Response:
+    return get_stats_entry_response(
+        request, await aget_stats_response_entry(endpoint, xuid, params, abuild_data)
+    )
+
+
 class CareerRankView(APIView):
     @extend_schema(
         parameters=[
@@ -81,29 +115,36 @@ class CareerRankView(APIView):
         if xuid is None or gamertag is None:
             raise NotFound(ERROR_GAMERTAG_NOT_FOUND)
 
-        try:
-            career_rank_data = get_career_ranks([xuid])
-            xuid_career_rank_data = career_rank_data.get("career_ranks").get(xuid)
-        except Exception as ex:
-            logger.error(ex)
-            raise APIException(f"Could not get Career Rank for gamertag {gamertag}.")
-
-        serializer = CareerRankResponseSerializer(
-            {
-                "gamertag": gamertag,
-                "xuid": xuid,
-                "currentRankNumber": xuid_career_rank_data["current_rank_number"],
-                "currentRankName": xuid_career_rank_data["current_rank_name"],
-                "currentRankScore": xuid_career_rank_data["current_rank_score"],
-                "currentRankScoreMax": xuid_career_rank_data["current_rank_score_max"],
-                "cumulativeScore": xuid_career_rank_data["cumulative_score"],
-                "cumulativeScoreMax": xuid_career_rank_data["cumulative_score_max"],
-            }
-        )
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        def build_data():
+            try:
+                career_rank_data = get_career_ranks([xuid])
+                xuid_career_rank_data = career_rank_data.get("career_ranks").get(xuid)
+            except Exception as ex:
+                logger.error(ex)
+                raise APIException(
+                    f"Could not get Career Rank for gamertag {gamertag}."
+                )
 
+            serializer = CareerRankResponseSerializer(
+                {
+                    "gamertag": gamertag,
+                    "xuid": xuid,
+                    "currentRankNumber": xuid_career_rank_data["current_rank_number"],
+                    "currentRankName": xuid_career_rank_data["current_rank_name"],
+                    "currentRankScore": xuid_career_rank_data["current_rank_score"],
+                    "currentRankScoreMax": xuid_career_rank_data[
+                        "current_rank_score_max"
+                    ],
+                    "cumulativeScore": xuid_career_rank_data["cumulative_score"],
+                    "cumulativeScoreMax": xuid_career_rank_data["cumulative_score_max"],
+                }
+            )
+            return serializer.data
 
-class CSRView(APIView):
+        return get_stats_response(request, "career-rank", xuid, {}, build_data)
+
+
+class CSRView(AsyncAPIView):
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -122,7 +163,7 @@ class CSRView(APIView):
             404: StandardErrorSerializer,
         },
     )
-    def get(self, request, *args, **kwargs):
+    async def get(self, request, *args, **kwargs):
         """
         Retrieves the current CSR in all active Ranked playlists for a given gamertag.
         """
@@ -135,78 +176,94 @@ class CSRView(APIView):
             raise ParseError(detail=ERROR_GAMERTAG_INVALID)
 
         logger.debug(f"Called CSR endpoint with gamertag '{gamertag}'")
-        gamertag_info = get_xuid_and_exact_gamertag(gamertag)
+        gamertag_info = await sync_to_async(get_xuid_and_exact_gamertag)(gamertag)
         xuid = gamertag_info[0]
         gamertag = gamertag_info[1]
         if xuid is None or gamertag is None:
             raise NotFound(ERROR_GAMERTAG_NOT_FOUND)
 
-        current_ranked_playlists = HaloInfinitePlaylist.objects.filter(
-            ranked=True, active=True
-        ).order_by("name")
-        playlists = []
-        try:
-            for playlist in current_ranked_playlists:
-                csr_data = get_csrs([xuid], playlist.playlist_id)
-                xuid_csr_data = csr_data.get("csrs", {}).get(xuid, {})
-                playlists.append(
-                    CSRPlaylistSerializer(
-                        {
-                            "playlistId": playlist.playlist_id,
-                            "playlistName": playlist.name,
-                            "playlistDescription": playlist.description,
-                            "current": CSRDataSerializer(
-                                {
-                                    "csr": xuid_csr_data.get("current_csr"),
-                                    "tier": xuid_csr_data.get("current_tier"),
-                                    "subtier": xuid_csr_data.get("current_subtier"),
-                                    "tierDescription": xuid_csr_data.get(
-                                        "current_tier_description"
-                                    ),
-                                }
-                            ).data,
-                            "currentResetMax": CSRDataSerializer(
-                                {
-                                    "csr": xuid_csr_data.get("current_reset_max_csr"),
-                                    "tier": xuid_csr_data.get("current_reset_max_tier"),
-                                    "subtier": xuid_csr_data.get(
-                                        "current_reset_max_subtier"
-                                    ),
-                                    "tierDescription": xuid_csr_data.get(
-                                        "current_reset_max_tier_description"
-                                    ),
-                                }
-                            ).data,
-                            "allTimeMax": CSRDataSerializer(
-                                {
-                                    "csr": xuid_csr_data.get("all_time_max_csr"),
-                                    "tier": xuid_csr_data.get("all_time_max_tier"),
-                                    "subtier": xuid_csr_data.get(
-                                        "all_time_max_subtier"
-                                    ),
-                                    "tierDescription": xuid_csr_data.get(
-                                        "all_time_max_tier_description"
-                                    ),
-                                }
-                            ).data,
-                        }
-                    ).data
+        async def build_data():
+            current_ranked_playlists = [
+                playlist
+                async for playlist in HaloInfinitePlaylist.objects.filter(
+                    ranked=True, active=True
+                ).order_by("name")
+            ]
+            playlists = []
+            try:
+                # Every playlist's CSR is requested at once
+                csr_datas = await asyncio.gather(
+                    *[
+                        aget_csrs([xuid], playlist.playlist_id)
+                        for playlist in current_ranked_playlists
+                    ]
                 )
-        except Exception as ex:
-            logger.error(ex)
-            raise APIException(f"Could not get CSR for gamertag {gamertag}.")
-
-        serializer = CSRResponseSerializer(
-            {
-                "gamertag": gamertag,
-                "xuid": xuid,
-                "playlists": playlists,
-            }
-        )
-        return Response(serializer.data, status=status.HTTP_200_OK)
+                for playlist, csr_data in zip(current_ranked_playlists, csr_datas):
+                    xuid_csr_data = csr_data.get("csrs", {}).get(xuid, {})
+                    playlists.append(
+                        CSRPlaylistSerializer(
+                            {
+                                "playlistId": playlist.playlist_id,
+                                "playlistName": playlist.name,
+                                "playlistDescription": playlist.description,
+                                "current": CSRDataSerializer(
+                                    {
+                                        "csr": xuid_csr_data.get("current_csr"),
+                                        "tier": xuid_csr_data.get("current_tier"),
+                                        "subtier": xuid_csr_data.get("current_subtier"),
+                                        "tierDescription": xuid_csr_data.get(
+                                            "current_tier_description"
+                                        ),
+                                    }
+                                ).data,
+                                "currentResetMax": CSRDataSerializer(
+                                    {
+                                        "csr": xuid_csr_data.get(
+                                            "current_reset_max_csr"
+                                        ),
+                                        "tier": xuid_csr_data.get(
+                                            "current_reset_max_tier"
+                                        ),
+                                        "subtier": xuid_csr_data.get(
+                                            "current_reset_max_subtier"
+                                        ),
+                                        "tierDescription": xuid_csr_data.get(
+                                            "current_reset_max_tier_description"
+                                        ),
+                                    }
+                                ).data,
+                                "allTimeMax": CSRDataSerializer(
+                                    {
+                                        "csr": xuid_csr_data.get("all_time_max_csr"),
+                                        "tier": xuid_csr_data.get("all_time_max_tier"),
+                                        "subtier": xuid_csr_data.get(
+                                            "all_time_max_subtier"
+                                        ),
+                                        "tierDescription": xuid_csr_data.get(
+                                            "all_time_max_tier_description"
+                                        ),
+                                    }
+                                ).data,
+                            }
+                        ).data
+                    )
+            except Exception as ex:
+                logger.error(ex)
+                raise APIException(f"Could not get CSR for gamertag {gamertag}.")
+
+            serializer = CSRResponseSerializer(
+                {
+                    "gamertag": gamertag,
+                    "xuid": xuid,
+                    "playlists": playlists,
+                }
+            )
+            return serializer.data
+
+        return await aget_stats_response(request, "csr", xuid, {}, build_data)
 
 
-class RecentGamesView(APIView):
+class RecentGamesView(AsyncAPIView):
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -233,7 +290,7 @@ class RecentGamesView(APIView):
             404: StandardErrorSerializer,
         },
     )
-    def get(self, request, *args, **kwargs):
+    async def get(self, request, *args, **kwargs):
         """
         Retrieves the summary stats for a given gamertag.
         """
@@ -256,41 +313,49 @@ class RecentGamesView(APIView):
         ):
             raise ParseError(detail=ERROR_MATCH_TYPE_INVALID)
 
-        gamertag_info = get_xuid_and_exact_gamertag(gamertag)
+        gamertag_info = await sync_to_async(get_xuid_and_exact_gamertag)(gamertag)
         xuid = gamertag_info[0]
         gamertag = gamertag_info[1]
         if xuid is None or gamertag is None:
             raise NotFound(ERROR_GAMERTAG_NOT_FOUND)
-        try:
-            games = get_recent_games(xuid, match_type)
-        except Exception as ex:
-            logger.error(ex)
-            raise APIException(f"Could not get summary stats for gamertag {gamertag}.")
-
-        serialized_games = []
-        for game in games:
-            serialized_games.append(
-                RecentGameSerializer(
-                    {
-                        "matchId": game.get("match_id"),
-                        "outcome": game.get("outcome"),
-                        "finished": game.get("finished"),
-                        "modeName": game.get("mode_name"),
-                        "modeAssetId": game.get("mode_asset_id"),
-                        "modeVersionId": game.get("mode_version_id"),
-                        "mapName": game.get("map_name"),
-                        "mapAssetId": game.get("map_asset_id"),
-                        "mapVersionId": game.get("map_version_id"),
-                        "mapThumbnailURL": game.get("map_thumbnail_url"),
-                        "playlistName": game.get("playlist_name"),
-                        "playlistAssetId": game.get("playlist_asset_id"),
-                        "playlistVersionId": game.get("playlist_version_id"),
-                    }
-                ).data
-            )
 
-        serializer = RecentGamesResponseSerializer({"games": serialized_games})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        async def build_data():
+            try:
+                games = await aget_recent_games(xuid, match_type)
+            except Exception as ex:
+                logger.error(ex)
+                raise APIException(
+                    f"Could not get summary stats for gamertag {gamertag}."
+                )
+
+            serialized_games = []
+            for game in games:
+                serialized_games.append(
+                    RecentGameSerializer(
+                        {
+                            "matchId": game.get("match_id"),
+                            "outcome": game.get("outcome"),
+                            "finished": game.get("finished"),
+                            "modeName": game.get("mode_name"),
+                            "modeAssetId": game.get("mode_asset_id"),
+                            "modeVersionId": game.get("mode_version_id"),
+                            "mapName": game.get("map_name"),
+                            "mapAssetId": game.get("map_asset_id"),
+                            "mapVersionId": game.get("map_version_id"),
+                            "mapThumbnailURL": game.get("map_thumbnail_url"),
+                            "playlistName": game.get("playlist_name"),
+                            "playlistAssetId": game.get("playlist_asset_id"),
+                            "playlistVersionId": game.get("playlist_version_id"),
+                        }
+                    ).data
+                )
+
+            serializer = RecentGamesResponseSerializer({"games": serialized_games})
+            return serializer.data
+
+        return await aget_stats_response(
+            request, "recent-games", xuid, {"matchType": match_type}, build_data
+        )
 
 
 class SummaryStatsView(APIView):
@@ -330,41 +395,47 @@ class SummaryStatsView(APIView):
         gamertag = gamertag_info[1]
         if xuid is None or gamertag is None:
             raise NotFound(ERROR_GAMERTAG_NOT_FOUND)
-        try:
-            summary_data = get_summary_stats(xuid)
-            matchmaking_data = summary_data.get("matchmaking")
-            custom_data = summary_data.get("custom")
-            local_data = summary_data.get("local")
-        except Exception as ex:
-            logger.error(ex)
-            raise APIException(f"Could not get summary stats for gamertag {gamertag}.")
-
-        serializer = SummaryStatsResponseSerializer(
-            {
-                "gamertag": gamertag,
-                "xuid": xuid,
-                "matchmaking": SummaryMatchmakingSerializer(
-                    {
-                        "gamesPlayed": matchmaking_data.get("games_played"),
-                        "wins": matchmaking_data.get("wins"),
-                        "losses": matchmaking_data.get("losses"),
-                        "ties": matchmaking_data.get("ties"),
-                        "kills": matchmaking_data.get("kills"),
-                        "deaths": matchmaking_data.get("deaths"),
-                        "assists": matchmaking_data.get("assists"),
-                        "kda": matchmaking_data.get("kda"),
-                    }
-                ).data,
-                "custom": SummaryCustomSerializer(
-                    {"gamesPlayed": custom_data.get("games_played")}
-                ).data,
-                "local": SummaryLocalSerializer(
-                    {"gamesPlayed": local_data.get("games_played")}
-                ).data,
-                "gamesPlayed": summary_data.get("games_played"),
-            }
-        )
-        return Response(serializer.data, status=status.HTTP_200_OK)
+
+        def build_data():
+            try:
+                summary_data = get_summary_stats(xuid)
+                matchmaking_data = summary_data.get("matchmaking")
+                custom_data = summary_data.get("custom")
+                local_data = summary_data.get("local")
+            except Exception as ex:
+                logger.error(ex)
+                raise APIException(
+                    f"Could not get summary stats for gamertag {gamertag}."
+                )
+
+            serializer = SummaryStatsResponseSerializer(
+                {
+                    "gamertag": gamertag,
+                    "xuid": xuid,
+                    "matchmaking": SummaryMatchmakingSerializer(
+                        {
+                            "gamesPlayed": matchmaking_data.get("games_played"),
+                            "wins": matchmaking_data.get("wins"),
+                            "losses": matchmaking_data.get("losses"),
+                            "ties": matchmaking_data.get("ties"),
+                            "kills": matchmaking_data.get("kills"),
+                            "deaths": matchmaking_data.get("deaths"),
+                            "assists": matchmaking_data.get("assists"),
+                            "kda": matchmaking_data.get("kda"),
+                        }
+                    ).data,
+                    "custom": SummaryCustomSerializer(
+                        {"gamesPlayed": custom_data.get("games_played")}
+                    ).data,
+                    "local": SummaryLocalSerializer(
+                        {"gamesPlayed": local_data.get("games_played")}
+                    ).data,
+                    "gamesPlayed": summary_data.get("games_played"),
+                }
+            )
+            return serializer.data
+
+        return get_stats_response(request, "summary-stats", xuid, {}, build_data)
 
 
 class UpdateActivePlaylistMapModePairsView(APIView):
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class InternConfig(AppConfig):
     name = "apps.intern"
+
+    def ready(self):
+        import apps.intern.signals  # noqa
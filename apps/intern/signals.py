@@ -0,0 +1,16 @@
+import logging
+
+from django.db.models.signals import post_delete, post_save
+
+from apps.intern.utils import SNAPSHOT_MODELS, invalidate_model_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+def intern_snapshot_model_changed(sender, **kwargs):
+    invalidate_model_snapshot(sender)
+
+
+for model in SNAPSHOT_MODELS:
+    post_save.connect(intern_snapshot_model_changed, sender=model)
+    post_delete.connect(intern_snapshot_model_changed, sender=model)
@@ -24,6 +24,7 @@ from apps.intern.models import (
     InternTrailblazerTitanDemotionQuip,
     InternTrailblazerTitanPromotionQuip,
 )
+from apps.intern.utils import model_snapshots
 from apps.intern.views import (
     INTERN_CHATTER_DEFAULT_MESSAGE,
     INTERN_CHATTER_ERROR_CHANNEL_FORBIDDEN,
@@ -331,6 +332,42 @@ class InternChatterPauseAcceptanceQuipTestCase(APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data, {"quip": quip_text})
 
+    def test_intern_random_quip_pool_snapshot(self):
+        model_snapshots.clear()
+
+        # The first request loads the quip pool (and validates the bearer token), and later requests are served from
+        # the snapshot without any queries
+        quip = intern_chatter_pause_acceptance_quip_factory(self.user, "First quip.")
+        with self.assertNumQueries(2):
+            self.client.get("/intern/random-chatter-pause-acceptance-quip")
+        for i in range(5):
+            with self.assertNumQueries(0):
+                response = self.client.get(
+                    "/intern/random-chatter-pause-acceptance-quip"
+                )
+            self.assertEqual(response.data, {"quip": "First quip."})
+
+        # Saving or deleting a quip drops the snapshot
+        quip.quip_text = "Edited quip."
+        quip.save()
+        response = self.client.get("/intern/random-chatter-pause-acceptance-quip")
+        self.assertEqual(response.data, {"quip": "Edited quip."})
+        quip.delete()
+        response = self.client.get("/intern/random-chatter-pause-acceptance-quip")
+        self.assertEqual(
+            response.data, {"quip": INTERN_CHATTER_PAUSE_ACCEPTANCE_QUIP_DEFAULT}
+        )
+
+        # Every quip in the pool can be picked
+        quip_texts = {f"Quip {i}." for i in range(3)}
+        for quip_text in quip_texts:
+            intern_chatter_pause_acceptance_quip_factory(self.user, quip_text)
+        returned_quip_texts = set()
+        for i in range(100):
+            response = self.client.get("/intern/random-chatter-pause-acceptance-quip")
+            returned_quip_texts.add(response.data.get("quip"))
+        self.assertEqual(returned_quip_texts, quip_texts)
+
 
 class InternChatterPauseDenialQuipTestCase(APITestCase):
     def setUp(self):
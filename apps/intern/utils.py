@@ -0,0 +1,91 @@
+import random
+import time
+
+from apps.intern.models import (
+    InternChatter,
+    InternChatterForbiddenChannel,
+    InternChatterPauseAcceptanceQuip,
+    InternChatterPauseDenialQuip,
+    InternChatterPauseReverenceQuip,
+    InternHelpfulHint,
+    InternHikeQueueQuip,
+    InternNewHereWelcomeQuip,
+    InternNewHereYeetQuip,
+    InternPassionReportQuip,
+    InternPathfinderProdigyDemotionQuip,
+    InternPathfinderProdigyPromotionQuip,
+    InternPlusRepQuip,
+    InternTrailblazerTitanDemotionQuip,
+    InternTrailblazerTitanPromotionQuip,
+)
+
+MODEL_SNAPSHOT_TIMEOUT = 60 * 5
+
+# The field holding the text served for each model with a random quip pool
+QUIP_POOL_TEXT_FIELDS = {
+    InternChatter: "message_text",
+    InternChatterPauseAcceptanceQuip: "quip_text",
+    InternChatterPauseDenialQuip: "quip_text",
+    InternChatterPauseReverenceQuip: "quip_text",
+    InternHelpfulHint: "message_text",
+    InternHikeQueueQuip: "quip_text",
+    InternNewHereWelcomeQuip: "quip_text",
+    InternNewHereYeetQuip: "quip_text",
+    InternPassionReportQuip: "quip_text",
+    InternPathfinderProdigyDemotionQuip: "quip_text",
+    InternPathfinderProdigyPromotionQuip: "quip_text",
+    InternPlusRepQuip: "quip_text",
+    InternTrailblazerTitanDemotionQuip: "quip_text",
+    InternTrailblazerTitanPromotionQuip: "quip_text",
+}
+SNAPSHOT_MODELS = [*QUIP_POOL_TEXT_FIELDS.keys(), InternChatterForbiddenChannel]
+
+# This worker's in-memory snapshots, keyed by model
+model_snapshots = {}
+
+
+def get_model_snapshot(model, load):
+    """
+    Returns this worker's snapshot of a model's records, calling `load` to build it if it is missing or older than
+    MODEL_SNAPSHOT_TIMEOUT. The intern signals drop a model's snapshot whenever one of its records is saved or deleted
+    in this worker, and the timeout bounds how long other workers keep serving the previous snapshot.
+    """
+    snapshot = model_snapshots.get(model)
+    if snapshot is None or time.monotonic() > snapshot["expires_at"]:
+        snapshot = {
+            "value": load(),
+            "expires_at": time.monotonic() + MODEL_SNAPSHOT_TIMEOUT,
+        }
+        model_snapshots[model] = snapshot
+    return snapshot["value"]
+
+
+def invalidate_model_snapshot(model) -> None:
+    model_snapshots.pop(model, None)
+
+
+def get_quip_pool(model) -> list[str]:
+    return get_model_snapshot(
+        model,
+        lambda: list(
+            model.objects.order_by().values_list(
+                QUIP_POOL_TEXT_FIELDS[model], flat=True
+            )
+        ),
+    )
+
+
+def get_random_quip(model, default: str) -> str:
+    quip_pool = get_quip_pool(model)
+    return random.choice(quip_pool) if len(quip_pool) > 0 else default
+
+
+def get_forbidden_channel_ids() -> set[str]:
+    return get_model_snapshot(
+        InternChatterForbiddenChannel,
+        lambda: set(
+            InternChatterForbiddenChannel.objects.values_list(
+                "discord_channel_id", flat=True
+            )
+        ),
+    )
@@ -8,7 +8,6 @@ from rest_framework.views import APIView
 from apps.discord.utils import update_or_create_discord_account
 from apps.intern.models import (
     InternChatter,
-    InternChatterForbiddenChannel,
     InternChatterPause,
     InternChatterPauseAcceptanceQuip,
     InternChatterPauseDenialQuip,
@@ -57,6 +56,7 @@ from apps.intern.serializers import (
     InternTrailblazerTitanPromotionQuipErrorSerializer,
     InternTrailblazerTitanPromotionQuipSerializer,
 )
+from apps.intern.utils import get_forbidden_channel_ids, get_random_quip
 
 logger = logging.getLogger(__name__)
 
@@ -149,16 +149,14 @@ class RandomInternChatter(APIView):
 
         # If the intended destination channel is forbidden, return an error
         try:
-            channels = InternChatterForbiddenChannel.objects.filter(
-                discord_channel_id=channel_id
-            )
+            is_forbidden_channel = channel_id in get_forbidden_channel_ids()
         except Exception as ex:
             logger.error(ex)
             serializer = InternChatterErrorSerializer(
                 {"error": INTERN_CHATTER_ERROR_UNKNOWN}
             )
             return Response(serializer.data, status=500)
-        if channels.count() > 0:
+        if is_forbidden_channel:
             logger.debug(f"Chatter is forbidden in channel ${channel_id}")
             serializer = InternChatterErrorSerializer(
                 {"error": INTERN_CHATTER_ERROR_CHANNEL_FORBIDDEN}
@@ -170,14 +168,16 @@ class RandomInternChatter(APIView):
             one_hour_ago = datetime.datetime.now(
                 tz=datetime.timezone.utc
             ) - datetime.timedelta(hours=1)
-            pauses = InternChatterPause.objects.filter(created_at__gt=one_hour_ago)
+            is_paused = InternChatterPause.objects.filter(
+                created_at__gt=one_hour_ago
+            ).exists()
         except Exception as ex:
             logger.error(ex)
             serializer = InternChatterErrorSerializer(
                 {"error": INTERN_CHATTER_ERROR_UNKNOWN}
             )
             return Response(serializer.data, status=500)
-        if pauses.count() > 0:
+        if is_paused:
             logger.debug("Chatter is currently paused")
             serializer = InternChatterErrorSerializer(
                 {"error": INTERN_CHATTER_ERROR_PAUSED}
@@ -185,11 +185,10 @@ class RandomInternChatter(APIView):
             return Response(serializer.data, status=403)
 
         # Get a random chatter and return it
-        random_chatter_message = INTERN_CHATTER_DEFAULT_MESSAGE
         try:
-            random_chatters = InternChatter.objects.order_by("?")
-            if random_chatters.count() > 0:
-                random_chatter_message = random_chatters.first().message_text
+            random_chatter_message = get_random_quip(
+                InternChatter, INTERN_CHATTER_DEFAULT_MESSAGE
+            )
         except Exception as ex:
             logger.error(ex)
             serializer = InternChatterErrorSerializer(
@@ -214,11 +213,11 @@ class RandomInternChatterPauseAcceptanceQuip(APIView):
         Retrieves a random InternChatterPauseAcceptanceQuip.
         """
         # Get a random quip and return it
-        random_quip = INTERN_CHATTER_PAUSE_ACCEPTANCE_QUIP_DEFAULT
         try:
-            random_quips = InternChatterPauseAcceptanceQuip.objects.order_by("?")
-            if random_quips.count() > 0:
-                random_quip = random_quips.first().quip_text
+            random_quip = get_random_quip(
+                InternChatterPauseAcceptanceQuip,
+                INTERN_CHATTER_PAUSE_ACCEPTANCE_QUIP_DEFAULT,
+            )
         except Exception as ex:
             logger.error(ex)
             serializer = InternChatterPauseAcceptanceQuipErrorSerializer(
@@ -243,11 +242,10 @@ class RandomInternChatterPauseDenialQuip(APIView):
         Retrieves a random InternChatterPauseDenialQuip.
         """
         # Get a random quip and return it
-        random_quip = INTERN_CHATTER_PAUSE_DENIAL_QUIP_DEFAULT
         try:
-            random_quips = InternChatterPauseDenialQuip.objects.order_by("?")
-            if random_quips.count() > 0:
-                random_quip = random_quips.first().quip_text
+            random_quip = get_random_quip(
+                InternChatterPauseDenialQuip, INTERN_CHATTER_PAUSE_DENIAL_QUIP_DEFAULT
+            )
         except Exception as ex:
             logger.error(ex)
             serializer = InternChatterPauseDenialQuipErrorSerializer(
@@ -272,11 +270,11 @@ class RandomInternChatterPauseReverenceQuip(APIView):
         Retrieves a random InternChatterPauseReverenceQuip.
         """
         # Get a random quip and return it
-        random_quip = INTERN_CHATTER_PAUSE_REVERENCE_QUIP_DEFAULT
         try:
-            random_quips = InternChatterPauseReverenceQuip.objects.order_by("?")
-            if random_quips.count() > 0:
-                random_quip = random_quips.first().quip_text
+            random_quip = get_random_quip(
+                InternChatterPauseReverenceQuip,
+                INTERN_CHATTER_PAUSE_REVERENCE_QUIP_DEFAULT,
+            )
         except Exception as ex:
             logger.error(ex)
             serializer = InternChatterPauseReverenceQuipErrorSerializer(
@@ -301,11 +299,10 @@ class RandomInternHikeQueueQuip(APIView):
         Retrieves a random InternHikeQueueQuip.
         """
         # Get a random quip and return it
-        random_quip = INTERN_HIKE_QUEUE_QUIP_DEFAULT
         try:
-            random_quips = InternHikeQueueQuip.objects.order_by("?")
-            if random_quips.count() > 0:
-                random_quip = random_quips.first().quip_text
+            random_quip = get_random_quip(
+                InternHikeQueueQuip, INTERN_HIKE_QUEUE_QUIP_DEFAULT
+            )
         except Exception as ex:
             logger.error(ex)
             serializer = InternHikeQueueQuipErrorSerializer(
@@ -330,11 +327,10 @@ class RandomInternNewHereWelcomeQuip(APIView):
         Retrieves a random InternNewHereWelcomeQuip.
         """
         # Get a random quip and return it
-        random_quip = INTERN_NEW_HERE_WELCOME_QUIP_DEFAULT
         try:
-            random_quips = InternNewHereWelcomeQuip.objects.order_by("?")
-            if random_quips.count() > 0:
-                random_quip = random_quips.first().quip_text
+            random_quip = get_random_quip(
+                InternNewHereWelcomeQuip, INTERN_NEW_HERE_WELCOME_QUIP_DEFAULT
+            )
         except Exception as ex:
             logger.error(ex)
             serializer = InternNewHereWelcomeQuipErrorSerializer(
@@ -359,11 +355,10 @@ class RandomInternNewHereYeetQuip(APIView):
         Retrieves a random InternNewHereYeetQuip.
         """
         # Get a random quip and return it
-        random_quip = INTERN_NEW_HERE_YEET_QUIP_DEFAULT
         try:
-            random_quips = InternNewHereYeetQuip.objects.order_by("?")
-            if random_quips.count() > 0:
-                random_quip = random_quips.first().quip_text
+            random_quip = get_random_quip(
+                InternNewHereYeetQuip, INTERN_NEW_HERE_YEET_QUIP_DEFAULT
+            )
         except Exception as ex:
             logger.error(ex)
             serializer = InternNewHereYeetQuipErrorSerializer(
@@ -388,11 +383,10 @@ class RandomInternPassionReportQuip(APIView):
         Retrieves a random InternPassionReportQuip.
         """
         # Get a random quip and return it
-        random_quip = INTERN_PASSION_REPORT_QUIP_DEFAULT
         try:
-            random_quips = InternPassionReportQuip.objects.order_by("?")
-            if random_quips.count() > 0:
-                random_quip = random_quips.first().quip_text
+            random_quip = get_random_quip(
+                InternPassionReportQuip, INTERN_PASSION_REPORT_QUIP_DEFAULT
+            )
         except Exception as ex:
             logger.error(ex)
             serializer = InternPassionReportQuipErrorSerializer(
@@ -417,11 +411,11 @@ class RandomInternPathfinderProdigyDemotionQuip(APIView):
         Retrieves a random InternPathfinderProdigyDemotionQuip.
         """
         # Get a random quip and return it
-        random_quip = INTERN_PATHFINDER_PRODIGY_DEMOTION_QUIP_DEFAULT
         try:
-            random_quips = InternPathfinderProdigyDemotionQuip.objects.order_by("?")
-            if random_quips.count() > 0:
-                random_quip = random_quips.first().quip_text
+            random_quip = get_random_quip(
+                InternPathfinderProdigyDemotionQuip,
+                INTERN_PATHFINDER_PRODIGY_DEMOTION_QUIP_DEFAULT,
+            )
         except Exception as ex:
             logger.error(ex)
             serializer = InternPathfinderProdigyDemotionQuipErrorSerializer(
@@ -448,11 +442,11 @@ class RandomInternPathfinderProdigyPromotionQuip(APIView):
         Retrieves a random InternPathfinderProdigyPromotionQuip.
         """
         # Get a random quip and return it
-        random_quip = INTERN_PATHFINDER_PRODIGY_PROMOTION_QUIP_DEFAULT
         try:
-            random_quips = InternPathfinderProdigyPromotionQuip.objects.order_by("?")
-            if random_quips.count() > 0:
-                random_quip = random_quips.first().quip_text
+            random_quip = get_random_quip(
+                InternPathfinderProdigyPromotionQuip,
+                INTERN_PATHFINDER_PRODIGY_PROMOTION_QUIP_DEFAULT,
+            )
         except Exception as ex:
             logger.error(ex)
             serializer = InternPathfinderProdigyPromotionQuipErrorSerializer(
@@ -479,11 +473,10 @@ class RandomInternPlusRepQuip(APIView):
         Retrieves a random InternPlusRepQuip.
         """
         # Get a random quip and return it
-        random_quip = INTERN_PLUS_REP_QUIP_DEFAULT
         try:
-            random_quips = InternPlusRepQuip.objects.order_by("?")
-            if random_quips.count() > 0:
-                random_quip = random_quips.first().quip_text
+            random_quip = get_random_quip(
+                InternPlusRepQuip, INTERN_PLUS_REP_QUIP_DEFAULT
+            )
         except Exception as ex:
             logger.error(ex)
             serializer = InternPlusRepQuipErrorSerializer(
@@ -508,11 +501,11 @@ class RandomInternTrailblazerTitanDemotionQuip(APIView):
         Retrieves a random InternTrailblazerTitanDemotionQuip.
         """
         # Get a random quip and return it
-        random_quip = INTERN_TRAILBLAZER_TITAN_DEMOTION_QUIP_DEFAULT
         try:
-            random_quips = InternTrailblazerTitanDemotionQuip.objects.order_by("?")
-            if random_quips.count() > 0:
-                random_quip = random_quips.first().quip_text
+            random_quip = get_random_quip(
+                InternTrailblazerTitanDemotionQuip,
+                INTERN_TRAILBLAZER_TITAN_DEMOTION_QUIP_DEFAULT,
+            )
         except Exception as ex:
             logger.error(ex)
             serializer = InternTrailblazerTitanDemotionQuipErrorSerializer(
@@ -537,11 +530,11 @@ class RandomInternTrailblazerTitanPromotionQuip(APIView):
         Retrieves a random InternTrailblazerTitanPromotionQuip.
         """
         # Get a random quip and return it
-        random_quip = INTERN_TRAILBLAZER_TITAN_PROMOTION_QUIP_DEFAULT
         try:
-            random_quips = InternTrailblazerTitanPromotionQuip.objects.order_by("?")
-            if random_quips.count() > 0:
-                random_quip = random_quips.first().quip_text
+            random_quip = get_random_quip(
+                InternTrailblazerTitanPromotionQuip,
+                INTERN_TRAILBLAZER_TITAN_PROMOTION_QUIP_DEFAULT,
+            )
         except Exception as ex:
             logger.error(ex)
             serializer = InternTrailblazerTitanPromotionQuipErrorSerializer(
@@ -620,11 +613,10 @@ class RandomInternHelpfulHint(APIView):
         Retrieves a random InternHelpfulHint.
         """
         # Get a random helpful hint and return it
-        random_helpful_hint = INTERN_HELPFUL_HINT_DEFAULT_MESSAGE
         try:
-            random_hints = InternHelpfulHint.objects.order_by("?")
-            if random_hints.count() > 0:
-                random_helpful_hint = random_hints.first().message_text
+            random_helpful_hint = get_random_quip(
+                InternHelpfulHint, INTERN_HELPFUL_HINT_DEFAULT_MESSAGE
+            )
         except Exception as ex:
             logger.error(ex)
             serializer = InternHelpfulHintErrorSerializer(
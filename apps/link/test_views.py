@@ -25,14 +25,7 @@ class LinkTestCase(APITestCase):
         self.client = APIClient(HTTP_AUTHORIZATION="Bearer " + token.key)
 
     @patch("apps.link.views.get_gamertag_from_xuid")
-    @patch("apps.xbox_live.signals.get_gamertag_from_xuid")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
-    def test_discord_to_xbox_live_get(
-        self,
-        mock_get_xuid_and_exact_gamertag,
-        mock_signals_get_gamertag_from_xuid,
-        mock_views_get_gamertag_from_xuid,
-    ):
+    def test_discord_to_xbox_live_get(self, mock_views_get_gamertag_from_xuid):
         # Missing `discordId` throws error
         response = self.client.get("/link/discord-to-xbox-live")
         self.assertEqual(response.status_code, 400)
@@ -65,9 +58,8 @@ class LinkTestCase(APITestCase):
         discord_account = DiscordAccount.objects.create(
             creator=self.user, discord_id="123", discord_username="ABC1234"
         )
-        mock_get_xuid_and_exact_gamertag.return_value = (0, "Test123")
         xbox_live_account = XboxLiveAccount.objects.create(
-            creator=self.user, gamertag="test123"
+            creator=self.user, gamertag="Test123", xuid=0
         )
         DiscordXboxLiveLink.objects.create(
             discord_account=discord_account,
@@ -75,7 +67,6 @@ class LinkTestCase(APITestCase):
             creator=self.user,
         )
         mock_views_get_gamertag_from_xuid.return_value = "Test321"
-        mock_signals_get_gamertag_from_xuid.return_value = "Test321"
         response = self.client.get(
             f"/link/discord-to-xbox-live?discordId={discord_account.discord_id}"
             f"&discordUsername={discord_account.discord_username}"
@@ -83,10 +74,8 @@ class LinkTestCase(APITestCase):
         mock_views_get_gamertag_from_xuid.assert_called_once_with(
             xbox_live_account.xuid
         )
-        mock_signals_get_gamertag_from_xuid.assert_called_once_with(
-            xbox_live_account.xuid
-        )
         xbox_live_account.refresh_from_db()
+        self.assertEqual(xbox_live_account.gamertag, "Test321")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data.get("discordUserId"), discord_account.discord_id)
         self.assertEqual(
@@ -100,10 +89,8 @@ class LinkTestCase(APITestCase):
 
     @patch("apps.link.views.auto_verify_discord_xbox_live_link")
     @patch("apps.xbox_live.utils.get_xuid_and_exact_gamertag")
-    @patch("apps.xbox_live.signals.get_gamertag_from_xuid")
     def test_discord_to_xbox_live_post(
         self,
-        mock_signals_get_gamertag_from_xuid,
         mock_utils_get_xuid_and_exact_gamertag,
         mock_auto_verify_discord_xbox_live_link,
     ):
@@ -169,7 +156,6 @@ class LinkTestCase(APITestCase):
         )
 
         # Happy path - new record created (defaults to unverified)
-        mock_signals_get_gamertag_from_xuid.return_value = "test"
         mock_utils_get_xuid_and_exact_gamertag.return_value = (0, "test")
         response = self.client.post(
             "/link/discord-to-xbox-live",
@@ -200,7 +186,6 @@ class LinkTestCase(APITestCase):
         link.save()
 
         # Repeat call with same Discord/Xbox IDs shouldn't change the link record's verification status
-        mock_signals_get_gamertag_from_xuid.return_value = "TEST"
         mock_utils_get_xuid_and_exact_gamertag.return_value = (0, "TEST")
         response = self.client.post(
             "/link/discord-to-xbox-live",
@@ -229,7 +214,6 @@ class LinkTestCase(APITestCase):
         mock_auto_verify_discord_xbox_live_link.reset_mock()
 
         # If another Discord Account attempts to claim an already-linked Xbox Live Account, an error should be thrown
-        mock_signals_get_gamertag_from_xuid.return_value = "test"
         mock_utils_get_xuid_and_exact_gamertag.return_value = (0, "test")
         response = self.client.post(
             "/link/discord-to-xbox-live",
@@ -247,7 +231,6 @@ class LinkTestCase(APITestCase):
 
         # If the original Discord Account attempts to link to a different Xbox Live Account, no error should be thrown
         # but the link record should now be unverified
-        mock_signals_get_gamertag_from_xuid.return_value = "test1"
         mock_utils_get_xuid_and_exact_gamertag.return_value = (1, "test1")
         response = self.client.post(
             "/link/discord-to-xbox-live",
@@ -276,7 +259,6 @@ class LinkTestCase(APITestCase):
         mock_auto_verify_discord_xbox_live_link.reset_mock()
 
         # Now the "other" Discord Account can link to the first Xbox Live Account without issue
-        mock_signals_get_gamertag_from_xuid.return_value = "test"
         mock_utils_get_xuid_and_exact_gamertag.return_value = (0, "test")
         response = self.client.post(
             "/link/discord-to-xbox-live",
@@ -7,6 +7,7 @@ from django.test import TestCase
 
 from apps.discord.models import DiscordAccount
 from apps.halo_infinite.models import HaloInfinitePlaylist
+from apps.halo_infinite.utils import apply_playlist_data
 from apps.link.models import DiscordXboxLiveLink
 from apps.link.utils import (
     auto_verify_discord_xbox_live_link,
@@ -16,25 +17,7 @@ from apps.xbox_live.models import XboxLiveAccount
 
 
 class LinkUtilsTestCase(TestCase):
-    @patch("apps.halo_infinite.signals.get_playlist")
-    @patch("apps.halo_infinite.signals.get_playlist_info")
-    @patch("apps.xbox_live.utils.get_xuid_and_exact_gamertag")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
-    def setUp(
-        self,
-        mock_signals_get_xuid_and_exact_gamertag,
-        mock_utils_get_xuid_and_exact_gamertag,
-        mock_get_playlist_info,
-        mock_get_playlist,
-    ):
-        def set_both_mock_return_values(return_value):
-            mock_signals_get_xuid_and_exact_gamertag.return_value = return_value
-            mock_utils_get_xuid_and_exact_gamertag.return_value = return_value
-
-        def reset_both_mocks():
-            mock_signals_get_xuid_and_exact_gamertag.reset_mock()
-            mock_utils_get_xuid_and_exact_gamertag.reset_mock()
-
+    def setUp(self):
         self.user = User.objects.create_user(
             username="test", email="test@test.com", password="test"
         )
@@ -44,38 +27,35 @@ class LinkUtilsTestCase(TestCase):
         self.discord_account_2 = DiscordAccount.objects.create(
             creator=self.user, discord_id="2", discord_username="Username2"
         )
-
-        set_both_mock_return_values((1, "xbl1"))
         self.xbox_live_account_1 = XboxLiveAccount.objects.create(
-            creator=self.user, gamertag="XBL1"
+            creator=self.user, gamertag="xbl1", xuid=1
         )
-        reset_both_mocks()
-        set_both_mock_return_values((2, "xbl2"))
         self.xbox_live_account_2 = XboxLiveAccount.objects.create(
-            creator=self.user, gamertag="XBL2"
+            creator=self.user, gamertag="xbl2", xuid=2
         )
-        reset_both_mocks()
-        set_both_mock_return_values((3, "xbl3"))
         self.xbox_live_account_3 = XboxLiveAccount.objects.create(
-            creator=self.user, gamertag="XBL3"
+            creator=self.user, gamertag="xbl3", xuid=3
         )
-        reset_both_mocks()
 
         test_playlist_id = uuid.uuid4()
         test_version_id = uuid.uuid4()
-        mock_get_playlist_info.return_value = {
-            "UgcPlaylistVersion": str(test_version_id),
-            "HasCsr": True,
-        }
-        mock_get_playlist.return_value = {
-            "AssetId": str(test_playlist_id),
-            "VersionId": str(test_version_id),
-            "PublicName": "name",
-            "Description": "description",
-        }
-        self.playlist = HaloInfinitePlaylist.objects.create(
+        self.playlist = HaloInfinitePlaylist(
             creator=self.user, playlist_id=test_playlist_id, active=True
         )
+        apply_playlist_data(
+            self.playlist,
+            {
+                "UgcPlaylistVersion": str(test_version_id),
+                "HasCsr": True,
+            },
+            {
+                "AssetId": str(test_playlist_id),
+                "VersionId": str(test_version_id),
+                "PublicName": "name",
+                "Description": "description",
+            },
+        )
+        self.playlist.save()
 
     def test_update_or_create_discord_xbox_live_link(self):
         # Initial call creates DiscordXboxLiveLink
@@ -119,12 +119,15 @@ class DiscordToXboxLive(APIView):
             return Response(serializer.data, status=404)
 
         # Update the gamertag for the XboxLiveAccount, in case it has changed
+        gamertag = get_gamertag_from_xuid(discord_xbox_live_link.xbox_live_account.xuid)
         if (
-            get_gamertag_from_xuid(discord_xbox_live_link.xbox_live_account.xuid)
-            != discord_xbox_live_link.xbox_live_account.gamertag
+            gamertag is not None
+            and gamertag != discord_xbox_live_link.xbox_live_account.gamertag
         ):
-            # Re-saving the XboxLiveAccount automatically updates the gamertag
-            discord_xbox_live_link.xbox_live_account.save()
+            discord_xbox_live_link.xbox_live_account.gamertag = gamertag
+            discord_xbox_live_link.xbox_live_account.save(
+                update_fields=["gamertag", "needs_hydration", "updated_at"]
+            )
 
         serializer = DiscordXboxLiveLinkResponseSerializer(
             {
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class OverridesConfig(AppConfig):
     name = "apps.overrides"
+
+    def ready(self):
+        import apps.overrides.signals  # noqa
@@ -0,0 +1,186 @@
+import datetime
+import pickle
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+# Far enough in the future that an entry saved with no timeout never expires
+NEVER_EXPIRES = datetime.datetime(9999, 12, 31, tzinfo=datetime.timezone.utc)
+
+
+class PostgresCache(BaseCache):
+    """
+    Cache backend shared by every worker and machine, stored in an UNLOGGED Postgres table (created by the overrides
+    migrations) so that cache writes skip the WAL. Reads are fronted by a small in-process L1 tier that keeps each
+    entry for at most `L1_TIMEOUT` seconds, and expired rows are swept at most once every `SWEEP_INTERVAL` seconds
+    per process, on the next write. The L1 tier is only used outside transactions.
+
+    OPTIONS: DATABASE (connection alias), L1_TIMEOUT, L1_MAX_ENTRIES and SWEEP_INTERVAL.
+    """
+
+    def __init__(self, table, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._table = table
+        self._database = options.get("DATABASE", DEFAULT_DB_ALIAS)
+        self._l1_timeout = options.get("L1_TIMEOUT", 5)
+        self._l1_max_entries = options.get("L1_MAX_ENTRIES", 1000)
+        self._sweep_interval = options.get("SWEEP_INTERVAL", 60 * 5)
+        # Pickled values keyed by cache key, with the monotonic time each stops being served from L1
+        self._l1 = {}
+        self._next_sweep = time.monotonic() + self._sweep_interval
+
+    def _execute(self, sql, params=None):
+        connection = connections[self._database]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql.format(table=connection.ops.quote_name(self._table)), params
+            )
+            return cursor.fetchall() if cursor.description is not None else []
+
+    def _get_expires_at(self, timeout) -> datetime.datetime:
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return NEVER_EXPIRES
+        return timezone.now() + datetime.timedelta(seconds=timeout)
+
+    def _l1_enabled(self) -> bool:
+        # Inside a transaction the L1 tier is bypassed, so values from a rolled back transaction are never kept
+        return not connections[self._database].in_atomic_block
+
+    def _l1_get(self, key):
+        if not self._l1_enabled():
+            return None
+        entry = self._l1.get(key)
+        if entry is None or time.monotonic() > entry[1]:
+            return None
+        return entry[0]
+
+    def _l1_set(self, key, pickled, expires_at: datetime.datetime):
+        if not self._l1_enabled():
+            self._l1.pop(key, None)
+            return
+        if len(self._l1) >= self._l1_max_entries:
+            self._l1.clear()
+        seconds_left = (expires_at - timezone.now()).total_seconds()
+        self._l1[key] = (
+            pickled,
+            time.monotonic() + min(self._l1_timeout, seconds_left),
+        )
+
+    def _maybe_sweep(self):
+        if time.monotonic() < self._next_sweep:
+            return
+        self._next_sweep = time.monotonic() + self._sweep_interval
+        self._execute("DELETE FROM {table} WHERE expires_at <= %s", [timezone.now()])
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._get_many([key]).get(key, default)
+
+    def get_many(self, keys, version=None):
+        keys_by_cache_key = {
+            self.make_and_validate_key(key, version=version): key for key in keys
+        }
+        return {
+            keys_by_cache_key[cache_key]: value
+            for cache_key, value in self._get_many(list(keys_by_cache_key)).items()
+        }
+
+    def _get_many(self, keys: list[str]) -> dict:
+        values = {}
+        missing_keys = []
+        for key in keys:
+            pickled = self._l1_get(key)
+            if pickled is None:
+                missing_keys.append(key)
+            else:
+                values[key] = pickle.loads(pickled)
+        if len(missing_keys) > 0:
+            for key, pickled, expires_at in self._execute(
+                "SELECT key, value, expires_at FROM {table} WHERE key = ANY(%s) AND expires_at > %s",
+                [missing_keys, timezone.now()],
+            ):
+                pickled = bytes(pickled)
+                self._l1_set(key, pickled, expires_at)
+                values[key] = pickle.loads(pickled)
+        return values
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.set_many({key: value}, timeout=timeout, version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        if len(data) == 0:
+            return []
+        if timeout is not DEFAULT_TIMEOUT and timeout is not None and timeout <= 0:
+            self.delete_many(data.keys(), version=version)
+            return []
+        expires_at = self._get_expires_at(timeout)
+        rows = []
+        for key, value in data.items():
+            key = self.make_and_validate_key(key, version=version)
+            pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            self._l1_set(key, pickled, expires_at)
+            rows.extend([key, pickled, expires_at])
+        self._execute(
+            "INSERT INTO {table} (key, value, expires_at) VALUES "
+            + ", ".join(["(%s, %s, %s)"] * len(data))
+            + " ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, expires_at = EXCLUDED.expires_at",
+            rows,
+        )
+        self._maybe_sweep()
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        expires_at = self._get_expires_at(timeout)
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        # Only an expired row may be replaced
+        added = self._execute(
+            "INSERT INTO {table} AS entry (key, value, expires_at) VALUES (%s, %s, %s) "
+            "ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, expires_at = EXCLUDED.expires_at "
+            "WHERE entry.expires_at <= %s RETURNING key",
+            [key, pickled, expires_at, timezone.now()],
+        )
+        if len(added) == 0:
+            return False
+        self._l1_set(key, pickled, expires_at)
+        return True
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._l1.pop(key, None)
+        touched = self._execute(
+            "UPDATE {table} SET expires_at = %s WHERE key = %s AND expires_at > %s RETURNING key",
+            [self._get_expires_at(timeout), key, timezone.now()],
+        )
+        return len(touched) > 0
+
+    def delete(self, key, version=None):
+        return self._delete_many([self.make_and_validate_key(key, version=version)])
+
+    def delete_many(self, keys, version=None):
+        self._delete_many(
+            [self.make_and_validate_key(key, version=version) for key in keys]
+        )
+
+    def _delete_many(self, keys: list[str]) -> bool:
+        if len(keys) == 0:
+            return False
+        for key in keys:
+            self._l1.pop(key, None)
+        deleted = self._execute(
+            "DELETE FROM {table} WHERE key = ANY(%s) RETURNING key", [keys]
+        )
+        return len(deleted) > 0
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return key in self._get_many([key])
+
+    def clear(self):
+        self._l1.clear()
+        self._execute("DELETE FROM {table}")
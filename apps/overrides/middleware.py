@@ -0,0 +1,22 @@
+from asgiref.sync import iscoroutinefunction
+from django.utils.decorators import sync_and_async_middleware
+
+from apps.overrides.utils import primary_pinning_scope
+
+
+@sync_and_async_middleware
+def primary_pinning_middleware(get_response):
+    # Gives each request its own read-your-writes pinning for the ReplicaRouter
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            with primary_pinning_scope():
+                return await get_response(request)
+
+    else:
+
+        def middleware(request):
+            with primary_pinning_scope():
+                return get_response(request)
+
+    return middleware
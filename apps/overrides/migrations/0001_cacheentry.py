@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = []
+
+    operations = [
+        # Backing table for `apps.overrides.cache.PostgresCache`. UNLOGGED skips the WAL: cache rows are disposable, and
+        # the table is emptied if Postgres crashes.
+        migrations.RunSQL(
+            sql=[
+                'CREATE UNLOGGED TABLE "CacheEntry" ('
+                "key varchar(255) PRIMARY KEY, "
+                "value bytea NOT NULL, "
+                "expires_at timestamp with time zone NOT NULL)",
+                'CREATE INDEX "CacheEntry_expires_at" ON "CacheEntry" (expires_at)',
+            ],
+            reverse_sql=['DROP TABLE "CacheEntry"'],
+        ),
+    ]
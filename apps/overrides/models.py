@@ -1,9 +1,16 @@
+import copy
+import time
 import uuid
 
 from django.conf import settings
 from django.db import models
 from rest_framework.authentication import TokenAuthentication
 
+BEARER_TOKEN_CACHE_TIMEOUT = 60
+
+# This worker's recently validated bearer tokens, keyed by token key
+bearer_tokens = {}
+
 
 class BaseWithoutPrimaryKey(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
@@ -23,5 +30,30 @@ class Base(BaseWithoutPrimaryKey):
         abstract = True
 
 
+def forget_bearer_tokens(key: str = None, user_id: int = None):
+    for cached_key, cached in list(bearer_tokens.items()):
+        if cached_key == key or cached["user"].id == user_id:
+            bearer_tokens.pop(cached_key, None)
+
+
 class BearerAuthentication(TokenAuthentication):
+    """
+    Token authentication with the "Bearer" keyword. Validated tokens are remembered by the worker for
+    BEARER_TOKEN_CACHE_TIMEOUT seconds, so repeat callers skip the token and user lookup; the overrides signals forget a
+    token as soon as it, or its user, is saved or deleted.
+    """
+
     keyword = "Bearer"
+
+    def authenticate_credentials(self, key):
+        cached = bearer_tokens.get(key)
+        if cached is None or time.monotonic() > cached["expires_at"]:
+            user, token = super().authenticate_credentials(key)
+            cached = {
+                "user": user,
+                "token": token,
+                "expires_at": time.monotonic() + BEARER_TOKEN_CACHE_TIMEOUT,
+            }
+            bearer_tokens[key] = cached
+        # Each request gets its own copies so per-request changes never leak into the cache
+        return (copy.copy(cached["user"]), copy.copy(cached["token"]))
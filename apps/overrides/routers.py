@@ -0,0 +1,33 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from apps.overrides.utils import primary_pinning, replica_reads
+
+REPLICA_DB_ALIAS = "replica"
+
+
+class ReplicaRouter:
+    """
+    Routes the reads made under `read_from_replica` to the `replica` database, and every other query to the primary.
+    Any write made during a request pins that request's remaining reads to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        pinning = primary_pinning.get()
+        if (
+            not replica_reads.get()
+            or pinning is None
+            or pinning["pinned"]
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return None
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        pinning = primary_pinning.get()
+        if pinning is not None:
+            pinning["pinned"] = True
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
@@ -0,0 +1,26 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from apps.overrides.models import forget_bearer_tokens
+
+
+@receiver(post_save, sender=Token)
+def token_post_save(sender, instance, **kwargs):
+    forget_bearer_tokens(key=instance.key)
+
+
+@receiver(post_delete, sender=Token)
+def token_post_delete(sender, instance, **kwargs):
+    forget_bearer_tokens(key=instance.key)
+
+
+@receiver(post_save, sender=User)
+def user_post_save(sender, instance, **kwargs):
+    forget_bearer_tokens(user_id=instance.id)
+
+
+@receiver(post_delete, sender=User)
+def user_post_delete(sender, instance, **kwargs):
+    forget_bearer_tokens(user_id=instance.id)
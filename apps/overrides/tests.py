@@ -0,0 +1,216 @@
+import asyncio
+import datetime
+
+import httpx
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from apps.overrides.cache import PostgresCache
+from apps.overrides.models import BearerAuthentication, bearer_tokens
+from apps.overrides.utils import (
+    acall_concurrently,
+    primary_pinning_scope,
+    read_from_replica,
+)
+
+
+class BearerAuthenticationTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="test", email="test@test.com", password="test"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.authentication = BearerAuthentication()
+        bearer_tokens.clear()
+        self.addCleanup(bearer_tokens.clear)
+
+    def test_bearer_authentication_cache(self):
+        # The first validation looks the token up, and later ones are served from the cache
+        with self.assertNumQueries(1):
+            user, token = self.authentication.authenticate_credentials(self.token.key)
+        self.assertEqual(user, self.user)
+        self.assertEqual(token, self.token)
+        with self.assertNumQueries(0):
+            user, token = self.authentication.authenticate_credentials(self.token.key)
+        self.assertEqual(user, self.user)
+        self.assertEqual(token, self.token)
+
+        # Deactivating the user forgets their tokens
+        self.user.is_active = False
+        self.user.save()
+        self.assertRaises(
+            AuthenticationFailed,
+            self.authentication.authenticate_credentials,
+            self.token.key,
+        )
+        self.user.is_active = True
+        self.user.save()
+        self.authentication.authenticate_credentials(self.token.key)
+
+        # Rotating the token forgets the old key
+        self.token.delete()
+        new_token = Token.objects.create(user=self.user)
+        self.assertRaises(
+            AuthenticationFailed,
+            self.authentication.authenticate_credentials,
+            self.token.key,
+        )
+        self.assertEqual(
+            self.authentication.authenticate_credentials(new_token.key)[0], self.user
+        )
+
+        # Expired entries are looked up again
+        bearer_tokens[new_token.key]["expires_at"] = 0
+        with self.assertNumQueries(1):
+            self.authentication.authenticate_credentials(new_token.key)
+
+
+def count_cache_entries(key: str) -> int:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT COUNT(*) FROM "CacheEntry" WHERE key LIKE %s', [f"%{key}"]
+        )
+        return cursor.fetchone()[0]
+
+
+class PostgresCacheTestCase(TestCase):
+    def setUp(self):
+        self.cache = PostgresCache("CacheEntry", {})
+
+    def test_postgres_cache(self):
+        # Values round trip, and many keys are read or written in one query
+        self.cache.set("a", {"value": 1})
+        self.assertEqual(self.cache.get("a"), {"value": 1})
+        self.assertIsNone(self.cache.get("missing"))
+        self.assertEqual(self.cache.get("missing", "default"), "default")
+        with self.assertNumQueries(2):
+            self.cache.set_many({"b": 2, "c": [3]})
+            self.assertEqual(
+                self.cache.get_many(["a", "b", "c", "missing"]),
+                {"a": {"value": 1}, "b": 2, "c": [3]},
+            )
+
+        # `add` only writes missing or expired keys
+        self.assertFalse(self.cache.add("a", "new"))
+        self.assertEqual(self.cache.get("a"), {"value": 1})
+        self.assertTrue(self.cache.add("d", "new"))
+        self.assertEqual(self.cache.get("d"), "new")
+
+        # Expired keys are treated as missing, can be added again, and are swept on the next write
+        self.cache.set("expired", 1, timeout=-1)
+        self.assertIsNone(self.cache.get("expired"))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """INSERT INTO "CacheEntry" (key, value, expires_at) VALUES (%s, %s, %s)""",
+                [
+                    self.cache.make_key("expired"),
+                    b"",
+                    timezone.now() - datetime.timedelta(seconds=1),
+                ],
+            )
+        self.assertFalse(self.cache.has_key("expired"))
+        self.assertTrue(self.cache.add("expired", 2))
+        self.assertEqual(self.cache.get("expired"), 2)
+        self.cache.touch("expired", -1)
+        self.assertEqual(count_cache_entries("expired"), 1)
+        self.cache._next_sweep = 0
+        self.cache.set("e", 5)
+        self.assertEqual(count_cache_entries("expired"), 0)
+
+        # Keys without a timeout never expire, and `touch` only extends live keys
+        self.cache.set("forever", 1, timeout=None)
+        self.assertTrue(self.cache.touch("forever", 60))
+        self.assertFalse(self.cache.touch("missing", 60))
+        self.assertEqual(self.cache.incr("forever"), 2)
+
+        # Deleting and clearing
+        self.assertTrue(self.cache.delete("a"))
+        self.assertFalse(self.cache.delete("a"))
+        self.cache.delete_many(["b", "c"])
+        self.assertEqual(self.cache.get_many(["a", "b", "c"]), {})
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("d"))
+
+
+class PostgresCacheL1TestCase(TransactionTestCase):
+    def test_postgres_cache_l1(self):
+        cache = PostgresCache("CacheEntry", {"OPTIONS": {"L1_TIMEOUT": 60}})
+        other_worker_cache = PostgresCache("CacheEntry", {})
+
+        # Outside a transaction, reads and writes fill the L1 tier, so repeat reads skip the database
+        cache.set("a", 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(cache.get("a"), 1)
+            self.assertEqual(cache.get("a"), 1)
+
+        # Other workers see writes immediately, while this worker serves its L1 copy until it expires
+        self.assertEqual(other_worker_cache.get("a"), 1)
+        other_worker_cache.set("a", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache._l1.clear()
+        self.assertEqual(cache.get("a"), 2)
+
+        # Deletes drop the L1 copy
+        cache.delete("a")
+        self.assertIsNone(cache.get("a"))
+
+
+class AsyncCallConcurrentlyTestCase(TestCase):
+    def test_acall_concurrently(self):
+        in_flight = []
+        max_in_flight = []
+
+        async def func(value, client):
+            self.assertIsInstance(client, httpx.AsyncClient)
+            in_flight.append(value)
+            max_in_flight.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(value)
+            return value * 2
+
+        # Every call is in flight at once, and the results keep their order
+        self.assertEqual(
+            async_to_sync(acall_concurrently)(func, [(i,) for i in range(50)]),
+            [i * 2 for i in range(50)],
+        )
+        self.assertEqual(max(max_in_flight), 50)
+        self.assertEqual(async_to_sync(acall_concurrently)(func, []), [])
+
+
+class ReplicaRouterTestCase(TransactionTestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        # The test databases aren't replicated, so each one holds a different User
+        User.objects.db_manager("default").create_user(username="primary")
+        User.objects.db_manager("replica").create_user(username="replica")
+
+    def read_username(self) -> str:
+        return User.objects.get().username
+
+    def test_replica_router(self):
+        # Reads stay on the primary outside of a request, and for reads that aren't marked for the replica
+        with read_from_replica():
+            self.assertEqual(self.read_username(), "primary")
+        with primary_pinning_scope():
+            self.assertEqual(self.read_username(), "primary")
+
+            # Marked reads go to the replica, except inside a transaction
+            with read_from_replica():
+                self.assertEqual(self.read_username(), "replica")
+                with transaction.atomic():
+                    self.assertEqual(self.read_username(), "primary")
+                self.assertEqual(read_from_replica()(self.read_username)(), "replica")
+
+                # Any write pins the rest of the request to the primary
+                Token.objects.create(user=User.objects.using("default").get())
+                self.assertEqual(self.read_username(), "primary")
+
+        # The next request starts unpinned
+        with primary_pinning_scope(), read_from_replica():
+            self.assertEqual(self.read_username(), "replica")
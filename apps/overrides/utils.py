@@ -0,0 +1,93 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import httpx
+import requests
+from django.db import connections
+
+ASYNC_REQUESTS_MAX_CONNECTIONS = 200
+CONCURRENT_REQUESTS_MAX_WORKERS = 8
+
+replica_reads = contextvars.ContextVar("replica_reads", default=False)
+# Holds {"pinned": bool} for the current request, or None outside of a request
+primary_pinning = contextvars.ContextVar("primary_pinning", default=None)
+
+
+@contextmanager
+def read_from_replica():
+    """
+    Sends the read queries made inside the block (or the decorated function) to the `replica` database when one is
+    configured. Reads stay on the primary outside of a request, inside a transaction, and for the rest of a request
+    once it has written anything, so a request always reads its own writes.
+    """
+    token = replica_reads.set(True)
+    try:
+        yield
+    finally:
+        replica_reads.reset(token)
+
+
+@contextmanager
+def primary_pinning_scope():
+    # Scopes read-your-writes pinning to one request; the first write inside the scope pins the rest of it
+    token = primary_pinning.set({"pinned": False})
+    try:
+        yield
+    finally:
+        primary_pinning.reset(token)
+
+
+def call_concurrently(func, args_list: list[tuple]) -> list:
+    """
+    Calls `func(*args, session)` for each args tuple on a small thread pool and returns the results in order. Each
+    worker thread reuses one requests.Session, and every call closes the thread's database connections afterwards
+    because the API helpers read their tokens from the database. A single args tuple is called on the current thread.
+    """
+    if len(args_list) == 0:
+        return []
+    # A single call is made inline, keeping the caller's database connections as they are
+    if len(args_list) == 1:
+        with requests.Session() as session:
+            return [func(*args_list[0], session)]
+    sessions = {}
+
+    def call(args):
+        try:
+            session = sessions.get(threading.get_ident())
+            if session is None:
+                session = sessions[threading.get_ident()] = requests.Session()
+            return func(*args, session)
+        finally:
+            connections.close_all()
+
+    try:
+        with ThreadPoolExecutor(
+            max_workers=min(CONCURRENT_REQUESTS_MAX_WORKERS, len(args_list))
+        ) as executor:
+            return list(executor.map(call, args_list))
+    finally:
+        for session in sessions.values():
+            session.close()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    # Like requests, calls are never timed out; the connection pool bounds how many are in flight at once
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=ASYNC_REQUESTS_MAX_CONNECTIONS),
+        timeout=None,
+    )
+
+
+async def acall_concurrently(func, args_list: list[tuple]) -> list:
+    """
+    Async counterpart of `call_concurrently`: awaits `func(*args, client)` for every args tuple at once, sharing one
+    httpx.AsyncClient, and returns the results in order. Up to ASYNC_REQUESTS_MAX_CONNECTIONS requests are in flight
+    at a time, all on the calling event loop, so no threads are pinned while they wait.
+    """
+    if len(args_list) == 0:
+        return []
+    async with get_async_client() as client:
+        return list(await asyncio.gather(*[func(*args, client) for args in args_list]))
@@ -0,0 +1,39 @@
+from inspect import isawaitable
+
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines, so views that fan out to upstream APIs don't pin a thread while they wait
+    under ASGI. Django still serves them under WSGI, running each request's handler on its own event loop.
+
+    Authentication, permission and throttle checks run synchronously off the event loop before the handler is
+    awaited. Handlers must keep any other ORM access inside `sync_to_async` or the ORM's async methods.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+            # OPTIONS and disallowed methods are handled by APIView's sync handlers
+            response = handler(request, *args, **kwargs)
+            if isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
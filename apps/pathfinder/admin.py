@@ -5,6 +5,7 @@ from django.contrib import admin
 from apps.overrides.admin import AutofillCreatorModelAdmin, linkify
 from apps.pathfinder.models import (
     PathfinderBeanCount,
+    PathfinderBeanTransaction,
     PathfinderHikeSubmission,
     PathfinderWAYWOComment,
     PathfinderWAYWOPost,
@@ -51,6 +52,28 @@ class PathfinderBeanCountAdmin(AutofillCreatorModelAdmin):
     )
 
 
+@admin.register(PathfinderBeanTransaction)
+class PathfinderBeanTransactionAdmin(AutofillCreatorModelAdmin):
+    autocomplete_fields = ["bean_owner_discord"]
+    list_display = (
+        "__str__",
+        linkify("bean_owner_discord"),
+        "bean_delta",
+        "reason",
+        "created_at",
+    )
+    list_filter = (
+        "reason",
+        "bean_owner_discord",
+    )
+    fields = (
+        "bean_owner_discord",
+        "bean_delta",
+        "reason",
+        "creator",
+    )
+
+
 @admin.register(PathfinderHikeSubmission)
 class PathfinderHikeSubmissionAdmin(AutofillCreatorModelAdmin):
     autocomplete_fields = ["map_submitter_discord"]
@@ -7,3 +7,7 @@ class PathfinderConfig(AppConfig):
 
     def ready(self):
         import apps.pathfinder.signals  # noqa
+        from apps.halo_infinite.utils import is_custom_match, register_xbox_earn_rules
+        from apps.pathfinder.utils import ERA_XBOX_EARN_RULES
+
+        register_xbox_earn_rules("pathfinder", is_custom_match, ERA_XBOX_EARN_RULES)
@@ -0,0 +1,118 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:06
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_opening_balances(apps, schema_editor):
+    PathfinderBeanCount = apps.get_model("pathfinder", "PathfinderBeanCount")
+    PathfinderBeanTransaction = apps.get_model(
+        "pathfinder", "PathfinderBeanTransaction"
+    )
+    PathfinderBeanTransaction.objects.bulk_create(
+        [
+            PathfinderBeanTransaction(
+                bean_owner_discord_id=bean_count.bean_owner_discord_id,
+                bean_delta=bean_count.bean_count,
+                reason="OpeningBalance",
+                creator_id=bean_count.creator_id,
+            )
+            for bean_count in PathfinderBeanCount.objects.exclude(bean_count=0)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("discord", "0006_alter_discordaccount_created_at_and_more"),
+        ("pathfinder", "0010_remove_pathfindertestinglfgpost_creator_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PathfinderBeanTransaction",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("bean_delta", models.IntegerField(verbose_name="Bean Delta")),
+                (
+                    "reason",
+                    models.CharField(
+                        choices=[
+                            ("OpeningBalance", "Opening Balance"),
+                            ("Change", "Change"),
+                            ("HikeSubmission", "Hike Submission"),
+                            ("HikeComplete", "Hike Complete"),
+                            ("WAYWOComment", "WAYWO Comment"),
+                            ("WeeklyRecap", "Weekly Recap"),
+                        ],
+                        default="Change",
+                        max_length=32,
+                        verbose_name="Reason",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Bean Transaction",
+                "verbose_name_plural": "Bean Transactions",
+                "db_table": "PathfinderBeanTransaction",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="pathfinderbeancount",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("bean_count__gte", 0)),
+                name="pathfinder_bean_count_non_negative",
+            ),
+        ),
+        migrations.AddField(
+            model_name="pathfinderbeantransaction",
+            name="bean_owner_discord",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="pathfinder_bean_transactions",
+                to="discord.discordaccount",
+                verbose_name="Bean Owner Discord",
+            ),
+        ),
+        migrations.AddField(
+            model_name="pathfinderbeantransaction",
+            name="creator",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pathfinderbeantransaction",
+            index=models.Index(
+                fields=["bean_owner_discord", "created_at"],
+                name="PathfinderB_bean_ow_45b8db_idx",
+            ),
+        ),
+        migrations.RunPython(
+            create_opening_balances, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("discord", "0006_alter_discordaccount_created_at_and_more"),
+        ("pathfinder", "0011_pathfinderbeantransaction"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="pathfinderhikesubmission",
+            index=models.Index(
+                fields=["map_submitter_discord", "created_at"],
+                name="PathfinderH_map_sub_d3ad04_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pathfinderwaywocomment",
+            index=models.Index(
+                fields=["commenter_discord", "created_at"],
+                name="PathfinderW_comment_5f8a43_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pathfinderwaywopost",
+            index=models.Index(
+                fields=["poster_discord", "created_at"],
+                name="PathfinderW_poster__b9fe53_idx",
+            ),
+        ),
+    ]
@@ -12,6 +12,12 @@ class PathfinderBeanCount(Base):
         ordering = [
             "-bean_count",
         ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(bean_count__gte=0),
+                name="pathfinder_bean_count_non_negative",
+            )
+        ]
         verbose_name = "Bean Count"
         verbose_name_plural = "Bean Counts"
 
@@ -27,6 +33,42 @@ class PathfinderBeanCount(Base):
         return f"{str(self.bean_owner_discord)}: {self.bean_count} bean{'s' if self.bean_count != 1 else ''}"
 
 
+class PathfinderBeanTransaction(Base):
+    class Meta:
+        db_table = "PathfinderBeanTransaction"
+        ordering = [
+            "-created_at",
+        ]
+        indexes = [models.Index(fields=["bean_owner_discord", "created_at"])]
+        verbose_name = "Bean Transaction"
+        verbose_name_plural = "Bean Transactions"
+
+    class Reasons(models.TextChoices):
+        OPENING_BALANCE = "OpeningBalance", "Opening Balance"
+        CHANGE = "Change", "Change"
+        HIKE_SUBMISSION = "HikeSubmission", "Hike Submission"
+        HIKE_COMPLETE = "HikeComplete", "Hike Complete"
+        WAYWO_COMMENT = "WAYWOComment", "WAYWO Comment"
+        WEEKLY_RECAP = "WeeklyRecap", "Weekly Recap"
+
+    bean_owner_discord = models.ForeignKey(
+        DiscordAccount,
+        on_delete=models.RESTRICT,
+        verbose_name="Bean Owner Discord",
+        related_name="pathfinder_bean_transactions",
+    )
+    bean_delta = models.IntegerField(verbose_name="Bean Delta")
+    reason = models.CharField(
+        max_length=32,
+        choices=Reasons.choices,
+        default=Reasons.CHANGE,
+        verbose_name="Reason",
+    )
+
+    def __str__(self):
+        return f"{str(self.bean_owner_discord)}: {self.bean_delta:+d} ({self.get_reason_display()})"
+
+
 class PathfinderHikeSubmission(Base):
     class Meta:
         db_table = "PathfinderHikeSubmission"
@@ -34,6 +76,7 @@ class PathfinderHikeSubmission(Base):
             "-scheduled_playtest_date",
             "-created_at",
         ]
+        indexes = [models.Index(fields=["map_submitter_discord", "created_at"])]
         verbose_name = "Hike Submission"
         verbose_name_plural = "Hike Submissions"
 
@@ -121,6 +164,7 @@ class PathfinderWAYWOComment(Base):
         ordering = [
             "-created_at",
         ]
+        indexes = [models.Index(fields=["commenter_discord", "created_at"])]
         verbose_name = "WAYWO Comment"
         verbose_name_plural = "WAYWO Comments"
 
@@ -144,6 +188,7 @@ class PathfinderWAYWOPost(Base):
         ordering = [
             "-created_at",
         ]
+        indexes = [models.Index(fields=["poster_discord", "created_at"])]
         verbose_name = "WAYWO Post"
         verbose_name_plural = "WAYWO Posts"
 
@@ -32,9 +32,12 @@ def pathfinder_hike_submission_post_save(sender, instance, created, **kwargs):
                 xuid = int(re.search(r"\d+", player.get("PlayerId")).group())
                 new_xuids.add(xuid)
     if existing_xuids != new_xuids:
-        for participation in existing_game_participations:
-            participation.delete()
-        for xuid in new_xuids:
-            PathfinderHikeGameParticipation.objects.create(
-                hike_submission=instance, xuid=xuid, creator=instance.creator
-            )
+        existing_game_participations.delete()
+        PathfinderHikeGameParticipation.objects.bulk_create(
+            [
+                PathfinderHikeGameParticipation(
+                    hike_submission=instance, xuid=xuid, creator_id=instance.creator_id
+                )
+                for xuid in new_xuids
+            ]
+        )
@@ -4,6 +4,8 @@ from collections import OrderedDict
 from unittest.mock import patch
 
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.authtoken.models import Token
 from rest_framework.exceptions import ErrorDetail
 from rest_framework.test import APIClient, APITestCase
@@ -213,10 +215,7 @@ class PathfinderTestCase(APITestCase):
         self.assertEqual(pbc.bean_count, 0)
 
     @patch("apps.pathfinder.signals.match_stats")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
-    def test_hike_complete_view_post(
-        self, mock_get_xuid_and_exact_gamertag, mock_match_stats
-    ):
+    def test_hike_complete_view_post(self, mock_match_stats):
         mock_match_stats.return_value = {}
         # Missing field values throw errors
         response = self.client.post("/pathfinder/hike-complete", {}, format="json")
@@ -280,12 +279,11 @@ class PathfinderTestCase(APITestCase):
         )
         discord_accounts = []
         for i in range(6):
-            mock_get_xuid_and_exact_gamertag.return_value = (i, f"test{i}")
             discord_account = DiscordAccount.objects.create(
                 creator=self.user, discord_id=str(i), discord_username=f"Test{i}"
             )
             xbox_live_account = XboxLiveAccount.objects.create(
-                creator=self.user, gamertag=f"testGT{i}"
+                creator=self.user, gamertag=f"test{i}", xuid=i
             )
             DiscordXboxLiveLink.objects.create(
                 creator=self.user,
@@ -533,6 +531,59 @@ class PathfinderTestCase(APITestCase):
         PathfinderHikeVoiceParticipation.objects.all().delete()
         PathfinderBeanCount.objects.all().delete()
 
+    @patch("apps.pathfinder.signals.match_stats")
+    def test_hike_complete_view_post_query_count(self, mock_match_stats):
+        for i in range(24):
+            DiscordXboxLiveLink.objects.create(
+                creator=self.user,
+                discord_account=DiscordAccount.objects.create(
+                    creator=self.user, discord_id=str(i), discord_username=f"Test{i}"
+                ),
+                xbox_live_account=XboxLiveAccount.objects.create(
+                    creator=self.user, gamertag=f"test{i}", xuid=i
+                ),
+                verified=True,
+            )
+
+        # The number of queries does not depend on how many players were in the game or in voice (the bearer token is
+        # validated up front so neither request looks it up)
+        self.client.get("/pathfinder/hike-queue", format="json")
+        query_counts = []
+        for lobby_size in (2, 24):
+            mock_match_stats.return_value = {
+                "Players": [
+                    {
+                        "PlayerId": f"xuid({i})",
+                        "ParticipationInfo": {"PresentAtCompletion": True},
+                    }
+                    for i in range(lobby_size)
+                ]
+            }
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(
+                    "/pathfinder/hike-complete",
+                    {
+                        "playtestGameId": uuid.uuid4(),
+                        "discordUsersInVoice": [
+                            {"discordId": str(i), "discordUsername": f"Test{i}"}
+                            for i in range(lobby_size)
+                        ],
+                        "waywoPostTitle": "WAYWO Post Title",
+                        "waywoPostId": str(lobby_size),
+                    },
+                    format="json",
+                )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data.get("awardedUsers")), lobby_size)
+            for awarded_user in response.data.get("awardedUsers"):
+                self.assertEqual(
+                    awarded_user.get("awardedBeans"),
+                    BEAN_AWARD_HIKE_GAME_PARTICIPATION
+                    + BEAN_AWARD_HIKE_VOICE_PARTICIPATION,
+                )
+            query_counts.append(len(context.captured_queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+
     def test_hike_queue_view_get(self):
         # Success - nothing in queue
         response = self.client.get("/pathfinder/hike-queue", format="json")
@@ -1116,26 +1167,25 @@ class PathfinderTestCase(APITestCase):
             ),
         )
 
+    @patch("apps.pathfinder.views.awarm_era_xbox_earns")
     @patch("apps.pathfinder.views.get_e1_xbox_earn_dict")
     @patch("apps.pathfinder.views.get_e1_discord_earn_dict")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
     @patch("apps.pathfinder.views.get_current_era")
     def test_pathfinder_dynamo_progress_view_e1(
         self,
         mock_get_current_era,
-        mock_get_xuid_and_exact_gamertag,
         mock_get_e1_discord_earn_dict,
         mock_get_e1_xbox_earn_dict,
+        mock_awarm_era_xbox_earns,
     ):
         mock_get_current_era.return_value = 1
 
         # Create test data
-        mock_get_xuid_and_exact_gamertag.return_value = (4567, "test1234")
         discord_account = DiscordAccount.objects.create(
             creator=self.user, discord_id="1234", discord_username="TestUsername1234"
         )
         xbox_live_account = XboxLiveAccount.objects.create(
-            creator=self.user, gamertag="testGT1234"
+            creator=self.user, gamertag="test1234", xuid=4567
         )
         link = DiscordXboxLiveLink.objects.create(
             creator=self.user,
@@ -1264,26 +1314,25 @@ class PathfinderTestCase(APITestCase):
         mock_get_e1_discord_earn_dict.reset_mock()
         mock_get_e1_xbox_earn_dict.reset_mock()
 
+    @patch("apps.pathfinder.views.awarm_era_xbox_earns")
     @patch("apps.pathfinder.views.get_e2_xbox_earn_dict")
     @patch("apps.pathfinder.views.get_e2_discord_earn_dict")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
     @patch("apps.pathfinder.views.get_current_era")
     def test_pathfinder_dynamo_progress_view_e2(
         self,
         mock_get_current_era,
-        mock_get_xuid_and_exact_gamertag,
         mock_get_e2_discord_earn_dict,
         mock_get_e2_xbox_earn_dict,
+        mock_awarm_era_xbox_earns,
     ):
         mock_get_current_era.return_value = 2
 
         # Create test data
-        mock_get_xuid_and_exact_gamertag.return_value = (4567, "test1234")
         discord_account = DiscordAccount.objects.create(
             creator=self.user, discord_id="1234", discord_username="TestUsername1234"
         )
         xbox_live_account = XboxLiveAccount.objects.create(
-            creator=self.user, gamertag="testGT1234"
+            creator=self.user, gamertag="test1234", xuid=4567
         )
         link = DiscordXboxLiveLink.objects.create(
             creator=self.user,
@@ -1412,26 +1461,25 @@ class PathfinderTestCase(APITestCase):
         mock_get_e2_discord_earn_dict.reset_mock()
         mock_get_e2_xbox_earn_dict.reset_mock()
 
+    @patch("apps.pathfinder.views.awarm_era_xbox_earns")
     @patch("apps.pathfinder.views.get_e3_xbox_earn_dict")
     @patch("apps.pathfinder.views.get_e3_discord_earn_dict")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
     @patch("apps.pathfinder.views.get_current_era")
     def test_pathfinder_dynamo_progress_view_e3(
         self,
         mock_get_current_era,
-        mock_get_xuid_and_exact_gamertag,
         mock_get_e3_discord_earn_dict,
         mock_get_e3_xbox_earn_dict,
+        mock_awarm_era_xbox_earns,
     ):
         mock_get_current_era.return_value = 3
 
         # Create test data
-        mock_get_xuid_and_exact_gamertag.return_value = (4567, "test1234")
         discord_account = DiscordAccount.objects.create(
             creator=self.user, discord_id="1234", discord_username="TestUsername1234"
         )
         xbox_live_account = XboxLiveAccount.objects.create(
-            creator=self.user, gamertag="testGT1234"
+            creator=self.user, gamertag="test1234", xuid=4567
         )
         link = DiscordXboxLiveLink.objects.create(
             creator=self.user,
@@ -1553,11 +1601,8 @@ class PathfinderTestCase(APITestCase):
         mock_get_e3_xbox_earn_dict.reset_mock()
 
     @patch("apps.pathfinder.views.get_contributor_xuids_for_maps_in_active_playlists")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
     def test_pathfinder_prodigy_check_view(
-        self,
-        mock_get_xuid_and_exact_gamertag,
-        mock_get_contributor_xuids_for_maps_in_active_playlists,
+        self, mock_get_contributor_xuids_for_maps_in_active_playlists
     ):
         # Missing field values throw errors
         response = self.client.post("/pathfinder/prodigy-check", {}, format="json")
@@ -1590,14 +1635,13 @@ class PathfinderTestCase(APITestCase):
         # Create some test data
         links = []
         for i in range(10):
-            mock_get_xuid_and_exact_gamertag.return_value = (i, f"test{i}")
             discord_account = DiscordAccount.objects.create(
                 creator=self.user,
                 discord_id=str(i),
                 discord_username=f"TestUsername{i}",
             )
             xbox_live_account = XboxLiveAccount.objects.create(
-                creator=self.user, gamertag=f"testGT{i}"
+                creator=self.user, gamertag=f"test{i}", xuid=i
             )
             links.append(
                 DiscordXboxLiveLink.objects.create(
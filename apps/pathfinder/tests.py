@@ -1,6 +1,8 @@
+import datetime
 from unittest.mock import patch
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
 
 from apps.discord.models import DiscordAccount
@@ -8,17 +10,24 @@ from apps.halo_infinite.constants import (
     ERA_1_START_TIME,
     ERA_2_START_TIME,
     ERA_3_START_TIME,
+    LEVEL_ID_ARID,
+    LEVEL_ID_STREETS,
+    LIFECYCLE_MODE_CUSTOM,
 )
 from apps.pathfinder.models import (
     PathfinderBeanCount,
+    PathfinderBeanTransaction,
+    PathfinderHikeGameParticipation,
     PathfinderHikeSubmission,
     PathfinderWAYWOComment,
     PathfinderWAYWOPost,
 )
 from apps.pathfinder.utils import (
+    award_beans,
     change_beans,
     check_beans,
     get_e1_discord_earn_dict,
+    get_e1_xbox_earn_dict,
     get_e2_discord_earn_dict,
     get_e3_discord_earn_dict,
 )
@@ -30,41 +39,91 @@ class PathfinderUtilsTestCase(TestCase):
             username="test", email="test@test.com", password="test"
         )
 
-    @patch("apps.pathfinder.utils.check_beans")
-    def test_change_beans(self, mock_check_beans):
+    def test_change_beans(self):
         discord_account = DiscordAccount.objects.create(
             discord_id="123", discord_username="Test123", creator=self.user
         )
-        pbc = PathfinderBeanCount.objects.create(
-            bean_owner_discord=discord_account, bean_count=0, creator=self.user
-        )
 
-        # Successful change (adds 10 beans)
-        mock_check_beans.return_value = 0
+        # Successful change (adds 10 beans) creates the missing PathfinderBeanCount record
         success = change_beans(discord_account, 10)
         self.assertTrue(success)
-        mock_check_beans.assert_called_once_with(discord_account)
-        pbc.refresh_from_db()
+        pbc = PathfinderBeanCount.objects.get(bean_owner_discord=discord_account)
         self.assertEqual(pbc.bean_count, 10)
-        mock_check_beans.reset_mock()
 
         # Successful change (removes 5 beans)
-        mock_check_beans.return_value = 10
-        success = change_beans(discord_account, -5)
+        success = change_beans(
+            discord_account, -5, PathfinderBeanTransaction.Reasons.HIKE_SUBMISSION
+        )
         self.assertTrue(success)
-        mock_check_beans.assert_called_once_with(discord_account)
         pbc.refresh_from_db()
         self.assertEqual(pbc.bean_count, 5)
-        mock_check_beans.reset_mock()
 
         # Unsuccessful change (removes no beans)
-        mock_check_beans.return_value = 5
         success = change_beans(discord_account, -6)
         self.assertFalse(success)
-        mock_check_beans.assert_called_once_with(discord_account)
         pbc.refresh_from_db()
         self.assertEqual(pbc.bean_count, 5)
-        mock_check_beans.reset_mock()
+
+        # Unsuccessful change for an account with no PathfinderBeanCount record
+        other_discord_account = DiscordAccount.objects.create(
+            discord_id="456", discord_username="Test456", creator=self.user
+        )
+        self.assertFalse(change_beans(other_discord_account, -1))
+        self.assertEqual(check_beans(other_discord_account), 0)
+
+        # Only successful changes are recorded in the ledger
+        self.assertEqual(
+            list(
+                PathfinderBeanTransaction.objects.order_by("created_at").values_list(
+                    "bean_owner_discord_id", "bean_delta", "reason"
+                )
+            ),
+            [
+                ("123", 10, PathfinderBeanTransaction.Reasons.CHANGE),
+                ("123", -5, PathfinderBeanTransaction.Reasons.HIKE_SUBMISSION),
+            ],
+        )
+
+    def test_award_beans(self):
+        discord_accounts = [
+            DiscordAccount.objects.create(
+                discord_id=str(i), discord_username=f"Test{i}", creator=self.user
+            )
+            for i in range(4)
+        ]
+        PathfinderBeanCount.objects.create(
+            bean_owner_discord=discord_accounts[0], bean_count=5, creator=self.user
+        )
+        PathfinderBeanCount.objects.create(
+            bean_owner_discord=discord_accounts[3], bean_count=1, creator=self.user
+        )
+
+        # Awards apply to existing and new records alike; negative deltas only apply if affordable
+        successes = award_beans(
+            {"0": 3, "1": 2, "2": -1, "3": -1},
+            self.user,
+            PathfinderBeanTransaction.Reasons.HIKE_COMPLETE,
+        )
+        self.assertEqual(successes, {"0": True, "1": True, "2": False, "3": True})
+        self.assertEqual(
+            dict(
+                PathfinderBeanCount.objects.values_list(
+                    "bean_owner_discord_id", "bean_count"
+                )
+            ),
+            {"0": 8, "1": 2, "2": 0, "3": 0},
+        )
+        self.assertEqual(
+            sorted(
+                PathfinderBeanTransaction.objects.values_list(
+                    "bean_owner_discord_id", "bean_delta"
+                )
+            ),
+            [("0", 3), ("1", 2), ("3", -1)],
+        )
+
+        # Awarding nothing is a no-op
+        self.assertEqual(award_beans({}, self.user), {})
 
     def test_check_beans(self):
         discord_account = DiscordAccount.objects.create(
@@ -104,7 +163,47 @@ class PathfinderUtilsTestCase(TestCase):
         earn_dict = get_e1_discord_earn_dict([])
         self.assertEqual(earn_dict, {})
 
-        # TODO: Complete this test.
+        # Activity counts are independent per account and per activity
+        PathfinderHikeSubmission.objects.create(
+            creator=self.user, map_submitter_discord=discord_accounts[0]
+        )
+        for i in range(2):
+            PathfinderWAYWOPost.objects.create(
+                creator=self.user, poster_discord=discord_accounts[0]
+            )
+        for i in range(5):
+            PathfinderWAYWOComment.objects.create(
+                creator=self.user,
+                commenter_discord=discord_accounts[0],
+                comment_length=100,
+            )
+        PathfinderWAYWOComment.objects.create(
+            creator=self.user,
+            commenter_discord=discord_accounts[1],
+            comment_length=100,
+        )
+        PathfinderHikeSubmission.objects.all().update(created_at=ERA_1_START_TIME)
+        PathfinderWAYWOPost.objects.all().update(created_at=ERA_1_START_TIME)
+        PathfinderWAYWOComment.objects.all().update(created_at=ERA_1_START_TIME)
+        with self.assertNumQueries(1):
+            earn_dict = get_e1_discord_earn_dict(
+                [account.discord_id for account in discord_accounts]
+            )
+        self.assertEqual(
+            earn_dict,
+            {
+                discord_accounts[0].discord_id: {
+                    "bean_spender": 200,
+                    "what_are_you_working_on": 100,
+                    "feedback_fiend": 5,
+                },
+                discord_accounts[1].discord_id: {
+                    "bean_spender": 0,
+                    "what_are_you_working_on": 0,
+                    "feedback_fiend": 1,
+                },
+            },
+        )
 
     def test_get_e2_discord_earn_dict(self):
         # Create some test data
@@ -330,3 +429,57 @@ class PathfinderUtilsTestCase(TestCase):
             earn_dict[discord_accounts[0].discord_id]["what_are_you_working_on"], 0
         )
         self.assertEqual(earn_dict[discord_accounts[0].discord_id]["feedback_fiend"], 0)
+
+    @patch("apps.halo_infinite.utils.get_era_matches_for_xuid")
+    def test_get_e1_xbox_earn_dict(self, mock_get_era_matches_for_xuid):
+        cache.clear()
+
+        def custom_match(level_id, hours):
+            end_time = ERA_1_START_TIME + datetime.timedelta(days=1)
+            return {
+                "MatchInfo": {
+                    "LevelId": level_id,
+                    "LifecycleMode": LIFECYCLE_MODE_CUSTOM,
+                    "StartTime": (
+                        end_time - datetime.timedelta(hours=hours)
+                    ).isoformat(),
+                    "EndTime": end_time.isoformat(),
+                }
+            }
+
+        # No XUIDs = No earn dicts
+        self.assertEqual(get_e1_xbox_earn_dict([]), {})
+        mock_get_era_matches_for_xuid.assert_not_called()
+
+        # Only custom games on Forge maps count towards Forged in Fire, in whole hours
+        mock_get_era_matches_for_xuid.side_effect = lambda xuid, era, session: (
+            [
+                custom_match(LEVEL_ID_ARID, 1.5),
+                custom_match(LEVEL_ID_ARID, 1),
+                custom_match(LEVEL_ID_STREETS, 4),
+            ]
+            if xuid == 0
+            else []
+        )
+        hike_submission = PathfinderHikeSubmission.objects.create(
+            creator=self.user,
+            map_submitter_discord=DiscordAccount.objects.create(
+                creator=self.user, discord_id="0", discord_username="TestUsername0"
+            ),
+        )
+        for i in range(3):
+            PathfinderHikeGameParticipation.objects.create(
+                creator=self.user, hike_submission=hike_submission, xuid=1
+            )
+        PathfinderHikeGameParticipation.objects.all().update(
+            created_at=ERA_1_START_TIME
+        )
+        earn_dict = get_e1_xbox_earn_dict([0, 1])
+        self.assertEqual(
+            earn_dict,
+            {
+                0: {"forged_in_fire": 2, "gone_hiking": 0},
+                1: {"forged_in_fire": 0, "gone_hiking": 30},
+            },
+        )
+        self.assertEqual(mock_get_era_matches_for_xuid.call_count, 2)
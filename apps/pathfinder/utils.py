@@ -1,15 +1,37 @@
 import datetime
 import logging
 
-from django.db.models import Count, Q
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
 
 from apps.discord.models import DiscordAccount
 from apps.halo_infinite.constants import LEVEL_IDS_FORGE
 from apps.halo_infinite.utils import (
-    get_era_custom_matches_for_xuid,
+    get_era_xbox_earn_dict,
+    get_match_duration_seconds,
     get_start_and_end_times_for_era,
 )
-from apps.pathfinder.models import PathfinderBeanCount, PathfinderHikeGameParticipation
+from apps.overrides.models import Base
+from apps.overrides.utils import read_from_replica
+from apps.pathfinder.models import (
+    PathfinderBeanCount,
+    PathfinderBeanTransaction,
+    PathfinderHikeGameParticipation,
+    PathfinderHikeSubmission,
+    PathfinderWAYWOComment,
+    PathfinderWAYWOPost,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,70 +42,148 @@ BEAN_COST_HIKE_SUBMISSION = 50
 PATHFINDER_WAYWO_COMMENT_MIN_LENGTH_FOR_BEAN_AWARD = 100
 
 
-def change_beans(discord_account: DiscordAccount, bean_delta: int) -> bool:
-    if check_beans(discord_account) + bean_delta >= 0:
-        pbc = PathfinderBeanCount.objects.filter(
-            bean_owner_discord=discord_account
-        ).get()
-        pbc.bean_count += bean_delta
-        pbc.save()
-        return True
-    else:
-        return False
+def change_beans(
+    discord_account: DiscordAccount,
+    bean_delta: int,
+    reason: str = PathfinderBeanTransaction.Reasons.CHANGE,
+) -> bool:
+    # Applies `bean_delta` in a single conditional UPDATE so concurrent changes cannot overwrite each other or take the
+    # count below zero, and records the change in the bean ledger. Returns False if the account lacks enough beans.
+    with transaction.atomic():
+        changed = PathfinderBeanCount.objects.filter(
+            bean_owner_discord=discord_account, bean_count__gte=-bean_delta
+        ).update(bean_count=F("bean_count") + bean_delta)
+        if changed == 0:
+            # Either the account has too few beans or no PathfinderBeanCount record yet
+            if check_beans(discord_account) + bean_delta < 0:
+                return False
+            changed = PathfinderBeanCount.objects.filter(
+                bean_owner_discord=discord_account, bean_count__gte=-bean_delta
+            ).update(bean_count=F("bean_count") + bean_delta)
+            if changed == 0:
+                return False
+        PathfinderBeanTransaction.objects.create(
+            bean_owner_discord=discord_account,
+            bean_delta=bean_delta,
+            reason=reason,
+            creator_id=discord_account.creator_id,
+        )
+    return True
+
+
+def award_beans(
+    bean_deltas_by_discord_id: dict[str, int],
+    creator: User,
+    reason: str = PathfinderBeanTransaction.Reasons.CHANGE,
+) -> dict[str, bool]:
+    # Applies every non-negative delta in `bean_deltas_by_discord_id` with one UPDATE (creating any missing
+    # PathfinderBeanCount records first) and records them in the bean ledger. Negative deltas can fail individually, so
+    # they go through `change_beans`. Returns whether each Discord ID's delta was applied.
+    awards = {
+        discord_id: bean_delta
+        for discord_id, bean_delta in bean_deltas_by_discord_id.items()
+        if bean_delta >= 0
+    }
+    results = {}
+    with transaction.atomic():
+        if len(awards) > 0:
+            PathfinderBeanCount.objects.bulk_create(
+                [
+                    PathfinderBeanCount(
+                        bean_owner_discord_id=discord_id, bean_count=0, creator=creator
+                    )
+                    for discord_id in awards
+                ],
+                ignore_conflicts=True,
+            )
+            PathfinderBeanCount.objects.filter(
+                bean_owner_discord_id__in=awards.keys()
+            ).update(
+                bean_count=F("bean_count")
+                + Case(
+                    *[
+                        When(bean_owner_discord_id=discord_id, then=Value(bean_delta))
+                        for discord_id, bean_delta in awards.items()
+                    ],
+                    default=Value(0),
+                )
+            )
+            PathfinderBeanTransaction.objects.bulk_create(
+                [
+                    PathfinderBeanTransaction(
+                        bean_owner_discord_id=discord_id,
+                        bean_delta=bean_delta,
+                        reason=reason,
+                        creator=creator,
+                    )
+                    for discord_id, bean_delta in awards.items()
+                ]
+            )
+            results.update({discord_id: True for discord_id in awards})
+        for discord_id, bean_delta in bean_deltas_by_discord_id.items():
+            if discord_id not in awards:
+                results[discord_id] = change_beans(
+                    DiscordAccount.objects.get(discord_id=discord_id),
+                    bean_delta,
+                    reason,
+                )
+    return results
 
 
 def check_beans(discord_account: DiscordAccount) -> int:
     assert discord_account is not None
-    try:
-        pbc = PathfinderBeanCount.objects.filter(
-            bean_owner_discord=discord_account
-        ).get()
-    except PathfinderBeanCount.DoesNotExist:
-        pbc = PathfinderBeanCount.objects.create(
-            bean_owner_discord=discord_account,
-            bean_count=0,
-            creator=discord_account.creator,
-        )
+    pbc, _ = PathfinderBeanCount.objects.get_or_create(
+        bean_owner_discord=discord_account,
+        defaults={"bean_count": 0, "creator_id": discord_account.creator_id},
+    )
     return pbc.bean_count
 
 
+def get_era_activity_count(
+    model: type[Base],
+    discord_field: str,
+    start_time: datetime.datetime,
+    end_time: datetime.datetime,
+) -> Coalesce:
+    # Counts the `model` rows made by the outer DiscordAccount within an Era as an independent correlated
+    # subquery. Each count is a range scan on its table's (discord, created_at) index, so counting several activity
+    # tables for an account never joins them against each other.
+    activity_count = (
+        model.objects.filter(
+            **{
+                discord_field: OuterRef("pk"),
+                "created_at__range": [start_time, end_time],
+            }
+        )
+        .order_by()
+        .values(discord_field)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(activity_count, output_field=IntegerField()), Value(0))
+
+
 def get_e1_discord_earn_dict(discord_ids: list[str]) -> dict[str, dict[str, int]]:
     start_time, end_time = get_start_and_end_times_for_era(1)
-    annotated_discord_accounts = DiscordAccount.objects.annotate(
-        hike_submissions=Count(
-            "pathfinder_hike_submitters",
-            distinct=True,
-            filter=Q(
-                pathfinder_hike_submitters__map_submitter_discord_id__in=discord_ids,
-                pathfinder_hike_submitters__created_at__range=[
-                    start_time,
-                    end_time,
-                ],
-            ),
+    annotated_discord_accounts = DiscordAccount.objects.filter(
+        discord_id__in=discord_ids
+    ).annotate(
+        hike_submissions=get_era_activity_count(
+            PathfinderHikeSubmission,
+            "map_submitter_discord",
+            start_time,
+            end_time,
         ),
-        waywo_posts=Count(
-            "pathfinder_waywo_posters",
-            distinct=True,
-            filter=Q(
-                pathfinder_waywo_posters__poster_discord_id__in=discord_ids,
-                pathfinder_waywo_posters__created_at__range=[
-                    start_time,
-                    end_time,
-                ],
-            ),
+        waywo_posts=get_era_activity_count(
+            PathfinderWAYWOPost, "poster_discord", start_time, end_time
         ),
-        waywo_comments=Count(
-            "pathfinder_waywo_commenters",
-            distinct=True,
-            filter=Q(
-                pathfinder_waywo_commenters__commenter_discord_id__in=discord_ids,
-                pathfinder_waywo_commenters__created_at__range=[
-                    start_time,
-                    end_time,
-                ],
-            ),
+        waywo_comments=get_era_activity_count(
+            PathfinderWAYWOComment,
+            "commenter_discord",
+            start_time,
+            end_time,
         ),
-    ).filter(discord_id__in=discord_ids)
+    )
 
     earn_dict = {}
     for account in annotated_discord_accounts:
@@ -96,89 +196,79 @@ def get_e1_discord_earn_dict(discord_ids: list[str]) -> dict[str, dict[str, int]
     return earn_dict
 
 
-def get_e1_xbox_earn_dict(xuids: list[int]) -> dict[int, dict[str, int]]:
-    start_time, end_time = get_start_and_end_times_for_era(1)
-    earn_dict = {}
-    for xuid in xuids:
-        # Get custom matches for this XUID
-        custom_matches = get_era_custom_matches_for_xuid(xuid, 1)
-        custom_matches_sorted = sorted(
-            custom_matches,
-            key=lambda m: datetime.datetime.fromisoformat(
-                m.get("MatchInfo", {}).get("EndTime")
-            ),
+def get_hike_game_participation_counts(
+    xuids: list[int], start_time: datetime.datetime, end_time: datetime.datetime
+) -> dict[int, int]:
+    return dict(
+        PathfinderHikeGameParticipation.objects.filter(
+            xuid__in=xuids, created_at__range=[start_time, end_time]
         )
+        .order_by()
+        .values("xuid")
+        .annotate(count=Count("pk"))
+        .values_list("xuid", "count")
+    )
 
-        # Gone Hiking: Participate in Pathfinder Hikes playtesting in-game
-        hike_game_participations = PathfinderHikeGameParticipation.objects.filter(
-            xuid=xuid, created_at__range=[start_time, end_time]
-        ).count()
 
-        # Forged in Fire: Play hours of custom games on Forge maps
-        custom_seconds_played = 0
-        for match in custom_matches_sorted:
-            if match.get("MatchInfo", {}).get("LevelId", {}) in LEVEL_IDS_FORGE:
-                match_start = datetime.datetime.strptime(
-                    match.get("MatchInfo", {})
-                    .get("StartTime", None)
-                    .rstrip("Z")
-                    .split(".")[0],
-                    "%Y-%m-%dT%H:%M:%S",
-                ).replace(tzinfo=datetime.timezone.utc)
-                match_end = datetime.datetime.strptime(
-                    match.get("MatchInfo", {})
-                    .get("EndTime", None)
-                    .rstrip("Z")
-                    .split(".")[0],
-                    "%Y-%m-%dT%H:%M:%S",
-                ).replace(tzinfo=datetime.timezone.utc)
-                custom_seconds_played += (match_end - match_start).total_seconds()
-        forge_custom_game_hours = int(custom_seconds_played / 3600)
-
-        earn_dict[xuid] = {
-            "gone_hiking": min(hike_game_participations, 25) * 10,  # Max 25 per account
-            "forged_in_fire": min(forge_custom_game_hours, 200),
-        }
+@read_from_replica()
+def get_weekly_recap_counts(
+    start_time: datetime.datetime, end_time: datetime.datetime
+) -> dict[str, int]:
+    return {
+        "hiker_count": PathfinderHikeGameParticipation.objects.filter(
+            created_at__range=[start_time, end_time]
+        )
+        .values("xuid")
+        .distinct()
+        .count(),
+        "hike_submission_count": PathfinderHikeSubmission.objects.filter(
+            created_at__range=[start_time, end_time]
+        ).count(),
+        "waywo_comment_count": PathfinderWAYWOComment.objects.filter(
+            created_at__range=[start_time, end_time]
+        ).count(),
+        "waywo_post_count": PathfinderWAYWOPost.objects.filter(
+            created_at__range=[start_time, end_time]
+        ).count(),
+    }
+
+
+def get_e1_xbox_earn_dict(xuids: list[int]) -> dict[int, dict[str, int]]:
+    start_time, end_time = get_start_and_end_times_for_era(1)
+    earn_dict = get_era_xbox_earn_dict("pathfinder", xuids, 1)
+
+    # Gone Hiking: Participate in Pathfinder Hikes playtesting in-game
+    hike_game_participations = get_hike_game_participation_counts(
+        xuids, start_time, end_time
+    )
+    for xuid in xuids:
+        earn_dict[xuid]["gone_hiking"] = (
+            min(hike_game_participations.get(xuid, 0), 25) * 10
+        )  # Max 25 per account
     return earn_dict
 
 
 def get_e2_discord_earn_dict(discord_ids: list[str]) -> dict[str, dict[str, int]]:
     start_time, end_time = get_start_and_end_times_for_era(2)
-    annotated_discord_accounts = DiscordAccount.objects.annotate(
-        hike_submissions=Count(
-            "pathfinder_hike_submitters",
-            distinct=True,
-            filter=Q(
-                pathfinder_hike_submitters__map_submitter_discord_id__in=discord_ids,
-                pathfinder_hike_submitters__created_at__range=[
-                    start_time,
-                    end_time,
-                ],
-            ),
+    annotated_discord_accounts = DiscordAccount.objects.filter(
+        discord_id__in=discord_ids
+    ).annotate(
+        hike_submissions=get_era_activity_count(
+            PathfinderHikeSubmission,
+            "map_submitter_discord",
+            start_time,
+            end_time,
         ),
-        waywo_posts=Count(
-            "pathfinder_waywo_posters",
-            distinct=True,
-            filter=Q(
-                pathfinder_waywo_posters__poster_discord_id__in=discord_ids,
-                pathfinder_waywo_posters__created_at__range=[
-                    start_time,
-                    end_time,
-                ],
-            ),
+        waywo_posts=get_era_activity_count(
+            PathfinderWAYWOPost, "poster_discord", start_time, end_time
         ),
-        waywo_comments=Count(
-            "pathfinder_waywo_commenters",
-            distinct=True,
-            filter=Q(
-                pathfinder_waywo_commenters__commenter_discord_id__in=discord_ids,
-                pathfinder_waywo_commenters__created_at__range=[
-                    start_time,
-                    end_time,
-                ],
-            ),
+        waywo_comments=get_era_activity_count(
+            PathfinderWAYWOComment,
+            "commenter_discord",
+            start_time,
+            end_time,
         ),
-    ).filter(discord_id__in=discord_ids)
+    )
 
     earn_dict = {}
     for account in annotated_discord_accounts:
@@ -193,76 +283,34 @@ def get_e2_discord_earn_dict(discord_ids: list[str]) -> dict[str, dict[str, int]
 
 def get_e2_xbox_earn_dict(xuids: list[int]) -> dict[int, dict[str, int]]:
     start_time, end_time = get_start_and_end_times_for_era(2)
-    earn_dict = {}
-    for xuid in xuids:
-        # Get custom matches for this XUID
-        custom_matches = get_era_custom_matches_for_xuid(xuid, 2)
-        custom_matches_sorted = sorted(
-            custom_matches,
-            key=lambda m: datetime.datetime.fromisoformat(
-                m.get("MatchInfo", {}).get("EndTime")
-            ),
-        )
-
-        # Gone Hiking: Participate in Pathfinder Hikes playtesting in-game
-        hike_game_participations = PathfinderHikeGameParticipation.objects.filter(
-            xuid=xuid, created_at__range=[start_time, end_time]
-        ).count()
+    earn_dict = get_era_xbox_earn_dict("pathfinder", xuids, 2)
 
-        # Forged in Fire: Play hours of custom games on Forge maps
-        custom_seconds_played = 0
-        for match in custom_matches_sorted:
-            if match.get("MatchInfo", {}).get("LevelId", {}) in LEVEL_IDS_FORGE:
-                match_start = datetime.datetime.strptime(
-                    match.get("MatchInfo", {})
-                    .get("StartTime", None)
-                    .rstrip("Z")
-                    .split(".")[0],
-                    "%Y-%m-%dT%H:%M:%S",
-                ).replace(tzinfo=datetime.timezone.utc)
-                match_end = datetime.datetime.strptime(
-                    match.get("MatchInfo", {})
-                    .get("EndTime", None)
-                    .rstrip("Z")
-                    .split(".")[0],
-                    "%Y-%m-%dT%H:%M:%S",
-                ).replace(tzinfo=datetime.timezone.utc)
-                custom_seconds_played += (match_end - match_start).total_seconds()
-        forge_custom_game_hours = int(custom_seconds_played / 3600)
-
-        earn_dict[xuid] = {
-            "gone_hiking": min(hike_game_participations, 25) * 10,  # Max 25 per account
-            "forged_in_fire": min(forge_custom_game_hours, 200),
-        }
+    # Gone Hiking: Participate in Pathfinder Hikes playtesting in-game
+    hike_game_participations = get_hike_game_participation_counts(
+        xuids, start_time, end_time
+    )
+    for xuid in xuids:
+        earn_dict[xuid]["gone_hiking"] = (
+            min(hike_game_participations.get(xuid, 0), 25) * 10
+        )  # Max 25 per account
     return earn_dict
 
 
 def get_e3_discord_earn_dict(discord_ids: list[str]) -> dict[str, dict[str, int]]:
     start_time, end_time = get_start_and_end_times_for_era(3)
-    annotated_discord_accounts = DiscordAccount.objects.annotate(
-        waywo_posts=Count(
-            "pathfinder_waywo_posters",
-            distinct=True,
-            filter=Q(
-                pathfinder_waywo_posters__poster_discord_id__in=discord_ids,
-                pathfinder_waywo_posters__created_at__range=[
-                    start_time,
-                    end_time,
-                ],
-            ),
+    annotated_discord_accounts = DiscordAccount.objects.filter(
+        discord_id__in=discord_ids
+    ).annotate(
+        waywo_posts=get_era_activity_count(
+            PathfinderWAYWOPost, "poster_discord", start_time, end_time
         ),
-        waywo_comments=Count(
-            "pathfinder_waywo_commenters",
-            distinct=True,
-            filter=Q(
-                pathfinder_waywo_commenters__commenter_discord_id__in=discord_ids,
-                pathfinder_waywo_commenters__created_at__range=[
-                    start_time,
-                    end_time,
-                ],
-            ),
+        waywo_comments=get_era_activity_count(
+            PathfinderWAYWOComment,
+            "commenter_discord",
+            start_time,
+            end_time,
         ),
-    ).filter(discord_id__in=discord_ids)
+    )
 
     earn_dict = {}
     for account in annotated_discord_accounts:
@@ -275,39 +323,25 @@ def get_e3_discord_earn_dict(discord_ids: list[str]) -> dict[str, dict[str, int]
 
 
 def get_e3_xbox_earn_dict(xuids: list[int]) -> dict[int, dict[str, int]]:
-    earn_dict = {}
-    for xuid in xuids:
-        # Get custom matches for this XUID
-        custom_matches = get_era_custom_matches_for_xuid(xuid, 3)
-        custom_matches_sorted = sorted(
-            custom_matches,
-            key=lambda m: datetime.datetime.fromisoformat(
-                m.get("MatchInfo", {}).get("EndTime")
-            ),
-        )
+    return get_era_xbox_earn_dict("pathfinder", xuids, 3)
+
+
+def is_forge_match(match: dict) -> bool:
+    return match.get("MatchInfo", {}).get("LevelId") in LEVEL_IDS_FORGE
 
+
+# Match-based Dynamo Challenges for each Era, scored against custom matches by `get_era_xbox_earn_dict`
+ERA_XBOX_EARN_RULES = {
+    era: [
         # Forged in Fire: Play hours of custom games on Forge maps
-        custom_seconds_played = 0
-        for match in custom_matches_sorted:
-            if match.get("MatchInfo", {}).get("LevelId", {}) in LEVEL_IDS_FORGE:
-                match_start = datetime.datetime.strptime(
-                    match.get("MatchInfo", {})
-                    .get("StartTime", None)
-                    .rstrip("Z")
-                    .split(".")[0],
-                    "%Y-%m-%dT%H:%M:%S",
-                ).replace(tzinfo=datetime.timezone.utc)
-                match_end = datetime.datetime.strptime(
-                    match.get("MatchInfo", {})
-                    .get("EndTime", None)
-                    .rstrip("Z")
-                    .split(".")[0],
-                    "%Y-%m-%dT%H:%M:%S",
-                ).replace(tzinfo=datetime.timezone.utc)
-                custom_seconds_played += (match_end - match_start).total_seconds()
-        forge_custom_game_hours = int(custom_seconds_played / 3600)
-
-        earn_dict[xuid] = {
-            "forged_in_fire": min(forge_custom_game_hours, 300),
-        }
-    return earn_dict
+        {
+            "key": "forged_in_fire",
+            "predicate": is_forge_match,
+            "value": get_match_duration_seconds,
+            "unit": 3600,
+            "cap": forged_in_fire_cap,
+            "points": 1,
+        },
+    ]
+    for era, forged_in_fire_cap in ((1, 200), (2, 200), (3, 300))
+}
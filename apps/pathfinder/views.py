@@ -1,6 +1,7 @@
 import datetime
 import logging
 
+from asgiref.sync import sync_to_async
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.exceptions import APIException, PermissionDenied
@@ -8,17 +9,23 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.discord.models import DiscordAccount
-from apps.discord.utils import update_or_create_discord_account
+from apps.discord.utils import (
+    bulk_update_or_create_discord_accounts,
+    update_or_create_discord_account,
+)
 from apps.halo_infinite.api.search import search_halofuntime_popular
 from apps.halo_infinite.constants import SEARCH_ASSET_KINDS
 from apps.halo_infinite.exceptions import MissingEraDataException
 from apps.halo_infinite.utils import (
+    awarm_era_xbox_earns,
     get_contributor_xuids_for_maps_in_active_playlists,
     get_current_era,
     get_waypoint_file_url,
 )
 from apps.link.models import DiscordXboxLiveLink
+from apps.overrides.views import AsyncAPIView
 from apps.pathfinder.models import (
+    PathfinderBeanTransaction,
     PathfinderHikeGameParticipation,
     PathfinderHikeSubmission,
     PathfinderHikeVoiceParticipation,
@@ -59,6 +66,7 @@ from apps.pathfinder.utils import (
     BEAN_AWARD_WAYWO_COMMENT,
     BEAN_COST_HIKE_SUBMISSION,
     PATHFINDER_WAYWO_COMMENT_MIN_LENGTH_FOR_BEAN_AWARD,
+    award_beans,
     change_beans,
     check_beans,
     get_e1_discord_earn_dict,
@@ -67,6 +75,7 @@ from apps.pathfinder.utils import (
     get_e2_xbox_earn_dict,
     get_e3_discord_earn_dict,
     get_e3_xbox_earn_dict,
+    get_weekly_recap_counts,
 )
 from config.serializers import StandardErrorSerializer
 
@@ -182,55 +191,80 @@ class HikeCompleteView(APIView):
             hike_submission.save()
 
             # Save records for every DiscordAccount represented in `discord_users_in_voice`
-            discord_accounts = []
-            for discord_user in discord_users_in_voice:
-                try:
-                    discord_account = update_or_create_discord_account(
-                        discord_user.get("discordId"),
-                        discord_user.get("discordUsername"),
-                        request.user,
-                    )
-                except Exception as ex:
-                    logger.error(ex)
-                    raise APIException(
-                        "Error attempting to complete a Pathfinder Hike Submission."
-                    )
-                discord_accounts.append(discord_account)
-            for discord_account in discord_accounts:
-                PathfinderHikeVoiceParticipation.objects.create(
-                    creator=request.user,
-                    hike_submission=hike_submission,
-                    discord=discord_account,
+            try:
+                discord_accounts_by_id = bulk_update_or_create_discord_accounts(
+                    {
+                        discord_user.get("discordId"): discord_user.get(
+                            "discordUsername"
+                        )
+                        for discord_user in discord_users_in_voice
+                    },
+                    request.user,
+                )
+            except Exception as ex:
+                logger.error(ex)
+                raise APIException(
+                    "Error attempting to complete a Pathfinder Hike Submission."
                 )
+            voice_participations = PathfinderHikeVoiceParticipation.objects.bulk_create(
+                [
+                    PathfinderHikeVoiceParticipation(
+                        creator=request.user,
+                        hike_submission=hike_submission,
+                        discord_id=discord_user.get("discordId"),
+                    )
+                    for discord_user in discord_users_in_voice
+                ]
+            )
 
-            # Award Pathfinder Beans
-            for game_participation in PathfinderHikeGameParticipation.objects.filter(
-                hike_submission=hike_submission
-            ):
-                try:
-                    link = DiscordXboxLiveLink.objects.filter(
-                        xbox_live_account_id=game_participation.xuid
-                    ).get()
-                except DiscordXboxLiveLink.DoesNotExist:
+            # Award Pathfinder Beans, newest participations first
+            game_participation_xuids = list(
+                PathfinderHikeGameParticipation.objects.filter(
+                    hike_submission=hike_submission
+                )
+                .order_by("-created_at", "-xuid")
+                .values_list("xuid", flat=True)
+            )
+            discord_ids_by_xuid = dict(
+                DiscordXboxLiveLink.objects.filter(
+                    xbox_live_account_id__in=game_participation_xuids
+                ).values_list("xbox_live_account_id", "discord_account_id")
+            )
+            for xuid in game_participation_xuids:
+                if xuid not in discord_ids_by_xuid:
                     continue
-                if link.discord_account_id not in account_ids_to_beans_awarded:
-                    account_ids_to_beans_awarded[link.discord_account_id] = 0
+                discord_id = discord_ids_by_xuid[xuid]
+                if discord_id not in account_ids_to_beans_awarded:
+                    account_ids_to_beans_awarded[discord_id] = 0
                 account_ids_to_beans_awarded[
-                    link.discord_account_id
+                    discord_id
                 ] += BEAN_AWARD_HIKE_GAME_PARTICIPATION
-            for voice_participation in PathfinderHikeVoiceParticipation.objects.filter(
-                hike_submission=hike_submission
-            ):
+            for voice_participation in reversed(voice_participations):
                 if voice_participation.discord_id not in account_ids_to_beans_awarded:
                     account_ids_to_beans_awarded[voice_participation.discord_id] = 0
                 account_ids_to_beans_awarded[
                     voice_participation.discord_id
                 ] += BEAN_AWARD_HIKE_VOICE_PARTICIPATION
+            # Game participants linked to a Discord account not in voice still need their account details
+            discord_accounts_by_id.update(
+                DiscordAccount.objects.in_bulk(
+                    [
+                        discord_id
+                        for discord_id in account_ids_to_beans_awarded
+                        if discord_id not in discord_accounts_by_id
+                    ]
+                )
+            )
             awarded_users = []
+            successes = award_beans(
+                account_ids_to_beans_awarded,
+                request.user,
+                PathfinderBeanTransaction.Reasons.HIKE_COMPLETE,
+            )
             for discord_id in account_ids_to_beans_awarded:
                 beans_to_award = account_ids_to_beans_awarded[discord_id]
-                discord_account = DiscordAccount.objects.get(discord_id=discord_id)
-                success = change_beans(discord_account, beans_to_award)
+                discord_account = discord_accounts_by_id[discord_id]
+                success = successes[discord_id]
                 awarded_users.append(
                     DiscordUserAwardedBeansSerializer(
                         {
@@ -366,7 +400,11 @@ class HikeSubmissionView(APIView):
                 )
             # Try subtracting the beans, and create the submission if it works
             try:
-                if change_beans(map_submitter_discord, -1 * BEAN_COST_HIKE_SUBMISSION):
+                if change_beans(
+                    map_submitter_discord,
+                    -1 * BEAN_COST_HIKE_SUBMISSION,
+                    PathfinderBeanTransaction.Reasons.HIKE_SUBMISSION,
+                ):
                     PathfinderHikeSubmission.objects.create(
                         creator=request.user,
                         waywo_post_title=waywo_post_title,
@@ -529,7 +567,9 @@ class PathfinderWAYWOCommentView(APIView):
                     >= PATHFINDER_WAYWO_COMMENT_MIN_LENGTH_FOR_BEAN_AWARD
                 ):
                     awarded_bean = change_beans(
-                        commenter_discord, BEAN_AWARD_WAYWO_COMMENT
+                        commenter_discord,
+                        BEAN_AWARD_WAYWO_COMMENT,
+                        PathfinderBeanTransaction.Reasons.WAYWO_COMMENT,
                     )
             except Exception as ex:
                 logger.error(ex)
@@ -584,7 +624,7 @@ class PathfinderWAYWOPostView(APIView):
             return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class PathfinderDynamoProgressView(APIView):
+class PathfinderDynamoProgressView(AsyncAPIView):
     @extend_schema(
         request=PathfinderDynamoProgressRequestSerializer,
         responses={
@@ -593,7 +633,7 @@ class PathfinderDynamoProgressView(APIView):
             500: StandardErrorSerializer,
         },
     )
-    def post(self, request, format=None):
+    async def post(self, request, format=None):
         """
         Evaluate an individual Discord ID's progress toward the Pathfinder Dynamo role.
         """
@@ -619,14 +659,14 @@ class PathfinderDynamoProgressView(APIView):
                 assert era is not None
 
                 # Upsert the DiscordAccount & find a link record
-                discord_account = update_or_create_discord_account(
+                discord_account = await sync_to_async(update_or_create_discord_account)(
                     discord_id, discord_username, request.user
                 )
                 link = None
                 try:
-                    link = DiscordXboxLiveLink.objects.filter(
+                    link = await DiscordXboxLiveLink.objects.filter(
                         discord_account_id=discord_account.discord_id, verified=True
-                    ).get()
+                    ).aget()
                 except DiscordXboxLiveLink.DoesNotExist:
                     pass
             except Exception as ex:
@@ -635,11 +675,18 @@ class PathfinderDynamoProgressView(APIView):
             serializer_class = None
             serializable_dict = {}
             try:
+                # Fetch the linked player's match history on the event loop, so the tallies below read their
+                # match-based earns from the cache
+                if link is not None:
+                    await awarm_era_xbox_earns([link.xbox_live_account_id], era)
+
                 if era == 1:
                     serializer_class = PathfinderDynamoEra1ProgressResponseSerializer
                     # Tally the Discord Points
-                    discord_earns = get_e1_discord_earn_dict(
-                        [discord_account.discord_id]
+                    discord_earns = (
+                        await sync_to_async(get_e1_discord_earn_dict)(
+                            [discord_account.discord_id]
+                        )
                     ).get(discord_account.discord_id)
                     serializable_dict["pointsBeanSpender"] = discord_earns.get(
                         "bean_spender", 0
@@ -654,8 +701,10 @@ class PathfinderDynamoProgressView(APIView):
                     # Tally the Xbox Points
                     xbox_earns = {}
                     if link is not None:
-                        xbox_earns = get_e1_xbox_earn_dict(
-                            [link.xbox_live_account_id]
+                        xbox_earns = (
+                            await sync_to_async(get_e1_xbox_earn_dict)(
+                                [link.xbox_live_account_id]
+                            )
                         ).get(link.xbox_live_account_id)
                     serializable_dict["pointsGoneHiking"] = xbox_earns.get(
                         "gone_hiking", 0
@@ -666,8 +715,10 @@ class PathfinderDynamoProgressView(APIView):
                 elif era == 2:
                     serializer_class = PathfinderDynamoEra2ProgressResponseSerializer
                     # Tally the Discord Points
-                    discord_earns = get_e2_discord_earn_dict(
-                        [discord_account.discord_id]
+                    discord_earns = (
+                        await sync_to_async(get_e2_discord_earn_dict)(
+                            [discord_account.discord_id]
+                        )
                     ).get(discord_account.discord_id)
                     serializable_dict["pointsBeanSpender"] = discord_earns.get(
                         "bean_spender", 0
@@ -682,8 +733,10 @@ class PathfinderDynamoProgressView(APIView):
                     # Tally the Xbox Points
                     xbox_earns = {}
                     if link is not None:
-                        xbox_earns = get_e2_xbox_earn_dict(
-                            [link.xbox_live_account_id]
+                        xbox_earns = (
+                            await sync_to_async(get_e2_xbox_earn_dict)(
+                                [link.xbox_live_account_id]
+                            )
                         ).get(link.xbox_live_account_id)
                     serializable_dict["pointsGoneHiking"] = xbox_earns.get(
                         "gone_hiking", 0
@@ -694,8 +747,10 @@ class PathfinderDynamoProgressView(APIView):
                 elif era == 3:
                     serializer_class = PathfinderDynamoEra3ProgressResponseSerializer
                     # Tally the Discord Points
-                    discord_earns = get_e3_discord_earn_dict(
-                        [discord_account.discord_id]
+                    discord_earns = (
+                        await sync_to_async(get_e3_discord_earn_dict)(
+                            [discord_account.discord_id]
+                        )
                     ).get(discord_account.discord_id)
                     serializable_dict["pointsWhatAreYouWorkingOn"] = discord_earns.get(
                         "what_are_you_working_on", 0
@@ -707,8 +762,10 @@ class PathfinderDynamoProgressView(APIView):
                     # Tally the Xbox Points
                     xbox_earns = {}
                     if link is not None:
-                        xbox_earns = get_e3_xbox_earn_dict(
-                            [link.xbox_live_account_id]
+                        xbox_earns = (
+                            await sync_to_async(get_e3_xbox_earn_dict)(
+                                [link.xbox_live_account_id]
+                            )
                         ).get(link.xbox_live_account_id)
                     serializable_dict["pointsForgedInFire"] = xbox_earns.get(
                         "forged_in_fire", 0
@@ -808,41 +865,45 @@ class WeeklyRecapView(APIView):
             discord_users_awarded_beans = validation_serializer.data.get(
                 "discordUsersAwardedBeans"
             )
+            # Count the past week's activity before any Beans are awarded, while it can still be read from the replica
+            end_time = now_utc()
+            start_time = end_time + datetime.timedelta(days=-7)
+            recap_counts = get_weekly_recap_counts(start_time, end_time)
             # Award Beans as instructed
-            for discord_user in discord_users_awarded_beans:
-                try:
-                    discord_account = update_or_create_discord_account(
-                        discord_user.get("discordId"),
-                        discord_user.get("discordUsername"),
-                        request.user,
-                    )
-                    success = change_beans(
-                        discord_account, discord_user.get("awardedBeans")
+            try:
+                bulk_update_or_create_discord_accounts(
+                    {
+                        discord_user.get("discordId"): discord_user.get(
+                            "discordUsername"
+                        )
+                        for discord_user in discord_users_awarded_beans
+                    },
+                    request.user,
+                )
+                bean_deltas_by_discord_id = {}
+                for discord_user in discord_users_awarded_beans:
+                    discord_id = discord_user.get("discordId")
+                    bean_deltas_by_discord_id[
+                        discord_id
+                    ] = bean_deltas_by_discord_id.get(discord_id, 0) + discord_user.get(
+                        "awardedBeans"
                     )
-                    assert success
-                except Exception as ex:
-                    logger.error(ex)
-                    raise APIException("Error attempting the Pathfinder Weekly Recap.")
+                successes = award_beans(
+                    bean_deltas_by_discord_id,
+                    request.user,
+                    PathfinderBeanTransaction.Reasons.WEEKLY_RECAP,
+                )
+                assert all(successes.values())
+            except Exception as ex:
+                logger.error(ex)
+                raise APIException("Error attempting the Pathfinder Weekly Recap.")
             # Return weekly recap data
-            end_time = now_utc()
-            start_time = end_time + datetime.timedelta(days=-7)
             serializer = WeeklyRecapResponseSerializer(
                 {
-                    "hikerCount": PathfinderHikeGameParticipation.objects.filter(
-                        created_at__range=[start_time, end_time]
-                    )
-                    .values("xuid")
-                    .distinct()
-                    .count(),
-                    "hikeSubmissionCount": PathfinderHikeSubmission.objects.filter(
-                        created_at__range=[start_time, end_time]
-                    ).count(),
-                    "waywoCommentCount": PathfinderWAYWOComment.objects.filter(
-                        created_at__range=[start_time, end_time]
-                    ).count(),
-                    "waywoPostCount": PathfinderWAYWOPost.objects.filter(
-                        created_at__range=[start_time, end_time]
-                    ).count(),
+                    "hikerCount": recap_counts.get("hiker_count"),
+                    "hikeSubmissionCount": recap_counts.get("hike_submission_count"),
+                    "waywoCommentCount": recap_counts.get("waywo_comment_count"),
+                    "waywoPostCount": recap_counts.get("waywo_post_count"),
                 }
             )
             return Response(serializer.data, status=status.HTTP_200_OK)
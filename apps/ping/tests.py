@@ -5,6 +5,9 @@ from rest_framework.test import APIClient, APITestCase
 
 
 class PingTestCase(APITestCase):
+    # Ping checks a random connection, which includes the replica when USE_READ_REPLICA is set
+    databases = "__all__"
+
     def setUp(self):
         self.client = APIClient()
 
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ReputationConfig(AppConfig):
     name = "apps.reputation"
+
+    def ready(self):
+        import apps.reputation.signals  # noqa
@@ -0,0 +1,173 @@
+# Generated by Django 5.1.4 on 2026-10-19 03:41
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Min
+from django.db.models.functions import TruncDate
+
+
+def backfill_plus_rep_tallies(apps, schema_editor):
+    PlusRep = apps.get_model("reputation", "PlusRep")
+    PlusRepDailyTally = apps.get_model("reputation", "PlusRepDailyTally")
+    PlusRepGiverTally = apps.get_model("reputation", "PlusRepGiverTally")
+    PlusRepDailyTally.objects.bulk_create(
+        [
+            PlusRepDailyTally(
+                receiver_id=row["receiver_id"],
+                day=row["day"],
+                total=row["total"],
+                creator_id=row["first_creator_id"],
+            )
+            for row in PlusRep.objects.annotate(day=TruncDate("created_at"))
+            .values("receiver_id", "day")
+            .annotate(total=Count("id"), first_creator_id=Min("creator_id"))
+            .order_by()
+        ],
+        batch_size=1000,
+    )
+    PlusRepGiverTally.objects.bulk_create(
+        [
+            PlusRepGiverTally(
+                receiver_id=row["receiver_id"],
+                giver_id=row["giver_id"],
+                latest_at=row["latest_at"],
+                creator_id=row["first_creator_id"],
+            )
+            for row in PlusRep.objects.values("receiver_id", "giver_id")
+            .annotate(latest_at=Max("created_at"), first_creator_id=Min("creator_id"))
+            .order_by()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("discord", "0006_alter_discordaccount_created_at_and_more"),
+        ("reputation", "0002_alter_plusrep_created_at_alter_plusrep_updated_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlusRepDailyTally",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("day", models.DateField(verbose_name="Day (UTC)")),
+                ("total", models.PositiveIntegerField(default=0, verbose_name="Total")),
+                (
+                    "creator",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.RESTRICT,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "receiver",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="plus_rep_daily_tallies",
+                        to="discord.discordaccount",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Plus Rep Daily Tally",
+                "verbose_name_plural": "Plus Rep Daily Tallies",
+                "db_table": "PlusRepDailyTally",
+                "ordering": ["-day"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("receiver", "day"), name="unique_plus_rep_daily_tally"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="PlusRepGiverTally",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("latest_at", models.DateTimeField(verbose_name="Latest At")),
+                (
+                    "creator",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.RESTRICT,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "giver",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="discord.discordaccount",
+                    ),
+                ),
+                (
+                    "receiver",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="plus_rep_giver_tallies",
+                        to="discord.discordaccount",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Plus Rep Giver Tally",
+                "verbose_name_plural": "Plus Rep Giver Tallies",
+                "db_table": "PlusRepGiverTally",
+                "ordering": ["-latest_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["receiver", "latest_at"],
+                        name="PlusRepGive_receive_b58335_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("receiver", "giver"), name="unique_plus_rep_giver_tally"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            backfill_plus_rep_tallies, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.4 on 2026-10-19 03:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("discord", "0006_alter_discordaccount_created_at_and_more"),
+        ("reputation", "0003_plusrepdailytally_plusrepgivertally"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="plusrep",
+            index=models.Index(
+                fields=["giver", "created_at"], name="PlusRep_giver_i_409ad9_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="plusrep",
+            index=models.Index(
+                fields=["receiver", "created_at"], name="PlusRep_receive_7fb2f1_idx"
+            ),
+        ),
+    ]
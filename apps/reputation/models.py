@@ -8,6 +8,10 @@ class PlusRep(Base):
     class Meta:
         db_table = "PlusRep"
         ordering = ["-updated_at"]
+        indexes = [
+            models.Index(fields=["giver", "created_at"]),
+            models.Index(fields=["receiver", "created_at"]),
+        ]
         verbose_name = "Plus Rep"
         verbose_name_plural = "Plus Reps"
 
@@ -25,3 +29,50 @@ class PlusRep(Base):
 
     def __str__(self):
         return self.short_message
+
+
+class PlusRepDailyTally(Base):
+    class Meta:
+        db_table = "PlusRepDailyTally"
+        ordering = ["-day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["receiver", "day"], name="unique_plus_rep_daily_tally"
+            )
+        ]
+        verbose_name = "Plus Rep Daily Tally"
+        verbose_name_plural = "Plus Rep Daily Tallies"
+
+    receiver = models.ForeignKey(
+        DiscordAccount, on_delete=models.CASCADE, related_name="plus_rep_daily_tallies"
+    )
+    day = models.DateField(verbose_name="Day (UTC)")
+    total = models.PositiveIntegerField(default=0, verbose_name="Total")
+
+    def __str__(self):
+        return f"{self.receiver} on {self.day}: {self.total}"
+
+
+class PlusRepGiverTally(Base):
+    class Meta:
+        db_table = "PlusRepGiverTally"
+        ordering = ["-latest_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["receiver", "giver"], name="unique_plus_rep_giver_tally"
+            )
+        ]
+        indexes = [models.Index(fields=["receiver", "latest_at"])]
+        verbose_name = "Plus Rep Giver Tally"
+        verbose_name_plural = "Plus Rep Giver Tallies"
+
+    receiver = models.ForeignKey(
+        DiscordAccount, on_delete=models.CASCADE, related_name="plus_rep_giver_tallies"
+    )
+    giver = models.ForeignKey(
+        DiscordAccount, on_delete=models.CASCADE, related_name="+"
+    )
+    latest_at = models.DateTimeField(verbose_name="Latest At")
+
+    def __str__(self):
+        return f"{self.giver} to {self.receiver}"
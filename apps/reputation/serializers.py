@@ -53,6 +53,7 @@ class PlusRepRequestSerializer(serializers.Serializer):
 
 class PlusRepResponseSerializer(serializers.Serializer):
     success = serializers.BooleanField()
+    thisWeekRepRemaining = serializers.IntegerField()
 
 
 class TopRepErrorSerializer(serializers.Serializer):
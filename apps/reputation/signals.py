@@ -0,0 +1,52 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.reputation.models import PlusRep
+from apps.reputation.utils import (
+    count_plus_rep_in_tallies,
+    get_utc_day,
+    refresh_plus_rep_tallies,
+)
+
+
+@receiver(pre_save, sender=PlusRep)
+def plus_rep_pre_save(sender, instance, **kwargs):
+    # Remember which tallies the row counted towards before an edit so they can be refreshed as well
+    instance._previous_tally_keys = None
+    if not instance._state.adding:
+        previous = (
+            PlusRep.objects.filter(pk=instance.pk)
+            .values("receiver_id", "giver_id", "created_at")
+            .first()
+        )
+        if previous is not None:
+            instance._previous_tally_keys = (
+                previous["receiver_id"],
+                previous["giver_id"],
+                get_utc_day(previous["created_at"]),
+            )
+
+
+@receiver(post_save, sender=PlusRep)
+def plus_rep_post_save(sender, instance, created, **kwargs):
+    if created:
+        count_plus_rep_in_tallies(instance)
+        return
+    tally_keys = {
+        (instance.receiver_id, instance.giver_id, get_utc_day(instance.created_at))
+    }
+    previous_tally_keys = getattr(instance, "_previous_tally_keys", None)
+    if previous_tally_keys is not None:
+        tally_keys.add(previous_tally_keys)
+    for receiver_id, giver_id, day in tally_keys:
+        refresh_plus_rep_tallies(receiver_id, giver_id, day, instance.creator)
+
+
+@receiver(post_delete, sender=PlusRep)
+def plus_rep_post_delete(sender, instance, **kwargs):
+    refresh_plus_rep_tallies(
+        instance.receiver_id,
+        instance.giver_id,
+        get_utc_day(instance.created_at),
+        instance.creator,
+    )
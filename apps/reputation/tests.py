@@ -6,16 +6,15 @@ from django.contrib.auth.models import User
 from django.test import TestCase
 from rest_framework.authtoken.models import Token
 from rest_framework.exceptions import ErrorDetail
-from rest_framework.test import APIClient, APITestCase
+from rest_framework.test import APIClient, APITestCase, APITransactionTestCase
 
 from apps.discord.models import DiscordAccount
 from apps.discord.utils import update_or_create_discord_account
-from apps.reputation.models import PlusRep
+from apps.reputation.models import PlusRep, PlusRepDailyTally, PlusRepGiverTally
 from apps.reputation.utils import (
-    can_giver_send_rep,
-    can_giver_send_rep_to_receiver,
     check_past_year_rep,
     count_plus_rep_given_in_current_week,
+    create_new_plus_rep,
     get_current_week_start_time,
     get_partytimers_past_year,
     get_time_until_reset,
@@ -389,14 +388,7 @@ class PlusRepTestCase(APITestCase):
         token, _created = Token.objects.get_or_create(user=self.user)
         self.client = APIClient(HTTP_AUTHORIZATION="Bearer " + token.key)
 
-    @patch("apps.reputation.utils.can_giver_send_rep_to_receiver")
-    @patch("apps.reputation.utils.can_giver_send_rep")
-    def test_plus_rep(
-        self, mock_can_giver_send_rep, mock_can_giver_send_rep_to_receiver
-    ):
-        mock_can_giver_send_rep.return_value = True
-        mock_can_giver_send_rep_to_receiver.return_value = True
-
+    def test_plus_rep(self):
         # Missing 'giverDiscordId' throws error
         response = self.client.post("/reputation/plus-rep", {}, format="json")
         self.assertEqual(response.status_code, 400)
@@ -486,7 +478,7 @@ class PlusRepTestCase(APITestCase):
             format="json",
         )
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.data, {"success": True})
+        self.assertEqual(response.data, {"success": True, "thisWeekRepRemaining": 2})
         self.assertEqual(PlusRep.objects.count(), 1)
         plus_rep_1 = PlusRep.objects.order_by("-created_at").first()
         self.assertEqual(plus_rep_1.giver.discord_id, "1234")
@@ -508,7 +500,7 @@ class PlusRepTestCase(APITestCase):
             format="json",
         )
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.data, {"success": True})
+        self.assertEqual(response.data, {"success": True, "thisWeekRepRemaining": 1})
         self.assertEqual(PlusRep.objects.count(), 2)
         plus_rep_2 = PlusRep.objects.order_by("-created_at").first()
         self.assertEqual(plus_rep_2.giver.discord_id, "1234")
@@ -533,7 +525,7 @@ class PlusRepTestCase(APITestCase):
             format="json",
         )
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.data, {"success": True})
+        self.assertEqual(response.data, {"success": True, "thisWeekRepRemaining": 0})
         self.assertEqual(PlusRep.objects.count(), 3)
         plus_rep_3 = PlusRep.objects.order_by("-created_at").first()
         self.assertEqual(plus_rep_3.giver.discord_id, "1234")
@@ -542,13 +534,41 @@ class PlusRepTestCase(APITestCase):
         self.assertEqual(plus_rep_3.receiver.discord_username, "HFTIntern7890")
         self.assertEqual(plus_rep_3.message, "")
 
-        # 4: 403 if giver cannot send rep - no record created
-        mock_can_giver_send_rep.return_value = False
+        # 4: 403 if giver has used up their weekly rep - no record created
         response = self.client.post(
             "/reputation/plus-rep",
             {
                 "giverDiscordId": "1234",
                 "giverDiscordUsername": "HFTIntern1234",
+                "receiverDiscordId": "8901",
+                "receiverDiscordUsername": "HFTIntern8901",
+                "message": None,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data, {"error": REPUTATION_ERROR_FORBIDDEN})
+        self.assertEqual(PlusRep.objects.count(), 3)
+
+        # 5: 403 if giver already sent rep to receiver this week - no record created
+        response = self.client.post(
+            "/reputation/plus-rep",
+            {
+                "giverDiscordId": "6789",
+                "giverDiscordUsername": "HFTIntern6789",
+                "receiverDiscordId": "7890",
+                "receiverDiscordUsername": "HFTIntern7890",
+                "message": None,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(PlusRep.objects.count(), 4)
+        response = self.client.post(
+            "/reputation/plus-rep",
+            {
+                "giverDiscordId": "6789",
+                "giverDiscordUsername": "HFTIntern6789",
                 "receiverDiscordId": "7890",
                 "receiverDiscordUsername": "HFTIntern7890",
                 "message": None,
@@ -557,16 +577,14 @@ class PlusRepTestCase(APITestCase):
         )
         self.assertEqual(response.status_code, 403)
         self.assertEqual(response.data, {"error": REPUTATION_ERROR_FORBIDDEN})
-        self.assertEqual(PlusRep.objects.count(), 3)
+        self.assertEqual(PlusRep.objects.count(), 4)
 
-        # 5: 403 if giver cannot send rep to receiver - no record created
-        mock_can_giver_send_rep.return_value = True
-        mock_can_giver_send_rep_to_receiver.return_value = False
+        # 6: 403 if giver tries to send rep to themself - no record created
         response = self.client.post(
             "/reputation/plus-rep",
             {
-                "giverDiscordId": "1234",
-                "giverDiscordUsername": "HFTIntern1234",
+                "giverDiscordId": "7890",
+                "giverDiscordUsername": "HFTIntern7890",
                 "receiverDiscordId": "7890",
                 "receiverDiscordUsername": "HFTIntern7890",
                 "message": None,
@@ -575,7 +593,7 @@ class PlusRepTestCase(APITestCase):
         )
         self.assertEqual(response.status_code, 403)
         self.assertEqual(response.data, {"error": REPUTATION_ERROR_FORBIDDEN})
-        self.assertEqual(PlusRep.objects.count(), 3)
+        self.assertEqual(PlusRep.objects.count(), 4)
 
 
 class TopRepTestCase(APITestCase):
@@ -796,66 +814,57 @@ class TopRepTestCase(APITestCase):
         mock_get_top_rep_past_year.reset_mock()
 
 
-class UtilsTestCase(TestCase):
+class TopRepReplicaTestCase(APITransactionTestCase):
+    databases = "__all__"
+
     def setUp(self):
         self.user = User.objects.create_user(
             username="test", email="test@test.com", password="test"
         )
+        token, _created = Token.objects.get_or_create(user=self.user)
+        self.client = APIClient(HTTP_AUTHORIZATION="Bearer " + token.key)
 
-    @patch("apps.reputation.utils.count_plus_rep_given_in_current_week")
-    def test_can_giver_send_rep(self, mock_count_plus_rep_given_in_current_week):
-        giver = update_or_create_discord_account("1234", "ABCD#1234", self.user)
-        # Rep can be sent if a Discord Account has not yet sent any in the current week
-        mock_count_plus_rep_given_in_current_week.return_value = 0
-        self.assertTrue(can_giver_send_rep(giver))
-
-        # Rep can be sent if a Discord Account has sent one rep so far in the current week
-        mock_count_plus_rep_given_in_current_week.return_value = 1
-        self.assertTrue(can_giver_send_rep(giver))
-
-        # Rep can be sent if a Discord Account has sent two reps so far in the current week
-        mock_count_plus_rep_given_in_current_week.return_value = 2
-        self.assertTrue(can_giver_send_rep(giver))
-
-        # Rep cannot be sent if a Discord Account has sent three reps so far in the current week
-        mock_count_plus_rep_given_in_current_week.return_value = 3
-        self.assertFalse(can_giver_send_rep(giver))
-
-    @patch("apps.reputation.utils.get_current_week_start_time")
-    def test_can_giver_send_rep_to_receiver(self, mock_get_current_week_start_time):
-        giver = update_or_create_discord_account("1234", "ABCD#1234", self.user)
-        receiver = update_or_create_discord_account("5678", "EFGH#5678", self.user)
-        mock_get_current_week_start_time.return_value = datetime.datetime.fromisoformat(
-            "2023-01-03T11:00:00-07:00"
+    def test_top_rep_reads_from_replica(self):
+        # The test databases aren't replicated, so the rep tallies only exist on the replica
+        creator = User.objects.db_manager("replica").create_user(username="test")
+        receiver = DiscordAccount.objects.using("replica").create(
+            creator=creator, discord_id="0", discord_username="receiver"
         )
-        # Rep cannot be sent from a Discord Account to itself
-        self.assertFalse(can_giver_send_rep_to_receiver(giver, giver))
-        self.assertFalse(can_giver_send_rep_to_receiver(receiver, receiver))
-
-        # Rep can be sent if a Discord Account has not yet sent any to the receiver
-        self.assertTrue(can_giver_send_rep_to_receiver(giver, receiver))
-
-        # Rep can be sent if a Discord Account has sent one rep so far to the receiver, but in a previous week
-        plus_rep_old = plus_rep_factory(self.user, giver, receiver)
-        plus_rep_old.created_at = datetime.datetime.fromisoformat(
-            "2023-12-27T11:00:00-07:00"
+        giver = DiscordAccount.objects.using("replica").create(
+            creator=creator, discord_id="1", discord_username="giver"
+        )
+        two_days_ago = datetime.datetime.now(
+            tz=datetime.timezone.utc
+        ) - datetime.timedelta(days=2)
+        PlusRepDailyTally.objects.using("replica").create(
+            creator=creator, receiver=receiver, day=two_days_ago.date(), total=3
+        )
+        PlusRepGiverTally.objects.using("replica").create(
+            creator=creator, receiver=receiver, giver=giver, latest_at=two_days_ago
         )
-        plus_rep_old.save()
-        self.assertTrue(can_giver_send_rep_to_receiver(giver, receiver))
 
-        # Rep cannot be sent if a Discord Account has sent one rep so far to the receiver in the current week
-        plus_rep_1 = plus_rep_factory(self.user, giver, receiver)
-        plus_rep_1.created_at = datetime.datetime.fromisoformat(
-            "2023-01-03T11:00:00-07:00"
+        response = self.client.get("/reputation/top-rep")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data,
+            {
+                "topRepReceivers": [
+                    {
+                        "rank": 1,
+                        "discordId": "0",
+                        "pastYearTotalRep": 3,
+                        "pastYearUniqueRep": 1,
+                    }
+                ]
+            },
         )
-        plus_rep_1.save()
-        self.assertFalse(can_giver_send_rep_to_receiver(giver, receiver))
 
-        # Rep can be sent the following week (when no rep has been sent yet)
-        mock_get_current_week_start_time.return_value = datetime.datetime.fromisoformat(
-            "2023-01-10T11:00:00-07:00"
+
+class UtilsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="test", email="test@test.com", password="test"
         )
-        self.assertTrue(can_giver_send_rep_to_receiver(giver, receiver))
 
     @patch("apps.reputation.utils.get_current_time")
     def test_check_past_year_rep(self, mock_get_current_time):
@@ -1300,6 +1309,107 @@ class UtilsTestCase(TestCase):
         # Selecting 0 (with a bunch of rep in the DB) should still result in empty list
         self.assertEqual(get_partytimers_past_year(0, 1, 1), [])
 
+    def test_create_new_plus_rep(self):
+        giver = update_or_create_discord_account("1", "giver", self.user)
+        receivers = [
+            update_or_create_discord_account(f"{i}0", f"receiver{i}", self.user)
+            for i in range(4)
+        ]
+
+        # Each successful transaction reports the giver's remaining weekly rep
+        for i in range(3):
+            plus_rep, remaining_rep = create_new_plus_rep(
+                giver, receivers[i], "", self.user
+            )
+            self.assertIsNotNone(plus_rep)
+            self.assertEqual(remaining_rep, 2 - i)
+
+        # Weekly limit reached
+        self.assertEqual(
+            create_new_plus_rep(giver, receivers[3], "", self.user), (None, 0)
+        )
+        self.assertEqual(PlusRep.objects.count(), 3)
+
+        # Repeat receiver and self-rep are refused without using up rep
+        self.assertEqual(create_new_plus_rep(receivers[0], giver, "", self.user)[1], 2)
+        self.assertEqual(
+            create_new_plus_rep(receivers[0], giver, "", self.user), (None, 2)
+        )
+        self.assertEqual(
+            create_new_plus_rep(receivers[0], receivers[0], "", self.user), (None, 2)
+        )
+        self.assertEqual(PlusRep.objects.count(), 4)
+
+        # Rep sent to the same receiver in a previous week does not block a new transaction
+        plus_rep_old = plus_rep_factory(self.user, receivers[1], receivers[2])
+        plus_rep_old.created_at = get_current_week_start_time() - datetime.timedelta(
+            days=1
+        )
+        plus_rep_old.save()
+        plus_rep, remaining_rep = create_new_plus_rep(
+            receivers[1], receivers[2], "", self.user
+        )
+        self.assertIsNotNone(plus_rep)
+        self.assertEqual(remaining_rep, 2)
+
+    @patch("apps.reputation.utils.get_current_time")
+    def test_plus_rep_tallies(self, mock_get_current_time):
+        jan_3_2023 = datetime.datetime.fromisoformat("2023-01-03T12:00:00-07:00")
+        mock_get_current_time.return_value = jan_3_2023
+        giver = update_or_create_discord_account("1", "giver", self.user)
+        other_giver = update_or_create_discord_account("2", "other_giver", self.user)
+        receiver = update_or_create_discord_account("3", "receiver", self.user)
+
+        # Tallies follow a PlusRep as its timestamp is edited
+        plus_rep_1 = plus_rep_factory(self.user, giver, receiver)
+        plus_rep_1.created_at = jan_3_2023 - datetime.timedelta(days=2)
+        plus_rep_1.save()
+        self.assertEqual(
+            list(PlusRepDailyTally.objects.values_list("day", "total")),
+            [(datetime.date(2023, 1, 1), 1)],
+        )
+        self.assertEqual(
+            list(PlusRepGiverTally.objects.values_list("giver_id", "latest_at")),
+            [("1", jan_3_2023 - datetime.timedelta(days=2))],
+        )
+
+        # Rep on the partial first day of the window only counts if it is after the window start
+        plus_rep_2 = plus_rep_factory(self.user, other_giver, receiver)
+        plus_rep_2.created_at = jan_3_2023.replace(year=2022) - datetime.timedelta(
+            minutes=1
+        )
+        plus_rep_2.save()
+        plus_rep_3 = plus_rep_factory(self.user, other_giver, receiver)
+        plus_rep_3.created_at = jan_3_2023.replace(year=2022) + datetime.timedelta(
+            minutes=1
+        )
+        plus_rep_3.save()
+        result = get_top_rep_past_year(10)
+        self.assertEqual(result, [receiver])
+        self.assertEqual(result[0].total_rep, 2)
+        self.assertEqual(result[0].unique_rep, 2)
+        self.assertEqual(result[0].rank, 1)
+
+        # Deleting rep removes it from the tallies
+        plus_rep_3.delete()
+        result = get_top_rep_past_year(10)
+        self.assertEqual(result[0].total_rep, 1)
+        self.assertEqual(result[0].unique_rep, 1)
+        plus_rep_1.delete()
+        plus_rep_2.delete()
+        self.assertEqual(PlusRepDailyTally.objects.count(), 0)
+        self.assertEqual(PlusRepGiverTally.objects.count(), 0)
+        self.assertEqual(get_top_rep_past_year(10), [])
+
+        # New rep is added to the existing tallies with one upsert each
+        plus_rep_factory(self.user, giver, receiver)
+        with self.assertNumQueries(3):
+            plus_rep_factory(self.user, other_giver, receiver)
+        self.assertEqual(
+            list(PlusRepDailyTally.objects.values_list("total", flat=True)), [2]
+        )
+        self.assertEqual(PlusRepGiverTally.objects.count(), 2)
+
     def test_get_week_start_time(self):
         expected_tuples = [
             # Basic example
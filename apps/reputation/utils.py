@@ -1,12 +1,31 @@
 import datetime
+import uuid
 from calendar import MONDAY
 
 import pytz
 from django.contrib.auth.models import User
-from django.db.models import Count, Q
+from django.db import connection, transaction
+from django.db.models import (
+    Count,
+    F,
+    IntegerField,
+    Max,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+    Window,
+)
+from django.db.models.functions import Coalesce, Rank
+from django.utils import timezone
 
 from apps.discord.models import DiscordAccount
-from apps.reputation.models import PlusRep
+from apps.overrides.utils import read_from_replica
+from apps.reputation.models import PlusRep, PlusRepDailyTally, PlusRepGiverTally
+
+PLUS_REP_WEEKLY_LIMIT = 3
 
 
 def get_current_time() -> datetime.datetime:
@@ -57,50 +76,187 @@ def count_plus_rep_given_in_current_week(giver: DiscordAccount) -> int:
     return PlusRep.objects.filter(giver=giver, created_at__range=(start, end)).count()
 
 
-def can_giver_send_rep(giver: DiscordAccount) -> bool:
-    # Users are only allowed to give out reputation 3 times per week
-    rep_given_in_current_week = count_plus_rep_given_in_current_week(giver)
-    return rep_given_in_current_week < 3
-
-
-def can_giver_send_rep_to_receiver(
-    giver: DiscordAccount, receiver: DiscordAccount
-) -> bool:
-    # A user cannot give themself reputation
-    if giver.discord_id == receiver.discord_id:
-        return False
-    # Only one reputation transaction is allowed per week from a giver to a receiver
-    start = get_current_week_start_time()
-    end = start + datetime.timedelta(days=7)
-    plus_rep_given_in_current_week = PlusRep.objects.filter(
-        giver=giver, receiver=receiver, created_at__range=(start, end)
-    ).count()
-    rep_given_in_current_week = plus_rep_given_in_current_week
-    return rep_given_in_current_week < 1
-
-
 def create_new_plus_rep(
     giver: DiscordAccount, receiver: DiscordAccount, message: str, user: User
-) -> PlusRep | None:
-    if can_giver_send_rep(giver) and can_giver_send_rep_to_receiver(giver, receiver):
-        return PlusRep.objects.create(
+) -> tuple[PlusRep | None, int]:
+    # Returns the new PlusRep (or None if the transaction is not allowed) and the giver's remaining rep for the week.
+    # The giver's DiscordAccount row is locked for the duration so concurrent +rep commands from the same giver are
+    # checked against each other's inserts rather than both passing the quota check.
+    start = get_current_week_start_time()
+    end = start + datetime.timedelta(days=7)
+    with transaction.atomic():
+        DiscordAccount.objects.select_for_update().filter(
+            discord_id=giver.discord_id
+        ).values_list("discord_id").first()
+        rep_given = PlusRep.objects.filter(
+            giver=giver, created_at__range=(start, end)
+        ).aggregate(
+            total=Count("id"),
+            to_receiver=Count("id", filter=Q(receiver=receiver)),
+        )
+        remaining_rep = max(PLUS_REP_WEEKLY_LIMIT - rep_given["total"], 0)
+        if (
+            remaining_rep == 0
+            or rep_given["to_receiver"] > 0
+            or giver.discord_id == receiver.discord_id
+        ):
+            return (None, remaining_rep)
+        plus_rep = PlusRep.objects.create(
             giver=giver,
             receiver=receiver,
             message=message,
             creator=user,
         )
-    return None
+    return (plus_rep, remaining_rep - 1)
 
 
 def check_past_year_rep(account: DiscordAccount) -> tuple[int, int]:
     end = get_current_time()
     start = end.replace(year=end.year - 1)
-    plus_rep = PlusRep.objects.filter(receiver=account, created_at__range=(start, end))
-    unique_rep = plus_rep.values("giver__discord_id").distinct().count()
-    total_rep = plus_rep.count()
-    return (total_rep, unique_rep)
+    rep = PlusRep.objects.filter(
+        receiver=account, created_at__range=(start, end)
+    ).aggregate(total_rep=Count("id"), unique_rep=Count("giver", distinct=True))
+    return (rep["total_rep"], rep["unique_rep"])
+
+
+def get_utc_day(timestamp: datetime.datetime) -> datetime.date:
+    return timestamp.astimezone(datetime.timezone.utc).date()
+
+
+def count_plus_rep_in_tallies(plus_rep: PlusRep) -> None:
+    # Adds a new PlusRep to the receiver's tally for its day and to the receiver/giver tally with one upsert each, so
+    # the +rep write path never reads the tallies back
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO "PlusRepDailyTally" (id, created_at, updated_at, creator_id, receiver_id, day, total) '
+            "VALUES (%s, %s, %s, %s, %s, %s, 1) "
+            "ON CONFLICT (receiver_id, day) DO UPDATE "
+            'SET total = "PlusRepDailyTally".total + 1, updated_at = EXCLUDED.updated_at',
+            [
+                uuid.uuid4(),
+                now,
+                now,
+                plus_rep.creator_id,
+                plus_rep.receiver_id,
+                get_utc_day(plus_rep.created_at),
+            ],
+        )
+        cursor.execute(
+            'INSERT INTO "PlusRepGiverTally" '
+            "(id, created_at, updated_at, creator_id, receiver_id, giver_id, latest_at) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s) "
+            "ON CONFLICT (receiver_id, giver_id) DO UPDATE "
+            'SET latest_at = GREATEST("PlusRepGiverTally".latest_at, EXCLUDED.latest_at), '
+            "updated_at = EXCLUDED.updated_at",
+            [
+                uuid.uuid4(),
+                now,
+                now,
+                plus_rep.creator_id,
+                plus_rep.receiver_id,
+                plus_rep.giver_id,
+                plus_rep.created_at,
+            ],
+        )
+
+
+def refresh_plus_rep_tallies(
+    receiver_id: str, giver_id: str, day: datetime.date, creator: User
+) -> None:
+    # Recompute the receiver's tally for `day` and the receiver/giver tally from the PlusRep rows themselves, so that
+    # edits and deletes converge on the same aggregate as inserts
+    total = PlusRep.objects.filter(
+        receiver_id=receiver_id, created_at__date=day
+    ).count()
+    if total > 0:
+        PlusRepDailyTally.objects.update_or_create(
+            receiver_id=receiver_id,
+            day=day,
+            defaults={"total": total},
+            create_defaults={"total": total, "creator": creator},
+        )
+    else:
+        PlusRepDailyTally.objects.filter(receiver_id=receiver_id, day=day).delete()
+
+    latest_at = PlusRep.objects.filter(
+        receiver_id=receiver_id, giver_id=giver_id
+    ).aggregate(latest_at=Max("created_at"))["latest_at"]
+    if latest_at is not None:
+        PlusRepGiverTally.objects.update_or_create(
+            receiver_id=receiver_id,
+            giver_id=giver_id,
+            defaults={"latest_at": latest_at},
+            create_defaults={"latest_at": latest_at, "creator": creator},
+        )
+    else:
+        PlusRepGiverTally.objects.filter(
+            receiver_id=receiver_id, giver_id=giver_id
+        ).delete()
+
+
+def get_past_year_rep_receivers(
+    start: datetime.datetime, end: datetime.datetime, exclude_ids: list[str]
+) -> QuerySet:
+    # Annotates every DiscordAccount that received rep between `start` and `end` with its `total_rep`, `unique_rep`
+    # and `rank` (by `total_rep`, ties sharing a rank) using the PlusRep tallies. Whole UTC days inside the range come
+    # from the daily tallies and only the partial first day is counted from the PlusRep rows. A giver counts towards
+    # `unique_rep` when their latest rep to the receiver is in range, which holds because rep is never dated after the
+    # current time.
+    first_full_day = get_utc_day(start) + datetime.timedelta(days=1)
+    first_full_day_start = datetime.datetime.combine(
+        first_full_day, datetime.time(), tzinfo=datetime.timezone.utc
+    )
+    full_days_rep = (
+        PlusRepDailyTally.objects.filter(
+            receiver=OuterRef("pk"),
+            day__gte=first_full_day,
+            day__lte=get_utc_day(end),
+        )
+        .values("receiver")
+        .annotate(total_rep=Sum("total"))
+        .values("total_rep")
+    )
+    first_day_rep = (
+        PlusRep.objects.filter(
+            receiver=OuterRef("pk"),
+            created_at__gte=start,
+            created_at__lt=min(first_full_day_start, end),
+        )
+        .values("receiver")
+        .annotate(total_rep=Count("id"))
+        .values("total_rep")
+    )
+    unique_rep = (
+        PlusRepGiverTally.objects.filter(
+            receiver=OuterRef("pk"), latest_at__range=(start, end)
+        )
+        .values("receiver")
+        .annotate(unique_rep=Count("id"))
+        .values("unique_rep")
+    )
+    return (
+        DiscordAccount.objects.filter(
+            discord_id__in=PlusRepGiverTally.objects.filter(
+                latest_at__range=(start, end)
+            ).values("receiver_id")
+        )
+        .exclude(discord_id__in=exclude_ids)
+        .annotate(
+            total_rep=Coalesce(
+                Subquery(full_days_rep, output_field=IntegerField()), Value(0)
+            )
+            + Coalesce(Subquery(first_day_rep, output_field=IntegerField()), Value(0)),
+            unique_rep=Coalesce(
+                Subquery(unique_rep, output_field=IntegerField()), Value(0)
+            ),
+        )
+        .annotate(rank=Window(expression=Rank(), order_by=F("total_rep").desc()))
+        .order_by("-total_rep", "-unique_rep", "created_at")
+    )
 
 
+@read_from_replica()
 def get_top_rep_past_year(
     count: int, exclude_ids: list[str] = []
 ) -> list[DiscordAccount]:
@@ -111,40 +267,14 @@ def get_top_rep_past_year(
         return []
     end = get_current_time()
     start = end.replace(year=end.year - 1)
-    receivers = (
-        DiscordAccount.objects.annotate(
-            total_rep=Count(
-                "receivers", filter=Q(receivers__created_at__range=(start, end))
-            ),
-            unique_rep=Count(
-                "receivers__giver__discord_id",
-                distinct=True,
-                filter=Q(receivers__created_at__range=(start, end)),
-            ),
-        )
-        .filter(total_rep__gt=0)
-        .exclude(discord_id__in=exclude_ids)
-        .order_by("-total_rep", "-unique_rep", "created_at")[:count]
+    return list(
+        get_past_year_rep_receivers(start, end, exclude_ids).filter(total_rep__gt=0)[
+            :count
+        ]
     )
 
-    # Evaluate the queryset at this stage
-    top_rep = []
-    for receiver in receivers:
-        top_rep.append(receiver)
-
-    # Rank every DiscordAccount in the list by `total_rep`
-    sorted_rep = [account.total_rep for account in top_rep]
-    sorted_rep.sort()
-    sorted_rep.reverse()
-    rep_ranks = [sorted_rep.index(account.total_rep) + 1 for account in top_rep]
-
-    # Tack the rank data on too
-    for i in range(len(top_rep)):
-        top_rep[i].rank = int(rep_ranks[i])
-
-    return top_rep
-
 
+@read_from_replica()
 def get_partytimers_past_year(
     cap: int, total_rep_min: int, unique_rep_min: int, exclude_ids: list[str] = []
 ) -> list[DiscordAccount]:
@@ -153,35 +283,8 @@ def get_partytimers_past_year(
     # as well as all DiscordAccounts specifically excluded in `exclude_ids`.
     end = get_current_time()
     start = end.replace(year=end.year - 1)
-    receivers = (
-        DiscordAccount.objects.annotate(
-            total_rep=Count(
-                "receivers", filter=Q(receivers__created_at__range=(start, end))
-            ),
-            unique_rep=Count(
-                "receivers__giver__discord_id",
-                distinct=True,
-                filter=Q(receivers__created_at__range=(start, end)),
-            ),
-        )
-        .filter(total_rep__gte=total_rep_min, unique_rep__gte=unique_rep_min)
-        .exclude(discord_id__in=exclude_ids)
-        .order_by("-total_rep", "-unique_rep", "created_at")[:cap]
+    return list(
+        get_past_year_rep_receivers(start, end, exclude_ids).filter(
+            total_rep__gte=total_rep_min, unique_rep__gte=unique_rep_min
+        )[:cap]
     )
-
-    # Evaluate the queryset at this stage
-    partytimers = []
-    for receiver in receivers:
-        partytimers.append(receiver)
-
-    # Rank every DiscordAccount in the list by `total_rep`
-    sorted_rep = [account.total_rep for account in partytimers]
-    sorted_rep.sort()
-    sorted_rep.reverse()
-    rep_ranks = [sorted_rep.index(account.total_rep) + 1 for account in partytimers]
-
-    # Tack the rank data on too
-    for i in range(len(partytimers)):
-        partytimers[i].rank = int(rep_ranks[i])
-
-    return partytimers
@@ -197,7 +197,7 @@ class NewPlusRep(APIView):
             receiver_discord_account = update_or_create_discord_account(
                 receiver_discord_id, receiver_discord_username, request.user
             )
-            plus_rep = create_new_plus_rep(
+            plus_rep, remaining_rep = create_new_plus_rep(
                 giver_discord_account, receiver_discord_account, message, request.user
             )
             if plus_rep is None:
@@ -205,7 +205,9 @@ class NewPlusRep(APIView):
                     {"error": REPUTATION_ERROR_FORBIDDEN}
                 )
                 return Response(serializer.data, status=403)
-            serializer = PlusRepResponseSerializer({"success": True})
+            serializer = PlusRepResponseSerializer(
+                {"success": True, "thisWeekRepRemaining": remaining_rep}
+            )
             return Response(
                 data=serializer.data,
                 status=200,
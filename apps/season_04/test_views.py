@@ -117,23 +117,18 @@ class Season04TestCase(APITestCase):
 
     @patch("apps.season_04.views.get_season_custom_matches_for_xuid")
     @patch("apps.season_04.views.service_record")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
     def test_check_stamps_view(
-        self,
-        mock_get_xuid_and_exact_gamertag,
-        mock_service_record,
-        mock_get_season_custom_matches_for_xuid,
+        self, mock_service_record, mock_get_season_custom_matches_for_xuid
     ):
         # Create test data
         season_start_time = SEASON_4_START_TIME
         season_api_id = SEASON_4_API_ID
         season_id = "4"
-        mock_get_xuid_and_exact_gamertag.return_value = (4567, "test1234")
         discord_account = DiscordAccount.objects.create(
             creator=self.user, discord_id="1234", discord_username="TestUsername1234"
         )
         xbox_live_account = XboxLiveAccount.objects.create(
-            creator=self.user, gamertag="testGT1234"
+            creator=self.user, gamertag="test1234", xuid=4567
         )
         link = DiscordXboxLiveLink.objects.create(
             creator=self.user,
@@ -8,7 +8,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.discord.utils import update_or_create_discord_account
-from apps.fun_time_friday.utils import get_voice_connections
+from apps.fun_time_friday.utils import get_max_voice_session_time
 from apps.halo_infinite.api.service_record import service_record
 from apps.halo_infinite.constants import (
     GAME_VARIANT_CATEGORY_INFECTION,
@@ -101,7 +101,7 @@ class CheckStampsView(APIView):
                 # HALOFUNTIME DISCORD CHALLENGES
                 funtimer_rank = validation_serializer.data.get("funTimerRank")
                 invite_uses = validation_serializer.data.get("inviteUses")
-                voice_connections = get_voice_connections(
+                max_voice_session_time = get_max_voice_session_time(
                     discord_account, season_start_time, season_end_time
                 )
                 societies_joined = validation_serializer.data.get("societiesJoined")
@@ -121,10 +121,8 @@ class CheckStampsView(APIView):
                 if score_repping_it >= 10:
                     stamps_completed += 1
                 # CHALLENGE #4: Fundurance
-                if voice_connections:
-                    max_connected_seconds = max(
-                        voice_connections, key=lambda x: x.get("time_connected")
-                    )["time_connected"].total_seconds()
+                if max_voice_session_time is not None:
+                    max_connected_seconds = max_voice_session_time.total_seconds()
                     score_fundurance = int(max_connected_seconds / 3600)
                 if score_fundurance >= 3:
                     stamps_completed += 1
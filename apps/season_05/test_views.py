@@ -25,8 +25,7 @@ class Season05TestCase(APITestCase):
         token, _created = Token.objects.get_or_create(user=self.user)
         self.client = APIClient(HTTP_AUTHORIZATION="Bearer " + token.key)
 
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
-    def test_check_domains_view(self, mock_get_xuid_and_exact_gamertag):
+    def test_check_domains_view(self):
         # Missing field values throw errors
         response = self.client.post("/season-05/check-domains", {}, format="json")
         self.assertEqual(response.status_code, 400)
@@ -115,12 +114,8 @@ class Season05TestCase(APITestCase):
         with patch(
             "apps.season_05.views.get_domain_score_info"
         ) as mock_get_domain_score_info:
-            mock_get_xuid_and_exact_gamertag.return_value = (
-                2535405290989773,
-                "test1234",
-            )
             xbl_account = XboxLiveAccount.objects.create(
-                creator=self.user, gamertag="test1234"
+                creator=self.user, gamertag="test1234", xuid=2535405290989773
             )
             link = DiscordXboxLiveLink.objects.create(
                 creator=self.user,
@@ -210,8 +205,7 @@ class Season05TestCase(APITestCase):
             )
 
     @patch("apps.season_05.views.sleep")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
-    def test_check_teams_view(self, mock_get_xuid_and_exact_gamertag, mock_sleep):
+    def test_check_teams_view(self, mock_sleep):
         # No team assignment record returns no score info
         response = self.client.get("/season-05/check-teams")
         self.assertEqual(response.data.get("teamScores"), [])
@@ -224,12 +218,8 @@ class Season05TestCase(APITestCase):
             discord_account_a = DiscordAccount.objects.create(
                 creator=self.user, discord_id="123", discord_username="ABC1234"
             )
-            mock_get_xuid_and_exact_gamertag.return_value = (
-                0,
-                "test1234",
-            )
             xbl_account_a = XboxLiveAccount.objects.create(
-                creator=self.user, gamertag="test1234"
+                creator=self.user, gamertag="test1234", xuid=0
             )
             DiscordXboxLiveLink.objects.create(
                 creator=self.user,
@@ -251,12 +241,8 @@ class Season05TestCase(APITestCase):
             discord_account_b = DiscordAccount.objects.create(
                 creator=self.user, discord_id="456", discord_username="DEF1234"
             )
-            mock_get_xuid_and_exact_gamertag.return_value = (
-                1,
-                "test5678",
-            )
             xbl_account_b = XboxLiveAccount.objects.create(
-                creator=self.user, gamertag="test5678"
+                creator=self.user, gamertag="test5678", xuid=1
             )
             DiscordXboxLiveLink.objects.create(
                 creator=self.user,
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class SeriesConfig(AppConfig):
     name = "apps.series"
+
+    def ready(self):
+        import apps.series.signals  # noqa
@@ -0,0 +1,45 @@
+import logging
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.series.models import SeriesGametype, SeriesMap, SeriesMode, SeriesRuleset
+from apps.series.utils import invalidate_series_indexes
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=SeriesRuleset)
+@receiver(post_delete, sender=SeriesRuleset)
+def series_ruleset_changed(sender, instance, **kwargs):
+    invalidate_series_indexes([instance.id])
+
+
+@receiver(post_save, sender=SeriesGametype)
+@receiver(post_delete, sender=SeriesGametype)
+def series_gametype_changed(sender, instance, **kwargs):
+    invalidate_series_indexes([instance.ruleset_id])
+
+
+@receiver(post_save, sender=SeriesMap)
+@receiver(post_delete, sender=SeriesMap)
+def series_map_changed(sender, instance, **kwargs):
+    invalidate_series_indexes(
+        list(
+            SeriesGametype.objects.filter(map_id=instance.id)
+            .values_list("ruleset_id", flat=True)
+            .distinct()
+        )
+    )
+
+
+@receiver(post_save, sender=SeriesMode)
+@receiver(post_delete, sender=SeriesMode)
+def series_mode_changed(sender, instance, **kwargs):
+    invalidate_series_indexes(
+        list(
+            SeriesGametype.objects.filter(mode_id=instance.id)
+            .values_list("ruleset_id", flat=True)
+            .distinct()
+        )
+    )
@@ -5,6 +5,7 @@ import uuid
 from unittest.mock import patch
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient, APITestCase
@@ -15,7 +16,12 @@ from apps.series.exceptions import (
     SeriesBuildUnsupportedException,
 )
 from apps.series.models import SeriesGametype, SeriesMap, SeriesMode, SeriesRuleset
-from apps.series.utils import build_best_of_dict, build_series
+from apps.series.utils import (
+    SeriesSolver,
+    build_best_of_dict,
+    build_series,
+    get_series_index_cache_key,
+)
 
 
 def ruleset_factory(creator: User, name: str = None) -> SeriesRuleset:
@@ -649,6 +655,109 @@ class SeriesUtilsTestCase(TestCase):
                     a.mode, b.mode
                 )  # No non-Slayer mode should be repeated
 
+    def test_build_series_large_ruleset(self):
+        # Set up a ruleset far too large to enumerate every combination of (60 choose 7 is ~386M)
+        ruleset = ruleset_factory(self.user, "Large")
+        maps = [map_factory(self.user) for _ in range(12)]
+        modes = [mode_factory(self.user) for _ in range(5)]
+        ruleset.featured_mode = modes[0]
+        ruleset.save()
+        for i in range(60):
+            gametype_factory(self.user, ruleset, maps[i % 12], modes[i // 12])
+
+        for x, featured_games in {3: [1], 5: [1, 4], 7: [1, 4, 6]}.items():
+            series = build_series(ruleset, x)
+            self.assertEqual(len(series), x)
+            for i, gametype in enumerate(series):
+                if i in featured_games:
+                    self.assertEqual(gametype.mode, modes[0])
+                else:
+                    self.assertNotEqual(gametype.mode, modes[0])
+            # No map should be repeated and no non-featured mode should be repeated
+            self.assertEqual(len({gametype.map for gametype in series}), x)
+            non_featured_modes = [
+                gametype.mode for gametype in series if gametype.mode != modes[0]
+            ]
+            self.assertEqual(len(set(non_featured_modes)), len(non_featured_modes))
+
+    def test_build_series_no_consecutive_plays(self):
+        # Two maps and two modes can only avoid consecutive plays by alternating both
+        ruleset = ruleset_factory(self.user, "Alternating")
+        ruleset.allow_bo3_map_repeats = True
+        ruleset.allow_bo3_mode_repeats = True
+        ruleset.save()
+        maps = [map_factory(self.user) for _ in range(2)]
+        modes = [mode_factory(self.user) for _ in range(2)]
+        for map in maps:
+            for mode in modes:
+                gametype_factory(self.user, ruleset, map, mode)
+                gametype_factory(self.user, ruleset, map, mode)
+
+        for _ in range(10):
+            series = build_series(ruleset, 3)
+            for a, b in zip(series, series[1:]):
+                self.assertNotEqual(a.map, b.map)
+                self.assertNotEqual(a.mode, b.mode)
+
+    def test_series_index_invalidation(self):
+        ruleset = ruleset_factory(self.user)
+        gametypes = [gametype_factory(self.user, ruleset) for _ in range(3)]
+        cache_key = get_series_index_cache_key(ruleset.id)
+
+        # Building a series caches the ruleset's index; later builds only read the cache (whose in-process tier is
+        # bypassed inside the test transaction)
+        self.assertIsNone(cache.get(cache_key))
+        build_series(ruleset, 3)
+        self.assertEqual(len(cache.get(cache_key).get("gametypes")), 3)
+        self.assertEqual(cache.get(cache_key).get("levels"), {3: 0})
+        self.assertEqual(
+            [
+                sorted(combination)
+                for combination in cache.get(cache_key).get("combinations")[3]
+            ],
+            [[0, 1, 2]],
+        )
+        with self.assertNumQueries(1):
+            build_series(ruleset, 3)
+
+        # Later builds draw from the index's combinations without searching again, even when no uniform draw is found
+        with patch.object(SeriesSolver, "_choose") as mock_choose, patch.object(
+            SeriesSolver, "_draw_uniformly", return_value=None
+        ):
+            self.assertEqual(
+                {gametype.id for gametype in build_series(ruleset, 3)},
+                {gametype.id for gametype in gametypes},
+            )
+            mock_choose.assert_not_called()
+
+        # Saving or deleting a gametype invalidates the index
+        gametype = gametype_factory(self.user, ruleset)
+        self.assertIsNone(cache.get(cache_key))
+        build_series(ruleset, 3)
+        self.assertEqual(len(cache.get(cache_key).get("gametypes")), 4)
+        gametype.delete()
+        self.assertIsNone(cache.get(cache_key))
+
+        # Saving a map or mode used by the ruleset invalidates the index
+        build_series(ruleset, 3)
+        gametypes[0].map.name = "Renamed Map"
+        gametypes[0].map.save()
+        self.assertIsNone(cache.get(cache_key))
+        build_series(ruleset, 3)
+        gametypes[0].mode.name = "Renamed Mode"
+        gametypes[0].mode.save()
+        self.assertIsNone(cache.get(cache_key))
+
+        # Saving a map used only by other rulesets leaves the index alone
+        build_series(ruleset, 3)
+        gametype_factory(self.user).map.save()
+        self.assertIsNotNone(cache.get(cache_key))
+
+        # Saving the ruleset invalidates the index
+        ruleset.allow_bo3_map_repeats = True
+        ruleset.save()
+        self.assertIsNone(cache.get(cache_key))
+
     @patch("apps.series.utils.time.perf_counter")
     def test_build_series_timeout(self, mock_perf_counter):
         mock_perf_counter.side_effect = [0, 1.1]
@@ -1,8 +1,9 @@
-import itertools
 import logging
 import random
 import time
 
+from django.core.cache import cache
+
 from apps.series.exceptions import (
     SeriesBuildImpossibleException,
     SeriesBuildTimeoutException,
@@ -13,6 +14,401 @@ from apps.series.models import SeriesGametype, SeriesRuleset
 logger = logging.getLogger(__name__)
 
 
+# Games (zero-indexed) that must be the featured mode in a best of x series
+FEATURED_MODE_GAMES = {3: [1], 5: [1, 4], 7: [1, 4, 6]}
+# An "ideal" series plays no map or non-featured mode more than this many times...
+IDEAL_INDIVIDUAL_REPEAT_THRESHOLD = {3: 1, 5: 2, 7: 2}
+# ...and has strictly fewer than this many total map (or non-featured mode) repeats
+IDEAL_TOTAL_REPEAT_THRESHOLD = {3: 1, 5: 2, 7: 3}
+# Number of uniform draws attempted before settling for the solver's own series
+UNIFORM_DRAW_ATTEMPTS = 250
+# Most valid combinations kept in the series index for each series length, and how long a cold build may keep searching
+# for more of them once it has found its own series
+SERIES_INDEX_COMBINATIONS = 16
+SERIES_INDEX_COLLECTION_SECONDS = 0.01
+# Signals invalidate the shared cache for every worker, though each worker's L1 tier may serve a stale index for a few
+# more seconds. The timeout only bounds how long an unused ruleset's index is kept.
+SERIES_INDEX_CACHE_TIMEOUT = 60 * 10
+
+
+def is_consecutive_play(gametype_a: SeriesGametype, gametype_b: SeriesGametype) -> bool:
+    return (
+        gametype_a.map_id == gametype_b.map_id
+        or gametype_a.mode_id == gametype_b.mode_id
+    )
+
+
+def has_consecutive_plays(series: list[SeriesGametype]) -> bool:
+    for i in range(1, len(series)):
+        if is_consecutive_play(series[i - 1], series[i]):
+            return True
+    return False
+
+
+class SeriesSolver:
+    """
+    Randomized backtracking search for a best of x series.
+
+    Gametypes are chosen as a combination first (featured mode gametypes, then all others, each in a randomly shuffled
+    canonical order so no combination is visited twice) and then arranged into the series' games. Every pick is checked
+    incrementally against the ruleset's map/mode repeat rules and the current repeat limit, and branches that can no
+    longer meet that limit are pruned immediately, so large rulesets never need every combination enumerated.
+
+    The valid series found at the most diverse level are returned as combinations of indexes into `gametypes`, so the
+    series index can store them and later builds can `draw` from them without searching again.
+    """
+
+    def __init__(
+        self,
+        gametypes: list[SeriesGametype],
+        x: int,
+        featured_mode_id,
+        map_repeats_allowed: bool,
+        mode_repeats_allowed: bool,
+        start: float,
+    ):
+        self.gametypes = gametypes
+        self.x = x
+        self.featured_mode_id = featured_mode_id
+        self.map_repeats_allowed = map_repeats_allowed
+        self.mode_repeats_allowed = mode_repeats_allowed
+        self.start = start
+        self.featured_games = (
+            FEATURED_MODE_GAMES.get(x) if featured_mode_id is not None else []
+        )
+        self.featured_gametypes = [
+            gametype
+            for gametype in gametypes
+            if featured_mode_id is not None and gametype.mode_id == featured_mode_id
+        ]
+        self.other_gametypes = [
+            gametype
+            for gametype in gametypes
+            if featured_mode_id is None or gametype.mode_id != featured_mode_id
+        ]
+        random.shuffle(self.featured_gametypes)
+        random.shuffle(self.other_gametypes)
+
+    def levels(self) -> list[tuple[int, bool, bool]]:
+        """
+        Returns every (repeat limit, ideal, no consecutive plays) search level, from most to least preferred.
+        """
+        levels = [
+            (limit, True, True)
+            for limit in range(IDEAL_TOTAL_REPEAT_THRESHOLD.get(self.x))
+        ]
+        for limit in range(self.x):
+            levels += [(limit, False, True), (limit, False, False)]
+        return levels
+
+    def solve(
+        self, first_level: int = 0
+    ) -> tuple[list[SeriesGametype] | None, int, list[tuple[int, ...]]]:
+        """
+        Returns the most diverse series available (preferring ideal series over merely valid ones), the index of the
+        level it was found at and the valid combinations found at that level. Levels before `first_level` are skipped
+        because they are known to be impossible.
+        """
+        levels = self.levels()
+        if len(self.featured_gametypes) < len(self.featured_games) or len(
+            self.other_gametypes
+        ) < self.x - len(self.featured_games):
+            return None, len(levels), []
+        for i in range(first_level, len(levels)):
+            limit, ideal, no_consecutive_plays = levels[i]
+            found_series = self._solve_at(limit, ideal, no_consecutive_plays)
+            if found_series:
+                logger.info(
+                    f"Bo{self.x}: Found {'ideal' if ideal else 'valid'} series with repeat limit {limit}"
+                )
+                gametype_indexes = {
+                    gametype.id: index for index, gametype in enumerate(self.gametypes)
+                }
+                combinations = [
+                    tuple(gametype_indexes[gametype.id] for gametype in series)
+                    for series in found_series
+                ]
+                # The search above proves that a series exists at this level; now try to draw one uniformly at random
+                return (
+                    self._draw_uniformly() or random.choice(found_series),
+                    i,
+                    combinations,
+                )
+        return None, len(levels), []
+
+    def draw(
+        self, level: int, combinations: list[tuple[int, ...]]
+    ) -> list[SeriesGametype] | None:
+        """
+        Returns a series at a level already solved by `solve`, without searching: a uniform draw if one is found in
+        time, otherwise a fresh arrangement of one of that level's stored combinations. Returns None if neither works.
+        """
+        levels = self.levels()
+        if level >= len(levels) or len(combinations) == 0:
+            return None
+        self._set_level(*levels[level])
+        series = self._draw_uniformly()
+        if series is None:
+            combination = [
+                self.gametypes[index] for index in random.choice(combinations)
+            ]
+            series = self._rearrange(combination)
+        return series
+
+    def _set_level(self, limit: int, ideal: bool, no_consecutive_plays: bool):
+        individual_threshold = (
+            IDEAL_INDIVIDUAL_REPEAT_THRESHOLD.get(self.x) if ideal else self.x
+        )
+        self.map_limit = limit if self.map_repeats_allowed else 0
+        self.mode_limit = limit if self.mode_repeats_allowed else 0
+        self.map_cap = individual_threshold if self.map_repeats_allowed else 1
+        self.mode_cap = individual_threshold if self.mode_repeats_allowed else 1
+        self.no_consecutive_plays = no_consecutive_plays
+
+    def _solve_at(
+        self, limit: int, ideal: bool, no_consecutive_plays: bool
+    ) -> list[list[SeriesGametype]]:
+        # Returns up to SERIES_INDEX_COMBINATIONS valid series at this level, continuing the search for a short while
+        # after the first one is found so the series index has more than one combination to draw from
+        self._set_level(limit, ideal, no_consecutive_plays)
+        self._reset_counts()
+        self.collection_deadline = None
+        found_series = []
+        for series in self._choose([], 0):
+            found_series.append(series)
+            if len(found_series) == SERIES_INDEX_COMBINATIONS:
+                break
+            if self.collection_deadline is None:
+                self.collection_deadline = (
+                    time.perf_counter() + SERIES_INDEX_COLLECTION_SECONDS
+                )
+        return found_series
+
+    def _choose(self, picks: list[SeriesGametype], start: int):
+        now = time.perf_counter()
+        # Once a series has been found, stop collecting more when out of time rather than failing the build
+        if self.collection_deadline is not None and (
+            now > self.collection_deadline or now - self.start > 1
+        ):
+            return
+        # Raise an exception if we spend more than one full second searching for a series
+        if now - self.start > 1:
+            raise SeriesBuildTimeoutException(
+                "Took longer than one second to process potential series combinations"
+            )
+        if len(picks) == self.x:
+            series = self._arrange(picks)
+            if series is not None:
+                yield series
+            return
+        choosing_featured = len(picks) < len(self.featured_games)
+        if choosing_featured:
+            pool = self.featured_gametypes
+            picks_left_in_pool = len(self.featured_games) - len(picks)
+        else:
+            pool = self.other_gametypes
+            picks_left_in_pool = self.x - len(picks)
+        if not self._can_meet_limits(picks, pool, start, choosing_featured):
+            return
+
+        # Identical map/mode pairs are interchangeable, so only the first of each is tried at this depth
+        tried_pairs = set()
+        for index in range(start, len(pool) - picks_left_in_pool + 1):
+            gametype = pool[index]
+            pair = (gametype.map_id, gametype.mode_id)
+            if pair in tried_pairs or not self._fits(gametype):
+                continue
+            tried_pairs.add(pair)
+            self._count(gametype, 1)
+            picks.append(gametype)
+            # Once the last featured mode gametype is picked, start over at the top of the other gametypes
+            next_start = (
+                0
+                if choosing_featured and len(picks) == len(self.featured_games)
+                else index + 1
+            )
+            yield from self._choose(picks, next_start)
+            picks.pop()
+            self._count(gametype, -1)
+
+    def _can_meet_limits(
+        self,
+        picks: list[SeriesGametype],
+        pool: list[SeriesGametype],
+        start: int,
+        choosing_featured: bool,
+    ) -> bool:
+        # Every pick beyond the number of still-unused maps/modes left to choose from forces a repeat
+        remaining_gametypes = pool[start:]
+        if choosing_featured:
+            remaining_gametypes = remaining_gametypes + self.other_gametypes
+        remaining_other_gametypes = (
+            self.other_gametypes if choosing_featured else remaining_gametypes
+        )
+        fresh_maps = {
+            gametype.map_id
+            for gametype in remaining_gametypes
+            if gametype.map_id not in self.map_counts
+        }
+        fresh_modes = {
+            gametype.mode_id
+            for gametype in remaining_other_gametypes
+            if gametype.mode_id not in self.mode_counts
+        }
+        open_games = self.x - len(picks)
+        open_other_games = min(open_games, self.x - len(self.featured_games))
+        forced_map_repeats = max(0, open_games - len(fresh_maps))
+        forced_mode_repeats = max(0, open_other_games - len(fresh_modes))
+        return (
+            self.map_repeats + forced_map_repeats <= self.map_limit
+            and self.mode_repeats + forced_mode_repeats <= self.mode_limit
+        )
+
+    def _arrange(self, picks: list[SeriesGametype]) -> list[SeriesGametype] | None:
+        # Featured mode gametypes fill the featured games; everything else fills the remaining games
+        featured_count = len(self.featured_games)
+        featured_picks = picks[:featured_count]
+        other_picks = picks[featured_count:]
+        random.shuffle(featured_picks)
+        random.shuffle(other_picks)
+        series = [None] * self.x
+        if self._arrange_game(series, 0, featured_picks, other_picks):
+            return series
+        return None
+
+    def _rearrange(self, series: list[SeriesGametype]) -> list[SeriesGametype]:
+        # Shuffles a valid series' games, keeping the featured mode gametypes in the featured games
+        featured_picks = [
+            gametype for i, gametype in enumerate(series) if i in self.featured_games
+        ]
+        other_picks = [
+            gametype
+            for i, gametype in enumerate(series)
+            if i not in self.featured_games
+        ]
+        return self._arrange(featured_picks + other_picks) or series
+
+    def _arrange_game(
+        self,
+        series: list,
+        i: int,
+        featured_picks: list[SeriesGametype],
+        other_picks: list[SeriesGametype],
+    ) -> bool:
+        if i == self.x:
+            return True
+        picks = featured_picks if i in self.featured_games else other_picks
+        tried_pairs = set()
+        for index, gametype in enumerate(picks):
+            pair = (gametype.map_id, gametype.mode_id)
+            if pair in tried_pairs:
+                continue
+            tried_pairs.add(pair)
+            if (
+                self.no_consecutive_plays
+                and i > 0
+                and is_consecutive_play(series[i - 1], gametype)
+            ):
+                continue
+            series[i] = picks.pop(index)
+            if self._arrange_game(series, i + 1, featured_picks, other_picks):
+                return True
+            picks.insert(index, series[i])
+            series[i] = None
+        return False
+
+    def _fits(self, gametype: SeriesGametype) -> bool:
+        map_count = self.map_counts.get(gametype.map_id, 0)
+        if map_count >= self.map_cap:
+            return False
+        if map_count > 0 and self.map_repeats >= self.map_limit:
+            return False
+        if gametype.mode_id != self.featured_mode_id:
+            mode_count = self.mode_counts.get(gametype.mode_id, 0)
+            if mode_count >= self.mode_cap:
+                return False
+            if mode_count > 0 and self.mode_repeats >= self.mode_limit:
+                return False
+        return True
+
+    def _count(self, gametype: SeriesGametype, delta: int):
+        # A map or non-featured mode played n times contributes n - 1 repeats
+        map_count = self.map_counts.get(gametype.map_id, 0)
+        self.map_repeats += max(map_count + delta - 1, 0) - max(map_count - 1, 0)
+        self.map_counts[gametype.map_id] = map_count + delta
+        if self.map_counts[gametype.map_id] == 0:
+            del self.map_counts[gametype.map_id]
+        if gametype.mode_id != self.featured_mode_id:
+            mode_count = self.mode_counts.get(gametype.mode_id, 0)
+            self.mode_repeats += max(mode_count + delta - 1, 0) - max(mode_count - 1, 0)
+            self.mode_counts[gametype.mode_id] = mode_count + delta
+            if self.mode_counts[gametype.mode_id] == 0:
+                del self.mode_counts[gametype.mode_id]
+
+    def _reset_counts(self):
+        self.map_counts = {}
+        self.mode_counts = {}
+        self.map_repeats = 0
+        self.mode_repeats = 0
+
+    def _draw_uniformly(self) -> list[SeriesGametype] | None:
+        # Rejection sampling: every arrangement of distinct gametypes that respects the featured mode games is equally
+        # likely to be proposed, so the first proposal that passes every check is a uniformly random valid series
+        featured_count = len(self.featured_games)
+        for _ in range(UNIFORM_DRAW_ATTEMPTS):
+            featured_picks = random.sample(self.featured_gametypes, featured_count)
+            other_picks = random.sample(self.other_gametypes, self.x - featured_count)
+            series = [
+                featured_picks.pop() if i in self.featured_games else other_picks.pop()
+                for i in range(self.x)
+            ]
+            self._reset_counts()
+            for i, gametype in enumerate(series):
+                if not self._fits(gametype):
+                    break
+                if (
+                    self.no_consecutive_plays
+                    and i > 0
+                    and is_consecutive_play(series[i - 1], gametype)
+                ):
+                    break
+                self._count(gametype, 1)
+            else:
+                return series
+        return None
+
+
+def get_series_index_cache_key(ruleset_id: str) -> str:
+    return f"series-index-{ruleset_id}"
+
+
+def get_series_index(ruleset: SeriesRuleset) -> dict:
+    """
+    Returns the cached series index for a ruleset, building it if necessary. The index holds the ruleset's gametypes
+    (with maps and modes already joined) and, for each series length built so far, the first solver level at which a
+    series exists along with the valid combinations (as indexes into the gametypes) found there - so later builds
+    draw from those combinations without searching again.
+    """
+    cache_key = get_series_index_cache_key(ruleset.id)
+    series_index = cache.get(cache_key)
+    if series_index is None:
+        series_index = {
+            "gametypes": list(
+                SeriesGametype.objects.select_related("ruleset", "map", "mode").filter(
+                    ruleset=ruleset
+                )
+            ),
+            "levels": {},
+            "combinations": {},
+        }
+        cache.set(cache_key, series_index, SERIES_INDEX_CACHE_TIMEOUT)
+    return series_index
+
+
+def invalidate_series_indexes(ruleset_ids: list[str]) -> None:
+    cache.delete_many([get_series_index_cache_key(id) for id in ruleset_ids])
+
+
 def build_series(ruleset: SeriesRuleset, x: int) -> list[SeriesGametype]:
     """
     Returns a list of SeriesGametype records, ordered appropriately for a best of X series.
@@ -24,214 +420,58 @@ def build_series(ruleset: SeriesRuleset, x: int) -> list[SeriesGametype]:
             "Only 3, 5, and 7 game series may be built"
         )
 
-    # 2) Get all gametypes related to the ruleset and shuffle them
-    ruleset_gametypes = list(
-        SeriesGametype.objects.select_related("ruleset", "map", "mode").filter(
-            ruleset=ruleset
-        )
-    )
-    random.shuffle(ruleset_gametypes)
+    # 2) Get all gametypes related to the ruleset from its series index
+    series_index = get_series_index(ruleset)
+    ruleset_gametypes = series_index.get("gametypes")
     if len(ruleset_gametypes) < x:
         raise SeriesBuildImpossibleException("Not enough gametypes to build series")
-
-    # 3) Compute all possible combinations of x gametype selections
-    combinations = list(itertools.combinations(ruleset_gametypes, x))
     logger.info(
-        f"Bo{x}: {len(combinations)} potential series combination(s) for ruleset '{ruleset.id}'"
+        f"Bo{x}: {len(ruleset_gametypes)} gametype(s) available for ruleset '{ruleset.id}'"
     )
 
-    # 4) Filter the list down to all combinations matching the ruleset's restrictions
-    valid_combinations = []
-    for combination in combinations:
-        # Raise an exception if we spend more than one full second evaluating combinations
-        if time.perf_counter() - start > 1:
-            raise SeriesBuildTimeoutException(
-                "Took longer than one second to process potential series combinations"
-            )
-
-        # Enforce featured mode constraints
-        if ruleset.featured_mode is not None:
-            # There must be exactly y occurrences of the featured mode in a best of x series
-            y = {3: 1, 5: 2, 7: 3}.get(x)
-            featured_mode_occurrences = 0
-            for gametype in combination:
-                if gametype.mode == ruleset.featured_mode:
-                    featured_mode_occurrences += 1
-            if featured_mode_occurrences != y:
-                continue
-        # Detect map repeats
-        map_repeats_allowed = {
+    # 3) Search for the most diverse series satisfying the ruleset's restrictions
+    # NOTE: We define an "ideal" series as one where:
+    # - No map or mode is played twice consecutively
+    # - Repeat maps/modes are minimized
+    # Ideal series are preferred; otherwise the most diverse valid series is returned
+    solver = SeriesSolver(
+        ruleset_gametypes,
+        x,
+        ruleset.featured_mode_id,
+        {
             3: ruleset.allow_bo3_map_repeats,
             5: ruleset.allow_bo5_map_repeats,
             7: ruleset.allow_bo7_map_repeats,
-        }.get(x)
-        if not map_repeats_allowed:
-            repeat_detected = False
-            for gametype1, gametype2 in itertools.combinations(combination, 2):
-                if gametype1.map == gametype2.map:
-                    repeat_detected = True
-                    break
-            if repeat_detected:
-                continue
-        # Detect mode repeats
-        mode_repeats_allowed = {
+        }.get(x),
+        {
             3: ruleset.allow_bo3_mode_repeats,
             5: ruleset.allow_bo5_mode_repeats,
             7: ruleset.allow_bo7_mode_repeats,
-        }.get(x)
-        if not mode_repeats_allowed:
-            repeat_detected = False
-            for gametype1, gametype2 in itertools.combinations(combination, 2):
-                if gametype1.mode == gametype2.mode:
-                    repeat_detected = (
-                        True
-                        if not bool(ruleset.featured_mode)
-                        else gametype1.mode != ruleset.featured_mode
-                    )
-                    if repeat_detected:
-                        break
-            if repeat_detected:
-                continue
-        valid_combinations.append(combination)
-    if len(valid_combinations) == 0:
-        raise SeriesBuildImpossibleException("No valid combinations to build series")
-    logger.info(
-        f"Bo{x}: {len(valid_combinations)} valid series combination(s) for ruleset '{ruleset.id}'"
+        }.get(x),
+        start,
     )
-
-    # 5) Slice and dice the valid combinations by uniqueness counts to build a list of the most diverse combinations
-    one_to_x_range = range(1, x + 1)
-    valid_combinations_by_unique_map_count = {i: [] for i in one_to_x_range}
-    valid_combinations_by_unique_mode_count = {i: [] for i in one_to_x_range}
-    for combination in valid_combinations:
-        unique_maps = set()
-        unique_modes = set()
-        for gametype in combination:
-            unique_maps.add(gametype.map)
-            unique_modes.add(gametype.mode)
-        valid_combinations_by_unique_map_count[len(unique_maps)].append(combination)
-        valid_combinations_by_unique_mode_count[len(unique_modes)].append(combination)
-    unique_map_high_water_mark = 0
-    unique_mode_high_water_mark = 0
-    for i in one_to_x_range:
-        if len(valid_combinations_by_unique_map_count[i]) > 0:
-            unique_map_high_water_mark = i
-        if len(valid_combinations_by_unique_mode_count[i]) > 0:
-            unique_mode_high_water_mark = i
-    diverse_map_combinations = set(
-        valid_combinations_by_unique_map_count[unique_map_high_water_mark]
-    )
-    if unique_map_high_water_mark >= 2:
-        diverse_map_combinations |= set(
-            valid_combinations_by_unique_map_count[unique_map_high_water_mark - 1]
+    known_level = series_index.get("levels").get(x)
+    chosen_series = None
+    if known_level is not None:
+        chosen_series = solver.draw(
+            known_level, series_index.get("combinations").get(x, [])
         )
-    diverse_mode_combinations = set(
-        valid_combinations_by_unique_mode_count[unique_mode_high_water_mark]
-    )
-    if unique_mode_high_water_mark >= 2:
-        diverse_mode_combinations |= set(
-            valid_combinations_by_unique_map_count[unique_mode_high_water_mark - 1]
-        )
-    most_diverse_combinations = list(
-        diverse_map_combinations.intersection(diverse_mode_combinations)
-    )
-    random.shuffle(most_diverse_combinations)
-
-    # 6) Pop combinations from the list and evaluate their permutations for suitability
-    ideal_permutation = None
-    fallback_permutation = None
-    while len(most_diverse_combinations) > 0:
-        chosen_combination = list(most_diverse_combinations.pop())
-
-        # 6a) Generate all valid permutations of the chosen combination; save a fallback
-        permutations = list(itertools.permutations(chosen_combination, x))
-        valid_permutations = []
-        for permutation in permutations:
-            # Enforce featured mode constraints
-            if ruleset.featured_mode is not None:
-                # Certain games must be the featured mode in a best of x
-                games_that_must_be_featured_mode = {
-                    3: [1],
-                    5: [1, 4],
-                    7: [1, 4, 6],
-                }.get(x)
-                permutation_violates_featured_mode_pattern = False
-                for game in games_that_must_be_featured_mode:
-                    if permutation[game].mode != ruleset.featured_mode:
-                        permutation_violates_featured_mode_pattern = True
-                        break
-                if permutation_violates_featured_mode_pattern:
-                    continue
-            valid_permutations.append(permutation)
-        logger.info(
-            f"Bo{x}: {len(valid_permutations)} valid series permutation(s) for chosen combination"
-        )
-        fallback_permutation = random.choice(valid_permutations)
-        # 6b) Generate ideal permutations from the valid permutations
-        # NOTE: We define an "ideal" permutation as one where:
-        # - No map or mode is played twice consecutively
-        # - Repeat maps/modes are minimized
-        ideal_permutations = []
-        for valid_permutation in valid_permutations:
-            # Evaluate the valid permutation for consecutive plays of the same map or mode
-            has_consecutive_plays = False
-            i = 1
-            while i < len(valid_permutation):
-                gametypeA = valid_permutation[i - 1]
-                gametypeB = valid_permutation[i]
-                if gametypeA.map == gametypeB.map or gametypeA.mode == gametypeB.mode:
-                    has_consecutive_plays = True
-                    break
-                i += 1
-            # Evaluate the valid permutation for excessive repeats of the same map or non-featured mode
-            count_by_map = {}
-            count_by_mode = {}
-            for gametype in valid_permutation:
-                if str(gametype.map) not in count_by_map:
-                    count_by_map[str(gametype.map)] = 1
-                else:
-                    count_by_map[str(gametype.map)] = (
-                        count_by_map[str(gametype.map)] + 1
-                    )
-                if gametype.mode == ruleset.featured_mode:
-                    continue
-                elif str(gametype.mode) not in count_by_mode:
-                    count_by_mode[str(gametype.mode)] = 0
-                else:
-                    count_by_mode[str(gametype.mode)] = (
-                        count_by_mode[str(gametype.mode)] + 1
-                    )
-            individual_repeat_threshold = {3: 1, 5: 2, 7: 2}.get(x)
-            total_repeat_threshold = {3: 1, 5: 2, 7: 3}.get(x)
-            total_map_repeats = sum(x - 1 for x in list(count_by_map.values()))
-            total_mode_repeats = sum(x - 1 for x in list(count_by_mode.values()))
-            has_too_many_individual_repeats = (
-                max(x for x in list(count_by_map.values()))
-                > individual_repeat_threshold
-                or max(x for x in list(count_by_mode.values()))
-                > individual_repeat_threshold
-            )
-            has_too_many_total_repeats = (
-                max(total_map_repeats, total_mode_repeats) >= total_repeat_threshold
+    # Only search when this series length has not been solved yet, or its stored combinations could not be drawn from
+    if chosen_series is None:
+        chosen_series, level, combinations = solver.solve(known_level or 0)
+        if level != known_level or combinations:
+            series_index["levels"][x] = level
+            series_index["combinations"][x] = combinations
+            cache.set(
+                get_series_index_cache_key(ruleset.id),
+                series_index,
+                SERIES_INDEX_CACHE_TIMEOUT,
             )
-            has_excessive_repeats = (
-                has_too_many_individual_repeats or has_too_many_total_repeats
-            )
-            if not has_consecutive_plays and not has_excessive_repeats:
-                ideal_permutations.append(valid_permutation)
-        # 6c) If we have any ideal permutations, choose one and break (otherwise try again with another combination)
-        if len(ideal_permutations) != 0:
-            logger.info(
-                f"Bo{x}: {len(ideal_permutations)} ideal series permutation(s) for chosen combination"
-            )
-            ideal_permutation = random.choice(ideal_permutations)
-            break
-    chosen_permutation = (
-        ideal_permutation if ideal_permutation is not None else fallback_permutation
-    )
+    if chosen_series is None:
+        raise SeriesBuildImpossibleException("No valid combinations to build series")
     end = time.perf_counter()
     logger.info(f"Bo{x}: Found series in {end - start:0.4f} seconds")
-    return list(chosen_permutation)
+    return chosen_series
 
 
 def build_best_of_dict(
@@ -39,6 +39,7 @@ class ShowcaseFileSnapshotAdmin(AutofillCreatorModelAdmin):
         "version_id",
         "name",
         "description",
+        "thumbnail_url",
         "snapshot_date",
         "plays_recent",
         "plays_all_time",
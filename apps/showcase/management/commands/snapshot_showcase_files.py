@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.showcase.utils import (
+    SHOWCASE_FILE_SNAPSHOT_BATCH_SIZE,
+    snapshot_showcase_files,
+)
+
+
+class Command(BaseCommand):
+    help = "Snapshots every Showcase File's stats for today. Safe to run repeatedly; run it once a day."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SHOWCASE_FILE_SNAPSHOT_BATCH_SIZE,
+            help="Number of files fetched, and snapshots written, per batch.",
+        )
+
+    def handle(self, *args, **options):
+        created_count = snapshot_showcase_files(
+            timezone.now().date(), options["batch_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {created_count} showcase file snapshot(s).")
+        )
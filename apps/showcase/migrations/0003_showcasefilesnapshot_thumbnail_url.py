@@ -0,0 +1,20 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("showcase", "0002_alter_showcasefile_created_at_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="showcasefilesnapshot",
+            name="thumbnail_url",
+            field=models.URLField(
+                blank=True, max_length=512, null=True, verbose_name="Thumbnail URL"
+            ),
+        ),
+    ]
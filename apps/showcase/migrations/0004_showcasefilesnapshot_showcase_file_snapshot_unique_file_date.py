@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("showcase", "0003_showcasefilesnapshot_thumbnail_url"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="showcasefilesnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("file", "snapshot_date"),
+                name="showcase_file_snapshot_unique_file_date",
+            ),
+        ),
+    ]
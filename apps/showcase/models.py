@@ -42,6 +42,12 @@ class ShowcaseFileSnapshot(Base):
         ordering = [
             "-snapshot_date",
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["file", "snapshot_date"],
+                name="showcase_file_snapshot_unique_file_date",
+            )
+        ]
         verbose_name = "Showcase File Snapshot"
         verbose_name_plural = "Showcase File Snapshots"
 
@@ -54,6 +60,9 @@ class ShowcaseFileSnapshot(Base):
     version_id = models.UUIDField(verbose_name="Version ID")
     name = models.CharField(max_length=64)
     description = models.CharField(max_length=512)
+    thumbnail_url = models.URLField(
+        max_length=512, blank=True, null=True, verbose_name="Thumbnail URL"
+    )
     snapshot_date = models.DateField()
     plays_recent = models.IntegerField()
     plays_all_time = models.IntegerField()
@@ -62,4 +71,4 @@ class ShowcaseFileSnapshot(Base):
     average_rating = models.DecimalField(max_digits=16, decimal_places=15)
 
     def __str__(self):
-        return self.name + ": " + self.snapshot_date
+        return f"{self.name}: {self.snapshot_date}"
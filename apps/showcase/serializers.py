@@ -15,6 +15,8 @@ class ShowcaseFileDataSerializer(serializers.Serializer):
     favorites = serializers.IntegerField()
     ratings = serializers.IntegerField()
     averageRating = serializers.DecimalField(max_digits=16, decimal_places=15)
+    playsLast7Days = serializers.IntegerField(allow_null=True)
+    playsLast30Days = serializers.IntegerField(allow_null=True)
 
 
 class CheckShowcaseRequestSerializer(serializers.Serializer):
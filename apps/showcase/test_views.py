@@ -1,13 +1,16 @@
+import datetime
 import uuid
 from collections import OrderedDict
-from unittest.mock import patch
+from decimal import Decimal
+from unittest.mock import ANY, patch
 
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
 from rest_framework.exceptions import ErrorDetail
 from rest_framework.test import APIClient, APITestCase
 
-from apps.showcase.models import ShowcaseFile
+from apps.discord.models import DiscordAccount
+from apps.showcase.models import ShowcaseFile, ShowcaseFileSnapshot
 
 
 class ShowcaseTestCase(APITestCase):
@@ -18,10 +21,10 @@ class ShowcaseTestCase(APITestCase):
         token, _created = Token.objects.get_or_create(user=self.user)
         self.client = APIClient(HTTP_AUTHORIZATION="Bearer " + token.key)
 
-    @patch("apps.showcase.views.get_prefab")
-    @patch("apps.showcase.views.get_mode")
-    @patch("apps.showcase.views.get_map")
-    def test_check_showcase_view(self, mock_get_map, mock_get_mode, mock_get_prefab):
+    @patch("apps.showcase.utils.aget_prefab")
+    @patch("apps.showcase.utils.aget_mode")
+    @patch("apps.showcase.utils.aget_map")
+    def test_check_showcase_view(self, mock_aget_map, mock_aget_mode, mock_aget_prefab):
         # Missing field values throw errors
         response = self.client.post("/showcase/check-showcase", {}, format="json")
         self.assertEqual(response.status_code, 400)
@@ -77,7 +80,7 @@ class ShowcaseTestCase(APITestCase):
         # Showcase has one map, one mode, one prefab
         map_asset_id = uuid.uuid4()
         map_version_id = uuid.uuid4()
-        mock_get_map.return_value = {
+        mock_aget_map.return_value = {
             "CustomData": {},
             "Tags": [],
             "AssetId": map_asset_id,
@@ -102,7 +105,7 @@ class ShowcaseTestCase(APITestCase):
         }
         mode_asset_id = uuid.uuid4()
         mode_version_id = uuid.uuid4()
-        mock_get_mode.return_value = {
+        mock_aget_mode.return_value = {
             "CustomData": {},
             "Tags": [],
             "AssetId": mode_asset_id,
@@ -127,7 +130,7 @@ class ShowcaseTestCase(APITestCase):
         }
         prefab_asset_id = uuid.uuid4()
         prefab_version_id = uuid.uuid4()
-        mock_get_prefab.return_value = {
+        mock_aget_prefab.return_value = {
             "CustomData": {},
             "Tags": [],
             "AssetId": prefab_asset_id,
@@ -201,6 +204,8 @@ class ShowcaseTestCase(APITestCase):
                         ("favorites", 3),
                         ("ratings", 5),
                         ("averageRating", "4.000000000000000"),
+                        ("playsLast7Days", None),
+                        ("playsLast30Days", None),
                     ]
                 ),
                 OrderedDict(
@@ -221,6 +226,8 @@ class ShowcaseTestCase(APITestCase):
                         ("favorites", 2),
                         ("ratings", 4),
                         ("averageRating", "3.000000000000000"),
+                        ("playsLast7Days", None),
+                        ("playsLast30Days", None),
                     ]
                 ),
                 OrderedDict(
@@ -241,26 +248,28 @@ class ShowcaseTestCase(APITestCase):
                         ("favorites", 1),
                         ("ratings", 3),
                         ("averageRating", "2.000000000000000"),
+                        ("playsLast7Days", None),
+                        ("playsLast30Days", None),
                     ]
                 ),
             ],
         )
-        mock_get_map.assert_called_once_with(map_asset_id)
-        mock_get_mode.assert_called_once_with(mode_asset_id)
-        mock_get_prefab.assert_called_once_with(prefab_asset_id)
+        mock_aget_map.assert_called_once_with(map_asset_id, client=ANY)
+        mock_aget_mode.assert_called_once_with(mode_asset_id, client=ANY)
+        mock_aget_prefab.assert_called_once_with(prefab_asset_id, client=ANY)
 
         ShowcaseFile.objects.all().delete()
-        mock_get_map.reset_mock()
-        mock_get_mode.reset_mock()
-        mock_get_prefab.reset_mock()
+        mock_aget_map.reset_mock()
+        mock_aget_mode.reset_mock()
+        mock_aget_prefab.reset_mock()
 
         # Showcase has one map, one mode, one prefab - but all are missing data on the API
         map_asset_id = uuid.uuid4()
-        mock_get_map.return_value = {}
+        mock_aget_map.return_value = {}
         mode_asset_id = uuid.uuid4()
-        mock_get_mode.return_value = {}
+        mock_aget_mode.return_value = {}
         prefab_asset_id = uuid.uuid4()
-        mock_get_prefab.return_value = {}
+        mock_aget_prefab.return_value = {}
         ShowcaseFile.objects.create(
             showcase_owner_id="123",
             file_id=map_asset_id,
@@ -309,6 +318,8 @@ class ShowcaseTestCase(APITestCase):
                         ("favorites", None),
                         ("ratings", None),
                         ("averageRating", None),
+                        ("playsLast7Days", None),
+                        ("playsLast30Days", None),
                     ]
                 ),
                 OrderedDict(
@@ -326,6 +337,8 @@ class ShowcaseTestCase(APITestCase):
                         ("favorites", None),
                         ("ratings", None),
                         ("averageRating", None),
+                        ("playsLast7Days", None),
+                        ("playsLast30Days", None),
                     ]
                 ),
                 OrderedDict(
@@ -343,18 +356,151 @@ class ShowcaseTestCase(APITestCase):
                         ("favorites", None),
                         ("ratings", None),
                         ("averageRating", None),
+                        ("playsLast7Days", None),
+                        ("playsLast30Days", None),
                     ]
                 ),
             ],
         )
-        mock_get_map.assert_called_once_with(map_asset_id)
-        mock_get_mode.assert_called_once_with(mode_asset_id)
-        mock_get_prefab.assert_called_once_with(prefab_asset_id)
+        mock_aget_map.assert_called_once_with(map_asset_id, client=ANY)
+        mock_aget_mode.assert_called_once_with(mode_asset_id, client=ANY)
+        mock_aget_prefab.assert_called_once_with(prefab_asset_id, client=ANY)
+
+        ShowcaseFile.objects.all().delete()
+        mock_aget_map.reset_mock()
+        mock_aget_mode.reset_mock()
+
+        # Fresh snapshots are served without calling the API, stale ones only when the API call fails
+        fresh_map = ShowcaseFile.objects.create(
+            showcase_owner_id="123",
+            file_id=uuid.uuid4(),
+            file_type=ShowcaseFile.FileType.Map,
+            position=1,
+            creator=self.user,
+        )
+        stale_mode = ShowcaseFile.objects.create(
+            showcase_owner_id="123",
+            file_id=uuid.uuid4(),
+            file_type=ShowcaseFile.FileType.Mode,
+            position=2,
+            creator=self.user,
+        )
+        for showcase_file, created_at in (
+            (fresh_map, datetime.datetime.now(tz=datetime.timezone.utc)),
+            (
+                stale_mode,
+                datetime.datetime.now(tz=datetime.timezone.utc)
+                - datetime.timedelta(days=2),
+            ),
+        ):
+            snapshot = ShowcaseFileSnapshot.objects.create(
+                file=showcase_file,
+                version_id=uuid.uuid4(),
+                name=f"Snapshot {showcase_file.file_type}",
+                description="Snapshot description",
+                thumbnail_url="https://example.com/thumbnail.jpg",
+                snapshot_date=created_at.date(),
+                plays_recent=1,
+                plays_all_time=10,
+                favorites=2,
+                number_of_ratings=3,
+                average_rating=Decimal("4.5"),
+                creator=self.user,
+            )
+            ShowcaseFileSnapshot.objects.filter(id=snapshot.id).update(
+                created_at=created_at
+            )
+        mock_aget_mode.side_effect = Exception("Upstream unavailable")
+        response = self.client.post(
+            "/showcase/check-showcase",
+            {
+                "discordUserId": "123",
+                "discordUsername": "test123",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        showcase_files = response.data.get("showcaseFiles")
+        self.assertEqual(
+            [
+                (data.get("isMissing"), data.get("name"), data.get("plays"))
+                for data in showcase_files
+            ],
+            [(False, "Snapshot map", 10), (False, "Snapshot mode", 10)],
+        )
+        self.assertEqual(
+            showcase_files[0].get("thumbnailURL"), "https://example.com/thumbnail.jpg"
+        )
+        self.assertEqual(showcase_files[0].get("averageRating"), "4.500000000000000")
+        mock_aget_map.assert_not_called()
+        mock_aget_mode.assert_called_once_with(stale_mode.file_id, client=ANY)
+
+        # A failed API call with no snapshot to fall back on is an error
+        ShowcaseFileSnapshot.objects.all().delete()
+        response = self.client.post(
+            "/showcase/check-showcase",
+            {
+                "discordUserId": "123",
+                "discordUsername": "test123",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 500)
 
     # TODO: Write this test
     def test_add_file_view(self):
         pass
 
-    # TODO: Write this test
     def test_remove_file_view(self):
-        pass
+        DiscordAccount.objects.create(
+            creator=self.user, discord_id="123", discord_username="test123"
+        )
+        showcase_files = [
+            ShowcaseFile.objects.create(
+                showcase_owner_id="123",
+                file_id=uuid.uuid4(),
+                file_type=ShowcaseFile.FileType.Map,
+                position=position,
+                creator=self.user,
+            )
+            for position in range(1, 6)
+        ]
+
+        # Removing a file moves every later file forward one position
+        response = self.client.post(
+            "/showcase/remove-file",
+            {
+                "discordUserId": "123",
+                "discordUsername": "test123",
+                "position": 2,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data.get("success"))
+        self.assertEqual(
+            list(
+                ShowcaseFile.objects.filter(showcase_owner_id="123")
+                .order_by("position")
+                .values_list("file_id", "position")
+            ),
+            [
+                (showcase_files[0].file_id, 1),
+                (showcase_files[2].file_id, 2),
+                (showcase_files[3].file_id, 3),
+                (showcase_files[4].file_id, 4),
+            ],
+        )
+
+        # Removing an empty position is an error
+        response = self.client.post(
+            "/showcase/remove-file",
+            {
+                "discordUserId": "123",
+                "discordUsername": "test123",
+                "position": 5,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(ShowcaseFile.objects.count(), 4)
@@ -0,0 +1,145 @@
+import datetime
+import uuid
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.discord.models import DiscordAccount
+from apps.showcase.models import ShowcaseFile, ShowcaseFileSnapshot
+from apps.showcase.utils import (
+    build_showcase_file_snapshot,
+    get_showcase_file_play_baselines,
+    snapshot_showcase_files,
+)
+
+
+class ShowcaseTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="test", email="test@test.com", password="test"
+        )
+        self.discord_account = DiscordAccount.objects.create(
+            creator=self.user, discord_id="123", discord_username="test123"
+        )
+
+    def create_showcase_file(self, position: int) -> ShowcaseFile:
+        return ShowcaseFile.objects.create(
+            showcase_owner=self.discord_account,
+            file_id=uuid.uuid4(),
+            file_type=ShowcaseFile.FileType.Map,
+            position=position,
+            creator=self.user,
+        )
+
+    @patch("apps.showcase.utils.get_map")
+    def test_snapshot_showcase_files(self, mock_get_map):
+        published_file = self.create_showcase_file(1)
+        missing_file = self.create_showcase_file(2)
+        version_id = uuid.uuid4()
+        mock_get_map.side_effect = lambda file_id: (
+            {
+                "VersionId": version_id,
+                "PublicName": "Test Map",
+                "Description": "This is a test description for Test Map.",
+                "Files": {
+                    "Prefix": "https://example.com/",
+                    "FileRelativePaths": ["images/thumbnail.jpg"],
+                },
+                "AssetStats": {
+                    "PlaysRecent": 1,
+                    "PlaysAllTime": 2,
+                    "Favorites": 3,
+                    "AverageRating": 4.25,
+                    "NumberOfRatings": 5,
+                },
+            }
+            if file_id == published_file.file_id
+            else {}
+        )
+        today = datetime.date(2024, 1, 31)
+
+        # Files the API cannot return are skipped
+        self.assertEqual(snapshot_showcase_files(today, batch_size=1), 1)
+        snapshot = ShowcaseFileSnapshot.objects.get()
+        self.assertEqual(snapshot.file, published_file)
+        self.assertEqual(snapshot.version_id, version_id)
+        self.assertEqual(snapshot.name, "Test Map")
+        self.assertEqual(
+            snapshot.thumbnail_url, "https://example.com/images/thumbnail.jpg"
+        )
+        self.assertEqual(snapshot.snapshot_date, today)
+        self.assertEqual(snapshot.plays_recent, 1)
+        self.assertEqual(snapshot.plays_all_time, 2)
+        self.assertEqual(snapshot.favorites, 3)
+        self.assertEqual(snapshot.number_of_ratings, 5)
+        self.assertEqual(snapshot.average_rating, Decimal("4.25"))
+        self.assertEqual(snapshot.creator, self.user)
+
+        # Files already snapshotted for the day are not fetched again
+        mock_get_map.reset_mock()
+        self.assertEqual(snapshot_showcase_files(today), 0)
+        mock_get_map.assert_called_once_with(missing_file.file_id)
+
+    @patch("apps.showcase.utils.build_showcase_file_snapshot")
+    @patch("apps.showcase.utils.get_map")
+    def test_snapshot_showcase_files_concurrent_run(
+        self, mock_get_map, mock_build_showcase_file_snapshot
+    ):
+        self.create_showcase_file(1)
+        today = datetime.date(2024, 1, 31)
+        mock_get_map.return_value = {"VersionId": uuid.uuid4()}
+
+        def build_during_concurrent_run(showcase_file, raw_api_data, snapshot_date):
+            # Another run snapshots the file while this run is building its snapshot
+            snapshot = build_showcase_file_snapshot(
+                showcase_file, raw_api_data, snapshot_date
+            )
+            ShowcaseFileSnapshot.objects.create(
+                **{
+                    field.attname: getattr(snapshot, field.attname)
+                    for field in ShowcaseFileSnapshot._meta.concrete_fields
+                    if field.attname != "id"
+                }
+            )
+            return snapshot
+
+        mock_build_showcase_file_snapshot.side_effect = build_during_concurrent_run
+
+        # The conflicting snapshot is skipped and not counted
+        self.assertEqual(snapshot_showcase_files(today), 0)
+        self.assertEqual(ShowcaseFileSnapshot.objects.count(), 1)
+
+    def test_get_showcase_file_play_baselines(self):
+        showcase_file = self.create_showcase_file(1)
+        new_showcase_file = self.create_showcase_file(2)
+        today = datetime.date(2024, 1, 31)
+        for showcase_file_to_snapshot, days_ago, plays_all_time in (
+            (showcase_file, 40, 10),
+            (showcase_file, 30, 20),
+            (showcase_file, 10, 50),
+            (showcase_file, 7, 70),
+            (showcase_file, 0, 100),
+            (new_showcase_file, 3, 5),
+        ):
+            ShowcaseFileSnapshot.objects.create(
+                file=showcase_file_to_snapshot,
+                version_id=uuid.uuid4(),
+                name="Test Map",
+                description="",
+                snapshot_date=today - datetime.timedelta(days=days_ago),
+                plays_recent=0,
+                plays_all_time=plays_all_time,
+                favorites=0,
+                number_of_ratings=0,
+                average_rating=0,
+                creator=self.user,
+            )
+        self.assertEqual(
+            get_showcase_file_play_baselines([showcase_file, new_showcase_file], today),
+            {
+                showcase_file.id: {7: 70, 30: 20},
+                new_showcase_file.id: {7: 5, 30: 5},
+            },
+        )
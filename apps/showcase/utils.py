@@ -0,0 +1,332 @@
+import datetime
+import logging
+from decimal import Decimal
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+
+from apps.halo_infinite.api.files import (
+    aget_map,
+    aget_mode,
+    aget_prefab,
+    get_map,
+    get_mode,
+    get_prefab,
+)
+from apps.overrides.utils import acall_concurrently, call_concurrently
+from apps.showcase.models import ShowcaseFile, ShowcaseFileSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Snapshots younger than this are served in place of a live discovery-infiniteugc call
+SHOWCASE_FILE_SNAPSHOT_MAX_AGE = datetime.timedelta(days=1)
+SHOWCASE_FILE_SNAPSHOT_BATCH_SIZE = 100
+SHOWCASE_FILE_PLAY_TREND_DAYS = (7, 30)
+
+SHOWCASE_FILE_WAYPOINT_PATHS = {
+    ShowcaseFile.FileType.Map: "maps",
+    ShowcaseFile.FileType.Mode: "modes",
+    ShowcaseFile.FileType.Prefab: "prefabs",
+}
+
+
+def get_waypoint_url(showcase_file: ShowcaseFile) -> str:
+    path = SHOWCASE_FILE_WAYPOINT_PATHS.get(showcase_file.file_type)
+    if path is None:
+        return ""
+    return (
+        f"https://www.halowaypoint.com/halo-infinite/ugc/{path}/{showcase_file.file_id}"
+    )
+
+
+def get_thumbnail_url(raw_api_data: dict) -> str | None:
+    thumbnail_filepaths = [
+        filepath
+        for filepath in raw_api_data.get("Files", {}).get("FileRelativePaths", [])
+        if "thumbnail" in filepath
+    ]
+    if len(thumbnail_filepaths) == 0:
+        return None
+    return raw_api_data.get("Files", {}).get("Prefix") + thumbnail_filepaths[0]
+
+
+def get_showcase_file_api_data(showcase_file: ShowcaseFile) -> dict | None:
+    """
+    Fetches a ShowcaseFile's raw discovery-infiniteugc data. Returns an empty dict if the API returns a non-200 for the
+    file and None if the call itself fails.
+    """
+    try:
+        if showcase_file.file_type == ShowcaseFile.FileType.Map:
+            return get_map(showcase_file.file_id)
+        elif showcase_file.file_type == ShowcaseFile.FileType.Mode:
+            return get_mode(showcase_file.file_id)
+        elif showcase_file.file_type == ShowcaseFile.FileType.Prefab:
+            return get_prefab(showcase_file.file_id)
+    except Exception as ex:
+        logger.error(f"Error attempting to fetch Showcase File {showcase_file.id}.")
+        logger.error(ex)
+        return None
+    return {}
+
+
+async def aget_showcase_file_api_data(
+    showcase_file: ShowcaseFile, client: httpx.AsyncClient = None
+) -> dict | None:
+    # Async counterpart of `get_showcase_file_api_data`
+    try:
+        if showcase_file.file_type == ShowcaseFile.FileType.Map:
+            return await aget_map(showcase_file.file_id, client=client)
+        elif showcase_file.file_type == ShowcaseFile.FileType.Mode:
+            return await aget_mode(showcase_file.file_id, client=client)
+        elif showcase_file.file_type == ShowcaseFile.FileType.Prefab:
+            return await aget_prefab(showcase_file.file_id, client=client)
+    except Exception as ex:
+        logger.error(f"Error attempting to fetch Showcase File {showcase_file.id}.")
+        logger.error(ex)
+        return None
+    return {}
+
+
+def get_latest_showcase_file_snapshots(
+    showcase_files: list[ShowcaseFile],
+) -> dict[int, ShowcaseFileSnapshot]:
+    # DISTINCT ON keeps only the newest snapshot of each file in a single query
+    return {
+        snapshot.file_id: snapshot
+        for snapshot in ShowcaseFileSnapshot.objects.filter(file__in=showcase_files)
+        .order_by("file_id", "-created_at")
+        .distinct("file_id")
+    }
+
+
+def get_showcase_file_play_baselines(
+    showcase_files: list[ShowcaseFile], today: datetime.date
+) -> dict[int, dict[int, int]]:
+    """
+    Returns each ShowcaseFile's all-time play count at the start of every SHOWCASE_FILE_PLAY_TREND_DAYS window, taken
+    from the oldest snapshot inside the window. Windows with no snapshots are left out.
+    """
+    play_baselines = {}
+    for file_id, snapshot_date, plays_all_time in (
+        ShowcaseFileSnapshot.objects.filter(
+            file__in=showcase_files,
+            snapshot_date__gte=today
+            - datetime.timedelta(days=max(SHOWCASE_FILE_PLAY_TREND_DAYS)),
+        )
+        .order_by("file_id", "snapshot_date")
+        .values_list("file_id", "snapshot_date", "plays_all_time")
+    ):
+        file_baselines = play_baselines.setdefault(file_id, {})
+        for days in SHOWCASE_FILE_PLAY_TREND_DAYS:
+            if (
+                days not in file_baselines
+                and snapshot_date >= today - datetime.timedelta(days=days)
+            ):
+                file_baselines[days] = plays_all_time
+    return play_baselines
+
+
+def get_play_trends(plays: int | None, baselines: dict[int, int]) -> dict:
+    return {
+        f"playsLast{days}Days": (
+            None if plays is None or days not in baselines else plays - baselines[days]
+        )
+        for days in SHOWCASE_FILE_PLAY_TREND_DAYS
+    }
+
+
+def get_showcase_file_data_from_api(
+    showcase_file: ShowcaseFile, raw_api_data: dict
+) -> dict:
+    return {
+        "isMissing": False,
+        "fileType": showcase_file.file_type,
+        "name": raw_api_data.get("PublicName"),
+        "description": raw_api_data.get("Description"),
+        "thumbnailURL": get_thumbnail_url(raw_api_data),
+        "waypointURL": get_waypoint_url(showcase_file),
+        "plays": raw_api_data.get("AssetStats", {}).get("PlaysAllTime"),
+        "favorites": raw_api_data.get("AssetStats", {}).get("Favorites"),
+        "ratings": raw_api_data.get("AssetStats", {}).get("NumberOfRatings"),
+        "averageRating": raw_api_data.get("AssetStats", {}).get("AverageRating"),
+    }
+
+
+def get_showcase_file_data_from_snapshot(
+    showcase_file: ShowcaseFile, snapshot: ShowcaseFileSnapshot
+) -> dict:
+    return {
+        "isMissing": False,
+        "fileType": showcase_file.file_type,
+        "name": snapshot.name,
+        "description": snapshot.description,
+        "thumbnailURL": snapshot.thumbnail_url,
+        "waypointURL": get_waypoint_url(showcase_file),
+        "plays": snapshot.plays_all_time,
+        "favorites": snapshot.favorites,
+        "ratings": snapshot.number_of_ratings,
+        "averageRating": snapshot.average_rating,
+    }
+
+
+def get_missing_showcase_file_data(showcase_file: ShowcaseFile) -> dict:
+    return {
+        "isMissing": True,
+        "fileType": showcase_file.file_type,
+        "name": None,
+        "description": None,
+        "thumbnailURL": None,
+        "waypointURL": get_waypoint_url(showcase_file),
+        "plays": None,
+        "favorites": None,
+        "ratings": None,
+        "averageRating": None,
+    }
+
+
+def get_stale_showcase_files(
+    showcase_files: list[ShowcaseFile],
+    latest_snapshots: dict[int, ShowcaseFileSnapshot],
+) -> list[ShowcaseFile]:
+    fresh_after = timezone.now() - SHOWCASE_FILE_SNAPSHOT_MAX_AGE
+    return [
+        showcase_file
+        for showcase_file in showcase_files
+        if showcase_file.id not in latest_snapshots
+        or latest_snapshots[showcase_file.id].created_at < fresh_after
+    ]
+
+
+def merge_showcase_file_data(
+    showcase_files: list[ShowcaseFile],
+    latest_snapshots: dict[int, ShowcaseFileSnapshot],
+    raw_api_datas: dict[int, dict | None],
+) -> list[dict]:
+    play_baselines = get_showcase_file_play_baselines(
+        showcase_files, timezone.now().date()
+    )
+
+    showcase_file_data = []
+    for showcase_file in showcase_files:
+        raw_api_data = raw_api_datas.get(showcase_file.id)
+        snapshot = latest_snapshots.get(showcase_file.id)
+        if raw_api_data:
+            showcase_file_data.append(
+                get_showcase_file_data_from_api(showcase_file, raw_api_data)
+            )
+        elif snapshot is not None:
+            showcase_file_data.append(
+                get_showcase_file_data_from_snapshot(showcase_file, snapshot)
+            )
+        elif raw_api_data is None:
+            raise Exception(
+                f"Could not fetch Showcase File {showcase_file.id} and it has no snapshot."
+            )
+        else:
+            showcase_file_data.append(get_missing_showcase_file_data(showcase_file))
+        showcase_file_data[-1].update(
+            get_play_trends(
+                showcase_file_data[-1].get("plays"),
+                play_baselines.get(showcase_file.id, {}),
+            )
+        )
+    return showcase_file_data
+
+
+def get_showcase_file_data(showcase_files: list[ShowcaseFile]) -> list[dict]:
+    """
+    Builds the display data for each ShowcaseFile, in order. Files whose latest snapshot is younger than
+    SHOWCASE_FILE_SNAPSHOT_MAX_AGE are served from it; every other file is fetched from the API concurrently, falling
+    back to its latest snapshot of any age when the API call fails or returns nothing.
+    """
+    latest_snapshots = get_latest_showcase_file_snapshots(showcase_files)
+    stale_files = get_stale_showcase_files(showcase_files, latest_snapshots)
+    raw_api_datas = dict(
+        zip(
+            [showcase_file.id for showcase_file in stale_files],
+            call_concurrently(
+                lambda showcase_file, session: get_showcase_file_api_data(
+                    showcase_file
+                ),
+                [(showcase_file,) for showcase_file in stale_files],
+            ),
+        )
+    )
+    return merge_showcase_file_data(showcase_files, latest_snapshots, raw_api_datas)
+
+
+async def aget_showcase_file_data(showcase_files: list[ShowcaseFile]) -> list[dict]:
+    # Async counterpart of `get_showcase_file_data`, requesting every stale file at once
+    latest_snapshots = await sync_to_async(get_latest_showcase_file_snapshots)(
+        showcase_files
+    )
+    stale_files = get_stale_showcase_files(showcase_files, latest_snapshots)
+    raw_api_datas = dict(
+        zip(
+            [showcase_file.id for showcase_file in stale_files],
+            await acall_concurrently(
+                aget_showcase_file_api_data,
+                [(showcase_file,) for showcase_file in stale_files],
+            ),
+        )
+    )
+    return await sync_to_async(merge_showcase_file_data)(
+        showcase_files, latest_snapshots, raw_api_datas
+    )
+
+
+def build_showcase_file_snapshot(
+    showcase_file: ShowcaseFile, raw_api_data: dict, snapshot_date: datetime.date
+) -> ShowcaseFileSnapshot:
+    asset_stats = raw_api_data.get("AssetStats", {})
+    return ShowcaseFileSnapshot(
+        creator_id=showcase_file.creator_id,
+        file=showcase_file,
+        version_id=raw_api_data.get("VersionId"),
+        name=(raw_api_data.get("PublicName") or "")[:64],
+        description=(raw_api_data.get("Description") or "")[:512],
+        thumbnail_url=get_thumbnail_url(raw_api_data),
+        snapshot_date=snapshot_date,
+        plays_recent=asset_stats.get("PlaysRecent", 0),
+        plays_all_time=asset_stats.get("PlaysAllTime", 0),
+        favorites=asset_stats.get("Favorites", 0),
+        number_of_ratings=asset_stats.get("NumberOfRatings", 0),
+        average_rating=round(Decimal(str(asset_stats.get("AverageRating", 0))), 15),
+    )
+
+
+def snapshot_showcase_files(
+    snapshot_date: datetime.date,
+    batch_size: int = SHOWCASE_FILE_SNAPSHOT_BATCH_SIZE,
+) -> int:
+    """
+    Snapshots every ShowcaseFile that has no snapshot for `snapshot_date` yet, fetching each batch of files
+    concurrently and writing it with one bulk insert. Files the API cannot return are skipped so a later run retries
+    them. Returns the number of snapshots actually inserted.
+    """
+    showcase_files = list(
+        ShowcaseFile.objects.exclude(snapshots__snapshot_date=snapshot_date).order_by(
+            "created_at"
+        )
+    )
+    created_count = 0
+    for batch_start in range(0, len(showcase_files), batch_size):
+        batch_end = batch_start + batch_size
+        batch = showcase_files[batch_start:batch_end]
+        raw_api_datas = call_concurrently(
+            lambda showcase_file, session: get_showcase_file_api_data(showcase_file),
+            [(showcase_file,) for showcase_file in batch],
+        )
+        snapshots = [
+            build_showcase_file_snapshot(showcase_file, raw_api_data, snapshot_date)
+            for showcase_file, raw_api_data in zip(batch, raw_api_datas)
+            if raw_api_data
+        ]
+        # A concurrent run may have snapshotted some of these files already, and the conflicting rows are skipped
+        # silently, so only the snapshots whose client-generated ids were actually written are counted
+        ShowcaseFileSnapshot.objects.bulk_create(snapshots, ignore_conflicts=True)
+        created_count += ShowcaseFileSnapshot.objects.filter(
+            id__in=[snapshot.id for snapshot in snapshots]
+        ).count()
+    return created_count
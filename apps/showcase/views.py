@@ -1,5 +1,7 @@
 import logging
 
+from asgiref.sync import sync_to_async
+from django.db.models import F
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.exceptions import APIException, PermissionDenied
@@ -9,6 +11,7 @@ from rest_framework.views import APIView
 from apps.discord.utils import update_or_create_discord_account
 from apps.halo_infinite.api.files import get_map, get_mode, get_prefab
 from apps.link.models import DiscordXboxLiveLink
+from apps.overrides.views import AsyncAPIView
 from apps.showcase.models import ShowcaseFile
 from apps.showcase.serializers import (
     AddFileRequestSerializer,
@@ -19,12 +22,13 @@ from apps.showcase.serializers import (
     RemoveFileResponseSerializer,
     ShowcaseFileDataSerializer,
 )
+from apps.showcase.utils import aget_showcase_file_data
 from config.serializers import StandardErrorSerializer
 
 logger = logging.getLogger(__name__)
 
 
-class CheckShowcaseView(APIView):
+class CheckShowcaseView(AsyncAPIView):
     @extend_schema(
         request=CheckShowcaseRequestSerializer,
         responses={
@@ -33,7 +37,7 @@ class CheckShowcaseView(APIView):
             500: StandardErrorSerializer,
         },
     )
-    def post(self, request, format=None):
+    async def post(self, request, format=None):
         """
         Retrieve a Discord Account's full Showcase data, if any exists.
         """
@@ -41,70 +45,21 @@ class CheckShowcaseView(APIView):
         if validation_serializer.is_valid(raise_exception=True):
             discord_id = validation_serializer.data.get("discordUserId")
             discord_username = validation_serializer.data.get("discordUsername")
-            showcase_file_data = []
-
             try:
-                discord_account = update_or_create_discord_account(
+                discord_account = await sync_to_async(update_or_create_discord_account)(
                     discord_id, discord_username, request.user
                 )
 
-                showcase_files = ShowcaseFile.objects.filter(
-                    showcase_owner=discord_account
-                ).order_by("position")
-                for showcase_file in showcase_files:
-                    raw_api_data = {}
-                    is_missing = True
-                    thumbnail_url = None
-                    waypoint_url = ""
-                    if showcase_file.file_type == ShowcaseFile.FileType.Map:
-                        raw_api_data = get_map(showcase_file.file_id)
-                        waypoint_url = f"https://www.halowaypoint.com/halo-infinite/ugc/maps/{showcase_file.file_id}"
-                    elif showcase_file.file_type == ShowcaseFile.FileType.Mode:
-                        raw_api_data = get_mode(showcase_file.file_id)
-                        waypoint_url = f"https://www.halowaypoint.com/halo-infinite/ugc/modes/{showcase_file.file_id}"
-                    elif showcase_file.file_type == ShowcaseFile.FileType.Prefab:
-                        raw_api_data = get_prefab(showcase_file.file_id)
-                        waypoint_url = f"https://www.halowaypoint.com/halo-infinite/ugc/prefabs/{showcase_file.file_id}"
-                    # NOTE: Raw API data should only be an empty dict if the API returns a non-200 for the file
-                    if raw_api_data != {}:
-                        is_missing = False
-                        thumbnail_filepaths = list(
-                            filter(
-                                lambda x: "thumbnail" in x,
-                                raw_api_data.get("Files", {}).get(
-                                    "FileRelativePaths", []
-                                ),
-                            )
-                        )
-                        if len(thumbnail_filepaths) > 0:
-                            thumbnail_url = (
-                                raw_api_data.get("Files", {}).get("Prefix")
-                                + thumbnail_filepaths[0]
-                            )
-                    showcase_file_data.append(
-                        ShowcaseFileDataSerializer(
-                            {
-                                "isMissing": is_missing,
-                                "fileType": showcase_file.file_type,
-                                "name": raw_api_data.get("PublicName"),
-                                "description": raw_api_data.get("Description"),
-                                "thumbnailURL": thumbnail_url,
-                                "waypointURL": waypoint_url,
-                                "plays": raw_api_data.get("AssetStats", {}).get(
-                                    "PlaysAllTime"
-                                ),
-                                "favorites": raw_api_data.get("AssetStats", {}).get(
-                                    "Favorites"
-                                ),
-                                "ratings": raw_api_data.get("AssetStats", {}).get(
-                                    "NumberOfRatings"
-                                ),
-                                "averageRating": raw_api_data.get("AssetStats", {}).get(
-                                    "AverageRating"
-                                ),
-                            }
-                        ).data
-                    )
+                showcase_files = [
+                    showcase_file
+                    async for showcase_file in ShowcaseFile.objects.filter(
+                        showcase_owner=discord_account
+                    ).order_by("position")
+                ]
+                showcase_file_data = [
+                    ShowcaseFileDataSerializer(data).data
+                    for data in await aget_showcase_file_data(showcase_files)
+                ]
             except Exception as ex:
                 logger.error("Error attempting to check a Showcase.")
                 logger.error(ex)
@@ -261,15 +216,9 @@ class RemoveFileView(APIView):
                 showcase_file_to_delete.delete()
 
                 # Move all later ShowcaseFiles forward one position
-                for i in range(position + 1, 6):
-                    try:
-                        showcase_file = ShowcaseFile.objects.get(
-                            showcase_owner=discord_account, position=i
-                        )
-                        showcase_file.position = showcase_file.position - 1
-                        showcase_file.save()
-                    except ShowcaseFile.DoesNotExist:
-                        pass
+                ShowcaseFile.objects.filter(
+                    showcase_owner=discord_account, position__gt=position
+                ).update(position=F("position") - 1)
             except Exception as ex:
                 logger.error("Error attempting to remove from a Showcase.")
                 logger.error(ex)
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class TrailblazerConfig(AppConfig):
     name = "apps.trailblazer"
     verbose_name = "Trailblazers"
+
+    def ready(self):
+        from apps.halo_infinite.utils import (
+            is_ranked_arena_match,
+            register_xbox_earn_rules,
+        )
+        from apps.trailblazer.utils import ERA_XBOX_EARN_RULES
+
+        register_xbox_earn_rules(
+            "trailblazer", is_ranked_arena_match, ERA_XBOX_EARN_RULES
+        )
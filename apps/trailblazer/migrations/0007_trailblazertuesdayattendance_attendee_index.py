@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-19 04:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("discord", "0006_alter_discordaccount_created_at_and_more"),
+        ("trailblazer", "0006_remove_trailblazertuesdayreferral_creator_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="trailblazertuesdayattendance",
+            index=models.Index(
+                fields=["attendee_discord", "attendance_date"],
+                name="Trailblazer_attende_ac6e4e_idx",
+            ),
+        ),
+    ]
@@ -10,6 +10,7 @@ class TrailblazerTuesdayAttendance(Base):
         ordering = [
             "-attendance_date",
         ]
+        indexes = [models.Index(fields=["attendee_discord", "attendance_date"])]
         verbose_name = "Tuesday Attendance"
         verbose_name_plural = "Tuesday Attendances"
 
@@ -58,26 +58,25 @@ class TrailblazerTestCase(APITestCase):
             ),
         )
 
+    @patch("apps.trailblazer.views.awarm_era_xbox_earns")
     @patch("apps.trailblazer.views.get_e1_xbox_earn_dict")
     @patch("apps.trailblazer.views.get_e1_discord_earn_dict")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
     @patch("apps.trailblazer.views.get_current_era")
     def test_trailblazer_scout_progress_view_e1(
         self,
         mock_get_current_era,
-        mock_get_xuid_and_exact_gamertag,
         mock_get_e1_discord_earn_dict,
         mock_get_e1_xbox_earn_dict,
+        mock_awarm_era_xbox_earns,
     ):
         mock_get_current_era.return_value = 1
 
         # Create test data
-        mock_get_xuid_and_exact_gamertag.return_value = (4567, "test1234")
         discord_account = DiscordAccount.objects.create(
             creator=self.user, discord_id="1234", discord_username="TestUsername1234"
         )
         xbox_live_account = XboxLiveAccount.objects.create(
-            creator=self.user, gamertag="testGT1234"
+            creator=self.user, gamertag="test1234", xuid=4567
         )
         link = DiscordXboxLiveLink.objects.create(
             creator=self.user,
@@ -165,8 +164,10 @@ class TrailblazerTestCase(APITestCase):
         self.assertEqual(response.data.get("pointsHotStreak"), 100)
         mock_get_e1_discord_earn_dict.assert_called_once_with([link.discord_account_id])
         mock_get_e1_xbox_earn_dict.assert_called_once_with([link.xbox_live_account_id])
+        mock_awarm_era_xbox_earns.assert_called_with([link.xbox_live_account_id], 1)
         mock_get_e1_discord_earn_dict.reset_mock()
         mock_get_e1_xbox_earn_dict.reset_mock()
+        mock_awarm_era_xbox_earns.reset_mock()
 
         # Success - no linked gamertag
         link.delete()
@@ -203,29 +204,29 @@ class TrailblazerTestCase(APITestCase):
             [discord_account.discord_id]
         )
         mock_get_e1_xbox_earn_dict.assert_not_called()
+        mock_awarm_era_xbox_earns.assert_not_called()
         mock_get_e1_discord_earn_dict.reset_mock()
         mock_get_e1_xbox_earn_dict.reset_mock()
 
+    @patch("apps.trailblazer.views.awarm_era_xbox_earns")
     @patch("apps.trailblazer.views.get_e2_xbox_earn_dict")
     @patch("apps.trailblazer.views.get_e2_discord_earn_dict")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
     @patch("apps.trailblazer.views.get_current_era")
     def test_trailblazer_scout_progress_view_e2(
         self,
         mock_get_current_era,
-        mock_get_xuid_and_exact_gamertag,
         mock_get_e2_discord_earn_dict,
         mock_get_e2_xbox_earn_dict,
+        mock_awarm_era_xbox_earns,
     ):
         mock_get_current_era.return_value = 2
 
         # Create test data
-        mock_get_xuid_and_exact_gamertag.return_value = (4567, "test1234")
         discord_account = DiscordAccount.objects.create(
             creator=self.user, discord_id="1234", discord_username="TestUsername1234"
         )
         xbox_live_account = XboxLiveAccount.objects.create(
-            creator=self.user, gamertag="testGT1234"
+            creator=self.user, gamertag="test1234", xuid=4567
         )
         link = DiscordXboxLiveLink.objects.create(
             creator=self.user,
@@ -354,26 +355,25 @@ class TrailblazerTestCase(APITestCase):
         mock_get_e2_discord_earn_dict.reset_mock()
         mock_get_e2_xbox_earn_dict.reset_mock()
 
+    @patch("apps.trailblazer.views.awarm_era_xbox_earns")
     @patch("apps.trailblazer.views.get_e3_xbox_earn_dict")
     @patch("apps.trailblazer.views.get_e3_discord_earn_dict")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
     @patch("apps.trailblazer.views.get_current_era")
     def test_trailblazer_scout_progress_view_e3(
         self,
         mock_get_current_era,
-        mock_get_xuid_and_exact_gamertag,
         mock_get_e3_discord_earn_dict,
         mock_get_e3_xbox_earn_dict,
+        mock_awarm_era_xbox_earns,
     ):
         mock_get_current_era.return_value = 3
 
         # Create test data
-        mock_get_xuid_and_exact_gamertag.return_value = (4567, "test1234")
         discord_account = DiscordAccount.objects.create(
             creator=self.user, discord_id="1234", discord_username="TestUsername1234"
         )
         xbox_live_account = XboxLiveAccount.objects.create(
-            creator=self.user, gamertag="testGT1234"
+            creator=self.user, gamertag="test1234", xuid=4567
         )
         link = DiscordXboxLiveLink.objects.create(
             creator=self.user,
@@ -497,10 +497,7 @@ class TrailblazerTestCase(APITestCase):
         mock_get_e3_xbox_earn_dict.reset_mock()
 
     @patch("apps.trailblazer.views.get_csrs")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
-    def test_trailblazer_titan_check_view(
-        self, mock_get_xuid_and_exact_gamertag, mock_get_csrs
-    ):
+    def test_trailblazer_titan_check_view(self, mock_get_csrs):
         # Missing field values throw errors
         response = self.client.post("/trailblazer/titan-check", {}, format="json")
         self.assertEqual(response.status_code, 400)
@@ -547,14 +544,13 @@ class TrailblazerTestCase(APITestCase):
         test_playlist_id = str(uuid.uuid4())
         links = []
         for i in range(10):
-            mock_get_xuid_and_exact_gamertag.return_value = (i, f"test{i}")
             discord_account = DiscordAccount.objects.create(
                 creator=self.user,
                 discord_id=str(i),
                 discord_username=f"TestUsername{i}",
             )
             xbox_live_account = XboxLiveAccount.objects.create(
-                creator=self.user, gamertag=f"testGT{i}"
+                creator=self.user, gamertag=f"test{i}", xuid=i
             )
             links.append(
                 DiscordXboxLiveLink.objects.create(
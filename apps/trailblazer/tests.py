@@ -1,14 +1,33 @@
 import datetime
+from unittest.mock import patch
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
 
 from apps.discord.models import DiscordAccount
+from apps.halo_infinite.constants import (
+    ERA_3_START_TIME,
+    GAME_VARIANT_CATEGORY_CAPTURE_THE_FLAG,
+    GAME_VARIANT_CATEGORY_KING_OF_THE_HILL,
+    GAME_VARIANT_CATEGORY_ODDBALL,
+    GAME_VARIANT_CATEGORY_SLAYER,
+    GAME_VARIANT_CATEGORY_STRONGHOLDS,
+    LEVEL_ID_AQUARIUS,
+    LIFECYCLE_MODE_CUSTOM,
+    LIFECYCLE_MODE_MATCHMADE,
+    MEDAL_ID_OVERKILL,
+    PLAYLIST_ID_RANKED_ARENA,
+)
+from apps.halo_infinite.utils import get_match_end_time, get_match_start_time
 from apps.trailblazer.models import TrailblazerTuesdayAttendance
 from apps.trailblazer.utils import (
     get_e1_discord_earn_dict,
     get_e2_discord_earn_dict,
     get_e3_discord_earn_dict,
+    get_e3_xbox_earn_dict,
+    has_categories_within_window,
+    has_consecutive_matches,
 )
 
 
@@ -174,3 +193,171 @@ class TrailblazerUtilsTestCase(TestCase):
         for account in discord_accounts:
             earn_dict = get_e3_discord_earn_dict([account.discord_id])
             self.assertEqual(earn_dict, {account.discord_id: {}})
+
+    def test_has_consecutive_matches(self):
+        def matches_for(ranks):
+            start_time = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+            matches = [
+                {
+                    "Rank": rank,
+                    "MatchInfo": {
+                        "StartTime": (
+                            start_time + datetime.timedelta(minutes=15 * i)
+                        ).isoformat(),
+                        "EndTime": (
+                            start_time + datetime.timedelta(minutes=15 * i + 10)
+                        ).isoformat(),
+                    },
+                }
+                for i, rank in enumerate(ranks)
+            ]
+            return matches
+
+        def is_first(match):
+            return match.get("Rank") == 1
+
+        self.assertFalse(has_consecutive_matches([], is_first, 3))
+        self.assertFalse(has_consecutive_matches(matches_for([1, 1]), is_first, 3))
+        self.assertFalse(
+            has_consecutive_matches(matches_for([1, 1, 2, 1, 1]), is_first, 3)
+        )
+        self.assertTrue(has_consecutive_matches(matches_for([1, 1, 1]), is_first, 3))
+        # The final three matches also count
+        self.assertTrue(
+            has_consecutive_matches(matches_for([2, 3, 1, 1, 1]), is_first, 3)
+        )
+
+    def test_has_categories_within_window(self):
+        categories = {
+            GAME_VARIANT_CATEGORY_CAPTURE_THE_FLAG,
+            GAME_VARIANT_CATEGORY_KING_OF_THE_HILL,
+            GAME_VARIANT_CATEGORY_ODDBALL,
+            GAME_VARIANT_CATEGORY_SLAYER,
+            GAME_VARIANT_CATEGORY_STRONGHOLDS,
+        }
+        start_time = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+        def matches_for(categories_by_hour):
+            return [
+                {
+                    "MatchInfo": {
+                        "GameVariantCategory": category,
+                        "StartTime": (
+                            start_time + datetime.timedelta(hours=hour)
+                        ).isoformat(),
+                        "EndTime": (
+                            start_time + datetime.timedelta(hours=hour, minutes=15)
+                        ).isoformat(),
+                    }
+                }
+                for hour, category in categories_by_hour
+            ]
+
+        def has_cycle(categories_by_hour):
+            matches = matches_for(categories_by_hour)
+            return has_categories_within_window(
+                matches,
+                [get_match_start_time(match).timestamp() for match in matches],
+                [get_match_end_time(match).timestamp() for match in matches],
+                datetime.timedelta(hours=6),
+                categories,
+                lambda match: match.get("MatchInfo", {}).get("GameVariantCategory"),
+            )
+
+        self.assertFalse(has_cycle([]))
+
+        # All five categories within six hours of the first match's start
+        self.assertTrue(
+            has_cycle(
+                [
+                    (0, GAME_VARIANT_CATEGORY_CAPTURE_THE_FLAG),
+                    (1, GAME_VARIANT_CATEGORY_KING_OF_THE_HILL),
+                    (2, GAME_VARIANT_CATEGORY_ODDBALL),
+                    (3, GAME_VARIANT_CATEGORY_SLAYER),
+                    (5, GAME_VARIANT_CATEGORY_STRONGHOLDS),
+                ]
+            )
+        )
+
+        # The last match ends more than six hours after the first one starts
+        self.assertFalse(
+            has_cycle(
+                [
+                    (0, GAME_VARIANT_CATEGORY_CAPTURE_THE_FLAG),
+                    (1, GAME_VARIANT_CATEGORY_KING_OF_THE_HILL),
+                    (2, GAME_VARIANT_CATEGORY_ODDBALL),
+                    (3, GAME_VARIANT_CATEGORY_SLAYER),
+                    (6, GAME_VARIANT_CATEGORY_STRONGHOLDS),
+                ]
+            )
+        )
+
+        # A later window completes the set after the first match drops out, ignoring unrelated categories
+        self.assertTrue(
+            has_cycle(
+                [
+                    (0, GAME_VARIANT_CATEGORY_CAPTURE_THE_FLAG),
+                    (1, GAME_VARIANT_CATEGORY_KING_OF_THE_HILL),
+                    (2, GAME_VARIANT_CATEGORY_ODDBALL),
+                    (3, None),
+                    (4, GAME_VARIANT_CATEGORY_SLAYER),
+                    (6, GAME_VARIANT_CATEGORY_STRONGHOLDS),
+                    (6, GAME_VARIANT_CATEGORY_CAPTURE_THE_FLAG),
+                ]
+            )
+        )
+
+        # Repeats of the same category never complete the set
+        self.assertFalse(
+            has_cycle([(hour, GAME_VARIANT_CATEGORY_SLAYER) for hour in range(10)])
+        )
+
+    @patch("apps.trailblazer.utils.get_era_ranked_arena_service_record_data")
+    @patch("apps.halo_infinite.utils.get_era_matches_for_xuid")
+    def test_get_e3_xbox_earn_dict(
+        self,
+        mock_get_era_matches_for_xuid,
+        mock_get_era_ranked_arena_service_record_data,
+    ):
+        cache.clear()
+
+        def match(lifecycle_mode, outcome):
+            end_time = ERA_3_START_TIME + datetime.timedelta(days=1)
+            return {
+                "Outcome": outcome,
+                "MatchInfo": {
+                    "GameVariantCategory": GAME_VARIANT_CATEGORY_ODDBALL,
+                    "LevelId": LEVEL_ID_AQUARIUS,
+                    "LifecycleMode": lifecycle_mode,
+                    "Playlist": {"AssetId": PLAYLIST_ID_RANKED_ARENA},
+                    "StartTime": (
+                        end_time - datetime.timedelta(minutes=10)
+                    ).isoformat(),
+                    "EndTime": end_time.isoformat(),
+                },
+            }
+
+        # Only Ranked Arena wins count, and Overkill comes from the Service Records
+        mock_get_era_matches_for_xuid.return_value = [
+            match(LIFECYCLE_MODE_MATCHMADE, 2),
+            match(LIFECYCLE_MODE_MATCHMADE, 3),
+            match(LIFECYCLE_MODE_CUSTOM, 2),
+        ]
+        mock_get_era_ranked_arena_service_record_data.return_value = {
+            "api_id": {"CoreStats": {"Medals": [{"NameId": MEDAL_ID_OVERKILL}]}}
+        }
+        earn_dict = get_e3_xbox_earn_dict([123])
+        self.assertEqual(
+            earn_dict,
+            {
+                123: {
+                    "csr_go_up": 1,
+                    "oddly_effective": 5,
+                    "bomb_dot_com": 0,
+                    "its_the_age": 5,
+                    "overkill": 100,
+                }
+            },
+        )
+        mock_get_era_matches_for_xuid.assert_called_once()
+        mock_get_era_ranked_arena_service_record_data.assert_called_once_with(123, 3)
@@ -1,7 +1,9 @@
 import datetime
 import logging
+from itertools import compress
 
-from django.db.models import Count, Q
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 
 from apps.discord.models import DiscordAccount
 from apps.halo_infinite.constants import (
@@ -16,29 +18,98 @@ from apps.halo_infinite.constants import (
     MEDAL_ID_OVERKILL,
 )
 from apps.halo_infinite.utils import (
-    get_era_ranked_arena_matches_for_xuid,
     get_era_ranked_arena_service_record_data,
+    get_era_xbox_earn_dict,
+    get_match_start_time,
     get_start_and_end_times_for_era,
 )
+from apps.trailblazer.models import TrailblazerTuesdayAttendance
 
 logger = logging.getLogger(__name__)
 
 
+def get_era_attendance_count(
+    start_time: datetime.datetime, end_time: datetime.datetime
+) -> Coalesce:
+    # Counts the outer DiscordAccount's Tuesday attendances within an Era as a correlated subquery that can be answered
+    # from the (attendee_discord, attendance_date) index.
+    attendance_count = (
+        TrailblazerTuesdayAttendance.objects.filter(
+            attendee_discord=OuterRef("pk"),
+            attendance_date__range=[
+                start_time.date(),
+                end_time.date() - datetime.timedelta(days=1),
+            ],
+        )
+        .order_by()
+        .values("attendee_discord")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(attendance_count, output_field=IntegerField()), Value(0))
+
+
+def has_consecutive_matches(matches: list[dict], predicate, count: int) -> bool:
+    """
+    Returns True if `count` consecutive matches all satisfy `predicate`, tracking the current run in a single pass over
+    matches ordered by end time.
+    """
+    run_length = 0
+    for match in matches:
+        run_length = run_length + 1 if predicate(match) else 0
+        if run_length >= count:
+            return True
+    return False
+
+
+def has_categories_within_window(
+    matches: list[dict],
+    start_times: list[float],
+    end_times: list[float],
+    window: datetime.timedelta,
+    categories: set,
+    get_category,
+) -> bool:
+    """
+    Returns True if some window starting at a match's start time contains, among the matches that end within `window`
+    of it, at least one match of every category in `categories`. Matches must be ordered by end time, with their
+    start and end times alongside as POSIX timestamps. A two-pointer sweep with per-category counters lets each match
+    enter and leave the window once. A player's matches never overlap, so start times follow the same order as end
+    times and the window's far edge only ever moves forward.
+    """
+    window_seconds = window.total_seconds()
+    match_categories = [get_category(match) for match in matches]
+    category_counts = dict.fromkeys(categories, 0)
+    covered_category_count = 0
+    # The window holds the matches in matches[start_index:end_index]
+    end_index = 0
+    for start_index, start_time in enumerate(start_times):
+        window_end_time = start_time + window_seconds
+        # The first match of a window always counts towards it, whenever it ended
+        while end_index < len(matches) and (
+            end_index <= start_index or end_times[end_index] <= window_end_time
+        ):
+            category = match_categories[end_index]
+            if category in category_counts:
+                if category_counts[category] == 0:
+                    covered_category_count += 1
+                category_counts[category] += 1
+            end_index += 1
+        if covered_category_count == len(categories):
+            return True
+        category = match_categories[start_index]
+        if category in category_counts:
+            category_counts[category] -= 1
+            if category_counts[category] == 0:
+                covered_category_count -= 1
+    return False
+
+
 def get_e1_discord_earn_dict(discord_ids: list[str]) -> dict[str, dict[str, int]]:
     start_time, end_time = get_start_and_end_times_for_era(1)
-    annotated_discord_accounts = DiscordAccount.objects.annotate(
-        attendances=Count(
-            "trailblazer_tuesday_attendees",
-            distinct=True,
-            filter=Q(
-                trailblazer_tuesday_attendees__attendee_discord_id__in=discord_ids,
-                trailblazer_tuesday_attendees__attendance_date__range=[
-                    start_time.date(),
-                    end_time.date() - datetime.timedelta(days=1),
-                ],
-            ),
-        ),
-    ).filter(discord_id__in=discord_ids)
+    annotated_discord_accounts = DiscordAccount.objects.filter(
+        discord_id__in=discord_ids
+    ).annotate(attendances=get_era_attendance_count(start_time, end_time))
 
     earn_dict = {}
     for account in annotated_discord_accounts:
@@ -49,75 +120,14 @@ def get_e1_discord_earn_dict(discord_ids: list[str]) -> dict[str, dict[str, int]
 
 
 def get_e1_xbox_earn_dict(xuids: list[int]) -> dict[int, dict[str, int]]:
-    earn_dict = {}
-    for xuid in xuids:
-        wins = 0
-        slayer_wins = 0
-        streets_wins = 0
-        unlocked_hot_streak = False
-
-        # Get matches for this XUID
-        matches = get_era_ranked_arena_matches_for_xuid(xuid, 1)
-        matches_sorted = sorted(
-            matches,
-            key=lambda m: datetime.datetime.fromisoformat(
-                m.get("MatchInfo", {}).get("EndTime")
-            ),
-        )
-
-        # CSR Go Up: Win games in Ranked Arena. 1 point per win.
-        # Play to Slay: Win Slayer games in Ranked Arena. 5 points per win.
-        # Mean Streets: Win games on the map Streets in Ranked Arena. 5 points per win.
-        for match in matches:
-            if match.get("Outcome") == 2:
-                wins += 1
-            if (
-                match.get("MatchInfo", {}).get("GameVariantCategory")
-                == GAME_VARIANT_CATEGORY_SLAYER
-            ):
-                if match.get("Outcome") == 2:
-                    slayer_wins += 1
-            if match.get("MatchInfo", {}).get("LevelId", {}) == LEVEL_ID_STREETS:
-                if match.get("Outcome") == 2:
-                    streets_wins += 1
-
-        # Hot Streak: Win 3 consecutive Ranked Arena games and finish on top of the scoreboard each time. Earnable once.
-        for i in range(len(matches_sorted) - 3):
-            match_a = matches[i]
-            match_b = matches[i + 1]
-            match_c = matches[i + 2]
-            if (
-                match_a.get("Rank") == 1
-                and match_b.get("Rank") == 1
-                and match_c.get("Rank") == 1
-            ):
-                unlocked_hot_streak = True
-                break
-
-        earn_dict[xuid] = {
-            "csr_go_up": min(wins, 200),
-            "play_to_slay": min(slayer_wins, 20) * 5,
-            "mean_streets": min(streets_wins, 20) * 5,
-            "hot_streak": 100 if unlocked_hot_streak else 0,
-        }
-    return earn_dict
+    return get_era_xbox_earn_dict("trailblazer", xuids, 1)
 
 
 def get_e2_discord_earn_dict(discord_ids: list[str]) -> dict[str, dict[str, int]]:
     start_time, end_time = get_start_and_end_times_for_era(2)
-    annotated_discord_accounts = DiscordAccount.objects.annotate(
-        attendances=Count(
-            "trailblazer_tuesday_attendees",
-            distinct=True,
-            filter=Q(
-                trailblazer_tuesday_attendees__attendee_discord_id__in=discord_ids,
-                trailblazer_tuesday_attendees__attendance_date__range=[
-                    start_time.date(),
-                    end_time.date() - datetime.timedelta(days=1),
-                ],
-            ),
-        ),
-    ).filter(discord_id__in=discord_ids)
+    annotated_discord_accounts = DiscordAccount.objects.filter(
+        discord_id__in=discord_ids
+    ).annotate(attendances=get_era_attendance_count(start_time, end_time))
 
     earn_dict = {}
     for account in annotated_discord_accounts:
@@ -128,92 +138,7 @@ def get_e2_discord_earn_dict(discord_ids: list[str]) -> dict[str, dict[str, int]
 
 
 def get_e2_xbox_earn_dict(xuids: list[int]) -> dict[int, dict[str, int]]:
-    earn_dict = {}
-    for xuid in xuids:
-        wins = 0
-        strongholds_wins = 0
-        live_fire_wins = 0
-        unlocked_the_cycle = False
-
-        # Get matches for this XUID
-        matches = get_era_ranked_arena_matches_for_xuid(xuid, 2)
-        matches_sorted = sorted(
-            matches,
-            key=lambda m: datetime.datetime.fromisoformat(
-                m.get("MatchInfo", {}).get("EndTime")
-            ),
-        )
-
-        # CSR Go Up: Win games in Ranked Arena. 1 point per win.
-        # Too Stronk: Win Strongholds games in Ranked Arena. 5 points per win.
-        # Scoreboard: Win games on the map Live Fire in Ranked Arena. 5 points per win.
-        for match in matches:
-            if match.get("Outcome") == 2:
-                wins += 1
-            if (
-                match.get("MatchInfo", {}).get("GameVariantCategory")
-                == GAME_VARIANT_CATEGORY_STRONGHOLDS
-            ):
-                if match.get("Outcome") == 2:
-                    strongholds_wins += 1
-            if match.get("MatchInfo", {}).get("LevelId", {}) == LEVEL_ID_LIVE_FIRE:
-                if match.get("Outcome") == 2:
-                    live_fire_wins += 1
-
-        # The Cycle: Win at least one CTF, KotH, Oddball, Slayer, and Strongholds game in a six-hour period
-        sorted_wins = []
-        for match in matches_sorted:
-            if match.get("Outcome") == 2:
-                sorted_wins.append(match)
-        start_index = 0
-        while start_index < len(sorted_wins):
-            ctf_win = False
-            koth_win = False
-            oddball_win = False
-            slayer_win = False
-            strongholds_win = False
-            first_win = sorted_wins[start_index]
-            start_time = datetime.datetime.fromisoformat(
-                first_win.get("MatchInfo", {}).get("StartTime")
-            )
-            six_hours_after_start_time = start_time + datetime.timedelta(hours=6)
-            wins_in_six_hour_window = [first_win]
-            for i in range(start_index + 1, len(sorted_wins)):
-                win = sorted_wins[i]
-                if (
-                    datetime.datetime.fromisoformat(
-                        win.get("MatchInfo", {}).get("EndTime")
-                    )
-                    <= six_hours_after_start_time
-                ):
-                    wins_in_six_hour_window.append(win)
-                else:
-                    break
-            for win in wins_in_six_hour_window:
-                mode_category = win.get("MatchInfo", {}).get("GameVariantCategory")
-                if mode_category == GAME_VARIANT_CATEGORY_CAPTURE_THE_FLAG:
-                    ctf_win = True
-                elif mode_category == GAME_VARIANT_CATEGORY_KING_OF_THE_HILL:
-                    koth_win = True
-                elif mode_category == GAME_VARIANT_CATEGORY_ODDBALL:
-                    oddball_win = True
-                elif mode_category == GAME_VARIANT_CATEGORY_SLAYER:
-                    slayer_win = True
-                elif mode_category == GAME_VARIANT_CATEGORY_STRONGHOLDS:
-                    strongholds_win = True
-
-            if ctf_win and koth_win and oddball_win and slayer_win and strongholds_win:
-                unlocked_the_cycle = True
-                break
-            start_index += 1
-
-        earn_dict[xuid] = {
-            "csr_go_up": min(wins, 200),
-            "too_stronk": min(strongholds_wins, 20) * 5,
-            "scoreboard": min(live_fire_wins, 20) * 5,
-            "the_cycle": 100 if unlocked_the_cycle else 0,
-        }
-    return earn_dict
+    return get_era_xbox_earn_dict("trailblazer", xuids, 2)
 
 
 def get_e3_discord_earn_dict(discord_ids: list[str]) -> dict[str, dict[str, int]]:
@@ -226,43 +151,13 @@ def get_e3_discord_earn_dict(discord_ids: list[str]) -> dict[str, dict[str, int]
 
 
 def get_e3_xbox_earn_dict(xuids: list[int]) -> dict[int, dict[str, int]]:
-    earn_dict = {}
+    earn_dict = get_era_xbox_earn_dict("trailblazer", xuids, 3)
     for xuid in xuids:
-        wins = 0
-        neutral_bomb_wins = 0
-        oddball_wins = 0
-        aquarius_wins = 0
         unlocked_overkill = False
 
-        # Get matches for this XUID
-        matches = get_era_ranked_arena_matches_for_xuid(xuid, 3)
-
         # Get Ranked Arena Service Record(s) for this XUID
         service_records = get_era_ranked_arena_service_record_data(xuid, 3)
 
-        # CSR Go Up: Win games in Ranked Arena. 1 point per win.
-        # Bomb Dot Com: Win Neutral Bomb games in Ranked Arena. 5 points per win.
-        # Oddly Effective: Win Oddball games in Ranked Arena. 5 points per win.
-        # It's the Age: Win games on the map Aquarius in Ranked Arena. 5 points per win.
-        for match in matches:
-            if match.get("Outcome") == 2:
-                wins += 1
-            if (
-                match.get("MatchInfo", {}).get("UgcGameVariant", {}).get("AssetId")
-                == "b91028ac-0531-4f71-b3bc-0b039ee8c73b"
-            ):
-                if match.get("Outcome") == 2:
-                    neutral_bomb_wins += 1
-            if (
-                match.get("MatchInfo", {}).get("GameVariantCategory")
-                == GAME_VARIANT_CATEGORY_ODDBALL
-            ):
-                if match.get("Outcome") == 2:
-                    oddball_wins += 1
-            if match.get("MatchInfo", {}).get("LevelId", {}) == LEVEL_ID_AQUARIUS:
-                if match.get("Outcome") == 2:
-                    aquarius_wins += 1
-
         # Overkill: Achieve an Overkill in Ranked Arena. Earnable once.
         for service_record in service_records.values():
             medals = service_record.get("CoreStats", {}).get("Medals", [])
@@ -271,11 +166,130 @@ def get_e3_xbox_earn_dict(xuids: list[int]) -> dict[int, dict[str, int]]:
             )
             unlocked_overkill = unlocked_overkill or len(medals_list) > 0
 
-        earn_dict[xuid] = {
-            "csr_go_up": min(wins, 300),
-            "oddly_effective": min(oddball_wins, 20) * 5,
-            "bomb_dot_com": min(neutral_bomb_wins, 20) * 5,
-            "its_the_age": min(aquarius_wins, 20) * 5,
-            "overkill": 100 if unlocked_overkill else 0,
-        }
+        earn_dict[xuid]["overkill"] = 100 if unlocked_overkill else 0
     return earn_dict
+
+
+def is_win(match: dict) -> bool:
+    return match.get("Outcome") == 2
+
+
+def is_win_where(predicate):
+    # Builds a rule predicate matching wins that also satisfy `predicate`
+    return lambda match: is_win(match) and predicate(match)
+
+
+def has_hot_streak(matches: list[dict], end_times: list[float]) -> bool:
+    # Hot Streak: Win 3 consecutive Ranked Arena games and finish on top of the scoreboard each time. Earnable once.
+    return has_consecutive_matches(matches, lambda match: match.get("Rank") == 1, 3)
+
+
+def has_the_cycle(matches: list[dict], end_times: list[float]) -> bool:
+    # The Cycle: Win at least one CTF, KotH, Oddball, Slayer, and Strongholds game in a six-hour period
+    wins_mask = [is_win(match) for match in matches]
+    wins = list(compress(matches, wins_mask))
+    return has_categories_within_window(
+        wins,
+        [get_match_start_time(match).timestamp() for match in wins],
+        list(compress(end_times, wins_mask)),
+        datetime.timedelta(hours=6),
+        {
+            GAME_VARIANT_CATEGORY_CAPTURE_THE_FLAG,
+            GAME_VARIANT_CATEGORY_KING_OF_THE_HILL,
+            GAME_VARIANT_CATEGORY_ODDBALL,
+            GAME_VARIANT_CATEGORY_SLAYER,
+            GAME_VARIANT_CATEGORY_STRONGHOLDS,
+        },
+        lambda match: match.get("MatchInfo", {}).get("GameVariantCategory"),
+    )
+
+
+# Match-based Scout Challenges for each Era, scored against Ranked Arena matches by `get_era_xbox_earn_dict`
+ERA_XBOX_EARN_RULES = {
+    1: [
+        # CSR Go Up: Win games in Ranked Arena. 1 point per win.
+        {"key": "csr_go_up", "predicate": is_win, "cap": 200, "points": 1},
+        # Play to Slay: Win Slayer games in Ranked Arena. 5 points per win.
+        {
+            "key": "play_to_slay",
+            "predicate": is_win_where(
+                lambda match: match.get("MatchInfo", {}).get("GameVariantCategory")
+                == GAME_VARIANT_CATEGORY_SLAYER
+            ),
+            "cap": 20,
+            "points": 5,
+        },
+        # Mean Streets: Win games on the map Streets in Ranked Arena. 5 points per win.
+        {
+            "key": "mean_streets",
+            "predicate": is_win_where(
+                lambda match: match.get("MatchInfo", {}).get("LevelId")
+                == LEVEL_ID_STREETS
+            ),
+            "cap": 20,
+            "points": 5,
+        },
+        {"key": "hot_streak", "detector": has_hot_streak, "points": 100},
+    ],
+    2: [
+        # CSR Go Up: Win games in Ranked Arena. 1 point per win.
+        {"key": "csr_go_up", "predicate": is_win, "cap": 200, "points": 1},
+        # Too Stronk: Win Strongholds games in Ranked Arena. 5 points per win.
+        {
+            "key": "too_stronk",
+            "predicate": is_win_where(
+                lambda match: match.get("MatchInfo", {}).get("GameVariantCategory")
+                == GAME_VARIANT_CATEGORY_STRONGHOLDS
+            ),
+            "cap": 20,
+            "points": 5,
+        },
+        # Scoreboard: Win games on the map Live Fire in Ranked Arena. 5 points per win.
+        {
+            "key": "scoreboard",
+            "predicate": is_win_where(
+                lambda match: match.get("MatchInfo", {}).get("LevelId")
+                == LEVEL_ID_LIVE_FIRE
+            ),
+            "cap": 20,
+            "points": 5,
+        },
+        {"key": "the_cycle", "detector": has_the_cycle, "points": 100},
+    ],
+    3: [
+        # CSR Go Up: Win games in Ranked Arena. 1 point per win.
+        {"key": "csr_go_up", "predicate": is_win, "cap": 300, "points": 1},
+        # Oddly Effective: Win Oddball games in Ranked Arena. 5 points per win.
+        {
+            "key": "oddly_effective",
+            "predicate": is_win_where(
+                lambda match: match.get("MatchInfo", {}).get("GameVariantCategory")
+                == GAME_VARIANT_CATEGORY_ODDBALL
+            ),
+            "cap": 20,
+            "points": 5,
+        },
+        # Bomb Dot Com: Win Neutral Bomb games in Ranked Arena. 5 points per win.
+        {
+            "key": "bomb_dot_com",
+            "predicate": is_win_where(
+                lambda match: match.get("MatchInfo", {})
+                .get("UgcGameVariant", {})
+                .get("AssetId")
+                == "b91028ac-0531-4f71-b3bc-0b039ee8c73b"
+            ),
+            "cap": 20,
+            "points": 5,
+        },
+        # It's the Age: Win games on the map Aquarius in Ranked Arena. 5 points per win.
+        {
+            "key": "its_the_age",
+            "predicate": is_win_where(
+                lambda match: match.get("MatchInfo", {}).get("LevelId")
+                == LEVEL_ID_AQUARIUS
+            ),
+            "cap": 20,
+            "points": 5,
+        },
+    ],
+}
@@ -1,5 +1,6 @@
 import logging
 
+from asgiref.sync import sync_to_async
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.exceptions import APIException
@@ -8,8 +9,9 @@ from rest_framework.views import APIView
 
 from apps.discord.utils import update_or_create_discord_account
 from apps.halo_infinite.exceptions import MissingEraDataException
-from apps.halo_infinite.utils import get_csrs, get_current_era
+from apps.halo_infinite.utils import awarm_era_xbox_earns, get_csrs, get_current_era
 from apps.link.models import DiscordXboxLiveLink
+from apps.overrides.views import AsyncAPIView
 from apps.trailblazer.constants import TRAILBLAZER_TITAN_CSR_MINIMUM
 from apps.trailblazer.serializers import (
     TrailblazerScoutEra1ProgressResponseSerializer,
@@ -34,7 +36,7 @@ from config.serializers import StandardErrorSerializer
 logger = logging.getLogger(__name__)
 
 
-class TrailblazerScoutProgressView(APIView):
+class TrailblazerScoutProgressView(AsyncAPIView):
     @extend_schema(
         request=TrailblazerScoutProgressRequestSerializer,
         responses={
@@ -43,7 +45,7 @@ class TrailblazerScoutProgressView(APIView):
             500: StandardErrorSerializer,
         },
     )
-    def post(self, request, format=None):
+    async def post(self, request, format=None):
         """
         Evaluate an individual Discord ID's progress toward the Trailblazer Scout role.
         """
@@ -72,14 +74,14 @@ class TrailblazerScoutProgressView(APIView):
                 assert era is not None
 
                 # Upsert the DiscordAccount & find a link record
-                discord_account = update_or_create_discord_account(
+                discord_account = await sync_to_async(update_or_create_discord_account)(
                     discord_id, discord_username, request.user
                 )
                 link = None
                 try:
-                    link = DiscordXboxLiveLink.objects.filter(
+                    link = await DiscordXboxLiveLink.objects.filter(
                         discord_account_id=discord_account.discord_id, verified=True
-                    ).get()
+                    ).aget()
                 except DiscordXboxLiveLink.DoesNotExist:
                     pass
             except Exception as ex:
@@ -88,11 +90,18 @@ class TrailblazerScoutProgressView(APIView):
             serializer_class = None
             serializable_dict = {}
             try:
+                # Fetch the linked player's match history on the event loop, so the tallies below read their
+                # match-based earns from the cache
+                if link is not None:
+                    await awarm_era_xbox_earns([link.xbox_live_account_id], era)
+
                 if era == 1:
                     serializer_class = TrailblazerScoutEra1ProgressResponseSerializer
                     # Tally the Discord Points
-                    discord_earns = get_e1_discord_earn_dict(
-                        [discord_account.discord_id]
+                    discord_earns = (
+                        await sync_to_async(get_e1_discord_earn_dict)(
+                            [discord_account.discord_id]
+                        )
                     ).get(discord_account.discord_id)
                     serializable_dict["pointsChurchOfTheCrab"] = discord_earns.get(
                         "church_of_the_crab", 0
@@ -100,8 +109,10 @@ class TrailblazerScoutProgressView(APIView):
                     # Tally the Xbox Points
                     xbox_earns = {}
                     if link is not None:
-                        xbox_earns = get_e1_xbox_earn_dict(
-                            [link.xbox_live_account_id]
+                        xbox_earns = (
+                            await sync_to_async(get_e1_xbox_earn_dict)(
+                                [link.xbox_live_account_id]
+                            )
                         ).get(link.xbox_live_account_id)
                     serializable_dict["pointsCSRGoUp"] = xbox_earns.get("csr_go_up", 0)
                     serializable_dict["pointsPlayToSlay"] = xbox_earns.get(
@@ -116,8 +127,10 @@ class TrailblazerScoutProgressView(APIView):
                 elif era == 2:
                     serializer_class = TrailblazerScoutEra2ProgressResponseSerializer
                     # Tally the Discord Points
-                    discord_earns = get_e2_discord_earn_dict(
-                        [discord_account.discord_id]
+                    discord_earns = (
+                        await sync_to_async(get_e2_discord_earn_dict)(
+                            [discord_account.discord_id]
+                        )
                     ).get(discord_account.discord_id)
                     serializable_dict["pointsChurchOfTheCrab"] = discord_earns.get(
                         "church_of_the_crab", 0
@@ -125,8 +138,10 @@ class TrailblazerScoutProgressView(APIView):
                     # Tally the Xbox Points
                     xbox_earns = {}
                     if link is not None:
-                        xbox_earns = get_e2_xbox_earn_dict(
-                            [link.xbox_live_account_id]
+                        xbox_earns = (
+                            await sync_to_async(get_e2_xbox_earn_dict)(
+                                [link.xbox_live_account_id]
+                            )
                         ).get(link.xbox_live_account_id)
                     serializable_dict["pointsCSRGoUp"] = xbox_earns.get("csr_go_up", 0)
                     serializable_dict["pointsTooStronk"] = xbox_earns.get(
@@ -139,14 +154,18 @@ class TrailblazerScoutProgressView(APIView):
                 elif era == 3:
                     serializer_class = TrailblazerScoutEra3ProgressResponseSerializer
                     # Tally the Discord Points
-                    discord_earns = get_e3_discord_earn_dict(
-                        [discord_account.discord_id]
+                    discord_earns = (
+                        await sync_to_async(get_e3_discord_earn_dict)(
+                            [discord_account.discord_id]
+                        )
                     ).get(discord_account.discord_id)
                     # Tally the Xbox Points
                     xbox_earns = {}
                     if link is not None:
-                        xbox_earns = get_e3_xbox_earn_dict(
-                            [link.xbox_live_account_id]
+                        xbox_earns = (
+                            await sync_to_async(get_e3_xbox_earn_dict)(
+                                [link.xbox_live_account_id]
+                            )
                         ).get(link.xbox_live_account_id)
                     serializable_dict["pointsCSRGoUp"] = xbox_earns.get("csr_go_up", 0)
                     serializable_dict["pointsBombDotCom"] = xbox_earns.get(
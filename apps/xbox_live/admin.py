@@ -7,14 +7,21 @@ from apps.xbox_live.models import (
     XboxLiveUserToken,
     XboxLiveXSTSToken,
 )
+from apps.xbox_live.utils import hydrate_xbox_live_accounts
 
 
 @admin.register(XboxLiveAccount)
 class XboxLiveAccountAdmin(AutofillCreatorModelAdmin):
     list_display = ("xuid", "gamertag", "creator")
-    list_filter = ("creator",)
+    list_filter = ("needs_hydration", "creator")
     fields = ("gamertag", "xuid", "creator")
     search_fields = ["gamertag"]
+    actions = ["hydrate"]
+
+    @admin.action(description="Refresh selected gamertags from the Xbox Live API")
+    def hydrate(self, request, queryset):
+        accounts = hydrate_xbox_live_accounts(list(queryset))
+        self.message_user(request, f"Updated {len(accounts)} gamertag(s).")
 
 
 @admin.register(XboxLiveOAuthToken)
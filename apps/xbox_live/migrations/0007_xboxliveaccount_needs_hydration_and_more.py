@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-19 07:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("xbox_live", "0006_alter_xboxliveaccount_created_at_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="xboxliveaccount",
+            name="needs_hydration",
+            field=models.BooleanField(default=False, verbose_name="Needs Hydration"),
+        ),
+        migrations.AlterField(
+            model_name="xboxliveaccount",
+            name="gamertag",
+            field=models.CharField(blank=True, max_length=15),
+        ),
+    ]
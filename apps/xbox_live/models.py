@@ -14,11 +14,12 @@ class XboxLiveAccount(BaseWithoutPrimaryKey):
         verbose_name = "Account"
         verbose_name_plural = "Accounts"
 
-    gamertag = models.CharField(max_length=15)
+    gamertag = models.CharField(blank=True, max_length=15)
     xuid = models.PositiveBigIntegerField(primary_key=True, verbose_name="Xbox Live ID")
+    needs_hydration = models.BooleanField(default=False, verbose_name="Needs Hydration")
 
     def __str__(self):
-        return self.gamertag
+        return self.gamertag or str(self.xuid)
 
 
 class XboxLiveOAuthToken(Base):
@@ -27,6 +27,7 @@ from apps.xbox_live.tokens import (
 )
 from apps.xbox_live.utils import (
     get_xuid_and_exact_gamertag,
+    hydrate_xbox_live_accounts,
     update_or_create_xbox_live_account,
 )
 
@@ -37,38 +38,36 @@ class XboxLiveAccountTestCase(TestCase):
             username="test", email="test@test.com", password="test"
         )
 
-    @patch("apps.xbox_live.signals.get_gamertag_from_xuid")
-    @patch("apps.xbox_live.signals.get_xuid_and_exact_gamertag")
-    def test_xbox_live_account_save(
-        self, mock_get_xuid_and_exact_gamertag, mock_get_gamertag_from_xuid
-    ):
-        # Creating an account should be successful if no XUID is provided (hydrated by pre_save)
-        mock_get_xuid_and_exact_gamertag.return_value = (0, "Test1")
-        account = XboxLiveAccount.objects.create(creator=self.user, gamertag="test1")
-        self.assertEqual(account.xuid, 0)
-        self.assertEqual(account.gamertag, "Test1")
-        mock_get_xuid_and_exact_gamertag.assert_called_once_with("test1")
-        mock_get_xuid_and_exact_gamertag.reset_mock()
-
-        # XUID set on instance is authoritative; gamertag is replaced by the one retrieved in pre_save signal
-        mock_get_gamertag_from_xuid.return_value = "Test2"
+    def test_xbox_live_account_save(self):
+        # Creating an account with a gamertag saves it as given
         account = XboxLiveAccount.objects.create(
-            creator=self.user, gamertag="test2", xuid=10
+            creator=self.user, gamertag="test1", xuid=0
         )
-        self.assertEqual(account.xuid, 10)
-        self.assertEqual(account.gamertag, "Test2")
-        mock_get_gamertag_from_xuid.assert_called_once_with(10)
-        mock_get_gamertag_from_xuid.reset_mock()
+        self.assertEqual(account.xuid, 0)
+        self.assertEqual(account.gamertag, "test1")
+        self.assertFalse(account.needs_hydration)
+
+        # Creating an account with only its XUID flags it for hydration
+        account = XboxLiveAccount.objects.create(creator=self.user, xuid=10)
+        self.assertEqual(account.gamertag, "")
+        self.assertEqual(str(account), "10")
+        self.assertTrue(account.needs_hydration)
+
+        # Setting the gamertag clears the flag on save
+        account.gamertag = "Edited"
+        account.save()
+        account.refresh_from_db()
+        self.assertEqual(account.gamertag, "Edited")
+        self.assertFalse(account.needs_hydration)
 
         # Duplicate XUID should fail to save
-        mock_get_xuid_and_exact_gamertag.return_value = (0, "Test3")
         self.assertRaisesMessage(
             IntegrityError,
             'duplicate key value violates unique constraint "XboxLiveAccount_pkey"',
-            lambda: XboxLiveAccount.objects.create(creator=self.user, gamertag="test3"),
+            lambda: XboxLiveAccount.objects.create(
+                creator=self.user, gamertag="test3", xuid=0
+            ),
         )
-        mock_get_xuid_and_exact_gamertag.assert_called_once_with("test3")
-        mock_get_xuid_and_exact_gamertag.reset_mock()
 
 
 class XboxLiveTokensTestCase(TestCase):
@@ -509,63 +508,67 @@ class XboxLiveUtilsTestCase(TestCase):
             username="test", email="test@test.com", password="test"
         )
 
+    @patch("apps.xbox_live.utils.get_gamertag_from_xuid")
+    def test_hydrate_xbox_live_accounts(self, mock_get_gamertag_from_xuid):
+        accounts = [
+            XboxLiveAccount.objects.create(
+                creator=self.user, gamertag=f"old{xuid}", xuid=xuid
+            )
+            for xuid in range(3)
+        ] + [XboxLiveAccount.objects.create(creator=self.user, xuid=3)]
+        gamertags = {0: "old0", 1: "new1", 2: None, 3: "new3"}
+        mock_get_gamertag_from_xuid.side_effect = lambda xuid: gamertags[xuid]
+
+        # Only accounts whose gamertag was retrieved and changed or flagged for hydration are updated
+        updated_accounts = hydrate_xbox_live_accounts(accounts)
+        self.assertEqual([account.xuid for account in updated_accounts], [1, 3])
+        self.assertEqual(mock_get_gamertag_from_xuid.call_count, 4)
+        self.assertEqual(
+            dict(XboxLiveAccount.objects.values_list("xuid", "gamertag")),
+            {0: "old0", 1: "new1", 2: "old2", 3: "new3"},
+        )
+        self.assertFalse(XboxLiveAccount.objects.filter(needs_hydration=True).exists())
+
     @patch("apps.xbox_live.utils.get_xuid_and_exact_gamertag")
-    @patch("apps.xbox_live.signals.get_gamertag_from_xuid")
-    def test_update_or_create_xbox_live_account(
-        self,
-        mock_signals_get_gamertag_from_xuid,
-        mock_utils_get_xuid_and_exact_gamertag,
-    ):
-        def set_both_mock_return_values(return_tuple):
-            mock_signals_get_gamertag_from_xuid.return_value = return_tuple[1]
-            mock_utils_get_xuid_and_exact_gamertag.return_value = return_tuple
-
-        def reset_both_mocks():
-            mock_signals_get_gamertag_from_xuid.reset_mock()
-            mock_utils_get_xuid_and_exact_gamertag.reset_mock()
-
-        # Initial call creates XboxLiveAccount with gamertag & XUID, calls two of the three mocks
-        set_both_mock_return_values((0, "Foo"))
+    def test_update_or_create_xbox_live_account(self, mock_get_xuid_and_exact_gamertag):
+        # Initial call creates XboxLiveAccount with gamertag & XUID; no other lookup is made on save
+        mock_get_xuid_and_exact_gamertag.return_value = (0, "Foo")
         xbl_account_1 = update_or_create_xbox_live_account("foo", self.user)
         self.assertEqual(xbl_account_1.xuid, 0)
         self.assertEqual(xbl_account_1.gamertag, "Foo")
-        mock_utils_get_xuid_and_exact_gamertag.assert_called_once_with("foo")
-        mock_signals_get_gamertag_from_xuid.assert_called_once_with(0)
+        mock_get_xuid_and_exact_gamertag.assert_called_once_with("foo")
         self.assertEqual(XboxLiveAccount.objects.count(), 1)
-        reset_both_mocks()
+        mock_get_xuid_and_exact_gamertag.reset_mock()
 
-        # Call with original gamertag & XUID also calls both mocks
-        set_both_mock_return_values((0, "Foo"))
+        # Call with original gamertag & XUID only looks up the XUID
+        mock_get_xuid_and_exact_gamertag.return_value = (0, "Foo")
         xbl_account_2 = update_or_create_xbox_live_account("foo", self.user)
         self.assertEqual(xbl_account_2.xuid, 0)
         self.assertEqual(xbl_account_2.gamertag, "Foo")
-        mock_utils_get_xuid_and_exact_gamertag.assert_called_once_with("foo")
-        mock_signals_get_gamertag_from_xuid.assert_called_once_with(0)
+        mock_get_xuid_and_exact_gamertag.assert_called_once_with("foo")
         self.assertEqual(XboxLiveAccount.objects.count(), 1)
-        reset_both_mocks()
+        mock_get_xuid_and_exact_gamertag.reset_mock()
 
         # Call with same gamertag, new XUID results in new record
-        set_both_mock_return_values((1, "Foo"))
+        mock_get_xuid_and_exact_gamertag.return_value = (1, "Foo")
         xbl_account_3 = update_or_create_xbox_live_account("foo", self.user)
         self.assertEqual(xbl_account_3.xuid, 1)
         self.assertEqual(xbl_account_3.gamertag, "Foo")
-        mock_utils_get_xuid_and_exact_gamertag.assert_called_once_with("foo")
-        mock_signals_get_gamertag_from_xuid.assert_called_once_with(1)
+        mock_get_xuid_and_exact_gamertag.assert_called_once_with("foo")
         self.assertEqual(XboxLiveAccount.objects.count(), 2)
-        reset_both_mocks()
+        mock_get_xuid_and_exact_gamertag.reset_mock()
 
         # Call with original XUID, new gamertag results in original record being updated
-        set_both_mock_return_values((0, "Bar"))
+        mock_get_xuid_and_exact_gamertag.return_value = (0, "Bar")
         xbl_account_4 = update_or_create_xbox_live_account("bar", self.user)
         self.assertEqual(xbl_account_4.xuid, 0)
         self.assertEqual(xbl_account_4.gamertag, "Bar")
-        mock_utils_get_xuid_and_exact_gamertag.assert_called_once_with("bar")
-        mock_signals_get_gamertag_from_xuid.assert_called_once_with(0)
+        mock_get_xuid_and_exact_gamertag.assert_called_once_with("bar")
         self.assertEqual(XboxLiveAccount.objects.count(), 2)
         xbl_account_1.refresh_from_db()
         self.assertEqual(xbl_account_1.xuid, 0)
         self.assertEqual(xbl_account_1.gamertag, "Bar")
-        reset_both_mocks()
+        mock_get_xuid_and_exact_gamertag.reset_mock()
 
     @patch("apps.xbox_live.utils.requests.Session")
     @patch("apps.xbox_live.decorators.get_xsts_token")
@@ -1,8 +1,10 @@
+import datetime
 import logging
 
 import requests
 from django.contrib.auth.models import User
 
+from apps.overrides.utils import call_concurrently
 from apps.xbox_live.decorators import xsts_token
 from apps.xbox_live.models import XboxLiveAccount
 
@@ -17,6 +19,33 @@ def update_or_create_xbox_live_account(gamertag: str, user: User) -> XboxLiveAcc
     )[0]
 
 
+def hydrate_xbox_live_accounts(
+    xbox_live_accounts: list[XboxLiveAccount],
+) -> list[XboxLiveAccount]:
+    """
+    Refreshes the gamertags of XboxLiveAccounts from their XUIDs concurrently and saves the changed ones in one query.
+    Accounts flagged with `needs_hydration` are cleared once their gamertag is found. Returns the updated accounts.
+    """
+    gamertags = call_concurrently(
+        lambda xuid, session: get_gamertag_from_xuid(xuid),
+        [(account.xuid,) for account in xbox_live_accounts],
+    )
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    updated_accounts = []
+    for account, gamertag in zip(xbox_live_accounts, gamertags):
+        if gamertag is not None and (
+            gamertag != account.gamertag or account.needs_hydration
+        ):
+            account.gamertag = gamertag
+            account.needs_hydration = False
+            account.updated_at = now
+            updated_accounts.append(account)
+    XboxLiveAccount.objects.bulk_update(
+        updated_accounts, ["gamertag", "needs_hydration", "updated_at"]
+    )
+    return updated_accounts
+
+
 @xsts_token
 def get_xuid_and_exact_gamertag(
     gamertag: str, **kwargs
@@ -53,6 +53,7 @@ INSTALLED_APPS = [
     "rest_framework",
     "rest_framework.authtoken",
     "drf_spectacular",
+    "apps.benchmarks",
     "apps.discord",
     "apps.era_01",
     "apps.era_02",
@@ -81,6 +82,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "apps.overrides.middleware.primary_pinning_middleware",
 ]
 ROOT_URLCONF = "config.urls"
 TEMPLATES = [
@@ -99,6 +101,7 @@ TEMPLATES = [
     },
 ]
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
 
 
 # Database
@@ -107,6 +110,33 @@ WSGI_APPLICATION = "config.wsgi.application"
 DATABASES = {
     "default": env.db(),
 }
+# Reporting and leaderboard reads marked with `read_from_replica` are sent to a read replica when USE_READ_REPLICA is
+# set. The replica gets its own test database, so tests exercise routing against two databases.
+USE_READ_REPLICA = env.bool("USE_READ_REPLICA", False)
+if USE_READ_REPLICA:
+    DATABASES["replica"] = env.db("DATABASE_REPLICA_URL")
+    DATABASES["replica"]["TEST"] = {
+        "NAME": f"test_{DATABASES['replica']['NAME']}_replica"
+    }
+    DATABASE_ROUTERS = ["apps.overrides.routers.ReplicaRouter"]
+
+# Cache settings
+# Read-only stats responses, token lookups and other short-lived API data are cached here. The default cache is shared
+# by every worker and machine through an UNLOGGED Postgres table; set USE_POSTGRES_CACHE=False to fall back to a
+# per-process local memory cache.
+USE_POSTGRES_CACHE = env.bool("USE_POSTGRES_CACHE", True)
+CACHES = {
+    "default": (
+        {
+            "BACKEND": "apps.overrides.cache.PostgresCache",
+            "LOCATION": "CacheEntry",
+        }
+        if USE_POSTGRES_CACHE
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    ),
+}
 
 # Logging settings
 LOGGING = {
@@ -0,0 +1,5 @@
+# SERVER_MODE="asgi" serves the app with uvicorn workers, so views awaiting upstream APIs don't pin a worker
+if [ "$SERVER_MODE" = "asgi" ]; then
+    exec gunicorn --access-logfile - --bind 0.0.0.0:8000 --timeout 0 --workers 2 --worker-class uvicorn_worker.UvicornWorker config.asgi
+fi
+exec gunicorn --access-logfile - --bind 0.0.0.0:8000 --timeout 0 --workers 2 config.wsgi